@@ -393,99 +393,161 @@ data_availability_summary = {
 # 8. DATA EXPORT FUNCTION
 # ============================================================================
 
-def create_excel_output():
-    """Create comprehensive Excel workbook with all compiled data"""
+def _column_widths(df, sample_size=200):
+    """Estimate column widths from the header and a sample of rows (no per-cell pass)"""
+    sample = df.head(sample_size)
+    return [
+        min(max([len(str(name))] + [len(str(v)) for v in sample[name].dropna()]) + 2, 50)
+        for name in df.columns
+    ]
+
+
+def _typed_columns(df):
+    """Keep numeric columns typed; object columns become numbers if they all parse, else text (nulls kept)"""
+    df = df.copy()
+    for name in df.columns:
+        if not (pd.api.types.is_object_dtype(df[name]) or pd.api.types.is_string_dtype(df[name])):
+            continue
+        try:
+            df[name] = pd.to_numeric(df[name])
+        except (ValueError, TypeError):
+            df[name] = df[name].map(lambda v: v if v is None or pd.isna(v) else str(v)).astype(object)
+    return df
+
+
+def write_sheets(sheets, path, output_format='xlsx'):
+    """
+    Write named DataFrames as a write-only Excel workbook, or as one
+    Parquet / Arrow IPC file per sheet for machine consumers.
+    """
+    if output_format in ('parquet', 'arrow'):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        os.makedirs(path, exist_ok=True)
+        for name, df in sheets.items():
+            # Mixed number/label columns go to text; typed columns stay typed
+            table = pa.Table.from_pandas(_typed_columns(df), preserve_index=False)
+            target = os.path.join(path, f"{name}.{output_format}")
+            if output_format == 'parquet':
+                pq.write_table(table, target)
+            else:
+                with pa.ipc.new_file(target, table.schema) as writer:
+                    writer.write_table(table)
+        return path
+
+    from openpyxl import Workbook
+    from openpyxl.utils import get_column_letter
+
+    # Constant-memory workbook: rows stream to disk as they are appended
+    workbook = Workbook(write_only=True)
+    for name, df in sheets.items():
+        ws = workbook.create_sheet(name)
+        for i, width in enumerate(_column_widths(df), start=1):
+            ws.column_dimensions[get_column_letter(i)].width = width
+        ws.append([str(c) for c in df.columns])
+        for row in df.astype(object).where(df.notna(), None).to_numpy().tolist():
+            ws.append([v if v is None or isinstance(v, (int, float, str)) else str(v) for v in row])
+    workbook.save(path)
+    return path
+
+
+def create_excel_output(output_format='xlsx'):
+    """Create comprehensive Excel workbook (or Parquet/Arrow files) with all compiled data"""
     
     excel_file = "/home/phyrexian/Downloads/llm_automation/project_portfolio/Solarpunk-bitcoin/ASEAN_IE_Data_Compiled.xlsx"
+    if output_format != 'xlsx':
+        excel_file = os.path.splitext(excel_file)[0] + f"_{output_format}"
     
-    with pd.ExcelWriter(excel_file, engine='openpyxl') as writer:
-        # Sheet 1: Malaysia Digital Tax
-        df_malaysia = pd.DataFrame(malaysia_digital_tax['data'])
-        df_malaysia.to_excel(writer, sheet_name='Malaysia_SToDS_LVG', index=False)
-        
-        # Sheet 2: Vietnam Foreign Suppliers
-        df_vietnam_foreign = pd.DataFrame(vietnam_digital_tax['foreign_supplier_portal_revenue']['data'])
-        df_vietnam_foreign.to_excel(writer, sheet_name='Vietnam_Foreign_Portal', index=False)
-        
-        # Sheet 3: Vietnam Domestic E-commerce
-        df_vietnam_domestic = pd.DataFrame(vietnam_digital_tax['domestic_ecommerce_tax']['data'])
-        df_vietnam_domestic.to_excel(writer, sheet_name='Vietnam_Domestic_Ecom', index=False)
-        
-        # Sheet 4: E-Conomy SEA Country Data
-        econemy_country_data = []
-        for country, metrics in economy_sea_2024['country_specific'].items():
-            row = {'country': country}
-            row.update(metrics)
-            econemy_country_data.append(row)
-        df_economy = pd.DataFrame(econemy_country_data)
-        df_economy.to_excel(writer, sheet_name='eConomy_SEA_2024', index=False)
-        
-        # Sheet 5: Payment Infrastructure
-        payment_data = []
-        for country, data in payment_infrastructure.items():
-            if country != 'global':
-                payment_data.append({
-                    'country': country,
-                    'system': data.get('system', ''),
-                    'key_metric': str(data.get('2024_data') or data.get('december_2023') or data.get('2023_data', ''))
-                })
-        df_payments = pd.DataFrame(payment_data)
-        df_payments.to_excel(writer, sheet_name='Payment_Systems', index=False)
-        
-        # Sheet 6: Data Availability Assessment
-        availability_data = []
-        
-        for category, items in data_availability_summary.items():
-            if isinstance(items, dict):
-                for item_name, item_data in items.items():
-                    row = {
-                        'category': category,
-                        'item': item_name,
-                        'status': item_data.get('status', ''),
-                        'details': str(item_data)
-                    }
-                    availability_data.append(row)
-        
-        df_availability = pd.DataFrame(availability_data)
-        df_availability.to_excel(writer, sheet_name='Data_Availability', index=False)
-        
-        # Sheet 7: Summary Statistics
-        summary_stats = [
-            {
-                'metric': 'Malaysia 2024 Total Digital Tax',
-                'value': 'RM 2.096 billion',
-                'usd_equivalent': '~$503 million',
-                'confidence': 'VERIFIED'
-            },
-            {
-                'metric': 'Vietnam Cumulative Foreign Supplier Tax (2022-Aug2025)',
-                'value': 'VND 26.149 trillion',
-                'usd_equivalent': '~$1 billion',
-                'confidence': 'VERIFIED'
-            },
-            {
-                'metric': 'Philippines RA 12023 Projected Revenue (2024-2028)',
-                'value': 'PHP 83.8 billion',
-                'usd_equivalent': '~$1.54 billion',
-                'confidence': 'PROJECTED'
-            },
-            {
-                'metric': 'Regional e-Conomy GMV (2024)',
-                'value': '$263 billion',
-                'usd_equivalent': '(regional aggregate)',
-                'confidence': 'VERIFIED'
-            },
-            {
-                'metric': 'Philippines Digital Payment Adoption (2024)',
-                'value': '57.4% volume, 59.0% value',
-                'usd_equivalent': 'N/A',
-                'confidence': 'VERIFIED'
-            }
-        ]
-        df_summary = pd.DataFrame(summary_stats)
-        df_summary.to_excel(writer, sheet_name='Summary_Statistics', index=False)
+    sheets = {}
+    
+    # Sheet 1: Malaysia Digital Tax
+    df_malaysia = pd.DataFrame(malaysia_digital_tax['data'])
+    sheets['Malaysia_SToDS_LVG'] = df_malaysia
+    
+    # Sheet 2: Vietnam Foreign Suppliers
+    df_vietnam_foreign = pd.DataFrame(vietnam_digital_tax['foreign_supplier_portal_revenue']['data'])
+    sheets['Vietnam_Foreign_Portal'] = df_vietnam_foreign
+    
+    # Sheet 3: Vietnam Domestic E-commerce
+    df_vietnam_domestic = pd.DataFrame(vietnam_digital_tax['domestic_ecommerce_tax']['data'])
+    sheets['Vietnam_Domestic_Ecom'] = df_vietnam_domestic
+    
+    # Sheet 4: E-Conomy SEA Country Data
+    econemy_country_data = []
+    for country, metrics in economy_sea_2024['country_specific'].items():
+        row = {'country': country}
+        row.update(metrics)
+        econemy_country_data.append(row)
+    df_economy = pd.DataFrame(econemy_country_data)
+    sheets['eConomy_SEA_2024'] = df_economy
+    
+    # Sheet 5: Payment Infrastructure
+    payment_data = []
+    for country, data in payment_infrastructure.items():
+        if country != 'global':
+            payment_data.append({
+                'country': country,
+                'system': data.get('system', ''),
+                'key_metric': str(data.get('2024_data') or data.get('december_2023') or data.get('2023_data', ''))
+            })
+    df_payments = pd.DataFrame(payment_data)
+    sheets['Payment_Systems'] = df_payments
+    
+    # Sheet 6: Data Availability Assessment
+    availability_data = []
+    
+    for category, items in data_availability_summary.items():
+        if isinstance(items, dict):
+            for item_name, item_data in items.items():
+                row = {
+                    'category': category,
+                    'item': item_name,
+                    'status': item_data.get('status', ''),
+                    'details': str(item_data)
+                }
+                availability_data.append(row)
+    
+    df_availability = pd.DataFrame(availability_data)
+    sheets['Data_Availability'] = df_availability
+    
+    # Sheet 7: Summary Statistics
+    summary_stats = [
+        {
+            'metric': 'Malaysia 2024 Total Digital Tax',
+            'value': 'RM 2.096 billion',
+            'usd_equivalent': '~$503 million',
+            'confidence': 'VERIFIED'
+        },
+        {
+            'metric': 'Vietnam Cumulative Foreign Supplier Tax (2022-Aug2025)',
+            'value': 'VND 26.149 trillion',
+            'usd_equivalent': '~$1 billion',
+            'confidence': 'VERIFIED'
+        },
+        {
+            'metric': 'Philippines RA 12023 Projected Revenue (2024-2028)',
+            'value': 'PHP 83.8 billion',
+            'usd_equivalent': '~$1.54 billion',
+            'confidence': 'PROJECTED'
+        },
+        {
+            'metric': 'Regional e-Conomy GMV (2024)',
+            'value': '$263 billion',
+            'usd_equivalent': '(regional aggregate)',
+            'confidence': 'VERIFIED'
+        },
+        {
+            'metric': 'Philippines Digital Payment Adoption (2024)',
+            'value': '57.4% volume, 59.0% value',
+            'usd_equivalent': 'N/A',
+            'confidence': 'VERIFIED'
+        }
+    ]
+    df_summary = pd.DataFrame(summary_stats)
+    sheets['Summary_Statistics'] = df_summary
     
-    return excel_file
+    return write_sheets(sheets, excel_file, output_format)
 
 # ============================================================================
 # MAIN EXECUTION
@@ -0,0 +1,304 @@
+"""
+Batch pricing for the API (``POST /price/batch``).
+
+A batch arrives as a list of contract specs, a columnar JSON object or an
+Arrow IPC table, and is normalized to one dict per contract. Contracts are
+validated one by one, grouped by engine and the parameters an engine
+shares across its batch (method, payoff type, steps / draws / seed), and
+each group is priced in one call to a vectorized engine:
+
+- 'binomial': ``binomial.price_batch`` (stacked lattices)
+- 'monte_carlo': ``monte_carlo.price_batch`` (shared draws)
+- 'analytic': ``analytic.bs_price`` (closed form)
+
+Results are kept as columns (NumPy arrays for the numbers), filled group
+by group with vectorized assignments; ``rows_from_columns`` turns them
+into one dict per contract for JSON. A contract that fails validation or
+pricing gets an 'error' entry and does not affect the rest of the batch.
+"""
+
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel, Field, ValidationError
+from scipy import stats
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from spk_derivatives import binomial, monte_carlo  # type: ignore  # noqa: E402
+from spk_derivatives.analytic import bs_price  # type: ignore  # noqa: E402
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - exercised only without pyarrow
+    pa = None
+
+MAX_BATCH_CONTRACTS = 10_000
+MAX_BINOMIAL_STEPS = 2000
+MAX_SIMULATIONS = 1_000_000
+FAST_BATCH_CONTRACTS = 256  # larger batches go to the heavy executor lane
+INPUTS = ("S0", "sigma", "K", "T", "r")
+ARROW_STREAM_TYPE = "application/vnd.apache.arrow.stream"
+ARROW_FILE_TYPE = "application/vnd.apache.arrow.file"
+
+
+class BatchContract(BaseModel):
+    id: Optional[str] = Field(None, description="Client tag echoed in the result")
+    S0: Optional[float] = Field(None, description="Underlying price; defaults to CEIR-derived")
+    K: Optional[float] = Field(None, description="Strike; defaults to S0")
+    T: float = 1.0
+    r: float = 0.05
+    sigma: Optional[float] = Field(None, description="Volatility; defaults to CEIR-derived")
+    method: str = Field("binomial", pattern="^(binomial|monte_carlo|analytic)$")
+    N: int = 100
+    num_simulations: int = 10000
+    seed: Optional[int] = None
+    payoff_type: str = Field("call", pattern="^(call|redeemable)$")
+    data_dir: str = "../empirical"
+    use_repo_fallback: bool = True
+
+
+def _drop_nulls(row: Mapping) -> Dict:
+    return {k: v for k, v in row.items() if v is not None}
+
+
+def rows_from_json(payload: Any) -> List[Dict]:
+    """
+    Contract dicts from a JSON (or MessagePack) batch.
+
+    Accepted shapes:
+
+    - ``[{...}, ...]`` or ``{"contracts": [{...}, ...]}``
+    - ``{"columns": {"S0": [...], "K": [...], "method": "binomial"}}``:
+      equal-length lists, scalars broadcast to every row
+
+    Either object form may carry ``"defaults": {...}``, applied to every
+    contract beneath its own fields. Nulls mean "use the default".
+    """
+    defaults: Dict = {}
+    if isinstance(payload, dict):
+        defaults = payload.get("defaults") or {}
+        if not isinstance(defaults, dict):
+            raise ValueError("'defaults' must be an object")
+        if "contracts" in payload:
+            payload = payload["contracts"]
+        elif "columns" in payload:
+            payload = _columns_to_rows(payload["columns"])
+        else:
+            raise ValueError("Expected 'contracts' or 'columns'")
+    if not isinstance(payload, list):
+        raise ValueError("Expected a list of contracts")
+    rows = []
+    for row in payload:
+        if not isinstance(row, dict):
+            raise ValueError("Every contract must be an object")
+        rows.append({**defaults, **_drop_nulls(row)})
+    return rows
+
+
+def _columns_to_rows(columns: Any) -> List[Dict]:
+    if not isinstance(columns, dict) or not columns:
+        raise ValueError("'columns' must be a non-empty object")
+    # Arrays decoded from binary payloads (MessagePack) behave like lists
+    columns = {name: v.tolist() if isinstance(v, np.ndarray) else v for name, v in columns.items()}
+    lengths = {len(v) for v in columns.values() if isinstance(v, list)}
+    if len(lengths) > 1:
+        raise ValueError(f"Column lengths differ: {sorted(lengths)}")
+    n = lengths.pop() if lengths else 1
+    return [
+        {name: (values[i] if isinstance(values, list) else values)
+         for name, values in columns.items()}
+        for i in range(n)
+    ]
+
+
+def rows_from_arrow(body: bytes, content_type: str = ARROW_STREAM_TYPE) -> List[Dict]:
+    """Contract dicts from an Arrow IPC stream (or file) with one column per field."""
+    if pa is None:
+        raise ImportError("pyarrow required for Arrow batches. Install with: pip install pyarrow")
+    reader = pa.ipc.open_file(pa.BufferReader(body)) if content_type == ARROW_FILE_TYPE \
+        else pa.ipc.open_stream(body)
+    return [_drop_nulls(row) for row in reader.read_all().to_pylist()]
+
+
+def _describe(exc: Exception) -> str:
+    if isinstance(exc, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in exc.errors()
+        )
+    return str(exc)
+
+
+def _check_limits(c: BatchContract) -> None:
+    # Same inputs rejected by every engine (the analytic one would price them)
+    for name in ("S0", "K", "T", "sigma"):
+        value = getattr(c, name)
+        if value is not None and not value > 0:
+            raise ValueError(f"{name} must be positive")
+    if c.method == "binomial" and not 1 <= c.N <= MAX_BINOMIAL_STEPS:
+        raise ValueError(f"N must be between 1 and {MAX_BINOMIAL_STEPS}")
+    if c.method == "monte_carlo" and not 1 <= c.num_simulations <= MAX_SIMULATIONS:
+        raise ValueError(f"num_simulations must be between 1 and {MAX_SIMULATIONS:,}")
+
+
+def _group_key(c: BatchContract) -> tuple:
+    if c.method == "binomial":
+        return (c.method, c.payoff_type, c.N)
+    if c.method == "monte_carlo":
+        return (c.method, c.payoff_type, c.num_simulations, c.seed)
+    return (c.method, c.payoff_type)
+
+
+def _run_engine(key: tuple, S0, K, T, r, sigma) -> Dict[str, np.ndarray]:
+    method, payoff_type = key[0], key[1]
+    if method == "binomial":
+        return {"price": binomial.price_batch(S0, K, T, r, sigma, N=key[2],
+                                              payoff_type=payoff_type)}
+    if method == "monte_carlo":
+        price, se = monte_carlo.price_batch(S0, K, T, r, sigma, num_simulations=key[2],
+                                            payoff_type=payoff_type, seed=key[3])
+        z = stats.norm.ppf(0.975)
+        return {"price": price, "ci_low": price - z * se, "ci_high": price + z * se}
+    return {"price": bs_price(S0, K, T, r, sigma, payoff_type)}
+
+
+def _new_columns(n: int) -> Dict[str, Any]:
+    """Empty result columns for ``n`` contracts."""
+    columns: Dict[str, Any] = {"index": np.arange(n), "id": [None] * n, "method": [None] * n}
+    for name in ("price", "ci_low", "ci_high") + INPUTS:
+        columns[name] = np.full(n, np.nan)
+    columns["error"] = [None] * n
+    return columns
+
+
+def _set_error(columns: Dict[str, Any], index: int, exc: Exception) -> None:
+    columns["error"][index] = _describe(exc)
+    columns["price"][index] = np.nan
+
+
+def _price_group(key: tuple, items: List[tuple], columns: Dict[str, Any]) -> None:
+    """Price one group; on an engine error retry item by item to isolate it."""
+    inputs = {name: np.array([p[name] for _, _, p in items], dtype=float) for name in INPUTS}
+    try:
+        out = _run_engine(key, **{name: inputs[name] for name in ("S0", "K", "T", "r", "sigma")})
+    except ValueError as exc:
+        if len(items) == 1:
+            _set_error(columns, items[0][0], exc)
+        else:
+            for item in items:
+                _price_group(key, [item], columns)
+        return
+
+    index = np.array([i for i, _, _ in items])
+    for name in INPUTS:
+        columns[name][index] = inputs[name]
+    for name, values in out.items():
+        columns[name][index] = values
+    for i in index:
+        columns["method"][i] = key[0]
+    for i in index[~np.isfinite(np.asarray(out["price"], dtype=float))]:
+        _set_error(columns, i, ValueError("Non-finite price"))
+
+
+def _error(index: int, contract_id: Optional[str], exc: Exception) -> Dict:
+    return {"index": index, "id": contract_id, "price": None, "error": _describe(exc)}
+
+
+def prepare_contracts(rows: List[Dict],
+                      defaults_for: Callable[[str, bool], Mapping]) -> Tuple[Dict[str, Any], Dict]:
+    """
+    Validate a batch and group it for pricing.
+
+    Cheap and picklable: the API runs this next to the parameter store and
+    ships the result to ``price_prepared`` on an executor lane.
+
+    Returns
+    -------
+    Tuple[Dict, Dict]
+        Result columns so far (ids and validation errors filled in) and
+        the groups: group key -> [(index, contract, params), ...]
+    """
+    columns = _new_columns(len(rows))
+    groups: Dict[tuple, List[tuple]] = defaultdict(list)
+
+    for index, row in enumerate(rows):
+        contract = None
+        try:
+            contract = BatchContract.model_validate(row)
+            columns["id"][index] = contract.id
+            _check_limits(contract)
+            K = contract.S0 if contract.K is None else contract.K
+            params = {"S0": contract.S0, "sigma": contract.sigma, "K": K}
+            if None in params.values():
+                defaults = defaults_for(contract.data_dir, contract.use_repo_fallback)
+                params = {name: defaults[name] if value is None else value
+                          for name, value in params.items()}
+            params.update({"T": contract.T, "r": contract.r})
+        except Exception as exc:  # noqa: BLE001 - reported per contract
+            if contract is None:
+                columns["id"][index] = row.get("id") if isinstance(row, Mapping) else None
+            _set_error(columns, index, exc)
+            continue
+        groups[_group_key(contract)].append((index, contract, params))
+    return columns, dict(groups)
+
+
+def price_prepared(columns: Dict[str, Any], groups: Dict[tuple, List[tuple]]) -> Dict[str, Any]:
+    """Price the groups from ``prepare_contracts`` into ``columns``."""
+    for key, items in groups.items():
+        _price_group(key, items, columns)
+    return columns
+
+
+def rows_from_columns(columns: Mapping[str, Any]) -> List[Dict]:
+    """
+    One result dict per contract, in order: index, id, method, price,
+    inputs and error=None (plus ci_95 for Monte-Carlo), or index, id,
+    price=None and error.
+    """
+    numbers = {name: columns[name].tolist() for name in ("price", "ci_low", "ci_high") + INPUTS}
+    rows = []
+    for i, (contract_id, method, error) in enumerate(zip(columns["id"], columns["method"],
+                                                         columns["error"])):
+        if error is not None:
+            rows.append(_error(i, contract_id, ValueError(error)))
+            continue
+        row = {"index": i, "id": contract_id, "method": method, "price": numbers["price"][i],
+               "inputs": {name: numbers[name][i] for name in INPUTS}, "error": None}
+        if method == "monte_carlo":
+            row["ci_95"] = [numbers["ci_low"][i], numbers["ci_high"][i]]
+        rows.append(row)
+    return rows
+
+
+def batch_is_heavy(groups: Dict[tuple, List[tuple]], fast_limit: int = FAST_BATCH_CONTRACTS) -> bool:
+    """True when a prepared batch belongs on the heavy executor lane."""
+    return (any(key[0] == "monte_carlo" for key in groups)
+            or sum(len(items) for items in groups.values()) > fast_limit)
+
+
+def price_contracts(rows: List[Dict],
+                    defaults_for: Callable[[str, bool], Mapping]) -> List[Dict]:
+    """
+    Price a batch of contract dicts.
+
+    Parameters
+    ----------
+    rows : List[Dict]
+        One dict per contract (see ``BatchContract``)
+    defaults_for : callable
+        ``defaults_for(data_dir, use_repo_fallback)`` -> mapping with S0,
+        sigma and K, used for fields a contract omits
+
+    Returns
+    -------
+    List[Dict]
+        One result per row, in order: index, id, method, price, inputs
+        (and ci_95 for Monte-Carlo), or index, id, price=None and error
+    """
+    return rows_from_columns(price_prepared(*prepare_contracts(rows, defaults_for)))
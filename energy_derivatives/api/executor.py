@@ -0,0 +1,220 @@
+"""
+Execution backend for CPU-bound pricing in the API.
+
+Handlers never price on the event loop or the shared request thread pool.
+They submit work units (``api.tasks``) to one of two lanes, each with its
+own workers, so a 1M-path stress test can only ever occupy the heavy lane
+while analytic and binomial requests keep flowing through the fast one:
+
+- 'fast': binomial / analytic prices and Greeks, small batches
+- 'heavy': Monte-Carlo prices and Greeks, stress tests, large batches
+
+Each lane is a process pool (default; warm workers started at application
+startup with the numerical stack pre-imported) or a thread pool. A lane
+admits at most ``workers + queue_size`` unfinished jobs; beyond that
+``LaneBusy`` is raised (HTTP 503) instead of queueing without bound. A job
+that outlives the lane timeout raises ``LaneTimeout`` (HTTP 504); it keeps
+its slot until it actually finishes, so the bound holds for real work.
+A worker that dies breaks a process pool for good: the lane drops it,
+answers that job with ``LaneBusy`` and starts a fresh pool on the next.
+
+Configuration (environment):
+
+- SPK_API_EXECUTOR: 'process' (default) or 'thread'
+- SPK_API_{FAST,HEAVY}_WORKERS: workers per lane (default 2 / 2)
+- SPK_API_{FAST,HEAVY}_QUEUE: waiting jobs per lane (default 64 / 8)
+- SPK_API_{FAST,HEAVY}_TIMEOUT: seconds per job (default 10 / 120)
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional
+
+from spk_derivatives import profiling  # type: ignore
+
+from .tasks import instrumented, ping, warm_worker
+
+FAST = "fast"
+HEAVY = "heavy"
+BACKENDS = ("process", "thread")
+LANE_DEFAULTS = {
+    FAST: {"workers": 2, "queue": 64, "timeout": 10.0},
+    HEAVY: {"workers": 2, "queue": 8, "timeout": 120.0},
+}
+
+
+class LaneBusy(RuntimeError):
+    """The lane's bounded queue is full."""
+
+
+class LaneTimeout(TimeoutError):
+    """A job did not finish within the lane timeout."""
+
+
+class Lane:
+    """
+    One pool with a bounded number of unfinished jobs.
+
+    Parameters
+    ----------
+    name : str
+        Lane name
+    workers : int
+        Worker processes / threads
+    queue_size : int
+        Jobs allowed to wait beyond the running ones
+    timeout : float
+        Seconds a caller waits for a job
+    backend : str
+        'process' or 'thread'
+    """
+
+    def __init__(self, name: str, workers: int, queue_size: int, timeout: float,
+                 backend: str = "process"):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown executor backend: {backend}. Choose from: {list(BACKENDS)}")
+        if workers < 1 or queue_size < 0 or timeout <= 0:
+            raise ValueError("Need workers >= 1, queue_size >= 0 and timeout > 0")
+        self.name = name
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.backend = backend
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+
+    def _ensure_pool(self) -> Executor:
+        with self._lock:
+            if self._pool is None:
+                if self.backend == "process":
+                    # spawn: never fork a process that is running threads
+                    self._pool = ProcessPoolExecutor(
+                        self.workers, mp_context=multiprocessing.get_context("spawn"),
+                        initializer=warm_worker, initargs=(profiling.enabled(),))
+                else:
+                    self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix=f"lane-{self.name}")
+            return self._pool
+
+    def start(self) -> None:
+        """Create the pool and wait until every worker is up and warm."""
+        pool = self._ensure_pool()
+        for future in [pool.submit(ping) for _ in range(self.workers)]:
+            future.result()
+
+    def _discard_pool(self, pool: Executor) -> None:
+        """Drop a broken pool so the next job starts a fresh one."""
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    async def run(self, fn: Callable, *args):
+        """Run ``fn(*args)`` on the lane; LaneBusy / LaneTimeout on overload."""
+        if not self._slots.acquire(blocking=False):
+            raise LaneBusy(f"{self.name} lane is full ({self.workers + self.queue_size} jobs)")
+        pool = None
+        try:
+            pool = self._ensure_pool()
+            if self.backend == "process":
+                # Engine phase timings recorded in the worker come back with the result
+                future = pool.submit(instrumented, fn, *args)
+            else:
+                future = pool.submit(fn, *args)
+        except BrokenProcessPool:
+            self._slots.release()
+            self._discard_pool(pool)
+            raise LaneBusy(f"{self.name} lane is restarting its workers") from None
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self.in_flight += 1
+        future.add_done_callback(self._release)
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            raise LaneTimeout(f"{self.name} job exceeded {self.timeout:g}s") from None
+        except BrokenProcessPool:
+            self._discard_pool(pool)
+            raise LaneBusy(f"{self.name} lane lost a worker; retry the request") from None
+        if self.backend == "process":
+            result, timings = result
+            profiling.merge(timings)
+        return result
+
+    def shutdown(self) -> None:
+        """Stop the pool, dropping queued jobs."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict:
+        return {"backend": self.backend, "workers": self.workers, "queue_size": self.queue_size,
+                "timeout": self.timeout, "in_flight": self.in_flight,
+                "started": self._pool is not None}
+
+
+class PricingExecutor:
+    """
+    Fast and heavy lanes for pricing work.
+
+    Pools are created on ``start()`` (application startup) or lazily on
+    first use.
+
+    Parameters
+    ----------
+    backend : str
+        'process' or 'thread'
+    **lanes
+        Per-lane overrides, e.g. ``heavy={'workers': 4, 'timeout': 300}``
+    """
+
+    def __init__(self, backend: str = "process", **lanes: Dict):
+        unknown = set(lanes) - set(LANE_DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown lanes: {sorted(unknown)}")
+        self.backend = backend
+        self.lanes = {}
+        for name, defaults in LANE_DEFAULTS.items():
+            cfg = {**defaults, **lanes.get(name, {})}
+            self.lanes[name] = Lane(name, int(cfg["workers"]), int(cfg["queue"]),
+                                    float(cfg["timeout"]), backend)
+
+    @classmethod
+    def from_env(cls) -> "PricingExecutor":
+        """Executor configured from the SPK_API_* environment variables."""
+        lanes = {}
+        for name, defaults in LANE_DEFAULTS.items():
+            prefix = f"SPK_API_{name.upper()}_"
+            lanes[name] = {
+                "workers": int(os.getenv(prefix + "WORKERS", defaults["workers"])),
+                "queue": int(os.getenv(prefix + "QUEUE", defaults["queue"])),
+                "timeout": float(os.getenv(prefix + "TIMEOUT", defaults["timeout"])),
+            }
+        return cls(os.getenv("SPK_API_EXECUTOR", "process"), **lanes)
+
+    def start(self) -> None:
+        for lane in self.lanes.values():
+            lane.start()
+
+    async def run(self, lane: str, fn: Callable, *args):
+        return await self.lanes[lane].run(fn, *args)
+
+    def shutdown(self) -> None:
+        for lane in self.lanes.values():
+            lane.shutdown()
+
+    def stats(self) -> Dict[str, Dict]:
+        return {name: lane.stats() for name, lane in self.lanes.items()}
@@ -0,0 +1,377 @@
+"""
+Live repricing feed behind ``/ws/prices``.
+
+Clients subscribe to contracts over a WebSocket and are pushed a price
+(and Greeks) whenever one of the contract's inputs changes. Inputs a
+client leaves out are live:
+
+- S0, sigma, K omitted: CEIR defaults from the ``ParameterStore`` snapshot
+  for ``data_dir`` (swapped when the CEIR files change)
+- ``source`` given: S0 and sigma from the NASA POWER series of a site
+  (solar, wind or hydro), memoized on the columnar cache's data version,
+  so a refreshed series gives new values
+- r omitted: the feed's current rate (``POST /market/rate``)
+
+Identical contracts are held once however many subscribers share them.
+On every poll (and immediately after a rate change) inputs are resolved
+again; only contracts whose inputs changed are repriced, all of them in
+one batched executor job per (N, payoff_type, greeks) on the fast lane.
+Each subscriber keeps only the latest unsent update per contract, so a
+slow client gets fresh values instead of a growing backlog.
+
+Configuration (environment):
+
+- SPK_FEED_POLL_SECONDS: how often live inputs are checked (default 5)
+- SPK_FEED_RATE: initial live rate (default 0.05)
+- SPK_FEED_MAX_CONTRACTS: contracts per subscriber (default 100)
+"""
+
+import asyncio
+import os
+import sys
+import time
+import warnings
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from pydantic import BaseModel, Field
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from spk_derivatives.memo import (  # type: ignore  # noqa: E402
+    content_key,
+    memoized_loader_parameters,
+    memoized_solar_parameters,
+)
+
+from . import tasks  # noqa: E402
+from .executor import FAST, LaneBusy, LaneTimeout  # noqa: E402
+
+DEFAULT_POLL_SECONDS = 5.0
+DEFAULT_RATE = 0.05
+DEFAULT_MAX_CONTRACTS = 100
+MAX_FEED_STEPS = 2000
+
+
+class FeedSource(BaseModel):
+    energy_type: str = Field(..., pattern="^(solar|wind|hydro)$")
+    lat: float = Field(..., ge=-90, le=90)
+    lon: float = Field(..., ge=-180, le=180)
+    start_year: Optional[int] = None
+    end_year: Optional[int] = None
+
+
+class FeedContract(BaseModel):
+    id: str = Field(..., min_length=1, max_length=64, description="Client label for updates")
+    S0: Optional[float] = Field(None, gt=0, description="Fixed underlying; live if omitted")
+    K: Optional[float] = Field(None, gt=0)
+    T: float = Field(1.0, gt=0)
+    r: Optional[float] = Field(None, description="Fixed rate; follows the live rate if omitted")
+    sigma: Optional[float] = Field(None, gt=0)
+    N: int = Field(100, ge=1, le=MAX_FEED_STEPS)
+    payoff_type: str = Field("call", pattern="^(call|redeemable)$")
+    greeks: bool = True
+    source: Optional[FeedSource] = Field(None, description="NASA POWER site for live S0 and sigma")
+    data_dir: str = "../empirical"
+    use_repo_fallback: bool = True
+
+    def spec_key(self) -> str:
+        """Identity shared by equal contracts, whoever subscribed."""
+        return content_key("feed", self.model_dump(exclude={"id"}))
+
+
+def source_parameters(source: FeedSource) -> Dict:
+    """S0 and sigma for a NASA POWER site (memoized on the data version)."""
+    years = {"start_year": source.start_year, "end_year": source.end_year}
+    years = {k: v for k, v in years.items() if v is not None}
+    if source.energy_type == "solar":
+        params = memoized_solar_parameters(
+            lat=source.lat, lon=source.lon,
+            **{"start" if k == "start_year" else "end": v for k, v in years.items()})
+    else:
+        from spk_derivatives import HydroDataLoader, WindDataLoader  # type: ignore
+
+        loader_cls = WindDataLoader if source.energy_type == "wind" else HydroDataLoader
+        params = memoized_loader_parameters(loader_cls, {"lat": source.lat, "lon": source.lon, **years})
+    return {"S0": float(params["S0"]), "sigma": float(params["sigma"])}
+
+
+class Subscriber:
+    """
+    Outbox of one WebSocket client.
+
+    Control messages are kept in order; price updates are coalesced to the
+    latest one per contract id.
+    """
+
+    def __init__(self):
+        self.contracts: Dict[str, str] = {}  # client id -> spec key
+        self._control: deque = deque()
+        self._updates: Dict[str, Dict] = {}
+        self._ready = asyncio.Event()
+
+    def send(self, message: Dict) -> None:
+        self._control.append(message)
+        self._ready.set()
+
+    def offer(self, contract_id: str, update: Dict) -> None:
+        self._updates.pop(contract_id, None)
+        self._updates[contract_id] = update
+        self._ready.set()
+
+    async def next(self) -> List[Dict]:
+        """Wait for and take every queued message."""
+        await self._ready.wait()
+        self._ready.clear()
+        messages = list(self._control) + list(self._updates.values())
+        self._control.clear()
+        self._updates.clear()
+        return messages
+
+
+class _Entry:
+    __slots__ = ("contract", "subscribers", "inputs", "result")
+
+    def __init__(self, contract: FeedContract):
+        self.contract = contract
+        self.subscribers: Set[Tuple[Subscriber, str]] = set()
+        self.inputs: Optional[Dict] = None
+        self.result: Optional[Dict] = None
+
+
+class PriceFeed:
+    """
+    Shared contracts, their last inputs and prices, and who to push them to.
+
+    Parameters
+    ----------
+    store : ParameterStore
+        CEIR default snapshots
+    executor : PricingExecutor
+        Runs ``tasks.feed_price_task`` on the fast lane
+    poll_seconds : float
+        Interval between input checks; 0 checks only after a rate change
+        or a new contract
+    rate : float
+        Initial live rate
+    max_contracts : int
+        Contracts one subscriber may hold
+    """
+
+    def __init__(self, store, executor, poll_seconds: float = DEFAULT_POLL_SECONDS,
+                 rate: float = DEFAULT_RATE, max_contracts: int = DEFAULT_MAX_CONTRACTS):
+        self.store = store
+        self.executor = executor
+        self.poll_seconds = poll_seconds
+        self.rate = rate
+        self.max_contracts = max_contracts
+        self._entries: Dict[str, _Entry] = {}
+        self._subscribers: Set[Subscriber] = set()
+        self._lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.repriced = 0
+        self.batches = 0
+
+    @classmethod
+    def from_env(cls, store, executor) -> "PriceFeed":
+        """Feed configured from the SPK_FEED_* environment variables."""
+        return cls(store, executor,
+                   float(os.getenv("SPK_FEED_POLL_SECONDS", DEFAULT_POLL_SECONDS)),
+                   float(os.getenv("SPK_FEED_RATE", DEFAULT_RATE)),
+                   int(os.getenv("SPK_FEED_MAX_CONTRACTS", DEFAULT_MAX_CONTRACTS)))
+
+    # ------------------------------------------------------------------
+    # Inputs and pricing
+    # ------------------------------------------------------------------
+
+    def resolve(self, contract: FeedContract) -> Dict[str, float]:
+        """Current inputs of a contract (may load data; call off the event loop)."""
+        params: Dict[str, float] = {}
+        if contract.source is not None:
+            params.update(source_parameters(contract.source))
+        elif None in (contract.S0, contract.sigma, contract.K):
+            defaults = self.store.get(contract.data_dir, contract.use_repo_fallback)
+            params.update({name: defaults[name] for name in ("S0", "sigma", "K")})
+        for name in ("S0", "sigma", "K"):
+            value = getattr(contract, name)
+            if value is not None:
+                params[name] = value
+        params.setdefault("K", params["S0"])
+        params["T"] = contract.T
+        params["r"] = contract.r if contract.r is not None else self.rate
+        return params
+
+    def _resolve_all(self, entries: Dict[str, _Entry]) -> Dict[str, object]:
+        resolved = {}
+        for key, entry in entries.items():
+            try:
+                resolved[key] = self.resolve(entry.contract)
+            except Exception as exc:  # noqa: BLE001
+                resolved[key] = exc
+        return resolved
+
+    async def _reprice(self, changed: List[Tuple[_Entry, Dict]]) -> None:
+        """Price the changed entries in one job per shared engine setting, then push."""
+        groups: Dict[tuple, List[Tuple[_Entry, Dict]]] = {}
+        for entry, inputs in changed:
+            c = entry.contract
+            groups.setdefault((c.N, c.payoff_type, c.greeks), []).append((entry, inputs))
+        for (N, payoff_type, greeks), group in groups.items():
+            rows = [inputs for _, inputs in group]
+            try:
+                results = await self.executor.run(FAST, tasks.feed_price_task,
+                                                  N, payoff_type, greeks, rows)
+            except (LaneBusy, LaneTimeout) as exc:
+                # Inputs stay unrecorded, so the next poll tries again
+                warnings.warn(f"Feed repricing deferred: {exc}")
+                continue
+            self.batches += 1
+            self.repriced += len(group)
+            as_of = time.time()
+            for (entry, inputs), result in zip(group, results):
+                entry.inputs = inputs
+                entry.result = {**result, "inputs": inputs, "as_of": as_of}
+                self._push(entry)
+
+    def _push(self, entry: _Entry) -> None:
+        if entry.result is None:
+            return
+        kind = "error" if "error" in entry.result else "update"
+        for subscriber, contract_id in entry.subscribers:
+            subscriber.offer(contract_id, {"type": kind, "id": contract_id, **entry.result})
+
+    async def refresh(self) -> int:
+        """
+        Reprice every entry whose inputs changed (or were never priced).
+
+        Returns
+        -------
+        int
+            Number of contracts repriced
+        """
+        async with self._lock:
+            entries = dict(self._entries)
+            resolved = await asyncio.to_thread(self._resolve_all, entries)
+            changed = []
+            for key, inputs in resolved.items():
+                entry = entries[key]
+                if isinstance(inputs, Exception):
+                    if entry.result is None:  # never priced: tell the subscribers why
+                        entry.result = {"error": f"Inputs unavailable: {inputs}"}
+                        self._push(entry)
+                    else:
+                        warnings.warn(f"Feed inputs unavailable, keeping last price: {inputs}")
+                elif inputs != entry.inputs:
+                    changed.append((entry, inputs))
+            before = self.repriced
+            if changed:
+                await self._reprice(changed)
+            return self.repriced - before
+
+    # ------------------------------------------------------------------
+    # Subscriptions
+    # ------------------------------------------------------------------
+
+    def connect(self) -> Subscriber:
+        subscriber = Subscriber()
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def subscribe(self, subscriber: Subscriber, contracts: List[FeedContract]) -> List[str]:
+        """
+        Add contracts for a subscriber; returns the ids accepted.
+
+        Contracts already priced for someone else are sent their last
+        price at once; new ones are priced by the next refresh, which
+        starts right away. Raises ValueError past ``max_contracts``.
+        """
+        new_ids = {c.id for c in contracts} - set(subscriber.contracts)
+        if len(subscriber.contracts) + len(new_ids) > self.max_contracts:
+            raise ValueError(f"At most {self.max_contracts} contracts per subscriber")
+        fresh = False
+        for contract in contracts:
+            self._detach(subscriber, [contract.id])
+            key = contract.spec_key()
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry(contract)
+                fresh = True
+            entry.subscribers.add((subscriber, contract.id))
+            subscriber.contracts[contract.id] = key
+            if entry.result is not None:
+                subscriber.offer(contract.id, {"type": "update", "id": contract.id, **entry.result})
+        if fresh:
+            self._wake.set()
+        return [c.id for c in contracts]
+
+    def _detach(self, subscriber: Subscriber, ids: Iterable[str]) -> List[str]:
+        removed = []
+        for contract_id in ids:
+            key = subscriber.contracts.pop(contract_id, None)
+            if key is None:
+                continue
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.subscribers.discard((subscriber, contract_id))
+                if not entry.subscribers:
+                    del self._entries[key]
+            removed.append(contract_id)
+        return removed
+
+    def unsubscribe(self, subscriber: Subscriber, ids: Iterable[str]) -> List[str]:
+        """Drop contracts for a subscriber; returns the ids that were held."""
+        return self._detach(subscriber, ids)
+
+    def disconnect(self, subscriber: Subscriber) -> None:
+        self._detach(subscriber, list(subscriber.contracts))
+        self._subscribers.discard(subscriber)
+
+    # ------------------------------------------------------------------
+    # Live rate and polling
+    # ------------------------------------------------------------------
+
+    def set_rate(self, r: float) -> None:
+        """New live rate; contracts following it are repriced right away."""
+        self.rate = float(r)
+        self._wake.set()
+
+    async def _poll(self) -> None:
+        while True:
+            try:
+                timeout = self.poll_seconds if self.poll_seconds > 0 else None
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.refresh()
+            except Exception as exc:  # noqa: BLE001
+                warnings.warn(f"Feed refresh failed: {exc}")
+
+    def start(self) -> None:
+        """Start polling (call from the running event loop)."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._poll())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "contracts": len(self._entries),
+            "subscriptions": sum(len(e.subscribers) for e in self._entries.values()),
+            "repriced": self.repriced,
+            "batches": self.batches,
+            "rate": self.rate,
+        }
@@ -0,0 +1,195 @@
+"""
+Content negotiation for the pricing endpoints.
+
+Responses are encoded by the Accept header:
+
+- application/json (default): orjson when installed, stdlib json otherwise
+- application/msgpack (also application/x-msgpack, application/vnd.msgpack)
+- application/vnd.apache.arrow.stream / .file: columnar payloads only
+  (``POST /price/batch``); one record batch, no per-row objects
+
+NumPy arrays inside a payload are written from their buffers: orjson
+serializes them natively and MessagePack stores them as raw bytes in the
+msgpack-numpy layout (``{b"nd": True, b"type": dtype.str, b"kind": b"",
+b"shape": [...], b"data": <bytes>}``), so ``msgpack_numpy`` clients
+decode them directly. Request bodies in MessagePack are decoded the same
+way (the layout comes back as an ndarray).
+
+An Accept header naming only unsupported types is answered with 406.
+orjson and msgpack are optional: without them JSON falls back to the
+standard library and MessagePack is not offered.
+"""
+
+import json
+import math
+from typing import Any, Dict, List, Mapping, Optional
+
+import numpy as np
+from fastapi import HTTPException
+from fastapi.responses import Response
+
+from .batch import ARROW_FILE_TYPE, ARROW_STREAM_TYPE
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - exercised only without msgpack
+    msgpack = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - exercised only without pyarrow
+    pa = None
+
+JSON_TYPE = "application/json"
+MSGPACK_TYPE = "application/msgpack"
+MSGPACK_ALIASES = (MSGPACK_TYPE, "application/x-msgpack", "application/vnd.msgpack")
+ARROW_TYPES = (ARROW_STREAM_TYPE, ARROW_FILE_TYPE)
+
+
+def _accepted(accept: Optional[str]) -> List[str]:
+    """Media types of an Accept header, most preferred first (q=0 dropped)."""
+    ranked = []
+    for position, part in enumerate((accept or "").split(",")):
+        fields = [f.strip() for f in part.split(";")]
+        media = fields[0].lower()
+        if not media:
+            continue
+        q = 1.0
+        for param in fields[1:]:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            ranked.append((-q, position, media))
+    return [media for _, _, media in sorted(ranked)]
+
+
+def negotiate(accept: Optional[str], columnar: bool = False) -> str:
+    """
+    Response media type for an Accept header.
+
+    ``columnar`` marks payloads that have an Arrow form. Without an
+    Accept header (or with ``*/*``) the answer is JSON; HTTPException 406
+    when nothing acceptable is offered.
+    """
+    media_types = _accepted(accept)
+    if not media_types:
+        return JSON_TYPE
+    for media in media_types:
+        if media in (JSON_TYPE, "application/*", "*/*"):
+            return JSON_TYPE
+        if media in MSGPACK_ALIASES and msgpack is not None:
+            return MSGPACK_TYPE
+        if media in ARROW_TYPES and columnar and pa is not None:
+            return media
+    offered = [JSON_TYPE] + ([MSGPACK_TYPE] if msgpack is not None else []) \
+        + (list(ARROW_TYPES) if columnar and pa is not None else [])
+    raise HTTPException(status_code=406, detail=f"Not acceptable; available: {', '.join(offered)}")
+
+
+# ----------------------------------------------------------------------
+# Encoders
+# ----------------------------------------------------------------------
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _json_safe(value: Any) -> Any:
+    """Copy with NaN/inf as None, as orjson writes them (stdlib path only)."""
+    if isinstance(value, Mapping):
+        return {k: _json_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    if isinstance(value, (np.ndarray, np.generic)):
+        return _json_safe(value.tolist())
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def dumps_json(content: Any) -> bytes:
+    """JSON bytes; non-finite floats are written as null."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_json_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(_json_safe(content), default=_json_default, allow_nan=False,
+                      separators=(",", ":")).encode()
+
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, np.ndarray) and value.dtype.kind in "biuf":
+        array = np.ascontiguousarray(value)
+        return {b"nd": True, b"type": array.dtype.str, b"kind": b"",
+                b"shape": list(array.shape), b"data": array.tobytes()}
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not MessagePack serializable")
+
+
+def _msgpack_hook(obj: Dict) -> Any:
+    if obj.get(b"nd") is True and b"data" in obj:
+        dtype = np.dtype(obj[b"type"])
+        if dtype.kind not in "biuf":
+            raise ValueError(f"Unsupported array dtype {dtype}")
+        return np.frombuffer(obj[b"data"], dtype=dtype).reshape(obj[b"shape"])
+    return obj
+
+
+def dumps_msgpack(content: Any) -> bytes:
+    if msgpack is None:
+        raise ImportError("msgpack required for MessagePack. Install with: pip install msgpack")
+    return msgpack.packb(content, default=_msgpack_default, use_bin_type=True)
+
+
+def loads_msgpack(body: bytes) -> Any:
+    """Decode a MessagePack body; msgpack-numpy arrays come back as ndarrays."""
+    if msgpack is None:
+        raise ImportError("msgpack required for MessagePack. Install with: pip install msgpack")
+    return msgpack.unpackb(body, object_hook=_msgpack_hook, raw=False, strict_map_key=False)
+
+
+def dumps_arrow(columns: Mapping[str, Any], media_type: str = ARROW_STREAM_TYPE) -> bytes:
+    """One Arrow IPC record batch from equal-length columns (ndarrays or lists; NaN -> null)."""
+    if pa is None:
+        raise ImportError("pyarrow required for Arrow. Install with: pip install pyarrow")
+    table = pa.table({name: pa.array(values, from_pandas=True) for name, values in columns.items()})
+    sink = pa.BufferOutputStream()
+    opener = pa.ipc.new_file if media_type == ARROW_FILE_TYPE else pa.ipc.new_stream
+    with opener(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def render(content: Any, media_type: str = JSON_TYPE,
+           columns: Optional[Mapping[str, Any]] = None, status_code: int = 200,
+           headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Response in the negotiated format.
+
+    ``content`` is the document for JSON and MessagePack; Arrow types
+    encode ``columns`` instead.
+    """
+    if media_type in ARROW_TYPES:
+        body = dumps_arrow(columns, media_type)
+    elif media_type == MSGPACK_TYPE:
+        body = dumps_msgpack(content)
+    else:
+        body = dumps_json(content)
+    return Response(body, status_code=status_code, media_type=media_type,
+                    headers={**(headers or {}), "Vary": "Accept"})
+
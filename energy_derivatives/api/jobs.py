@@ -0,0 +1,528 @@
+"""
+Asynchronous jobs for work that outlives an HTTP request.
+
+``POST /jobs`` records a job in a SQLite file and returns its id; worker
+processes on the same machine claim queued jobs from that file, run them
+and write progress, partial estimates and results back to it. No broker
+is involved: SQLite is the queue and the state store, so jobs survive an
+API restart.
+
+A worker records itself as ``host:pid`` on the jobs it claims and
+refreshes a heartbeat on them every ``HEARTBEAT_SECONDS`` while they run.
+A 'running' job is re-queued only when its worker is gone: a worker on
+this host whose process no longer exists, or any worker whose heartbeat
+is older than ``STALE_SECONDS``. Jobs of live workers (standalone
+``python -m api.jobs`` workers, other API processes) are left alone. The
+runner checks at start and idle workers check periodically.
+
+Job kinds:
+
+- 'monte_carlo': very large Monte-Carlo runs, priced in chunks; progress
+  carries the running estimate and its 95% CI
+- 'full_analysis': ``analysis.run_full_analysis``
+- 'region_screen': ``region.RegionScreener(...).screen()``
+
+Tables a job produces (convergence trace, stress grids, screening table)
+are written as Parquet files under the results directory by
+``analysis.export_results`` and served by ``GET /jobs/{id}/results/{name}``.
+
+Configuration (environment):
+
+- SPK_JOBS_DB: SQLite file (default: data/jobs/jobs.sqlite)
+- SPK_JOBS_DIR: results directory (default: data/jobs/results)
+- SPK_JOB_WORKERS: worker processes started with the API (default 1; 0
+  to run workers separately with ``python -m api.jobs``)
+
+Key Classes:
+-----------
+JobStore: SQLite-backed job queue and state
+JobRunner: Worker processes draining a JobStore
+
+Key Functions:
+-----------
+run_job(): Run one claimed job to completion
+worker_loop(): Claim and run jobs until stopped
+"""
+
+import json
+import math
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, Field
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from spk_derivatives.analysis import export_results, run_full_analysis  # type: ignore  # noqa: E402
+from spk_derivatives.monte_carlo import price_batch  # type: ignore  # noqa: E402
+from spk_derivatives.region import RegionScreener  # type: ignore  # noqa: E402
+
+DEFAULT_JOBS_DIR = ROOT / "data" / "jobs"
+MAX_JOB_SIMULATIONS = 1_000_000_000
+POLL_SECONDS = 0.5
+HEARTBEAT_SECONDS = 10.0
+STALE_SECONDS = 60.0
+STATUSES = ("queued", "running", "done", "failed", "cancelled")
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when cancellation was requested."""
+
+
+# ----------------------------------------------------------------------
+# Job kinds
+# ----------------------------------------------------------------------
+
+class MonteCarloJob(BaseModel):
+    S0: Optional[float] = Field(None, description="Underlying price; defaults to CEIR-derived")
+    K: Optional[float] = Field(None, description="Strike; defaults to S0")
+    T: float = 1.0
+    r: float = 0.05
+    sigma: Optional[float] = Field(None, description="Volatility; defaults to CEIR-derived")
+    num_simulations: int = Field(100_000_000, ge=1, le=MAX_JOB_SIMULATIONS)
+    chunk_size: int = Field(1_000_000, ge=1000, le=10_000_000)
+    payoff_type: str = Field("call", pattern="^(call|redeemable)$")
+    seed: Optional[int] = None
+    data_dir: str = "../empirical"
+    use_repo_fallback: bool = True
+
+
+class FullAnalysisJob(BaseModel):
+    S0: Optional[float] = None
+    K: Optional[float] = None
+    T: float = 1.0
+    r: float = 0.05
+    sigma: Optional[float] = None
+    location: str = "Location"
+    scenarios: Optional[List[Dict]] = None
+    data_dir: str = "../empirical"
+    use_repo_fallback: bool = True
+
+
+class RegionScreenJob(BaseModel):
+    bbox: List[float] = Field(..., min_length=4, max_length=4)
+    resolution: float = 1.0
+    energy_type: str = Field("solar", pattern="^(solar|wind|hydro)$")
+    start_year: int = 2020
+    end_year: int = 2024
+    T: float = 1.0
+    r: float = 0.05
+    moneyness: float = 1.0
+    power_model: Optional[str] = None
+    model_params: Dict[str, float] = Field(default_factory=dict)
+    rank_by: str = "mean_price"
+    ascending: bool = False
+
+
+Report = Callable[[float, Optional[Dict]], None]
+Outcome = Tuple[Dict, Dict[str, pd.DataFrame]]
+
+
+def _run_monte_carlo(params: Dict, report: Report) -> Outcome:
+    """Chunked Monte-Carlo; chunk statistics are pooled exactly (Chan et al.)."""
+    total, chunk = params["num_simulations"], params["chunk_size"]
+    sizes = [min(chunk, total - done) for done in range(0, total, chunk)]
+    root = np.random.SeedSequence(params["seed"])
+    seeds = root.spawn(len(sizes))
+    n, mean, m2 = 0, 0.0, 0.0
+    trace = []
+    for size, seq in zip(sizes, seeds):
+        price, se = price_batch(params["S0"], params["K"], params["T"], params["r"],
+                                params["sigma"], num_simulations=size,
+                                payoff_type=params["payoff_type"],
+                                seed=int(seq.generate_state(1)[0]))
+        price, chunk_m2 = float(price), float(se) ** 2 * size * size
+        delta = price - mean
+        mean += delta * size / (n + size)
+        m2 += chunk_m2 + delta ** 2 * n * size / (n + size)
+        n += size
+        std_error = math.sqrt(m2 / n / n)
+        estimate = {"paths": n, "price": mean, "std_error": std_error,
+                    "ci_95": [mean - 1.959964 * std_error, mean + 1.959964 * std_error]}
+        trace.append({"paths": n, "price": mean, "std_error": std_error,
+                      "ci_low": estimate["ci_95"][0], "ci_high": estimate["ci_95"][1]})
+        report(n / total, estimate)
+    return {**estimate, "seed": root.entropy}, {"convergence": pd.DataFrame(trace)}
+
+
+def _run_full_analysis(params: Dict, report: Report) -> Outcome:
+    report(0.0, {"stage": "analysis"})
+    results = run_full_analysis(params["S0"], params["K"], params["T"], params["r"],
+                                params["sigma"], location=params["location"],
+                                scenarios=params["scenarios"], parallel=False)
+    frames = {name: df for name, df in results.items() if isinstance(df, pd.DataFrame)}
+    summary = {"base_greeks": results["base_greeks"], "timings": results["timings"],
+               "wall_time": results["wall_time"]}
+    return summary, frames
+
+
+def _run_region_screen(params: Dict, report: Report) -> Outcome:
+    screener = RegionScreener(params["bbox"], params["resolution"], params["energy_type"],
+                              params["start_year"], params["end_year"], T=params["T"],
+                              r=params["r"], moneyness=params["moneyness"],
+                              power_model=params["power_model"], **params["model_params"])
+    report(0.0, {"stage": "fetch", "cells": len(screener.cells)})
+    _, values, coords = screener.fetch()
+    report(0.8, {"stage": "evaluate", "cells": len(coords)})
+    table = screener.evaluate(values, coords)
+    if params["rank_by"] not in table.columns:
+        raise ValueError(f"Unknown rank_by column: {params['rank_by']}")
+    table = table.sort_values(params["rank_by"], ascending=params["ascending"],
+                              kind="stable").reset_index(drop=True)
+    table.insert(0, "rank", np.arange(1, len(table) + 1))
+    summary = {"cells": len(screener.cells), "screened": len(table),
+               "top": table.head(10).to_dict("records")}
+    return summary, {"screen": table}
+
+
+JOB_KINDS: Dict[str, Tuple[type, Callable[[Dict, Report], Outcome]]] = {
+    "monte_carlo": (MonteCarloJob, _run_monte_carlo),
+    "full_analysis": (FullAnalysisJob, _run_full_analysis),
+    "region_screen": (RegionScreenJob, _run_region_screen),
+}
+
+
+def validate_job(kind: str, params: Dict) -> Dict:
+    """Validated parameters for a job kind; ValueError for unknown kinds or bad params."""
+    if kind not in JOB_KINDS:
+        raise ValueError(f"Unknown job kind: {kind}. Choose from: {list(JOB_KINDS)}")
+    return JOB_KINDS[kind][0].model_validate(params).model_dump()
+
+
+def _jsonable(value):
+    """JSON-safe copy: numpy scalars to Python, non-finite floats to None."""
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+# ----------------------------------------------------------------------
+# Store
+# ----------------------------------------------------------------------
+
+class JobStore:
+    """
+    SQLite-backed job queue and state.
+
+    Parameters
+    ----------
+    path : str or Path, optional
+        SQLite file (default: $SPK_JOBS_DB or data/jobs/jobs.sqlite)
+    results_dir : str or Path, optional
+        Root for job artifacts (default: $SPK_JOBS_DIR or data/jobs/results)
+    """
+
+    _COLUMNS = ("id", "kind", "status", "params", "progress", "partial", "result",
+                "artifacts", "error", "cancel_requested", "worker", "created", "started",
+                "finished", "heartbeat")
+
+    def __init__(self, path=None, results_dir=None):
+        self.path = Path(path or os.getenv("SPK_JOBS_DB") or DEFAULT_JOBS_DIR / "jobs.sqlite")
+        self.results_dir = Path(results_dir or os.getenv("SPK_JOBS_DIR")
+                                or DEFAULT_JOBS_DIR / "results")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, "
+                "params TEXT NOT NULL, progress REAL DEFAULT 0, partial TEXT, result TEXT, "
+                "artifacts TEXT, error TEXT, cancel_requested INTEGER DEFAULT 0, worker TEXT, "
+                "created REAL, started REAL, finished REAL, heartbeat REAL)")
+            columns = {row[1] for row in db.execute("PRAGMA table_info(jobs)")}
+            if "heartbeat" not in columns:  # files created before heartbeats
+                db.execute("ALTER TABLE jobs ADD COLUMN heartbeat REAL")
+            db.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.path), timeout=30)
+
+    def _update(self, job_id: str, **fields) -> None:
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._connect() as db:
+            db.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def _row(self, row) -> Dict:
+        job = dict(zip(self._COLUMNS, row))
+        for name in ("params", "partial", "result", "artifacts"):
+            job[name] = json.loads(job[name]) if job[name] else None
+        job["cancel_requested"] = bool(job["cancel_requested"])
+        return job
+
+    def submit(self, kind: str, params: Dict) -> str:
+        """Queue a job (parameters are validated first); returns its id."""
+        params = validate_job(kind, params)
+        job_id = uuid.uuid4().hex
+        with self._connect() as db:
+            db.execute("INSERT INTO jobs (id, kind, status, params, created) VALUES (?, ?, ?, ?, ?)",
+                       (job_id, kind, "queued", json.dumps(params), time.time()))
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Job record, or None if unknown."""
+        with self._connect() as db:
+            row = db.execute(f"SELECT {', '.join(self._COLUMNS)} FROM jobs WHERE id = ?",
+                             (job_id,)).fetchone()
+        return self._row(row) if row else None
+
+    def list(self, status: Optional[str] = None, limit: int = 50) -> List[Dict]:
+        """Most recent jobs first, optionally filtered by status."""
+        query = f"SELECT {', '.join(self._COLUMNS)} FROM jobs"
+        args: tuple = ()
+        if status is not None:
+            query += " WHERE status = ?"
+            args = (status,)
+        with self._connect() as db:
+            rows = db.execute(query + " ORDER BY created DESC LIMIT ?", (*args, limit)).fetchall()
+        return [self._row(row) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per status."""
+        with self._connect() as db:
+            rows = db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {**{status: 0 for status in STATUSES}, **dict(rows)}
+
+    def claim(self, worker: str) -> Optional[Dict]:
+        """Atomically move the oldest queued job to 'running' for ``worker``."""
+        db = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            row = db.execute("SELECT id FROM jobs WHERE status = 'queued' "
+                             "ORDER BY created LIMIT 1").fetchone()
+            if row is None:
+                db.execute("COMMIT")
+                return None
+            now = time.time()
+            db.execute("UPDATE jobs SET status = 'running', worker = ?, started = ?, heartbeat = ? "
+                       "WHERE id = ?", (worker, now, now, row[0]))
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        finally:
+            db.close()
+        return self.get(row[0])
+
+    def report(self, job_id: str, progress: float, partial: Optional[Dict] = None) -> None:
+        """Record progress; raises JobCancelled if cancellation was requested."""
+        self._update(job_id, progress=float(progress), heartbeat=time.time(),
+                     partial=json.dumps(_jsonable(partial)) if partial is not None else None)
+        job = self.get(job_id)
+        if job is not None and job["cancel_requested"]:
+            raise JobCancelled(job_id)
+
+    def finish(self, job_id: str, result: Dict, artifacts: Dict[str, str]) -> None:
+        self._update(job_id, status="done", progress=1.0, result=json.dumps(_jsonable(result)),
+                     artifacts=json.dumps(artifacts), finished=time.time())
+
+    def fail(self, job_id: str, error: str, status: str = "failed") -> None:
+        self._update(job_id, status=status, error=error, finished=time.time())
+
+    def cancel(self, job_id: str) -> Optional[Dict]:
+        """Cancel a queued job now, or ask its worker to stop a running one."""
+        with self._connect() as db:
+            db.execute("UPDATE jobs SET status = 'cancelled', finished = ? "
+                       "WHERE id = ? AND status = 'queued'", (time.time(), job_id))
+            db.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = 'running'",
+                       (job_id,))
+        return self.get(job_id)
+
+    def beat(self, job_id: str) -> None:
+        """Refresh the heartbeat of a running job."""
+        with self._connect() as db:
+            db.execute("UPDATE jobs SET heartbeat = ? WHERE id = ? AND status = 'running'",
+                       (time.time(), job_id))
+
+    def recover(self, stale_after: float = STALE_SECONDS) -> int:
+        """
+        Re-queue 'running' jobs whose worker is gone.
+
+        A worker on this host is gone when its process no longer exists;
+        any other worker when its heartbeat is older than ``stale_after``
+        seconds.
+
+        Returns
+        -------
+        int
+            Number of jobs re-queued
+        """
+        with self._connect() as db:
+            running = db.execute("SELECT id, worker, heartbeat FROM jobs "
+                                 "WHERE status = 'running'").fetchall()
+            now = time.time()
+            orphans = [job_id for job_id, worker, heartbeat in running
+                       if not _worker_alive(worker, heartbeat, now - stale_after)]
+            recovered = 0
+            for job_id, worker, _ in running:
+                if job_id in orphans:
+                    # Only if no one claimed or finished it since the read
+                    cursor = db.execute(
+                        "UPDATE jobs SET status = 'queued', worker = NULL, progress = 0, "
+                        "partial = NULL, heartbeat = NULL "
+                        "WHERE id = ? AND status = 'running' AND worker IS ?", (job_id, worker))
+                    recovered += cursor.rowcount
+            return recovered
+
+    def artifact_path(self, job_id: str, name: str) -> Optional[Path]:
+        """File of a finished job's table, or None."""
+        job = self.get(job_id)
+        if job is None or not job["artifacts"] or name not in job["artifacts"]:
+            return None
+        return self.results_dir / job["artifacts"][name]
+
+
+def worker_id() -> str:
+    """Identity recorded on claimed jobs: ``host:pid``."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _worker_alive(worker: Optional[str], heartbeat: Optional[float], stale_before: float) -> bool:
+    host, _, pid = (worker or "").rpartition(":")
+    if host == socket.gethostname() and pid.isdigit():
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:  # exists, owned by another user
+            return True
+        return True
+    return heartbeat is not None and heartbeat >= stale_before
+
+
+# ----------------------------------------------------------------------
+# Workers
+# ----------------------------------------------------------------------
+
+def run_job(store: JobStore, job: Dict) -> str:
+    """
+    Run a claimed job and record its outcome.
+
+    Returns
+    -------
+    str
+        Final status: 'done', 'failed' or 'cancelled'
+    """
+    runner = JOB_KINDS[job["kind"]][1]
+    try:
+        summary, frames = runner(job["params"], lambda p, partial=None: store.report(job["id"], p, partial))
+        written = export_results(frames, str(store.results_dir / job["id"]), fmt="parquet") if frames else {}
+        artifacts = {name: str(Path(path).relative_to(store.results_dir))
+                     for name, path in written.items()}
+        store.finish(job["id"], summary, artifacts)
+        return "done"
+    except JobCancelled:
+        store.fail(job["id"], "cancelled", status="cancelled")
+        return "cancelled"
+    except Exception as exc:  # noqa: BLE001 - recorded on the job
+        store.fail(job["id"], f"{type(exc).__name__}: {exc}")
+        return "failed"
+
+
+def _run_with_heartbeat(store: JobStore, job: Dict, interval: float = HEARTBEAT_SECONDS) -> str:
+    """``run_job`` while a thread refreshes the job's heartbeat."""
+    done = threading.Event()
+
+    def beat():
+        while not done.wait(interval):
+            try:
+                store.beat(job["id"])
+            except sqlite3.Error:
+                pass  # next beat retries; staleness needs STALE_SECONDS of misses
+
+    thread = threading.Thread(target=beat, name=f"job-heartbeat-{job['id'][:8]}", daemon=True)
+    thread.start()
+    try:
+        return run_job(store, job)
+    finally:
+        done.set()
+        thread.join()
+
+
+def worker_loop(db_path=None, results_dir=None, stop=None, poll: float = POLL_SECONDS) -> None:
+    """Claim and run jobs until ``stop`` (a multiprocessing Event) is set."""
+    store = JobStore(db_path, results_dir)
+    worker = worker_id()
+    checked = time.time()
+    while stop is None or not stop.is_set():
+        job = store.claim(worker)
+        if job is None:
+            if time.time() - checked >= STALE_SECONDS:
+                store.recover()
+                checked = time.time()
+            if stop is None:
+                time.sleep(poll)
+            else:
+                stop.wait(poll)
+            continue
+        _run_with_heartbeat(store, job)
+
+
+class JobRunner:
+    """
+    Worker processes draining a JobStore.
+
+    Workers are non-daemonic so jobs may use process pools of their own.
+    ``stop()`` lets idle workers exit and terminates those still running a
+    job after ``timeout``; such jobs are re-queued on the next start (their
+    worker process is gone) or by any idle worker.
+
+    Parameters
+    ----------
+    store : JobStore
+        Queue to drain
+    workers : int, optional
+        Processes to start (default: $SPK_JOB_WORKERS or 1)
+    """
+
+    def __init__(self, store: JobStore, workers: Optional[int] = None):
+        self.store = store
+        self.workers = int(os.getenv("SPK_JOB_WORKERS", 1)) if workers is None else workers
+        self._context = multiprocessing.get_context("spawn")
+        self._stop = self._context.Event()
+        self._processes: List = []
+
+    def start(self) -> None:
+        if self._processes or self.workers <= 0:
+            return
+        self.store.recover()
+        self._stop.clear()
+        for i in range(self.workers):
+            process = self._context.Process(
+                target=worker_loop, name=f"spk-job-worker-{i}",
+                args=(str(self.store.path), str(self.store.results_dir), self._stop))
+            process.start()
+            self._processes.append(process)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self._processes = []
+
+
+if __name__ == "__main__":
+    # Standalone worker: python -m api.jobs
+    worker_loop()
@@ -1,14 +1,40 @@
 """
 FastAPI service exposing pricing, Greeks, and stress testing endpoints.
+
+Default parameters (for requests omitting S0, sigma or K) are loaded at
+startup into a shared ``ParameterStore`` and refreshed in the background
+when the CEIR files change; see ``api.param_store``.
+
+Pricing runs off the event loop on the executor lanes of ``api.executor``:
+binomial work on the fast lane, Monte-Carlo, stress and large batches on
+the heavy lane, each with bounded queues (503 when full) and per-request
+timeouts (504). Repeated /price and /greeks requests are answered from a
+canonicalized response cache (``api.response_cache``, GET /cache/stats).
+/stress can stream scenario results as NDJSON or SSE (``api.streaming``).
+Work too long for a request runs as a job (``api.jobs``, /jobs).
+Prometheus metrics are served at /metrics (``api.metrics``).
+Binomial quotes can be served from precomputed price surfaces
+(``api.surfaces``, SPK_PRICE_SURFACES=1, GET /surfaces).
+Responses of the pricing endpoints are negotiated by Accept: JSON
+(orjson), MessagePack or, for /price/batch, Arrow IPC (``api.formats``).
+/ws/prices pushes prices and Greeks of subscribed contracts whenever their
+inputs change (``api.feed``; live rate via POST /market/rate).
 """
 
+import asyncio
+import json
+import secrets
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import List, Optional
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi import Header, HTTPException
-from pydantic import BaseModel, Field
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
+from limits import parse as parse_limit
+from pydantic import BaseModel, Field, ValidationError
+from starlette.concurrency import run_in_threadpool
 import os
 from slowapi import Limiter
 from slowapi.util import get_remote_address
@@ -21,18 +47,81 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from spk_derivatives.data_loader import load_parameters  # type: ignore  # noqa: E402
-from spk_derivatives.binomial import BinomialTree  # type: ignore  # noqa: E402
-from spk_derivatives.monte_carlo import MonteCarloSimulator  # type: ignore  # noqa: E402
-from spk_derivatives.sensitivities import GreeksCalculator  # type: ignore  # noqa: E402
-
-
-app = FastAPI(title="Energy Derivatives API", version="1.0.0")
+from spk_derivatives import profiling  # type: ignore  # noqa: E402
+from spk_derivatives.memo import default_memo  # type: ignore  # noqa: E402
+
+from . import metrics, tasks  # noqa: E402
+from .batch import (  # noqa: E402
+    ARROW_FILE_TYPE,
+    ARROW_STREAM_TYPE,
+    MAX_BATCH_CONTRACTS,
+    MAX_BINOMIAL_STEPS,
+    MAX_SIMULATIONS,
+    batch_is_heavy,
+    prepare_contracts,
+    price_prepared,
+    rows_from_arrow,
+    rows_from_columns,
+    rows_from_json,
+)
+from .formats import MSGPACK_ALIASES, loads_msgpack, negotiate, render  # noqa: E402
+from .streaming import chunked, encode, stream_chunks, stream_type  # noqa: E402
+from .feed import FeedContract, PriceFeed  # noqa: E402
+from .surfaces import SurfaceService  # noqa: E402
+from .executor import FAST, HEAVY, LaneBusy, LaneTimeout, PricingExecutor  # noqa: E402
+from .response_cache import ResponseCache, request_key  # noqa: E402
+from .jobs import JobRunner, JobStore  # noqa: E402
+from .param_store import (  # noqa: E402
+    ParameterStore,
+    configured_data_dirs,
+    configured_max_dirs,
+    configured_refresh_seconds,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    store = app.state.param_store
+    store.preload(configured_data_dirs())
+    store.start(configured_refresh_seconds())
+    executor = app.state.executor
+    await run_in_threadpool(executor.start)  # warm workers before serving
+    runner = JobRunner(app.state.job_store)
+    runner.start()
+    feed = app.state.price_feed = PriceFeed.from_env(store, executor)
+    feed.start()
+    surfaces = app.state.surfaces = SurfaceService.from_env(store, executor)
+    surfaces.start(configured_data_dirs())
+    try:
+        yield
+    finally:
+        await surfaces.stop()
+        await feed.stop()
+        store.stop()
+        executor.shutdown()
+        await run_in_threadpool(runner.stop)
+
+
+app = FastAPI(title="Energy Derivatives API", version="1.0.0", lifespan=lifespan)
+app.state.param_store = ParameterStore(max_dirs=configured_max_dirs())
+app.state.executor = PricingExecutor.from_env()
+app.state.response_cache = ResponseCache.from_env()
+app.state.job_store = JobStore()
+# Disabled until startup reads SPK_PRICE_SURFACES
+app.state.surfaces = SurfaceService(app.state.param_store, app.state.executor)
+MAX_STRESS_SCENARIOS = 50
+MAX_STREAM_SCENARIOS = 1000
 API_KEY = os.getenv("API_KEY")
 limiter = Limiter(key_func=get_remote_address, default_limits=["60/minute"])
+# /price/batch is limited by contracts priced, not by requests
+BATCH_CONTRACT_LIMIT = parse_limit(os.getenv("BATCH_CONTRACT_LIMIT", "20000/minute"))
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 app.add_middleware(SlowAPIMiddleware)
+# Engine phase timings on unless SPK_PROFILE=0; outermost middleware times everything
+profiling.enable(os.getenv("SPK_PROFILE", "1").lower() not in ("0", "false", "no"))
+app.state.request_metrics = metrics.RequestMetrics()
+app.add_middleware(metrics.MetricsMiddleware, metrics=app.state.request_metrics)
 
 
 class PriceRequest(BaseModel):
@@ -44,6 +133,7 @@ class PriceRequest(BaseModel):
     method: str = Field("binomial", pattern="^(binomial|monte_carlo)$")
     N: int = 100
     num_simulations: int = 10000
+    seed: Optional[int] = Field(None, description="Monte-Carlo seed; seeded results are cached")
     payoff_type: str = Field("call", pattern="^(call|redeemable)$")
     data_dir: str = "../empirical"
     use_repo_fallback: bool = True
@@ -82,8 +172,10 @@ def _ensure_params(S0: Optional[float], sigma: Optional[float], K: Optional[floa
                    data_dir: str, use_repo_fallback: bool):
     params = {}
     if S0 is None or sigma is None or K is None:
-        derived = load_parameters(data_dir=data_dir, use_repo_fallback=use_repo_fallback)
-        params.update(derived)
+        # Shared snapshot loaded at startup; no disk access per request
+        with profiling.phase("api", "parameters"):
+            defaults = app.state.param_store.get(data_dir, use_repo_fallback)
+        params.update({name: defaults[name] for name in ("S0", "sigma", "K")})
     if S0 is not None:
         params["S0"] = S0
     if sigma is not None:
@@ -100,10 +192,10 @@ def _check_api_key(x_api_key: Optional[str]):
         raise HTTPException(status_code=401, detail="Invalid API key")
 
 
-def _validate_limits(req: PriceRequest):
-    if req.method == "binomial" and req.N > 2000:
+def _validate_limits(method: str, N: int, num_simulations: int):
+    if method == "binomial" and N > MAX_BINOMIAL_STEPS:
         raise HTTPException(status_code=400, detail="Binomial steps too large (max 2000)")
-    if req.method == "monte_carlo" and req.num_simulations > 1_000_000:
+    if method == "monte_carlo" and num_simulations > MAX_SIMULATIONS:
         raise HTTPException(status_code=400, detail="Too many simulations (max 1,000,000)")
 
 
@@ -113,86 +205,371 @@ def root(request: Request, x_api_key: Optional[str] = Header(default=None)):
     return {"status": "ok", "message": "Energy Derivatives API"}
 
 
+@app.get("/metrics")
+@limiter.exempt
+def metrics_endpoint(request: Request):
+    """Prometheus metrics: request latency, engine phases, caches and queues."""
+    body = metrics.render(app.state.request_metrics, app.state.response_cache, default_memo(),
+                          app.state.executor, app.state.job_store.counts(),
+                          getattr(app.state, "price_feed", None))
+    return PlainTextResponse(body, media_type=metrics.CONTENT_TYPE)
+
+
+@app.get("/surfaces")
+def surface_stats(request: Request, x_api_key: Optional[str] = Header(default=None)):
+    """Price surfaces: domains, error bounds, hits and rebuilds."""
+    _check_api_key(x_api_key)
+    return app.state.surfaces.stats()
+
+
+@app.get("/cache/stats")
+def cache_stats(request: Request, x_api_key: Optional[str] = Header(default=None)):
+    """Response-cache hit rate and savings."""
+    _check_api_key(x_api_key)
+    return app.state.response_cache.stats()
+
+
+async def _run(lane: str, fn, *args):
+    """Run a pricing task on an executor lane, mapping overload to HTTP errors."""
+    try:
+        return await app.state.executor.run(lane, fn, *args)
+    except LaneBusy as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "1"})
+    except LaneTimeout as exc:
+        raise HTTPException(status_code=504, detail=str(exc))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
 @app.post("/price")
 @limiter.limit("30/minute")
-def price(request: Request, req: PriceRequest, x_api_key: Optional[str] = Header(default=None)):
+async def price(request: Request, req: PriceRequest, x_api_key: Optional[str] = Header(default=None)):
     _check_api_key(x_api_key)
-    _validate_limits(req)
-    params = _ensure_params(req.S0, req.sigma, req.K, req.data_dir, req.use_repo_fallback)
+    media_type = negotiate(request.headers.get("accept"))
+    _validate_limits(req.method, req.N, req.num_simulations)
+    params = await run_in_threadpool(_ensure_params, req.S0, req.sigma, req.K,
+                                     req.data_dir, req.use_repo_fallback)
     params.update({"T": req.T, "r": req.r})
-
     if req.method == "binomial":
-        tree = BinomialTree(params["S0"], params["K"], params["T"], params["r"],
-                            params["sigma"], req.N, req.payoff_type)
-        value = tree.price()
-        return {
-            "method": "binomial",
-            "price": value,
-            "steps": req.N,
-            "inputs": params
-        }
-    else:
-        sim = MonteCarloSimulator(params["S0"], params["K"], params["T"], params["r"],
-                                  params["sigma"], req.num_simulations,
-                                  payoff_type=req.payoff_type)
-        price, low, high = sim.confidence_interval()
-        return {
-            "method": "monte_carlo",
-            "price": price,
-            "ci_95": [low, high],
-            "num_simulations": req.num_simulations,
-            "inputs": params
-        }
+        quote = app.state.surfaces.quote(req.data_dir, req.use_repo_fallback, params, req.N,
+                                         req.payoff_type)
+        if quote is not None:
+            return render({"method": "binomial", "price": quote["Price"], "steps": req.N,
+                           "inputs": params, "surface": quote["surface"]}, media_type)
+    lane = HEAVY if req.method == "monte_carlo" else FAST
+    key = request_key("price", params, req.method, req.seed, req.N, req.num_simulations,
+                      payoff_type=req.payoff_type)
+    result = await app.state.response_cache.get_or_compute(
+        key, lambda: _run(lane, tasks.price_task, params, req.method, req.N,
+                          req.num_simulations, req.payoff_type, req.seed))
+    return render(result, media_type)
 
 
 @app.post("/greeks")
 @limiter.limit("30/minute")
-def greeks(request: Request, req: GreeksRequest, x_api_key: Optional[str] = Header(default=None)):
+async def greeks(request: Request, req: GreeksRequest, x_api_key: Optional[str] = Header(default=None)):
     _check_api_key(x_api_key)
-    params = _ensure_params(req.S0, req.sigma, req.K, req.data_dir, req.use_repo_fallback)
+    media_type = negotiate(request.headers.get("accept"))
+    _validate_limits(req.pricing_method, req.N, req.num_simulations)
+    params = await run_in_threadpool(_ensure_params, req.S0, req.sigma, req.K,
+                                     req.data_dir, req.use_repo_fallback)
     params.update({"T": req.T, "r": req.r})
-
-    calc = GreeksCalculator(
-        params["S0"], params["K"], params["T"], params["r"], params["sigma"],
-        pricing_method=req.pricing_method,
-        N=req.N,
-        num_simulations=req.num_simulations,
-        payoff_type=req.payoff_type,
-        seed=req.seed
-    )
-    greeks = calc.compute_all_greeks()
-    return {"inputs": params, "greeks": greeks}
+    if req.pricing_method == "binomial":
+        quote = app.state.surfaces.quote(req.data_dir, req.use_repo_fallback, params, req.N,
+                                         req.payoff_type, greeks=True)
+        if quote is not None:
+            surface = quote.pop("surface")
+            return render({"inputs": params, "greeks": quote, "surface": surface}, media_type)
+    lane = HEAVY if req.pricing_method == "monte_carlo" else FAST
+    key = request_key("greeks", params, req.pricing_method, req.seed, req.N, req.num_simulations,
+                      payoff_type=req.payoff_type)
+    result = await app.state.response_cache.get_or_compute(
+        key, lambda: _run(lane, tasks.greeks_task, params, req.pricing_method, req.N,
+                          req.num_simulations, req.payoff_type, req.seed))
+    return render(result, media_type)
 
 
 @app.post("/stress")
 @limiter.limit("10/minute")
-def stress(request: Request, req: StressRequest, x_api_key: Optional[str] = Header(default=None)):
+async def stress(request: Request, req: StressRequest, x_api_key: Optional[str] = Header(default=None)):
+    """
+    Base price plus volatility and rate scenarios.
+
+    With ``Accept: application/x-ndjson`` or ``text/event-stream`` each
+    scenario is streamed as soon as it is priced (all on shared draws),
+    followed by a final 'done' record; longer scenario lists are allowed.
+    """
     _check_api_key(x_api_key)
-    params = _ensure_params(req.S0, req.sigma, req.K, req.data_dir, req.use_repo_fallback)
+    _validate_limits("monte_carlo", 0, req.num_simulations)
+    media_type = stream_type(request.headers.get("accept"))
+    body_type = None if media_type else negotiate(request.headers.get("accept"))
+    max_scenarios = MAX_STREAM_SCENARIOS if media_type else MAX_STRESS_SCENARIOS
+    if len(req.volatilities or []) + len(req.rates or []) > max_scenarios:
+        raise HTTPException(status_code=400,
+                            detail=f"Too many stress scenarios (max {max_scenarios})")
+    params = await run_in_threadpool(_ensure_params, req.S0, req.sigma, req.K,
+                                     req.data_dir, req.use_repo_fallback)
     params.update({"T": req.T, "r": req.r})
+    if media_type:
+        return await _stream_stress(request, req, params, media_type)
+    return render(await _run(HEAVY, tasks.stress_task, params, req.payoff_type,
+                             req.num_simulations, req.volatilities, req.rates), body_type)
+
+
+async def _stream_stress(request: Request, req: StressRequest, params: dict, media_type: str):
+    scenarios = [("base", None)] + [("vol", v) for v in req.volatilities or []] \
+        + [("rate", r) for r in req.rates or []]
+    seed = secrets.randbits(32)
+
+    def run(chunk):
+        return _run(HEAVY, tasks.stress_scenarios_task, params, req.payoff_type,
+                    req.num_simulations, seed, chunk)
+
+    rows = stream_chunks(run, chunked(scenarios), app.state.executor.lanes[HEAVY].workers,
+                         request.is_disconnected)
+    # The first chunk is priced before responding, so overload still maps to 503/504
+    try:
+        first = await rows.__anext__()
+    except BaseException:
+        await rows.aclose()
+        raise
+
+    async def body():
+        yield encode({"inputs": params, "seed": seed, "scenarios": len(scenarios)},
+                     media_type, event="start")
+        yield encode(first, media_type)
+        try:
+            async for row in rows:
+                yield encode(row, media_type)
+        except HTTPException as exc:
+            yield encode({"error": exc.detail, "status_code": exc.status_code}, media_type, event="error")
+            return
+        finally:
+            await rows.aclose()
+        yield encode({"done": True, "count": len(scenarios)}, media_type, event="done")
+
+    return StreamingResponse(body(), media_type=media_type,
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+async def _read_batch(request: Request):
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    try:
+        if content_type in (ARROW_STREAM_TYPE, ARROW_FILE_TYPE):
+            return rows_from_arrow(await request.body(), content_type)
+        if content_type in MSGPACK_ALIASES:
+            return rows_from_json(loads_msgpack(await request.body()))
+        return rows_from_json(await request.json())
+    except ImportError as exc:
+        raise HTTPException(status_code=415, detail=str(exc))
+    except Exception as exc:  # noqa: BLE001 - malformed body
+        raise HTTPException(status_code=400, detail=f"Invalid batch payload: {exc}")
+
+
+def _charge_contracts(request: Request, count: int):
+    if not limiter.enabled:
+        return
+    if not limiter.limiter.hit(BATCH_CONTRACT_LIMIT, get_remote_address(request),
+                               "price_batch", cost=count):
+        raise HTTPException(
+            status_code=429,
+            detail=f"Contract rate limit exceeded: {BATCH_CONTRACT_LIMIT}",
+        )
+
+
+@app.post("/price/batch")
+@limiter.exempt
+async def price_batch(request: Request, layout: str = "rows",
+                      x_api_key: Optional[str] = Header(default=None)):
+    """
+    Price many contracts in one request.
+
+    Body: a JSON or MessagePack list of contract specs,
+    ``{"contracts": [...]}``, columnar ``{"columns": {...}}`` (optionally
+    with shared ``"defaults"``), or an Arrow IPC table (Content-Type
+    application/vnd.apache.arrow.stream or .file). Results are returned
+    in request order with per-contract errors: as one object per
+    contract, or with ``?layout=columns`` as ``{"columns": {...}}`` of
+    equal-length arrays (JSON / MessagePack). ``Accept`` an Arrow type to
+    get the columns as an Arrow table.
+    """
+    _check_api_key(x_api_key)
+    if layout not in ("rows", "columns"):
+        raise HTTPException(status_code=400, detail="layout must be 'rows' or 'columns'")
+    media_type = negotiate(request.headers.get("accept"), columnar=True)
+    rows = await _read_batch(request)
+    if len(rows) > MAX_BATCH_CONTRACTS:
+        raise HTTPException(status_code=413,
+                            detail=f"Too many contracts (max {MAX_BATCH_CONTRACTS:,})")
+    _charge_contracts(request, len(rows))
+
+    results, groups = await run_in_threadpool(prepare_contracts, rows, app.state.param_store.get)
+    lane = HEAVY if batch_is_heavy(groups) else FAST
+    columns = await _run(lane, price_prepared, results, groups)
+    summary = {"count": len(rows), "errors": sum(e is not None for e in columns["error"])}
+    if media_type in (ARROW_STREAM_TYPE, ARROW_FILE_TYPE):
+        return render(None, media_type, columns=columns,
+                      headers={f"X-Batch-{k.title()}": str(v) for k, v in summary.items()})
+    if layout == "columns":
+        return render({**summary, "columns": columns}, media_type)
+    return render({**summary, "results": rows_from_columns(columns)}, media_type)
+
+
+class JobRequest(BaseModel):
+    kind: str = Field(..., pattern="^(monte_carlo|full_analysis|region_screen)$")
+    params: dict = Field(default_factory=dict)
+
+
+def _job_view(job: dict) -> dict:
+    view = {k: job[k] for k in ("id", "kind", "status", "progress", "partial", "result",
+                                "error", "created", "started", "finished")}
+    view["params"] = job["params"]
+    view["cancel_requested"] = job["cancel_requested"]
+    view["results"] = {name: f"/jobs/{job['id']}/results/{name}"
+                       for name in (job["artifacts"] or {})}
+    return view
+
+
+def _get_job(job_id: str) -> dict:
+    job = app.state.job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job
+
+
+@app.post("/jobs", status_code=202)
+@limiter.limit("10/minute")
+async def submit_job(request: Request, req: JobRequest, x_api_key: Optional[str] = Header(default=None)):
+    """
+    Queue a long-running job and return its id.
 
-    results = {}
-    sim = MonteCarloSimulator(
-        params["S0"], params["K"], params["T"], params["r"], params["sigma"],
-        req.num_simulations, payoff_type=req.payoff_type
-    )
-    base_price = sim.price()
-    results["base_price"] = base_price
-
-    if req.volatilities:
-        vol_results = []
-        for vol in req.volatilities:
-            s = MonteCarloSimulator(params["S0"], params["K"], params["T"], params["r"], vol,
-                                    req.num_simulations, payoff_type=req.payoff_type)
-            vol_results.append({"vol": vol, "price": s.price()})
-        results["vol_stress"] = vol_results
-
-    if req.rates:
-        rate_results = []
-        for rate in req.rates:
-            s = MonteCarloSimulator(params["S0"], params["K"], params["T"], rate, params["sigma"],
-                                    req.num_simulations, payoff_type=req.payoff_type)
-            rate_results.append({"rate": rate, "price": s.price()})
-        results["rate_stress"] = rate_results
-
-    return {"inputs": params, "results": results}
+    Kinds: 'monte_carlo' (up to 1e9 paths), 'full_analysis' and
+    'region_screen'. Poll ``GET /jobs/{id}`` for progress.
+    """
+    _check_api_key(x_api_key)
+    params = dict(req.params)
+    if req.kind in ("monte_carlo", "full_analysis"):
+        resolved = await run_in_threadpool(_ensure_params, params.get("S0"), params.get("sigma"),
+                                           params.get("K"), params.get("data_dir", "../empirical"),
+                                           params.get("use_repo_fallback", True))
+        params.update(resolved)
+    try:
+        job_id = await run_in_threadpool(app.state.job_store.submit, req.kind, params)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return {"id": job_id, "status": "queued", "url": f"/jobs/{job_id}"}
+
+
+@app.get("/jobs")
+async def list_jobs(request: Request, status: Optional[str] = None, limit: int = 50,
+                    x_api_key: Optional[str] = Header(default=None)):
+    _check_api_key(x_api_key)
+    jobs = await run_in_threadpool(app.state.job_store.list, status, min(max(limit, 1), 500))
+    return {"jobs": [_job_view(job) for job in jobs]}
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(request: Request, job_id: str, x_api_key: Optional[str] = Header(default=None)):
+    """Status, progress (with partial estimates) and, once done, the result."""
+    _check_api_key(x_api_key)
+    return _job_view(await run_in_threadpool(_get_job, job_id))
+
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(request: Request, job_id: str, x_api_key: Optional[str] = Header(default=None)):
+    _check_api_key(x_api_key)
+    await run_in_threadpool(_get_job, job_id)
+    return _job_view(await run_in_threadpool(app.state.job_store.cancel, job_id))
+
+
+@app.get("/jobs/{job_id}/results/{name}")
+async def job_result(request: Request, job_id: str, name: str,
+                     x_api_key: Optional[str] = Header(default=None)):
+    """Download one result table of a finished job (Parquet)."""
+    _check_api_key(x_api_key)
+    path = await run_in_threadpool(app.state.job_store.artifact_path, job_id, name)
+    if path is None or not path.exists():
+        raise HTTPException(status_code=404, detail=f"No result '{name}' for job {job_id}")
+    return FileResponse(path, media_type="application/vnd.apache.parquet",
+                        filename=f"{job_id}-{path.name}")
+
+
+class RateUpdate(BaseModel):
+    r: float = Field(..., gt=-1, lt=1, description="Live rate for feed contracts without r")
+
+
+@app.post("/market/rate")
+def set_market_rate(request: Request, req: RateUpdate, x_api_key: Optional[str] = Header(default=None)):
+    """Set the live rate; feed contracts following it are repriced and pushed."""
+    _check_api_key(x_api_key)
+    app.state.price_feed.set_rate(req.r)
+    return {"r": req.r}
+
+
+def _validation_detail(exc: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors())
+
+
+async def _feed_message(feed: PriceFeed, subscriber, message) -> None:
+    """Handle one client message of the /ws/prices protocol."""
+    action = message.get("action") if isinstance(message, dict) else None
+    if action == "subscribe":
+        contracts, errors = [], {}
+        for i, raw in enumerate(message.get("contracts") or []):
+            try:
+                contracts.append(FeedContract.model_validate(raw))
+            except ValidationError as exc:
+                label = raw.get("id") if isinstance(raw, dict) and raw.get("id") else f"#{i}"
+                errors[str(label)] = _validation_detail(exc)
+        try:
+            ids = feed.subscribe(subscriber, contracts)
+        except ValueError as exc:
+            subscriber.send({"type": "error", "detail": str(exc)})
+            return
+        subscriber.send({"type": "subscribed", "ids": ids, "errors": errors})
+    elif action == "unsubscribe":
+        ids = feed.unsubscribe(subscriber, [str(i) for i in message.get("ids") or []])
+        subscriber.send({"type": "unsubscribed", "ids": ids})
+    else:
+        subscriber.send({"type": "error", "detail": "action must be 'subscribe' or 'unsubscribe'"})
+
+
+@app.websocket("/ws/prices")
+async def price_feed(websocket: WebSocket):
+    """
+    Live prices and Greeks.
+
+    Client messages: ``{"action": "subscribe", "contracts": [...]}`` (see
+    ``api.feed.FeedContract``) and ``{"action": "unsubscribe", "ids": [...]}``.
+    Server messages: "subscribed", "unsubscribed", "error" and one
+    "update" per contract whenever its inputs change. The API key goes in
+    the X-API-Key header or the ``api_key`` query parameter.
+    """
+    api_key = websocket.headers.get("x-api-key") or websocket.query_params.get("api_key")
+    if API_KEY and api_key != API_KEY:
+        await websocket.close(code=1008)
+        return
+    await websocket.accept()
+    feed = app.state.price_feed
+    subscriber = feed.connect()
+
+    async def send():
+        while True:
+            for message in await subscriber.next():
+                await websocket.send_json(message)
+
+    sender = asyncio.create_task(send())
+    try:
+        while True:
+            text = await websocket.receive_text()
+            try:
+                message = json.loads(text)
+            except ValueError:
+                subscriber.send({"type": "error", "detail": "Messages must be JSON"})
+                continue
+            await _feed_message(feed, subscriber, message)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        feed.disconnect(subscriber)
@@ -0,0 +1,159 @@
+"""
+Prometheus metrics for the API (``GET /metrics``).
+
+Rendered directly in the Prometheus text exposition format (0.0.4), so
+no client library is needed:
+
+- spk_http_request_duration_seconds{method, endpoint}: latency histogram
+  per route template, measured until the response body is complete
+  (streams included)
+- spk_http_requests_total{method, endpoint, status}
+- spk_engine_phase_seconds{engine, phase}: pricing-engine phases from
+  ``spk_derivatives.profiling``, merged in from executor worker processes
+- spk_response_cache_*, spk_memo_*: cache lookups and hit ratios
+- spk_executor_in_flight / spk_executor_capacity{lane}: executor queue depth
+- spk_jobs{status}: job queue depth
+- spk_feed_*: live feed subscribers, contracts and repricing
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from spk_derivatives import profiling  # type: ignore  # noqa: E402
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class RequestMetrics:
+    """Request latency histograms and status counters."""
+
+    def __init__(self):
+        self.latency = profiling.Timings()
+        self.statuses: Dict[Tuple[str, str, int], int] = {}
+
+    def observe(self, method: str, endpoint: str, status: int, seconds: float) -> None:
+        self.latency.observe((method, endpoint), seconds)
+        key = (method, endpoint, status)
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request by method and route template."""
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            endpoint = getattr(route, "path", None) or "unmatched"
+            self.metrics.observe(scope["method"], endpoint, status[0], time.perf_counter() - start)
+
+
+def _labels(labels: Mapping[str, object]) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for name, value in labels.items():
+        text = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{name}="{text}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _histogram(lines: List[str], name: str, help_text: str, buckets: Iterable[float],
+               data: Mapping[tuple, list], label_names: Tuple[str, ...]) -> None:
+    lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    bounds = [*(repr(float(b)) for b in buckets), "+Inf"]
+    for key, (count, total, counts) in sorted(data.items()):
+        labels = dict(zip(label_names, key))
+        cumulative = 0
+        for bound, n in zip(bounds, counts):
+            cumulative += n
+            lines.append(f"{name}_bucket{_labels({**labels, 'le': bound})} {cumulative}")
+        lines.append(f"{name}_sum{_labels(labels)} {_number(float(total))}")
+        lines.append(f"{name}_count{_labels(labels)} {count}")
+
+
+def _family(lines: List[str], name: str, kind: str, help_text: str,
+            samples: Iterable[Tuple[Mapping[str, object], float]]) -> None:
+    lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_labels(labels)} {_number(value)}")
+
+
+def render(requests: RequestMetrics, response_cache=None, memo=None, executor=None,
+           job_counts: Mapping[str, int] = None, feed=None) -> str:
+    """Prometheus text for the API's current state."""
+    lines: List[str] = []
+    _histogram(lines, "spk_http_request_duration_seconds", "HTTP request latency.",
+               requests.latency.buckets, requests.latency.snapshot(), ("method", "endpoint"))
+    _family(lines, "spk_http_requests_total", "counter", "HTTP requests by status.",
+            [({"method": m, "endpoint": e, "status": s}, n)
+             for (m, e, s), n in sorted(requests.statuses.items())])
+    _histogram(lines, "spk_engine_phase_seconds", "Pricing engine time per phase.",
+               profiling.BUCKETS, profiling.snapshot(), ("engine", "phase"))
+
+    if response_cache is not None:
+        stats = response_cache.stats()
+        _family(lines, "spk_response_cache_requests_total", "counter",
+                "Response cache lookups by outcome.",
+                [({"result": r}, stats[r]) for r in
+                 ("hits", "shared_hits", "coalesced", "misses", "uncacheable")])
+        _family(lines, "spk_response_cache_hit_ratio", "gauge",
+                "Share of cacheable requests served without computing.", [({}, stats["hit_rate"])])
+        _family(lines, "spk_response_cache_saved_seconds_total", "counter",
+                "Compute seconds saved by the response cache.", [({}, stats["saved_seconds"])])
+        _family(lines, "spk_response_cache_entries", "gauge", "Entries in memory.",
+                [({}, stats["entries"])])
+    if memo is not None:
+        stats = memo.stats()
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"]
+        _family(lines, "spk_memo_requests_total", "counter", "Parameter memo lookups by outcome.",
+                [({"result": r}, stats[r]) for r in ("hits", "disk_hits", "misses")])
+        _family(lines, "spk_memo_hit_ratio", "gauge", "Parameter memo hit ratio.",
+                [({}, (stats["hits"] + stats["disk_hits"]) / lookups if lookups else 0.0)])
+    if executor is not None:
+        lanes = executor.stats()
+        _family(lines, "spk_executor_in_flight", "gauge", "Unfinished jobs per executor lane.",
+                [({"lane": name}, s["in_flight"]) for name, s in lanes.items()])
+        _family(lines, "spk_executor_capacity", "gauge",
+                "Most unfinished jobs a lane admits (workers + queue).",
+                [({"lane": name}, s["workers"] + s["queue_size"]) for name, s in lanes.items()])
+    if job_counts is not None:
+        _family(lines, "spk_jobs", "gauge", "Jobs by status.",
+                [({"status": status}, n) for status, n in sorted(job_counts.items())])
+    if feed is not None:
+        stats = feed.stats()
+        _family(lines, "spk_feed_subscribers", "gauge", "Connected feed clients.",
+                [({}, stats["subscribers"])])
+        _family(lines, "spk_feed_contracts", "gauge", "Distinct contracts held by the feed.",
+                [({}, stats["contracts"])])
+        _family(lines, "spk_feed_repriced_total", "counter",
+                "Feed contracts repriced after an input change.", [({}, stats["repriced"])])
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,259 @@
+"""
+Shared default-parameter store for the API.
+
+Requests that omit S0, sigma or K fall back to CEIR-derived defaults. The
+store loads and validates those defaults once (at application startup for
+the configured data directories) and hands out immutable snapshots, so
+such requests never touch disk. A background thread polls the CEIR source
+fingerprint (CSV names, sizes and mtimes) and swaps in a fresh snapshot
+when the files change.
+
+Snapshots are keyed by the resolved directory, so spellings of the same
+path (and every missing directory that falls back to the same data) share
+one. Preloaded directories are kept for good; others requested by clients
+are loaded on first use and held in a bounded LRU, so arbitrary
+``data_dir`` values cannot grow the store (or the refresh work) without
+limit.
+
+Configuration (environment):
+
+- SPK_API_DATA_DIRS: comma-separated data directories to preload
+  (default: ../empirical)
+- SPK_PARAM_REFRESH_SECONDS: polling interval; 0 disables the thread
+  (default: 300)
+- SPK_PARAM_MAX_DIRS: directories loaded on request kept besides the
+  preloaded ones (default: 8)
+"""
+
+import math
+import os
+import sys
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from spk_derivatives.data_loader import _resolve_data_directory  # type: ignore  # noqa: E402
+from spk_derivatives.memo import ceir_data_version, memoized_ceir_parameters  # type: ignore  # noqa: E402
+
+DEFAULT_DATA_DIR = "../empirical"
+DEFAULT_REFRESH_SECONDS = 300.0
+DEFAULT_MAX_DIRS = 8
+MAX_ALIASES = 256
+SNAPSHOT_FIELDS = ("S0", "sigma", "K")
+SYNTHETIC = "<synthetic>"
+
+StoreKey = str  # resolved data directory, or SYNTHETIC
+
+
+def configured_data_dirs() -> Tuple[str, ...]:
+    """Data directories to preload, from SPK_API_DATA_DIRS."""
+    raw = os.getenv("SPK_API_DATA_DIRS", DEFAULT_DATA_DIR)
+    return tuple(d.strip() for d in raw.split(",") if d.strip())
+
+
+def configured_refresh_seconds() -> float:
+    """Refresh interval, from SPK_PARAM_REFRESH_SECONDS."""
+    return float(os.getenv("SPK_PARAM_REFRESH_SECONDS", DEFAULT_REFRESH_SECONDS))
+
+
+def configured_max_dirs() -> int:
+    """Directories kept besides the preloaded ones, from SPK_PARAM_MAX_DIRS."""
+    return int(os.getenv("SPK_PARAM_MAX_DIRS", DEFAULT_MAX_DIRS))
+
+
+def resolve_data_dir(data_dir: str, use_repo_fallback: bool = True) -> Optional[str]:
+    """Absolute directory the CEIR loader would read (None: synthetic fallback)."""
+    resolved = _resolve_data_directory(data_dir, use_repo_fallback=use_repo_fallback, warn=False)
+    return None if resolved is None else str(resolved.resolve())
+
+
+def _validated(params: Mapping, key: StoreKey, version: str) -> Mapping:
+    """Immutable snapshot of the scalar defaults; ValueError if unusable."""
+    snapshot = {}
+    for name in SNAPSHOT_FIELDS:
+        value = float(params[name])
+        if not math.isfinite(value) or value <= 0:
+            raise ValueError(f"Default {name}={value} for data_dir={key!r} is not positive")
+        snapshot[name] = value
+    snapshot.update({"data_dir": key, "data_version": version, "loaded_at": time.time()})
+    return MappingProxyType(snapshot)
+
+
+class ParameterStore:
+    """
+    Immutable default-parameter snapshots keyed by resolved data directory.
+
+    Parameters
+    ----------
+    loader : callable, optional
+        ``loader(data_dir=..., use_repo_fallback=...) -> Dict`` with S0,
+        sigma and K (default: ``memoized_ceir_parameters``)
+    version : callable, optional
+        ``version(data_dir, use_repo_fallback) -> str`` fingerprint of the
+        source data (default: ``ceir_data_version``)
+    resolve : callable, optional
+        ``resolve(data_dir, use_repo_fallback) -> str or None``, the
+        directory a request reads (default: ``resolve_data_dir``)
+    max_dirs : int
+        Directories loaded on request kept besides the preloaded ones
+        (least recently used dropped first)
+    """
+
+    def __init__(self, loader: Optional[Callable[..., Dict]] = None,
+                 version: Optional[Callable[[str, bool], str]] = None,
+                 resolve: Optional[Callable[[str, bool], Optional[str]]] = None,
+                 max_dirs: int = DEFAULT_MAX_DIRS):
+        self._loader = loader or memoized_ceir_parameters
+        self._version = version or ceir_data_version
+        self._resolve = resolve or resolve_data_dir
+        self.max_dirs = max_dirs
+        self._snapshots: "OrderedDict[StoreKey, Mapping]" = OrderedDict()
+        self._sources: Dict[StoreKey, Tuple[str, bool]] = {}  # key -> loader arguments
+        self._aliases: "OrderedDict[Tuple[str, bool], StoreKey]" = OrderedDict()
+        self._pinned = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _key(self, data_dir: str, use_repo_fallback: bool) -> Tuple[StoreKey, Tuple[str, bool]]:
+        """(store key, loader arguments) of a requested directory."""
+        alias = (data_dir, bool(use_repo_fallback))
+        with self._lock:
+            key = self._aliases.get(alias)
+            if key is not None:
+                self._aliases.move_to_end(alias)
+        if key is None:
+            key = self._resolve(data_dir, bool(use_repo_fallback)) or SYNTHETIC
+            with self._lock:
+                self._aliases[alias] = key
+                while len(self._aliases) > MAX_ALIASES:
+                    self._aliases.popitem(last=False)
+        # A resolved directory is read as is; the fallback is already applied
+        return key, (alias if key == SYNTHETIC else (key, False))
+
+    def resolve_key(self, data_dir: str = DEFAULT_DATA_DIR, use_repo_fallback: bool = True) -> StoreKey:
+        """Key a directory's snapshot is held under, without loading it."""
+        return self._key(data_dir, use_repo_fallback)[0]
+
+    def _load(self, key: StoreKey, source: Tuple[str, bool]) -> Mapping:
+        version = self._version(*source)
+        params = self._loader(data_dir=source[0], use_repo_fallback=source[1])
+        return _validated(params, key, version)
+
+    def _keep(self, key: StoreKey, source: Tuple[str, bool], snapshot: Mapping,
+              pin: bool = False) -> Mapping:
+        """Store a snapshot (caller holds the lock); evict beyond ``max_dirs``."""
+        self._snapshots[key] = snapshot
+        self._snapshots.move_to_end(key)
+        self._sources.setdefault(key, source)
+        if pin:
+            self._pinned.add(key)
+        lazy = [k for k in self._snapshots if k not in self._pinned]
+        for old in lazy[:max(len(lazy) - self.max_dirs, 0)]:
+            del self._snapshots[old]
+            del self._sources[old]
+        return snapshot
+
+    def get(self, data_dir: str = DEFAULT_DATA_DIR, use_repo_fallback: bool = True) -> Mapping:
+        """
+        Snapshot for a data directory.
+
+        Preloaded directories are served from memory; another directory is
+        loaded on first use and kept (and refreshed) while it stays among
+        the ``max_dirs`` most recently used.
+        """
+        key, source = self._key(data_dir, use_repo_fallback)
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None:
+                self._snapshots.move_to_end(key)
+                return snapshot
+        snapshot = self._load(key, source)
+        with self._lock:
+            current = self._snapshots.get(key)
+            return current if current is not None else self._keep(key, source, snapshot)
+
+    def preload(self, data_dirs: Iterable[str], use_repo_fallback: bool = True) -> Dict[str, str]:
+        """
+        Load and validate defaults for each directory.
+
+        Returns
+        -------
+        Dict[str, str]
+            data_dir -> 'ok' or the error; failures are warned about and
+            leave requests for that directory to explicit parameters or a
+            lazy retry
+        """
+        status = {}
+        for data_dir in data_dirs:
+            try:
+                key, source = self._key(data_dir, use_repo_fallback)
+                snapshot = self._load(key, source)
+            except Exception as exc:  # noqa: BLE001
+                warnings.warn(f"Default parameters for {data_dir!r} unavailable: {exc}")
+                status[data_dir] = str(exc)
+                continue
+            with self._lock:
+                self._keep(key, source, snapshot, pin=True)
+            status[data_dir] = "ok"
+        return status
+
+    def refresh(self, force: bool = False) -> int:
+        """
+        Reload every snapshot whose source fingerprint changed.
+
+        Returns
+        -------
+        int
+            Number of snapshots replaced
+        """
+        replaced = 0
+        with self._lock:
+            # Directories may have appeared or gone since they were resolved
+            self._aliases.clear()
+            held = [(key, self._sources[key], current) for key, current in self._snapshots.items()]
+        for key, source, current in held:
+            try:
+                if not force and self._version(*source) == current["data_version"]:
+                    continue
+                snapshot = self._load(key, source)
+            except Exception as exc:  # noqa: BLE001
+                warnings.warn(f"Refreshing defaults for {key!r} failed, keeping the old ones: {exc}")
+                continue
+            with self._lock:
+                if key in self._snapshots:
+                    self._snapshots[key] = snapshot
+                    replaced += 1
+        return replaced
+
+    def start(self, interval: float) -> None:
+        """Refresh in a daemon thread every ``interval`` seconds (no-op if <= 0)."""
+        if interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval):
+                self.refresh()
+
+        self._thread = threading.Thread(target=run, name="param-store-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the refresh thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def keys(self) -> Tuple[StoreKey, ...]:
+        """Keys currently held."""
+        return tuple(self._snapshots)
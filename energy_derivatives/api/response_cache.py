@@ -0,0 +1,273 @@
+"""
+Response cache for the pricing endpoints.
+
+Dashboards poll the same contract over and over; this cache answers
+repeats without touching the executor. A request is reduced to a canonical
+key after defaults are filled in (``_ensure_params``): floats are rounded
+to 12 significant digits and only the options the chosen engine uses are
+kept, so ``N`` does not split Monte-Carlo entries and ``num_simulations``
+does not split binomial ones. Unseeded Monte-Carlo results are random and
+never cached.
+
+Tiers:
+
+- in-process LRU with a TTL
+- optional shared SQLite file (``SPK_RESPONSE_CACHE_DB``) so every worker
+  process on the host shares results
+
+Concurrent identical requests are coalesced: the first computes, the rest
+await its result. ``stats()`` reports hits, misses, coalesced requests,
+the hit rate and the compute seconds saved.
+
+Configuration (environment):
+
+- SPK_RESPONSE_CACHE_SIZE: entries kept in memory (default 1024)
+- SPK_RESPONSE_CACHE_TTL: seconds an entry is served; 0 disables (default 60)
+- SPK_RESPONSE_CACHE_DB: SQLite path for the shared tier (default: none)
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from spk_derivatives.memo import content_key  # type: ignore  # noqa: E402
+
+DEFAULT_MAXSIZE = 1024
+DEFAULT_TTL = 60.0
+KEY_DIGITS = 12
+
+_MISSING = object()
+
+
+def _rounded(value: Any) -> Any:
+    if isinstance(value, float):
+        return float(f"{value:.{KEY_DIGITS}g}")
+    if isinstance(value, dict):
+        return {k: _rounded(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_rounded(v) for v in value]
+    return value
+
+
+def request_key(endpoint: str, params: Mapping, method: str, seed: Optional[int] = None,
+                N: Optional[int] = None, num_simulations: Optional[int] = None,
+                **options: Any) -> Optional[str]:
+    """
+    Canonical cache key for a pricing request, or None if not cacheable.
+
+    Parameters
+    ----------
+    endpoint : str
+        Endpoint name ('price', 'greeks', ...)
+    params : Mapping
+        Resolved contract inputs (S0, K, T, r, sigma)
+    method : str
+        'binomial', 'monte_carlo' or 'analytic'
+    seed : int, optional
+        Monte-Carlo seed; without one the result is not reproducible
+    N, num_simulations : int, optional
+        Engine size; only the one ``method`` uses enters the key
+    **options
+        Any other field that changes the response (payoff_type, ...)
+    """
+    if method == "monte_carlo":
+        if seed is None:
+            return None
+        engine = {"num_simulations": num_simulations, "seed": seed}
+    elif method == "binomial":
+        engine = {"N": N}
+    else:
+        engine = {}
+    return content_key(endpoint, method, _rounded(dict(params)), engine, _rounded(options))
+
+
+class ResponseCache:
+    """
+    TTL'd LRU of endpoint responses with an optional shared SQLite tier.
+
+    Parameters
+    ----------
+    maxsize : int
+        Entries kept in memory
+    ttl : float
+        Seconds an entry is served; 0 disables caching (coalescing stays)
+    shared_path : str or Path, optional
+        SQLite file shared by worker processes (default: memory only)
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, ttl: float = DEFAULT_TTL,
+                 shared_path=None):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if ttl < 0:
+            raise ValueError("ttl must be non-negative")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.shared_path = Path(shared_path) if shared_path else None
+        self._entries: "OrderedDict[str, Tuple[float, Any, float]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.uncacheable = 0
+        self.saved_seconds = 0.0
+        if self.shared_path is not None:
+            self.shared_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._connect() as db:
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("CREATE TABLE IF NOT EXISTS responses ("
+                           "key TEXT PRIMARY KEY, value TEXT, cost REAL, expires REAL)")
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        """Cache configured from the SPK_RESPONSE_CACHE_* environment variables."""
+        return cls(int(os.getenv("SPK_RESPONSE_CACHE_SIZE", DEFAULT_MAXSIZE)),
+                   float(os.getenv("SPK_RESPONSE_CACHE_TTL", DEFAULT_TTL)),
+                   os.getenv("SPK_RESPONSE_CACHE_DB") or None)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.shared_path), timeout=5)
+
+    def _memory_get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.saved_seconds += entry[2]
+            return entry[1]
+
+    def _remember(self, key: str, value: Any, cost: float, expires: float) -> None:
+        with self._lock:
+            self._entries[key] = (expires, value, cost)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _shared_get(self, key: str) -> Any:
+        try:
+            with self._connect() as db:
+                row = db.execute("SELECT value, cost, expires FROM responses "
+                                 "WHERE key = ? AND expires > ?", (key, time.time())).fetchone()
+        except sqlite3.Error as exc:
+            warnings.warn(f"Shared response cache unavailable ({exc})")
+            return _MISSING
+        if row is None:
+            return _MISSING
+        value = json.loads(row[0])
+        self._remember(key, value, row[1], row[2])
+        with self._lock:
+            self.shared_hits += 1
+            self.saved_seconds += row[1]
+        return value
+
+    def _shared_put(self, key: str, value: Any, cost: float, expires: float) -> None:
+        try:
+            with self._connect() as db:
+                db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                           (key, json.dumps(value), cost, expires))
+                db.execute("DELETE FROM responses WHERE expires <= ?", (time.time(),))
+        except (sqlite3.Error, TypeError, ValueError) as exc:
+            warnings.warn(f"Could not share cached response ({exc})")
+
+    async def get_or_compute(self, key: Optional[str], compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Cached response for ``key``, computing it with ``compute()`` on a miss.
+
+        ``key=None`` (not cacheable) always computes. While a key is being
+        computed, identical requests wait for that result instead of
+        starting their own; errors are not cached.
+        """
+        if key is None:
+            with self._lock:
+                self.uncacheable += 1
+            return await compute()
+        if self.ttl > 0:
+            value = self._memory_get(key)
+            if value is not _MISSING:
+                return value
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            with self._lock:
+                self.coalesced += 1
+            value, cost = await asyncio.shield(pending)
+            with self._lock:
+                self.saved_seconds += cost
+            return value
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = _MISSING
+            if self.ttl > 0 and self.shared_path is not None:
+                value = await asyncio.to_thread(self._shared_get, key)
+            cost = 0.0
+            if value is _MISSING:
+                with self._lock:
+                    self.misses += 1
+                started = time.perf_counter()
+                value = await compute()
+                cost = time.perf_counter() - started
+                if self.ttl > 0:
+                    expires = time.time() + self.ttl
+                    self._remember(key, value, cost, expires)
+                    if self.shared_path is not None:
+                        await asyncio.to_thread(self._shared_put, key, value, cost, expires)
+            future.set_result((value, cost))
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # retrieved here; waiters re-raise it
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._entries.clear()
+        if self.shared_path is not None:
+            with self._connect() as db:
+                db.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict:
+        """Hit / miss counters, hit rate and compute seconds saved."""
+        with self._lock:
+            served = self.hits + self.shared_hits + self.coalesced
+            lookups = served + self.misses
+            return {
+                "entries": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "coalesced": self.coalesced,
+                "misses": self.misses,
+                "uncacheable": self.uncacheable,
+                "hit_rate": served / lookups if lookups else 0.0,
+                "saved_seconds": self.saved_seconds,
+                "in_flight": len(self._inflight),
+                "shared_path": str(self.shared_path) if self.shared_path is not None else None,
+            }
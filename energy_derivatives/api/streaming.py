@@ -0,0 +1,91 @@
+"""
+Incremental (streamed) responses for long-running endpoints.
+
+Work is split into chunks that run as separate executor jobs; rows are
+written as soon as their chunk finishes, as NDJSON lines
+(``application/x-ndjson``) or Server-Sent Events (``text/event-stream``).
+At most ``window`` chunks are outstanding at a time, so a long stream
+neither floods its executor lane nor runs far ahead of the client. When
+the client goes away, outstanding chunks are cancelled: queued ones never
+run and no new ones are submitted.
+"""
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional
+
+NDJSON_TYPE = "application/x-ndjson"
+SSE_TYPE = "text/event-stream"
+STREAM_TYPES = (NDJSON_TYPE, SSE_TYPE)
+DISCONNECT_POLL_SECONDS = 0.25
+
+
+def stream_type(accept: Optional[str]) -> Optional[str]:
+    """Streaming media type requested by an Accept header, if any."""
+    for part in (accept or "").split(","):
+        media = part.split(";")[0].strip().lower()
+        if media in STREAM_TYPES:
+            return media
+    return None
+
+
+def encode(row: Dict, media_type: str, event: str = "result") -> bytes:
+    """One row as an NDJSON line or an SSE event."""
+    data = json.dumps(row, default=float)
+    if media_type == SSE_TYPE:
+        return f"event: {event}\ndata: {data}\n\n".encode()
+    return (data + "\n").encode()
+
+
+def chunked(items: List, first: int = 1, size: int = 4) -> List[List]:
+    """Split ``items`` into a small first chunk (fast first result) and ``size``-sized rest."""
+    head, rest = items[:first], items[first:]
+    return ([head] if head else []) + [rest[i:i + size] for i in range(0, len(rest), size)]
+
+
+async def stream_chunks(run: Callable[[Any], Awaitable[List[Dict]]],
+                        chunks: Iterable,
+                        window: int,
+                        is_disconnected: Callable[[], Awaitable[bool]]) -> AsyncIterator[Dict]:
+    """
+    Rows of every chunk, in completion order.
+
+    Parameters
+    ----------
+    run : callable
+        ``await run(chunk)`` -> list of row dicts
+    chunks : iterable
+        Work units
+    window : int
+        Chunks in flight at once
+    is_disconnected : callable
+        ``await is_disconnected()`` -> True once the client has gone
+
+    Errors from ``run`` propagate; outstanding chunks are cancelled first.
+    """
+    chunks = iter(chunks)
+    pending = set()
+
+    def submit() -> None:
+        while len(pending) < max(1, window):
+            chunk = next(chunks, None)
+            if chunk is None:
+                return
+            pending.add(asyncio.ensure_future(run(chunk)))
+
+    try:
+        submit()
+        while pending:
+            done, pending = await asyncio.wait(pending, timeout=DISCONNECT_POLL_SECONDS,
+                                               return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                if await is_disconnected():
+                    return
+                continue
+            for task in done:
+                for row in task.result():
+                    yield row
+            submit()
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,349 @@
+"""
+Precomputed price surfaces for /price and /greeks.
+
+With SPK_PRICE_SURFACES=1, binomial requests are answered from a
+``spk_derivatives.surface.PriceSurface`` when one covers them, in well
+under a millisecond, with the surface's error bound in the response.
+Everything else (Monte-Carlo, points outside every domain, surfaces
+whose validated price error exceeds the tolerance) is priced in full as
+before.
+
+Surfaces are kept per underlying (the ``ParameterStore`` directory a
+request resolves to) and (r, N, payoff_type). Only the (r, N,
+payoff_type) combinations configured in SPK_SURFACE_KEYS are ever built:
+builds take seconds to minutes (growing with N), so request parameters
+alone never start one. They are built at startup for the configured data
+directories and on first use for other underlyings, least recently used
+surfaces making room beyond SPK_SURFACE_MAX. Builds run on the heavy
+executor lane, so they never block the event loop; a build that exceeds
+the lane timeout is not retried. Each surface's domain is centred on its
+underlying's defaults at build time (moneyness S0/K, sigma); a
+background check compares the current defaults with those and rebuilds
+when either drifted by more than SPK_SURFACE_DRIFT. The old surface
+keeps serving until the new one replaces it.
+
+/greeks is served from a surface only when the validated bound of every
+Greek is within its own tolerance too; with the default nodes the
+lattice noise in Delta and Gamma exceeds the defaults, so Greeks are
+priced in full unless the tolerances are relaxed.
+
+Configuration (environment):
+
+- SPK_PRICE_SURFACES: 1 to serve quotes from surfaces (default 0)
+- SPK_SURFACE_KEYS: comma-separated r:N:payoff_type combinations to build
+  (default 0.05:100:call)
+- SPK_SURFACE_NODES: Chebyshev nodes in moneyness, T, sigma (default 24,16,16)
+- SPK_SURFACE_TOLERANCE: largest price error per unit strike served
+  (default 0.005)
+- SPK_SURFACE_GREEK_TOLERANCE: per-Greek overrides of the largest error
+  per unit strike, e.g. ``Delta=0.05,Gamma=1`` (defaults in
+  ``DEFAULT_GREEK_TOLERANCE``)
+- SPK_SURFACE_DRIFT: relative moneyness/sigma drift that triggers a
+  rebuild (default 0.1)
+- SPK_SURFACE_CHECK_SECONDS: drift check interval (default 60)
+- SPK_SURFACE_MAX: most surfaces kept (default 16)
+"""
+
+import asyncio
+import math
+import os
+import sys
+import time
+import warnings
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Mapping, Optional, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from spk_derivatives.surface import DEFAULT_NODES  # type: ignore  # noqa: E402
+
+from . import tasks  # noqa: E402
+from .executor import HEAVY, LaneTimeout  # noqa: E402
+
+DEFAULT_TOLERANCE = 0.005
+DEFAULT_GREEK_TOLERANCE = {"Delta": 0.01, "Gamma": 0.1, "Vega": 0.005, "Theta": 0.005, "Rho": 0.005}
+DEFAULT_DRIFT = 0.1
+DEFAULT_CHECK_SECONDS = 60.0
+DEFAULT_MAX_SURFACES = 16
+# The PriceRequest defaults
+DEFAULT_KEYS = ((0.05, 100, "call"),)
+
+BuildKey = Tuple[float, int, str]  # r, N, payoff_type
+SurfaceKey = Tuple[str, float, int, str]  # underlying (ParameterStore key), r, N, payoff_type
+
+
+def parse_keys(raw: str) -> Tuple[BuildKey, ...]:
+    """``"0.05:100:call,0.03:200:redeemable"`` -> ((0.05, 100, 'call'), ...)."""
+    keys = []
+    for item in raw.split(","):
+        if not item.strip():
+            continue
+        r, N, payoff_type = item.strip().split(":")
+        if payoff_type not in ("call", "redeemable"):
+            raise ValueError(f"Unknown payoff_type in SPK_SURFACE_KEYS: {payoff_type}")
+        keys.append((float(r), int(N), payoff_type))
+    return tuple(keys)
+
+
+def parse_tolerances(raw: str) -> Dict[str, float]:
+    """``"Delta=0.05,Gamma=1"`` -> {'Delta': 0.05, 'Gamma': 1.0} over the defaults."""
+    tolerances = dict(DEFAULT_GREEK_TOLERANCE)
+    for item in raw.split(","):
+        if not item.strip():
+            continue
+        name, _, value = item.partition("=")
+        if name.strip() not in tolerances:
+            raise ValueError(f"Unknown Greek in SPK_SURFACE_GREEK_TOLERANCE: {name.strip()}")
+        tolerances[name.strip()] = float(value)
+    return tolerances
+
+
+class _Slot:
+    __slots__ = ("source", "surface", "anchor", "building", "retry_at")
+
+    def __init__(self, source: Tuple[str, bool]):
+        self.source = source  # (data_dir, use_repo_fallback) the underlying was requested as
+        self.surface = None
+        self.anchor: Optional[Dict[str, float]] = None
+        self.building = False
+        self.retry_at = 0.0
+
+
+def _anchor(defaults: Mapping) -> Dict[str, float]:
+    return {"moneyness": defaults["S0"] / defaults["K"], "sigma": defaults["sigma"]}
+
+
+def _drifted(old: Mapping, new: Mapping, threshold: float) -> bool:
+    return any(abs(new[name] / old[name] - 1) > threshold for name in old)
+
+
+class SurfaceService:
+    """
+    Price surfaces by underlying, their builds and drift checks.
+
+    Parameters
+    ----------
+    store : ParameterStore
+        Underlying defaults the domains are centred on
+    executor : PricingExecutor
+        Builds run ``tasks.surface_task`` on the heavy lane
+    enabled : bool
+        Serve quotes from surfaces (when False, ``quote`` always misses)
+    keys : sequence of (r, N, payoff_type)
+        Combinations surfaces are built for; other requests are priced in full
+    nodes : (int, int, int)
+        Chebyshev nodes per dimension
+    tolerance : float
+        Largest validated price error per unit strike a surface may have
+    greek_tolerance : Dict[str, float], optional
+        Largest validated error per unit strike of each Greek for /greeks
+        (default: ``DEFAULT_GREEK_TOLERANCE``)
+    drift : float
+        Relative change in moneyness or sigma that triggers a rebuild
+    check_seconds : float
+        Drift check interval
+    max_surfaces : int
+        Most surfaces kept (least recently used evicted)
+    """
+
+    def __init__(self, store, executor, enabled: bool = False,
+                 keys: Sequence[BuildKey] = DEFAULT_KEYS,
+                 nodes: Tuple[int, int, int] = DEFAULT_NODES,
+                 tolerance: float = DEFAULT_TOLERANCE,
+                 greek_tolerance: Optional[Mapping[str, float]] = None,
+                 drift: float = DEFAULT_DRIFT,
+                 check_seconds: float = DEFAULT_CHECK_SECONDS,
+                 max_surfaces: int = DEFAULT_MAX_SURFACES):
+        self.store = store
+        self.executor = executor
+        self.enabled = enabled
+        self.keys = frozenset((float(r), int(N), payoff_type) for r, N, payoff_type in keys)
+        self.nodes = tuple(nodes)
+        self.tolerance = tolerance
+        self.greek_tolerance = dict(greek_tolerance or DEFAULT_GREEK_TOLERANCE)
+        self.drift = drift
+        self.check_seconds = check_seconds
+        self.max_surfaces = max_surfaces
+        self._slots: "OrderedDict[SurfaceKey, _Slot]" = OrderedDict()
+        self._builds = set()
+        self._task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.rebuilds = 0
+
+    @classmethod
+    def from_env(cls, store, executor) -> "SurfaceService":
+        """Service configured from SPK_PRICE_SURFACES and the SPK_SURFACE_* variables."""
+        nodes = os.getenv("SPK_SURFACE_NODES")
+        keys = os.getenv("SPK_SURFACE_KEYS")
+        return cls(store, executor,
+                   enabled=os.getenv("SPK_PRICE_SURFACES", "0").lower() in ("1", "true", "yes"),
+                   keys=parse_keys(keys) if keys else DEFAULT_KEYS,
+                   nodes=tuple(int(n) for n in nodes.split(",")) if nodes else DEFAULT_NODES,
+                   tolerance=float(os.getenv("SPK_SURFACE_TOLERANCE", DEFAULT_TOLERANCE)),
+                   greek_tolerance=parse_tolerances(os.getenv("SPK_SURFACE_GREEK_TOLERANCE", "")),
+                   drift=float(os.getenv("SPK_SURFACE_DRIFT", DEFAULT_DRIFT)),
+                   check_seconds=float(os.getenv("SPK_SURFACE_CHECK_SECONDS", DEFAULT_CHECK_SECONDS)),
+                   max_surfaces=int(os.getenv("SPK_SURFACE_MAX", DEFAULT_MAX_SURFACES)))
+
+    # ------------------------------------------------------------------
+    # Quotes
+    # ------------------------------------------------------------------
+
+    def quote(self, data_dir: str, use_repo_fallback: bool, params: Mapping, N: int,
+              payoff_type: str, greeks: bool = False) -> Optional[Dict]:
+        """
+        Surface quote for resolved inputs, or None to price in full.
+
+        A miss on a configured (r, N, payoff_type) for an underlying
+        without a surface schedules one, so repeated traffic is served once
+        it is built. With ``greeks`` every Greek's bound must be within
+        its tolerance as well.
+
+        Returns
+        -------
+        Dict or None
+            'Price' (and the Greeks when ``greeks``) as floats, plus
+            'surface' with the error bound at this strike and build time
+        """
+        if not self.enabled:
+            return None
+        build_key = (float(params["r"]), int(N), payoff_type)
+        if build_key not in self.keys:
+            self.misses += 1
+            return None
+        key = (self.store.resolve_key(data_dir, use_repo_fallback), *build_key)
+        slot = self._slots.get(key)
+        if slot is None:
+            self._schedule(key, (data_dir, bool(use_repo_fallback)))
+        else:
+            self._slots.move_to_end(key)
+        surface = slot.surface if slot is not None else None
+        if (surface is None or not self._within_tolerance(surface, greeks)
+                or not surface.contains(params["S0"], params["K"], params["T"], params["sigma"])):
+            self.misses += 1
+            return None
+        values = surface.quote(params["S0"], params["K"], params["T"], params["sigma"],
+                               greeks=greeks, fallback=False)
+        self.hits += 1
+        result = {name: float(v) for name, v in values.items() if name != "on_surface"}
+        bound = surface.bound_for(params["K"])
+        result["surface"] = {
+            "error_bound": {name: bound[name] for name in result if name in bound},
+            "built_at": surface.built_at,
+        }
+        return result
+
+    def _within_tolerance(self, surface, greeks: bool) -> bool:
+        bound = surface.error_bound
+        if bound.get("Price", math.inf) > self.tolerance:
+            return False
+        if greeks:
+            return all(bound.get(name, math.inf) <= limit
+                       for name, limit in self.greek_tolerance.items())
+        return True
+
+    # ------------------------------------------------------------------
+    # Builds
+    # ------------------------------------------------------------------
+
+    def _schedule(self, key: SurfaceKey, source: Optional[Tuple[str, bool]] = None) -> None:
+        slot = self._slots.get(key)
+        if slot is None:
+            while len(self._slots) >= self.max_surfaces:
+                idle = next((k for k, s in self._slots.items() if not s.building), None)
+                if idle is None:  # every slot is building; try again on a later miss
+                    return
+                del self._slots[idle]
+            slot = self._slots[key] = _Slot(source)
+        if slot.building or time.time() < slot.retry_at:
+            return
+        slot.building = True
+        task = asyncio.get_running_loop().create_task(self._build(key, slot))
+        self._builds.add(task)
+        task.add_done_callback(self._builds.discard)
+
+    async def _build(self, key: SurfaceKey, slot: _Slot) -> None:
+        _, r, N, payoff_type = key
+        try:
+            defaults = await asyncio.to_thread(self.store.get, *slot.source)
+            anchor = _anchor(defaults)
+            surface = await self.executor.run(HEAVY, tasks.surface_task, r, N, payoff_type,
+                                              anchor["moneyness"], anchor["sigma"], self.nodes)
+        except LaneTimeout as exc:
+            # The worker keeps building; another attempt would only stack up
+            warnings.warn(f"Price surface for {key} not built, not retrying: {exc}")
+            slot.retry_at = math.inf
+            return
+        except Exception as exc:  # noqa: BLE001
+            warnings.warn(f"Price surface for {key} not built, retrying later: {exc}")
+            slot.retry_at = time.time() + self.check_seconds
+            return
+        finally:
+            slot.building = False
+        if slot.surface is not None:
+            self.rebuilds += 1
+        slot.surface, slot.anchor = surface, anchor
+
+    async def check_drift(self) -> int:
+        """Rebuild surfaces whose underlying drifted; returns how many were scheduled."""
+        scheduled = 0
+        for key, slot in list(self._slots.items()):
+            if slot.anchor is None or slot.building:
+                continue
+            try:
+                defaults = await asyncio.to_thread(self.store.get, *slot.source)
+            except Exception as exc:  # noqa: BLE001
+                warnings.warn(f"Drift check for {key[0]!r} failed: {exc}")
+                continue
+            if _drifted(slot.anchor, _anchor(defaults), self.drift):
+                self._schedule(key)
+                scheduled += 1
+        return scheduled
+
+    async def _check(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_seconds)
+            await self.check_drift()
+
+    def start(self, data_dirs: Iterable[str]) -> None:
+        """Build the startup surfaces and start drift checks (from the running loop)."""
+        if not self.enabled or self._task is not None:
+            return
+        for data_dir in data_dirs:
+            for build_key in sorted(self.keys):
+                self._schedule((self.store.resolve_key(data_dir, True), *build_key), (data_dir, True))
+        if self.check_seconds > 0:
+            self._task = asyncio.get_running_loop().create_task(self._check())
+
+    async def stop(self) -> None:
+        for task in [self._task, *self._builds]:
+            if task is not None:
+                task.cancel()
+        await asyncio.gather(*self._builds, return_exceptions=True)
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def wait_built(self) -> None:
+        """Wait for every build in progress (tests, warm-up scripts)."""
+        while self._builds:
+            await asyncio.gather(*list(self._builds), return_exceptions=True)
+
+    def stats(self) -> Dict:
+        surfaces = []
+        for (underlying, r, N, payoff_type), slot in self._slots.items():
+            entry = {"data_dir": underlying, "building": slot.building, "anchor": slot.anchor,
+                     "failed": slot.retry_at == math.inf}
+            if slot.surface is not None:
+                entry.update(slot.surface.describe())
+            else:
+                entry.update({"r": r, "N": N, "payoff_type": payoff_type})
+            surfaces.append(entry)
+        return {"enabled": self.enabled, "hits": self.hits, "misses": self.misses,
+                "rebuilds": self.rebuilds, "tolerance": self.tolerance,
+                "greek_tolerance": self.greek_tolerance,
+                "keys": [list(k) for k in sorted(self.keys)], "surfaces": surfaces}
@@ -0,0 +1,183 @@
+"""
+Pricing work units run by the API executor.
+
+Module-level functions of plain arguments returning plain dicts, so they
+can be pickled to worker processes. ``warm_worker`` is the pool
+initializer: it imports the numerical stack and prices a tiny contract
+once, so the first real request does not pay for imports.
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from spk_derivatives import profiling  # type: ignore  # noqa: E402
+from spk_derivatives.binomial import BinomialTree  # type: ignore  # noqa: E402
+from spk_derivatives.binomial import price_batch as binomial_price_batch  # type: ignore  # noqa: E402
+from spk_derivatives.monte_carlo import MonteCarloSimulator, price_batch  # type: ignore  # noqa: E402
+from spk_derivatives.sensitivities import GreeksCalculator, greeks_batch  # type: ignore  # noqa: E402
+from spk_derivatives.surface import PriceSurface  # type: ignore  # noqa: E402
+
+from .batch import price_prepared  # noqa: E402,F401  (batch work unit)
+
+
+def warm_worker(profile: bool = False) -> None:
+    """Pool initializer: load modules and touch the pricing paths once."""
+    profiling.enable(profile)
+    BinomialTree(1.0, 1.0, 1.0, 0.05, 0.2, 8).price()
+    MonteCarloSimulator(1.0, 1.0, 1.0, 0.05, 0.2, 64, seed=0).confidence_interval()
+    profiling.reset()
+
+
+def instrumented(fn, *args):
+    """Run ``fn(*args)`` in a worker; return its value and the phase timings it recorded."""
+    try:
+        value = fn(*args)
+    finally:
+        timings = profiling.snapshot(reset=True) if profiling.enabled() else None
+    return value, timings
+
+
+def ping() -> bool:
+    """No-op task used to start and warm every worker."""
+    return True
+
+
+def price_task(params: Dict, method: str, N: int, num_simulations: int,
+               payoff_type: str, seed: Optional[int] = None) -> Dict:
+    """Body of ``POST /price``."""
+    if method == "binomial":
+        tree = BinomialTree(params["S0"], params["K"], params["T"], params["r"],
+                            params["sigma"], N, payoff_type)
+        return {
+            "method": "binomial",
+            "price": tree.price(),
+            "steps": N,
+            "inputs": params
+        }
+    sim = MonteCarloSimulator(params["S0"], params["K"], params["T"], params["r"],
+                              params["sigma"], num_simulations,
+                              payoff_type=payoff_type, seed=seed)
+    price, low, high = sim.confidence_interval()
+    return {
+        "method": "monte_carlo",
+        "price": price,
+        "ci_95": [low, high],
+        "num_simulations": num_simulations,
+        "inputs": params
+    }
+
+
+def greeks_task(params: Dict, pricing_method: str, N: int, num_simulations: int,
+                payoff_type: str, seed: Optional[int]) -> Dict:
+    """Body of ``POST /greeks``."""
+    calc = GreeksCalculator(
+        params["S0"], params["K"], params["T"], params["r"], params["sigma"],
+        pricing_method=pricing_method,
+        N=N,
+        num_simulations=num_simulations,
+        payoff_type=payoff_type,
+        seed=seed
+    )
+    return {"inputs": params, "greeks": calc.compute_all_greeks()}
+
+
+def stress_task(params: Dict, payoff_type: str, num_simulations: int,
+                volatilities: Optional[List[float]], rates: Optional[List[float]]) -> Dict:
+    """Body of ``POST /stress``."""
+    results = {}
+    sim = MonteCarloSimulator(
+        params["S0"], params["K"], params["T"], params["r"], params["sigma"],
+        num_simulations, payoff_type=payoff_type
+    )
+    results["base_price"] = sim.price()
+
+    if volatilities:
+        vol_results = []
+        for vol in volatilities:
+            s = MonteCarloSimulator(params["S0"], params["K"], params["T"], params["r"], vol,
+                                    num_simulations, payoff_type=payoff_type)
+            vol_results.append({"vol": vol, "price": s.price()})
+        results["vol_stress"] = vol_results
+
+    if rates:
+        rate_results = []
+        for rate in rates:
+            s = MonteCarloSimulator(params["S0"], params["K"], params["T"], rate, params["sigma"],
+                                    num_simulations, payoff_type=payoff_type)
+            rate_results.append({"rate": rate, "price": s.price()})
+        results["rate_stress"] = rate_results
+
+    return {"inputs": params, "results": results}
+
+
+def stress_scenarios_task(params: Dict, payoff_type: str, num_simulations: int,
+                          seed: int, scenarios: List[Tuple[str, Optional[float]]]) -> List[Dict]:
+    """
+    Price a chunk of stress scenarios in one ``price_batch`` call.
+
+    ``scenarios`` holds ('base', None), ('vol', sigma) or ('rate', r).
+    Chunks of one request share ``seed``, so every scenario is priced on
+    the same draws.
+    """
+    sigma = np.array([v if kind == "vol" else params["sigma"] for kind, v in scenarios])
+    rate = np.array([v if kind == "rate" else params["r"] for kind, v in scenarios])
+    prices, std_errors = price_batch(params["S0"], params["K"], params["T"], rate, sigma,
+                                     num_simulations=num_simulations,
+                                     payoff_type=payoff_type, seed=seed)
+    rows = []
+    for (kind, value), price, se in zip(scenarios, prices, std_errors):
+        row = {"scenario": kind, "price": float(price), "std_error": float(se)}
+        if kind != "base":
+            row[kind] = value
+        rows.append(row)
+    return rows
+
+
+FEED_INPUTS = ("S0", "K", "T", "r", "sigma")
+
+
+def feed_price_task(N: int, payoff_type: str, greeks: bool, rows: List[Dict]) -> List[Dict]:
+    """
+    Reprice a group of feed contracts (``api.feed``) in one batched call.
+
+    ``rows`` are resolved inputs sharing N and payoff_type. Returns one
+    ``{"price": ..., "greeks": {...}}`` per row (no "greeks" unless asked);
+    if the batch is rejected, rows are priced one by one and the bad ones
+    get ``{"error": ...}``.
+    """
+    def price(group: List[Dict]) -> List[Dict]:
+        args = [np.array([row[name] for row in group], dtype=float) for name in FEED_INPUTS]
+        if not greeks:
+            prices = binomial_price_batch(*args, N=N, payoff_type=payoff_type)
+            return [{"price": float(p)} for p in prices]
+        values = greeks_batch(*args, N=N, payoff_type=payoff_type)
+        return [
+            {"price": float(values["Price"][i]),
+             "greeks": {name: float(v[i]) for name, v in values.items() if name != "Price"}}
+            for i in range(len(group))
+        ]
+
+    try:
+        return price(rows)
+    except ValueError:
+        results = []
+        for row in rows:
+            try:
+                results.extend(price([row]))
+            except ValueError as exc:
+                results.append({"error": str(exc)})
+        return results
+
+
+def surface_task(r: float, N: int, payoff_type: str, moneyness: float, sigma: float,
+                 nodes: Tuple[int, int, int]) -> PriceSurface:
+    """Build a price surface (``api.surfaces``) centred on an underlying's moneyness and sigma."""
+    return PriceSurface.around(sigma, r=r, N=N, payoff_type=payoff_type,
+                               moneyness=(moneyness / 2, moneyness * 2), nodes=tuple(nodes))
@@ -11,6 +11,8 @@ Features:
 - Binomial Option Pricing Model (BOPM)
 - Monte-Carlo simulation for derivative pricing
 - Greeks calculation (Delta, Vega, Theta, Rho, Gamma)
+- Delta-hedging backtests over simulated and historical paths
+- Vectorized implied volatility from quoted prices
 - NASA POWER API integration for global data
 - Geographic presets: 10+ world locations optimized for each energy type
 - Professional workflow tools (validation, comparison, batch pricing)
@@ -27,8 +29,18 @@ __author__ = "SPK Derivatives Team"
 from . import binomial
 from . import monte_carlo
 from . import sensitivities
+from . import cache  # Shared columnar data cache
 from . import data_loader
 from . import data_loader_nasa
+from . import nasa_power  # Shared NASA POWER client
+from . import bulk_fetch  # Concurrent multi-site fetching
+from . import power_server  # Offline POWER stand-in
+from . import memo  # Memoized parameter pipelines
+from . import volatility  # Rolling / EWMA / GARCH estimators
+from . import region  # Region screening
+from . import hourly  # Hourly streaming mode
+from . import power_models  # Power-conversion model registry
+from . import profiling  # Engine phase timings
 from . import data_loader_base  # Multi-energy support
 from . import data_loader_wind  # Multi-energy support
 from . import data_loader_hydro  # Multi-energy support
@@ -36,6 +48,10 @@ from . import location_guide  # Geographic presets
 from . import live_data
 from . import context_translator
 from . import results_manager
+from . import payoffs  # Vectorized payoff / P&L kernels
+from . import analytic  # Closed-form batch kernels
+from . import hedging  # Delta-hedging backtests
+from . import implied_vol  # Implied volatility solver
 
 # Optional: plots (requires matplotlib)
 try:
@@ -52,6 +68,7 @@ try:
         stress_test_rates,
         combined_stress_test,
         export_to_excel,
+        export_results,
         run_full_analysis,
         scenario_comparison,
         break_even_analysis,
@@ -67,6 +84,21 @@ from .data_loader import load_parameters
 from .binomial import BinomialTree
 from .monte_carlo import MonteCarloSimulator, price_energy_derivative_mc
 from .sensitivities import GreeksCalculator, compute_energy_derivatives_greeks as calculate_greeks
+from .sensitivities import greeks_batch
+from .surface import PriceSurface  # Precomputed price/Greeks surfaces
+from .hedging import DeltaHedgeSimulator
+from .implied_vol import implied_volatility
+from .bulk_fetch import fetch_many
+from .memo import memoized_loader_parameters, memoized_ceir_parameters, memoized_solar_parameters
+from .volatility import (
+    RollingVolatility,
+    EWMAVolatility,
+    GARCHVolatility,
+    volatility_term_structure,
+)
+from .region import RegionScreener
+from .hourly import load_hourly_statistics
+from .power_models import compute_prices, list_models, register_model
 
 # Import multi-energy data loaders
 from .data_loader_base import EnergyDataLoader  # Abstract base class
@@ -107,8 +139,17 @@ __all__ = [
     'monte_carlo',
     'sensitivities',
     'plots',
+    'cache',
     'data_loader',
     'data_loader_nasa',
+    'nasa_power',
+    'bulk_fetch',
+    'power_server',
+    'memo',
+    'volatility',
+    'region',
+    'hourly',
+    'power_models',
     'data_loader_base',  # Multi-energy support
     'data_loader_wind',  # Multi-energy support
     'data_loader_hydro',  # Multi-energy support
@@ -116,6 +157,10 @@ __all__ = [
     'live_data',
     'context_translator',
     'results_manager',
+    'payoffs',
+    'analytic',
+    'hedging',
+    'implied_vol',
 
     # Convenience functions
     'load_solar_parameters',
@@ -126,6 +171,23 @@ __all__ = [
     'price_energy_derivative_mc',
     'GreeksCalculator',
     'calculate_greeks',
+    'greeks_batch',
+    'PriceSurface',
+    'DeltaHedgeSimulator',
+    'implied_volatility',
+    'fetch_many',
+    'memoized_loader_parameters',
+    'memoized_ceir_parameters',
+    'memoized_solar_parameters',
+    'RollingVolatility',
+    'EWMAVolatility',
+    'GARCHVolatility',
+    'volatility_term_structure',
+    'RegionScreener',
+    'load_hourly_statistics',
+    'compute_prices',
+    'list_models',
+    'register_model',
 
     # Multi-energy data loaders
     'EnergyDataLoader',  # Abstract base
@@ -161,6 +223,7 @@ __all__ = [
     'stress_test_rates',
     'combined_stress_test',
     'export_to_excel',
+    'export_results',
     'run_full_analysis',
     'scenario_comparison',
     'break_even_analysis',
@@ -11,20 +11,28 @@ stress_test_volatility(): Price across volatility range
 stress_test_rates(): Price across interest rate range
 combined_stress_test(): 2D volatility × rate scenarios
 export_to_excel(): Save results to Excel workbook
+export_results(): Save result bundles as Parquet or Arrow IPC files
+run_full_analysis(): All sections as a parallel task graph
 """
 
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from .binomial import BinomialTree
 from .monte_carlo import MonteCarloSimulator
 from .sensitivities import GreeksCalculator
+from . import payoffs
 
 
 def sensitivity_table(S0: float, K: float, T: float, r: float, sigma: float,
                       spot_range: Optional[List[float]] = None,
                       method: str = 'binomial', N: int = 100,
-                      num_simulations: int = 10000) -> pd.DataFrame:
+                      num_simulations: int = 10000,
+                      base_greeks: Optional[Dict[str, float]] = None) -> pd.DataFrame:
     """
     Generate sensitivity table: Greeks at different spot prices.
     
@@ -48,6 +56,9 @@ def sensitivity_table(S0: float, K: float, T: float, r: float, sigma: float,
         Steps for binomial (default: 100)
     num_simulations : int
         Paths for Monte Carlo (default: 10000)
+    base_greeks : Dict[str, float], optional
+        Precomputed ``GreeksCalculator.compute_all_greeks()`` at S0, reused
+        for the spot == S0 row instead of repricing it
     
     Returns
     -------
@@ -68,6 +79,18 @@ def sensitivity_table(S0: float, K: float, T: float, r: float, sigma: float,
     results = []
     
     for spot in spot_range:
+        if base_greeks is not None and np.isclose(spot, S0):
+            results.append({
+                'Spot Price ($/kWh)': spot,
+                'Option Price ($/kWh)': base_greeks['Price'],
+                'Delta': base_greeks['Delta'],
+                'Gamma': base_greeks['Gamma'],
+                'Vega': base_greeks['Vega'],
+                'Theta': base_greeks['Theta'],
+                'Rho': base_greeks['Rho'],
+            })
+            continue
+
         # Price
         if method == 'binomial':
             tree = BinomialTree(S0=spot, K=K, T=T, r=r, sigma=sigma, N=N, payoff_type='call')
@@ -294,13 +317,116 @@ def combined_stress_test(S0: float, K: float, T: float,
     return df
 
 
+EXCEL_MAX_COLUMN_WIDTH = 50
+EXCEL_WIDTH_SAMPLE = 200
+
+
+def _estimate_column_widths(df: pd.DataFrame, index: bool = False,
+                            sample_size: int = EXCEL_WIDTH_SAMPLE) -> List[int]:
+    """
+    Estimate Excel column widths without visiting every cell.
+
+    Numeric columns are sized from their extremes (the widest rendering of
+    a number is at its min or max), other columns from a head/tail sample.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Frame to be written
+    index : bool
+        Whether the index is written as the leading column(s)
+    sample_size : int
+        Rows sampled for non-numeric columns
+
+    Returns
+    -------
+    List[int]
+        Width per written column, in Excel character units
+    """
+    frame = df.reset_index() if index else df
+    if len(frame) > sample_size:
+        sample = pd.concat([frame.head(sample_size // 2), frame.tail(sample_size // 2)])
+    else:
+        sample = frame
+
+    widths = []
+    for name in frame.columns:
+        column = frame[name]
+        if pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column):
+            values = column.dropna()
+            candidates = [values.min(), values.max()] if len(values) else []
+        else:
+            candidates = sample[name].dropna().tolist()
+        longest = max((len(str(v)) for v in candidates), default=0)
+        widths.append(min(max(longest, len(str(name))) + 2, EXCEL_MAX_COLUMN_WIDTH))
+    return widths
+
+
+def _write_excel_sheets(filename: str, sheets: List[Tuple[str, pd.DataFrame, bool]],
+                        write_only: bool = False) -> None:
+    """Write (sheet name, frame, include index) entries with styled headers."""
+    try:
+        import openpyxl
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, PatternFill, Alignment
+        from openpyxl.utils import get_column_letter
+    except ImportError:
+        raise ImportError("openpyxl required for Excel export. Install with: pip install openpyxl")
+
+    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+    header_font = Font(bold=True, color="FFFFFF")
+    header_alignment = Alignment(horizontal='center', vertical='center')
+
+    if not write_only:
+        with pd.ExcelWriter(filename, engine='openpyxl') as writer:
+            for sheet_name, df, index in sheets:
+                df.to_excel(writer, sheet_name=sheet_name, index=index)
+                ws = writer.book[sheet_name]
+                for cell in ws[1]:
+                    if cell.value is not None:
+                        cell.fill = header_fill
+                        cell.font = header_font
+                        cell.alignment = header_alignment
+                for i, width in enumerate(_estimate_column_widths(df, index=index), start=1):
+                    ws.column_dimensions[get_column_letter(i)].width = width
+        return
+
+    # Constant-memory mode: rows are streamed straight to disk, so widths and
+    # header styles have to be set before any row is appended
+    workbook = openpyxl.Workbook(write_only=True)
+    for sheet_name, df, index in sheets:
+        frame = df.reset_index() if index else df
+        ws = workbook.create_sheet(sheet_name)
+        for i, width in enumerate(_estimate_column_widths(df, index=index), start=1):
+            ws.column_dimensions[get_column_letter(i)].width = width
+
+        header = []
+        for name in frame.columns:
+            cell = WriteOnlyCell(ws, value=str(name))
+            cell.fill = header_fill
+            cell.font = header_font
+            cell.alignment = header_alignment
+            header.append(cell)
+        ws.append(header)
+
+        # One bulk conversion to native Python values (NaN -> empty cell)
+        for row in frame.astype(object).where(frame.notna(), None).to_numpy().tolist():
+            ws.append(row)
+    workbook.save(filename)
+
+
 def export_to_excel(filename: str, 
                    sensitivity_df: Optional[pd.DataFrame] = None,
                    volatility_stress_df: Optional[pd.DataFrame] = None,
                    rate_stress_df: Optional[pd.DataFrame] = None,
-                   combined_stress_df: Optional[pd.DataFrame] = None) -> None:
+                   combined_stress_df: Optional[pd.DataFrame] = None,
+                   write_only: bool = False) -> None:
     """
     Export analysis results to Excel workbook.
+
+    Column widths are estimated from dtypes and a sample of rows rather than
+    by measuring every cell. With ``write_only=True`` rows are streamed to
+    disk in openpyxl's constant-memory mode, which suits large stress grids.
     
     Parameters
     ----------
@@ -314,6 +440,8 @@ def export_to_excel(filename: str,
         Rate stress test
     combined_stress_df : pd.DataFrame, optional
         Combined 2D stress test
+    write_only : bool
+        Stream rows in constant memory (default: False)
     
     Raises
     ------
@@ -328,67 +456,180 @@ def export_to_excel(filename: str,
     ...                 sensitivity_df=sensitivity_df,
     ...                 volatility_stress_df=vol_stress)
     """
-    try:
-        import openpyxl
-        from openpyxl.styles import Font, PatternFill, Alignment
-    except ImportError:
-        raise ImportError("openpyxl required for Excel export. Install with: pip install openpyxl")
-    
-    with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-        # Write sheets
-        if sensitivity_df is not None:
-            sensitivity_df.to_excel(writer, sheet_name='Sensitivity', index=False)
-        
-        if volatility_stress_df is not None:
-            volatility_stress_df.to_excel(writer, sheet_name='Vol Stress', index=False)
-        
-        if rate_stress_df is not None:
-            rate_stress_df.to_excel(writer, sheet_name='Rate Stress', index=False)
-        
-        if combined_stress_df is not None:
-            combined_stress_df.to_excel(writer, sheet_name='Combined Stress')
-        
-        # Format sheets
-        workbook = writer.book
-        
-        # Style headers
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF")
-        
-        for sheet_name in workbook.sheetnames:
-            ws = workbook[sheet_name]
-            
-            # Header formatting
-            for cell in ws[1]:
-                if cell.value is not None:
-                    cell.fill = header_fill
-                    cell.font = header_font
-                    cell.alignment = Alignment(horizontal='center', vertical='center')
-            
-            # Column width auto-adjust
-            for column in ws.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                ws.column_dimensions[column_letter].width = min(max_length + 2, 50)
-        
-        # Save
-        workbook.save(filename)
+    sheets = [
+        (sheet_name, df, index)
+        for sheet_name, df, index in (
+            ('Sensitivity', sensitivity_df, False),
+            ('Vol Stress', volatility_stress_df, False),
+            ('Rate Stress', rate_stress_df, False),
+            ('Combined Stress', combined_stress_df, True),
+        )
+        if df is not None
+    ]
+    _write_excel_sheets(filename, sheets, write_only=write_only)
     
     print(f"✅ Analysis exported to {filename}")
 
 
+def export_results(results: Dict, path: str, fmt: str = 'parquet') -> Dict[str, str]:
+    """
+    Export every DataFrame in a result bundle for machine consumers.
+
+    Works on any dict of results, e.g. the output of ``run_full_analysis``;
+    non-DataFrame entries (timings, base Greeks) are skipped. Named indexes
+    such as the combined stress grid's 'Volatility' are kept as columns.
+
+    Parameters
+    ----------
+    results : Dict
+        Result bundle, name -> DataFrame
+    path : str
+        Output directory (created if missing); one file per DataFrame
+    fmt : str
+        'parquet' or 'arrow' (Arrow IPC file format)
+
+    Returns
+    -------
+    Dict[str, str]
+        Written file path per result name
+
+    Raises
+    ------
+    ImportError
+        If pyarrow not installed
+
+    Example
+    -------
+    >>> results = run_full_analysis(S0=0.035, K=0.040, T=1.0, r=0.025, sigma=0.42)
+    >>> files = export_results(results, 'taiwan_analysis', fmt='arrow')
+    """
+    if fmt not in ('parquet', 'arrow'):
+        raise ValueError(f"Unknown export format: {fmt}")
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("pyarrow required for Parquet/Arrow export. Install with: pip install pyarrow")
+
+    out_dir = Path(path)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    written = {}
+    for name, df in results.items():
+        if not isinstance(df, pd.DataFrame):
+            continue
+        table = pa.Table.from_pandas(df)
+        target = out_dir / f"{name}.{fmt}"
+        if fmt == 'parquet':
+            pq.write_table(table, target)
+        else:
+            with pa.ipc.new_file(target, table.schema) as writer:
+                writer.write_table(table)
+        written[name] = str(target)
+
+    return written
+
+
+# ============================================================================
+# TASK GRAPH
+# ============================================================================
+
+def _timed_call(func: Callable, kwargs: Dict) -> Tuple[object, float]:
+    """Run one task and return (result, elapsed seconds); executes in workers."""
+    start = time.perf_counter()
+    result = func(**kwargs)
+    return result, time.perf_counter() - start
+
+
+def _base_greeks(S0: float, K: float, T: float, r: float, sigma: float) -> Dict[str, float]:
+    """Base price and Greeks, shared by the sections that need them."""
+    return GreeksCalculator(S0=S0, K=K, T=T, r=r, sigma=sigma).compute_all_greeks()
+
+
+def _export_bundle(path: str, fmt: str, **frames) -> Dict[str, str]:
+    """Task-graph adapter: upstream frames arrive as keyword arguments."""
+    return export_results(frames, path, fmt=fmt)
+
+
+def _run_task_graph(graph: Dict[str, Tuple[Callable, Dict, Dict[str, str]]],
+                    parallel: bool = True,
+                    max_workers: Optional[int] = None) -> Tuple[Dict, Dict[str, float]]:
+    """
+    Execute a task graph, running every task as soon as its inputs are ready.
+
+    Parameters
+    ----------
+    graph : Dict[str, Tuple[Callable, Dict, Dict[str, str]]]
+        name -> (function, keyword arguments, {kwarg name: upstream task name}).
+        Functions must be module-level so they can be sent to worker processes.
+    parallel : bool
+        Run ready tasks concurrently in a process pool (default: True)
+    max_workers : int, optional
+        Pool size (default: number of CPUs)
+
+    Returns
+    -------
+    Tuple[Dict, Dict[str, float]]
+        Results by task name, and seconds spent inside each task
+    """
+    for name, (_, _, deps) in graph.items():
+        missing = set(deps.values()) - set(graph)
+        if missing:
+            raise ValueError(f"Task '{name}' depends on unknown task(s): {sorted(missing)}")
+
+    results: Dict = {}
+    timings: Dict[str, float] = {}
+    pending = dict(graph)
+
+    def ready_tasks():
+        return [name for name, (_, _, deps) in pending.items()
+                if all(dep in results for dep in deps.values())]
+
+    def task_kwargs(name):
+        _, kwargs, deps = graph[name]
+        return {**kwargs, **{arg: results[dep] for arg, dep in deps.items()}}
+
+    if not parallel:
+        while pending:
+            ready = ready_tasks()
+            if not ready:
+                raise ValueError(f"Task graph has a cycle among: {sorted(pending)}")
+            for name in ready:
+                results[name], timings[name] = _timed_call(pending.pop(name)[0], task_kwargs(name))
+        return results, timings
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        running = {}
+        while pending or running:
+            for name in ready_tasks():
+                func = pending.pop(name)[0]
+                running[pool.submit(_timed_call, func, task_kwargs(name))] = name
+            if not running:
+                raise ValueError(f"Task graph has a cycle among: {sorted(pending)}")
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name], timings[name] = future.result()
+
+    return results, timings
+
+
 # Convenience function: run all analyses
 def run_full_analysis(S0: float, K: float, T: float, r: float, sigma: float,
                       location: str = "Location",
-                      export_file: Optional[str] = None) -> Dict:
+                      export_file: Optional[str] = None,
+                      export_format: str = 'excel',
+                      scenarios: Optional[List[Dict[str, float]]] = None,
+                      parallel: bool = True,
+                      max_workers: Optional[int] = None) -> Dict:
     """
     Run comprehensive sensitivity and stress test analysis.
+
+    The sections are independent, so they run as a small task graph: the
+    base price and Greeks are computed once and shared, the pricing
+    sections run concurrently in a process pool, and the Excel export runs
+    once they have finished. Wall time is roughly that of the slowest
+    section rather than the sum of all of them.
     
     Parameters
     ----------
@@ -405,12 +646,22 @@ def run_full_analysis(S0: float, K: float, T: float, r: float, sigma: float,
     location : str
         Location name for context (default: "Location")
     export_file : str, optional
-        Excel filename to export results
+        Excel filename, or output directory for 'parquet' / 'arrow'
+    export_format : str
+        'excel', 'excel_write_only' (streamed), 'parquet' or 'arrow'
+    scenarios : List[Dict], optional
+        Scenario dicts for ``scenario_comparison`` (section skipped if None)
+    parallel : bool
+        Run independent sections in worker processes (default: True)
+    max_workers : int, optional
+        Process pool size (default: number of CPUs)
     
     Returns
     -------
     Dict
-        Contains: sensitivity_table, vol_stress, rate_stress, combined_stress DataFrames
+        Contains: base_greeks, sensitivity_table, vol_stress, rate_stress,
+        combined_stress (and scenario_comparison if requested) results, plus
+        'timings' (seconds per section) and 'wall_time' (seconds overall)
     
     Example
     -------
@@ -420,29 +671,42 @@ def run_full_analysis(S0: float, K: float, T: float, r: float, sigma: float,
     ...     export_file='taiwan_analysis.xlsx'
     ... )
     >>> print(results['sensitivity_table'])
+    >>> print(results['timings'])
     """
     print(f"Running full analysis for {location}...")
-    
-    sensitivity_df = sensitivity_table(S0=S0, K=K, T=T, r=r, sigma=sigma)
-    vol_stress_df = stress_test_volatility(S0=S0, K=K, T=T, r=r)
-    rate_stress_df = stress_test_rates(S0=S0, K=K, T=T, sigma=sigma)
-    combined_stress_df = combined_stress_test(S0=S0, K=K, T=T)
-    
-    if export_file:
-        export_to_excel(export_file,
-                       sensitivity_df=sensitivity_df,
-                       volatility_stress_df=vol_stress_df,
-                       rate_stress_df=rate_stress_df,
-                       combined_stress_df=combined_stress_df)
-    
+    start = time.perf_counter()
+
+    graph = {
+        'base_greeks': (_base_greeks, dict(S0=S0, K=K, T=T, r=r, sigma=sigma), {}),
+        'sensitivity_table': (sensitivity_table, dict(S0=S0, K=K, T=T, r=r, sigma=sigma),
+                              {'base_greeks': 'base_greeks'}),
+        'vol_stress': (stress_test_volatility, dict(S0=S0, K=K, T=T, r=r), {}),
+        'rate_stress': (stress_test_rates, dict(S0=S0, K=K, T=T, sigma=sigma), {}),
+        'combined_stress': (combined_stress_test, dict(S0=S0, K=K, T=T), {}),
+    }
+    if scenarios is not None:
+        graph['scenario_comparison'] = (scenario_comparison, dict(scenarios=scenarios, T=T, r=r), {})
+    if export_file and export_format in ('excel', 'excel_write_only'):
+        graph['export'] = (export_to_excel, dict(filename=export_file,
+                                                 write_only=export_format == 'excel_write_only'), {
+            'sensitivity_df': 'sensitivity_table',
+            'volatility_stress_df': 'vol_stress',
+            'rate_stress_df': 'rate_stress',
+            'combined_stress_df': 'combined_stress',
+        })
+    elif export_file:
+        frames = [name for name in graph if name != 'base_greeks']
+        graph['export'] = (_export_bundle, dict(path=export_file, fmt=export_format),
+                           {name: name for name in frames})
+
+    results, timings = _run_task_graph(graph, parallel=parallel, max_workers=max_workers)
+    results.pop('export', None)
+    results['timings'] = timings
+    results['wall_time'] = time.perf_counter() - start
+
     print("✅ Analysis complete")
     
-    return {
-        'sensitivity_table': sensitivity_df,
-        'vol_stress': vol_stress_df,
-        'rate_stress': rate_stress_df,
-        'combined_stress': combined_stress_df,
-    }
+    return results
 
 
 # ============================================================================
@@ -520,11 +784,31 @@ def scenario_comparison(scenarios: List[Dict[str, float]], T: float = 1.0,
     return df
 
 
+def _option_premium(S0: float, K: float, T: float, r: float, sigma: float,
+                    option_type: str = 'call', method: str = 'binomial',
+                    N: int = 100) -> float:
+    """Price a European call, or a put via put-call parity."""
+    if method == 'binomial':
+        tree = BinomialTree(S0=S0, K=K, T=T, r=r, sigma=sigma, N=N, payoff_type='call')
+        call_price = tree.price()
+    else:
+        mc = MonteCarloSimulator(S0=S0, K=K, T=T, r=r, sigma=sigma, payoff_type='call')
+        call_price = mc.price()
+    if option_type == 'put':
+        return call_price - S0 + K * np.exp(-r * T)
+    return call_price
+
+
 def break_even_analysis(S0: float, K: float, T: float, r: float, sigma: float,
                         option_price: Optional[float] = None,
-                        method: str = 'binomial', N: int = 100) -> Dict:
+                        method: str = 'binomial', N: int = 100,
+                        position: str = 'long_call',
+                        legs: Optional[List[Dict]] = None) -> Dict:
     """
-    Calculate break-even spot price for option buyer.
+    Calculate break-even spot price(s) for an option position or strategy.
+    
+    Break-even points are solved in closed form from the piecewise-linear
+    expiry P&L (see ``payoffs.break_even_points``).
     
     Parameters
     ----------
@@ -544,11 +828,16 @@ def break_even_analysis(S0: float, K: float, T: float, r: float, sigma: float,
         'binomial' or 'monte_carlo'
     N : int
         Binomial steps
+    position : str
+        'long_call', 'short_call', 'long_put', 'short_put' (ignored if legs given)
+    legs : List[Dict], optional
+        Multi-leg strategy (see ``payoffs``); overrides K/position/option_price
     
     Returns
     -------
     Dict
-        Contains: break_even_spot, profit_at_current, max_loss, intrinsic_value
+        Contains: break_even_spot, break_even_points, profit_at_current,
+        max_loss, intrinsic_value
     
     Example
     -------
@@ -556,38 +845,38 @@ def break_even_analysis(S0: float, K: float, T: float, r: float, sigma: float,
     >>> print(f"Break-even: ${be['break_even_spot']:.6f}/kWh")
     >>> print(f"Max loss: ${be['max_loss']:.6f}/kWh")
     """
-    # Compute option price if not provided
-    if option_price is None:
-        if method == 'binomial':
-            tree = BinomialTree(S0=S0, K=K, T=T, r=r, sigma=sigma, N=N, payoff_type='call')
-            option_price = tree.price()
-        else:
-            mc = MonteCarloSimulator(S0=S0, K=K, T=T, r=r, sigma=sigma, payoff_type='call')
-            option_price = mc.price()
+    if legs is None:
+        option_type = payoffs.POSITIONS.get(position, ('call', 1.0))[0]
+        if option_price is None:
+            option_price = _option_premium(S0, K, T, r, sigma, option_type, method, N)
+        legs = payoffs.position_legs(position, K, option_price)
+    premium = payoffs.net_premium(legs)
     
-    # Break-even: K + premium
-    break_even = K + option_price
+    # Exact roots of the piecewise-linear expiry P&L
+    points = payoffs.break_even_points(legs)
+    break_even = float(points[0]) if points.size else float('nan')
     
-    # Current P&L
-    intrinsic = max(S0 - K, 0)
-    current_pnl = intrinsic - option_price
+    # Extremes: evaluate at the knots, then account for the unbounded right tail
+    knots = np.unique(np.concatenate(([0.0, S0], [leg['K'] for leg in legs])))
+    knot_pnl = payoffs.strategy_pnl(knots, legs)
+    tail_slope = payoffs.tail_slope(legs)
+    max_profit = float('inf') if tail_slope > 0 else float(knot_pnl.max())
+    max_loss = float('-inf') if tail_slope < 0 else float(knot_pnl.min())
     
-    # Max loss = premium paid (if S0 never rises above K)
-    max_loss = -option_price
-    
-    # Max profit = unlimited (call)
-    max_profit = float('inf')
+    intrinsic = float(payoffs.strategy_payoff(S0, legs))
+    current_pnl = intrinsic - premium
     
     return {
         'break_even_spot': break_even,
+        'break_even_points': points.tolist(),
         'current_spot': S0,
         'strike': K,
-        'option_premium': option_price,
+        'option_premium': premium,
         'current_profit_loss': current_pnl,
         'intrinsic_value': intrinsic,
         'max_loss': max_loss,
         'max_profit': max_profit,
-        'profit_margin': (current_pnl / option_price * 100) if option_price > 0 else 0,
+        'profit_margin': (current_pnl / abs(premium) * 100) if premium != 0 else 0,
     }
 
 
@@ -652,10 +941,14 @@ def pnl_calculator(S0: float, K: float, T: float, r: float, sigma: float,
                    spot_range: Optional[List[float]] = None,
                    option_price: Optional[float] = None,
                    position: str = 'long_call',
-                   method: str = 'binomial', N: int = 100) -> pd.DataFrame:
+                   method: str = 'binomial', N: int = 100,
+                   legs: Optional[List[Dict]] = None) -> pd.DataFrame:
     """
     Calculate profit/loss at different spot prices at expiry.
     
+    The whole spot grid is evaluated in one vectorized kernel call, so
+    thousands of points cost about the same as a handful.
+    
     Parameters
     ----------
     S0 : float
@@ -671,18 +964,21 @@ def pnl_calculator(S0: float, K: float, T: float, r: float, sigma: float,
     spot_range : List[float], optional
         Range of spot prices at expiry (default: -30% to +30%)
     option_price : float, optional
-        Premium paid (default: computed)
+        Premium paid (default: computed; puts priced via put-call parity)
     position : str
         'long_call', 'short_call', 'long_put', 'short_put'
     method : str
         'binomial' or 'monte_carlo'
     N : int
         Binomial steps
+    legs : List[Dict], optional
+        Multi-leg strategy (see ``payoffs``); overrides K/position/option_price
     
     Returns
     -------
     pd.DataFrame
-        Columns: Spot at Expiry, Intrinsic Value, Premium Cost, Net P&L, Profit/Loss
+        Single positions: Spot at Expiry, Call/Put Intrinsic, Premium, Net P&L, Profit/Loss
+        Strategies: Spot at Expiry, Payoff, Net Premium, Net P&L, Profit/Loss
     
     Example
     -------
@@ -693,52 +989,42 @@ def pnl_calculator(S0: float, K: float, T: float, r: float, sigma: float,
     if spot_range is None:
         spot_range = np.linspace(S0 * 0.7, S0 * 1.3, 21)
     else:
-        spot_range = np.array(spot_range)
-    
-    # Compute option price if not provided
-    if option_price is None:
-        if method == 'binomial':
-            tree = BinomialTree(S0=S0, K=K, T=T, r=r, sigma=sigma, N=N, payoff_type='call')
-            option_price = tree.price()
-        else:
-            mc = MonteCarloSimulator(S0=S0, K=K, T=T, r=r, sigma=sigma, payoff_type='call')
-            option_price = mc.price()
+        spot_range = np.asarray(spot_range, dtype=float)
     
-    results = []
-    
-    for spot_t in spot_range:
-        # Intrinsic values at expiry
-        call_intrinsic = max(spot_t - K, 0)
-        put_intrinsic = max(K - spot_t, 0)
-        
-        # P&L based on position
-        if position == 'long_call':
-            pnl = call_intrinsic - option_price
-        elif position == 'short_call':
-            pnl = option_price - call_intrinsic
-        elif position == 'long_put':
-            pnl = put_intrinsic - option_price
-        elif position == 'short_put':
-            pnl = option_price - put_intrinsic
-        else:
-            raise ValueError(f"Unknown position: {position}")
-        
-        status = "Profit" if pnl > 0 else ("Loss" if pnl < 0 else "Breakeven")
-        
-        results.append({
-            'Spot at Expiry ($/kWh)': spot_t,
-            'Call Intrinsic ($/kWh)': call_intrinsic,
-            'Put Intrinsic ($/kWh)': put_intrinsic,
-            'Premium ($/kWh)': option_price,
+    if legs is not None:
+        payoff = payoffs.strategy_payoff(spot_range, legs)
+        premium = payoffs.net_premium(legs)
+        pnl = payoff - premium
+        return pd.DataFrame({
+            'Spot at Expiry ($/kWh)': spot_range,
+            'Payoff ($/kWh)': payoff,
+            'Net Premium ($/kWh)': premium,
             'Net P&L ($/kWh)': pnl,
-            'Profit/Loss': status,
+            'Profit/Loss': _pnl_status(pnl),
         })
     
-    df = pd.DataFrame(results)
-    # Simplify columns for display
-    if position.startswith('long_call') or position.startswith('short_call'):
-        df = df[['Spot at Expiry ($/kWh)', 'Call Intrinsic ($/kWh)', 'Premium ($/kWh)', 'Net P&L ($/kWh)', 'Profit/Loss']]
-    else:
-        df = df[['Spot at Expiry ($/kWh)', 'Put Intrinsic ($/kWh)', 'Premium ($/kWh)', 'Net P&L ($/kWh)', 'Profit/Loss']]
+    if position not in payoffs.POSITIONS:
+        raise ValueError(f"Unknown position: {position}")
+    option_type = payoffs.POSITIONS[position][0]
     
-    return df
+    # Compute option price if not provided
+    if option_price is None:
+        option_price = _option_premium(S0, K, T, r, sigma, option_type, method, N)
+    
+    legs = payoffs.position_legs(position, K, option_price)
+    pnl = payoffs.strategy_pnl(spot_range, legs)
+    intrinsic_label = 'Call Intrinsic ($/kWh)' if option_type == 'call' else 'Put Intrinsic ($/kWh)'
+    intrinsic = np.abs(payoffs.strategy_payoff(spot_range, legs))
+    
+    return pd.DataFrame({
+        'Spot at Expiry ($/kWh)': spot_range,
+        intrinsic_label: intrinsic,
+        'Premium ($/kWh)': option_price,
+        'Net P&L ($/kWh)': pnl,
+        'Profit/Loss': _pnl_status(pnl),
+    })
+
+
+def _pnl_status(pnl: np.ndarray) -> np.ndarray:
+    """Vectorized Profit/Loss/Breakeven labels."""
+    return np.select([pnl > 0, pnl < 0], ["Profit", "Loss"], default="Breakeven")
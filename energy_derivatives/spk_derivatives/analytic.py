@@ -0,0 +1,100 @@
+"""
+Closed-Form (Black-Scholes) Kernels
+===================================
+
+Vectorized closed-form prices and Greeks for the two payoff types used
+throughout the library, under the same risk-neutral GBM dynamics as
+``BinomialTree`` and ``MonteCarloSimulator``:
+
+- 'call': European call, max(S_T - K, 0)
+- 'redeemable': direct claim on S_T (price S, delta 1, no vega)
+
+Every function broadcasts its inputs, so a whole path set, a spot grid or
+a batch of contracts is evaluated in a single NumPy expression. These are
+the batch building blocks for hedging, implied volatility and screening.
+
+Key Functions:
+-----------
+bs_price(): Option value
+bs_delta(): dV/dS
+bs_gamma(): d2V/dS2
+bs_vega(): dV/dsigma (per unit sigma, not per 1%)
+"""
+
+import numpy as np
+from scipy.special import ndtr
+
+PAYOFF_TYPES = ('call', 'redeemable')
+
+
+def _check_payoff(payoff_type: str):
+    if payoff_type not in PAYOFF_TYPES:
+        raise ValueError(f"Unknown payoff_type: {payoff_type}")
+
+
+def _d1_d2(S, K, T, r, sigma):
+    """d1, d2 with expired (T <= 0) entries mapped to +/-inf by moneyness."""
+    S, K, T, r, sigma = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (S, K, T, r, sigma)))
+    live = (T > 0) & (sigma > 0)
+    safe_T = np.where(live, T, 1.0)
+    safe_sigma = np.where(live, sigma, 1.0)
+    sqrt_t = np.sqrt(safe_T)
+    vol_sqrt_t = safe_sigma * sqrt_t
+    with np.errstate(divide='ignore'):
+        d1 = (np.log(S / K) + (r + 0.5 * safe_sigma ** 2) * safe_T) / vol_sqrt_t
+    d2 = d1 - vol_sqrt_t
+    expired = np.where(S > K, np.inf, -np.inf)
+    return np.where(live, d1, expired), np.where(live, d2, expired), live, sqrt_t, vol_sqrt_t
+
+
+def bs_price(S, K, T, r, sigma, payoff_type: str = 'call') -> np.ndarray:
+    """
+    Closed-form price.
+
+    Parameters
+    ----------
+    S, K, T, r, sigma : array_like
+        Spot, strike, time to maturity (years), rate, volatility (broadcast)
+    payoff_type : str
+        'call' or 'redeemable'
+
+    Returns
+    -------
+    np.ndarray
+        Prices
+    """
+    _check_payoff(payoff_type)
+    if payoff_type == 'redeemable':
+        return np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (S, K, T, r, sigma)))[0].copy()
+    d1, d2, _, _, _ = _d1_d2(S, K, T, r, sigma)
+    T_pos = np.maximum(np.asarray(T, dtype=float), 0.0)
+    return S * ndtr(d1) - K * np.exp(-np.asarray(r, dtype=float) * T_pos) * ndtr(d2)
+
+
+def bs_delta(S, K, T, r, sigma, payoff_type: str = 'call') -> np.ndarray:
+    """Closed-form delta (at expiry: 1 if S > K else 0 for calls)."""
+    _check_payoff(payoff_type)
+    d1, _, _, _, _ = _d1_d2(S, K, T, r, sigma)
+    if payoff_type == 'redeemable':
+        return np.ones_like(d1)
+    return ndtr(d1)
+
+
+def bs_gamma(S, K, T, r, sigma, payoff_type: str = 'call') -> np.ndarray:
+    """Closed-form gamma (zero at expiry and for redeemable claims)."""
+    _check_payoff(payoff_type)
+    d1, _, live, _, vol_sqrt_t = _d1_d2(S, K, T, r, sigma)
+    if payoff_type == 'redeemable':
+        return np.zeros_like(d1)
+    pdf = np.exp(-0.5 * np.where(live, d1, 0.0) ** 2) / np.sqrt(2 * np.pi)
+    return np.where(live, pdf / (np.asarray(S, dtype=float) * vol_sqrt_t), 0.0)
+
+
+def bs_vega(S, K, T, r, sigma, payoff_type: str = 'call') -> np.ndarray:
+    """Closed-form vega per unit volatility (multiply by 0.01 for per-1%)."""
+    _check_payoff(payoff_type)
+    d1, _, live, sqrt_t, _ = _d1_d2(S, K, T, r, sigma)
+    if payoff_type == 'redeemable':
+        return np.zeros_like(d1)
+    pdf = np.exp(-0.5 * np.where(live, d1, 0.0) ** 2) / np.sqrt(2 * np.pi)
+    return np.where(live, np.asarray(S, dtype=float) * pdf * sqrt_t, 0.0)
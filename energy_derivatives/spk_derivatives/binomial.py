@@ -14,6 +14,7 @@ Key Methods:
 price_call_option(): Price call-style redeemable claims
 price_european_claim(): Price direct redeemable claims
 compute_convergence(): Show convergence as steps increase
+price_batch(): Price many contracts at once on stacked lattices
 """
 
 import numpy as np
@@ -21,6 +22,8 @@ import pandas as pd
 from typing import Tuple, Dict, List
 import warnings
 
+from .profiling import phase
+
 
 class PayoffFunction:
     """
@@ -159,10 +162,8 @@ class BinomialTree:
         np.ndarray
             Array of terminal prices (length N+1)
         """
-        terminal_prices = np.zeros(self.N + 1)
-        for i in range(self.N + 1):
-            terminal_prices[i] = self.S0 * (self.u ** (self.N - i)) * (self.d ** i)
-        return terminal_prices
+        i = np.arange(self.N + 1)
+        return self.S0 * (self.u ** (self.N - i)) * (self.d ** i)
     
     def _compute_payoffs(self, terminal_prices: np.ndarray) -> np.ndarray:
         """
@@ -178,14 +179,10 @@ class BinomialTree:
         np.ndarray
             Payoff values at maturity
         """
-        payoffs = np.zeros(len(terminal_prices))
-        
         if self.payoff_type == 'call':
-            for i, price in enumerate(terminal_prices):
-                payoffs[i] = PayoffFunction.european_call(price, self.K)
+            payoffs = np.maximum(terminal_prices - self.K, 0.0)
         elif self.payoff_type == 'redeemable':
-            for i, price in enumerate(terminal_prices):
-                payoffs[i] = PayoffFunction.redeemable_claim(price, self.K)
+            payoffs = terminal_prices.astype(float)
         else:
             raise ValueError(f"Unknown payoff_type: {self.payoff_type}")
         
@@ -209,17 +206,10 @@ class BinomialTree:
         values = payoffs.copy()
         discount = np.exp(-self.r * self.dt)
         
-        # Backward iterate through time steps
+        # Backward iterate through time steps; each step rolls back all nodes
+        # at once as the discounted risk-neutral expectation of their children
         for step in range(self.N - 1, -1, -1):
-            # Number of nodes at this step
-            nodes = step + 1
-            new_values = np.zeros(nodes)
-            
-            for i in range(nodes):
-                # Value is discounted expected value under risk-neutral measure
-                new_values[i] = discount * (self.q * values[i] + (1 - self.q) * values[i + 1])
-            
-            values = new_values
+            values = discount * (self.q * values[:-1] + (1 - self.q) * values[1:])
         
         option_price = values[0]
         return values, option_price
@@ -233,9 +223,12 @@ class BinomialTree:
         float
             Arbitrage-free option price
         """
-        terminal_prices = self._generate_terminal_prices()
-        payoffs = self._compute_payoffs(terminal_prices)
-        _, option_price = self._backward_induction(payoffs)
+        with phase('binomial', 'build'):
+            terminal_prices = self._generate_terminal_prices()
+        with phase('binomial', 'payoff'):
+            payoffs = self._compute_payoffs(terminal_prices)
+        with phase('binomial', 'rollback'):
+            _, option_price = self._backward_induction(payoffs)
         return option_price
     
     def price_with_tree(self) -> Tuple[float, Dict]:
@@ -369,3 +362,71 @@ def price_energy_claim(S0: float, T: float, r: float, sigma: float,
     """
     tree = BinomialTree(S0, K=0, T=T, r=r, sigma=sigma, N=N, payoff_type='redeemable')
     return tree.price()
+
+
+def price_batch(S0, K, T, r, sigma, N: int = 100,
+                payoff_type: str = 'call') -> np.ndarray:
+    """
+    Price a batch of contracts on stacked binomial lattices.
+    
+    All inputs broadcast to a common batch shape; the lattices share the
+    step count N and are rolled back together, one vectorized operation
+    per time step for the whole batch.
+    
+    Parameters
+    ----------
+    S0, K, T, r, sigma : array_like
+        Contract parameters (broadcast against each other)
+    N : int
+        Tree steps (shared by the batch)
+    payoff_type : str
+        'call' or 'redeemable'
+        
+    Returns
+    -------
+    np.ndarray
+        Prices with the broadcast batch shape
+    """
+    S0, K, T, r, sigma = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (S0, K, T, r, sigma))
+    )
+    shape = S0.shape
+    S0, K, T, r, sigma = (x.reshape(-1, 1) for x in (S0, K, T, r, sigma))
+    
+    if np.any(S0 <= 0):
+        raise ValueError("S0 must be positive")
+    if np.any(T <= 0):
+        raise ValueError("T must be positive")
+    if np.any(sigma <= 0):
+        raise ValueError("sigma must be positive")
+    if N < 1:
+        raise ValueError("N must be at least 1")
+    
+    dt = T / N
+    u = np.exp(sigma * np.sqrt(dt))
+    d = 1 / u
+    q = (np.exp(r * dt) - d) / (u - d)
+    if np.any((q < 0) | (q > 1)):
+        bad = int(np.sum((q < 0) | (q > 1)))
+        raise ValueError(
+            f"Invalid parameters: risk-neutral probability outside [0,1] for {bad} "
+            f"contract(s). Consider adjusting sigma or r"
+        )
+    
+    with phase('binomial', 'build'):
+        i = np.arange(N + 1)
+        terminal_prices = S0 * u ** (N - i) * d ** i
+    with phase('binomial', 'payoff'):
+        if payoff_type == 'call':
+            values = np.maximum(terminal_prices - K, 0.0)
+        elif payoff_type == 'redeemable':
+            values = terminal_prices
+        else:
+            raise ValueError(f"Unknown payoff_type: {payoff_type}")
+    
+    with phase('binomial', 'rollback'):
+        discount = np.exp(-r * dt)
+        for _ in range(N):
+            values = discount * (q * values[:, :-1] + (1 - q) * values[:, 1:])
+    
+    return values[:, 0].reshape(shape)
@@ -0,0 +1,205 @@
+"""
+Concurrent Multi-Site NASA POWER Fetching
+=========================================
+
+Loads many (location, date range, energy type) jobs at once, e.g. a
+nightly refresh of a few hundred sites.
+
+Jobs run on a thread pool and share one pooled ``requests.Session``, so
+connections to the POWER host are reused instead of re-opened per site.
+Two shared limits keep a large batch well-behaved:
+
+- per-host concurrency: at most ``per_host_limit`` requests in flight to
+  any one host (the pool size matches, so no connection is discarded)
+- retry budget: a global cap on retries across the whole batch, so an
+  outage fails fast instead of every job sleeping through its backoff
+
+Each job goes through ``nasa_power.load_daily``, so the shared columnar
+cache and gap-only fetching apply: a warm nightly run downloads one day
+per site.
+
+Key Functions:
+-----------
+fetch_many(): Run a batch of fetch jobs concurrently
+bulk_summary(): One-row-per-job status table
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import nasa_power
+from .cache import ColumnarCache
+from .data_loader_nasa import SOLAR_VARIABLES, clean_solar_data
+from .data_loader_wind import WIND_VARIABLES, clean_wind_data
+from .data_loader_hydro import HYDRO_VARIABLES, clean_hydro_data
+
+# Energy type -> (POWER parameter set, cleaning function)
+ENERGY_TYPES: Dict[str, Tuple[List[str], Callable[[pd.DataFrame], pd.DataFrame]]] = {
+    'solar': (SOLAR_VARIABLES, clean_solar_data),
+    'wind': (WIND_VARIABLES, clean_wind_data),
+    'hydro': (HYDRO_VARIABLES, clean_hydro_data),
+}
+
+
+class HostLimitedSession:
+    """
+    Pooled session that caps concurrent requests per host.
+
+    Exposes ``get`` with the ``requests`` signature so it can be passed
+    wherever ``nasa_power`` accepts a session.
+
+    Parameters
+    ----------
+    per_host_limit : int
+        Maximum in-flight requests to any single host
+    """
+
+    def __init__(self, per_host_limit: int = 4):
+        if per_host_limit < 1:
+            raise ValueError("per_host_limit must be at least 1")
+        self.per_host_limit = per_host_limit
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=per_host_limit)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _semaphore(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._semaphores[host]
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        with self._semaphore(url):
+            return self.session.get(url, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def _job_window(job: Dict) -> Tuple[str, str]:
+    """Start/end dates of a job; integer years expand to whole years."""
+    start, end = job['start'], job['end']
+    if isinstance(start, int):
+        start = f"{start}-01-01"
+    if isinstance(end, int):
+        end = f"{end}-12-31"
+    return str(start), str(end)
+
+
+def fetch_many(jobs: Sequence[Dict],
+               max_workers: int = 16,
+               per_host_limit: int = 4,
+               retry_budget: int = 20,
+               cache: bool = True,
+               store: Optional[ColumnarCache] = None,
+               base_url: Optional[str] = None) -> List[Dict]:
+    """
+    Fetch many sites concurrently.
+
+    Parameters
+    ----------
+    jobs : Sequence[Dict]
+        Job dicts: {'lat': float, 'lon': float, 'start': year or date,
+        'end': year or date, 'energy_type': 'solar' | 'wind' | 'hydro',
+        'name': str (optional), 'variables': extra POWER parameters
+        (optional, e.g. ['T2M'] for a power model that needs them)}
+    max_workers : int
+        Worker threads (jobs in progress at once)
+    per_host_limit : int
+        Maximum concurrent requests per host
+    retry_budget : int
+        Total retries allowed across the whole batch
+    cache : bool
+        Use the shared columnar cache and fetch only missing days
+    store : ColumnarCache, optional
+        Cache to use (default: ``cache.default_cache()``)
+    base_url : str, optional
+        Daily point endpoint (e.g. a local stand-in server)
+
+    Returns
+    -------
+    List[Dict]
+        One result per job, in job order: the job fields plus 'data'
+        (DataFrame or None), 'error' (str or None) and 'seconds'
+
+    Example
+    -------
+    >>> jobs = [{'lat': 24.99, 'lon': 121.30, 'start': 2020, 'end': 2024, 'energy_type': 'solar'},
+    ...         {'lat': 57.05, 'lon': 9.92, 'start': 2020, 'end': 2024, 'energy_type': 'wind'}]
+    >>> results = fetch_many(jobs)
+    >>> print(bulk_summary(results))
+    """
+    for job in jobs:
+        if job.get('energy_type') not in ENERGY_TYPES:
+            raise ValueError(
+                f"Unknown energy_type: {job.get('energy_type')}. "
+                f"Choose from: {sorted(ENERGY_TYPES)}"
+            )
+
+    session = HostLimitedSession(per_host_limit)
+    budget = nasa_power.RetryBudget(retry_budget)
+
+    def run(job: Dict) -> Dict:
+        variables, clean = ENERGY_TYPES[job['energy_type']]
+        variables = variables + [v for v in job.get('variables', ()) if v not in variables]
+        start, end = _job_window(job)
+        result = dict(job, data=None, error=None)
+        began = time.perf_counter()
+        try:
+            result['data'] = nasa_power.load_daily(
+                variables, job['lat'], job['lon'], start, end,
+                clean=clean, store=store, cache=cache,
+                session=session, retry_budget=budget, base_url=base_url,
+            )
+        except (ConnectionError, ValueError) as exc:
+            result['error'] = str(exc)
+        result['seconds'] = time.perf_counter() - began
+        return result
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(run, jobs))
+    finally:
+        session.close()
+
+    return results
+
+
+def bulk_summary(results: Sequence[Dict]) -> pd.DataFrame:
+    """
+    Status table for a ``fetch_many`` run.
+
+    Parameters
+    ----------
+    results : Sequence[Dict]
+        Output of ``fetch_many``
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns: name, energy_type, lat, lon, days, ok, error, seconds
+    """
+    rows = []
+    for r in results:
+        rows.append({
+            'name': r.get('name', f"{r['lat']},{r['lon']}"),
+            'energy_type': r['energy_type'],
+            'lat': r['lat'],
+            'lon': r['lon'],
+            'days': 0 if r['data'] is None else len(r['data']),
+            'ok': r['error'] is None,
+            'error': r['error'],
+            'seconds': r['seconds'],
+        })
+    return pd.DataFrame(rows)
@@ -0,0 +1,579 @@
+"""
+Columnar Cache for NASA POWER Time Series
+=========================================
+
+One on-disk cache shared by the solar, wind and hydro loaders, replacing
+their per-loader CSV files.
+
+Each series is stored once per (parameter set, location) as a columnar
+file with float32 columns and a DatetimeIndex, so loading it is a
+memory-mapped read instead of a CSV parse. Long intraday series are split
+into partitions (one entry per year, see ``hourly``) so that no single
+entry has to be loaded whole:
+
+- Feather (Arrow IPC, uncompressed) when pyarrow is installed
+- pandas pickle otherwise (still typed, no text parsing)
+
+A JSON manifest records, for every entry, the variables, the location, the
+date coverage actually requested from the API as a list of disjoint
+intervals (days dropped as invalid inside them are not "missing"), the file
+size, the last access time and optional caller metadata (e.g. the
+provenance of an ingested dataset, see ``data_loader.ingest_ceir_data``).
+``missing()`` reports which parts of a
+requested window are not covered, and ``put(..., merge=True)`` folds newly
+fetched gaps into the stored series, so extending or refreshing a window
+only downloads the new days.
+
+All file and manifest writes go through a temp file + ``os.replace`` so a
+crash never leaves a half-written entry, and the total size is bounded by
+evicting least-recently-used entries. Every read-modify-write of the
+manifest holds an exclusive lock on ``manifest.lock`` (fcntl, or msvcrt on
+Windows) as well as the in-process lock, so processes sharing the cache
+(executor lanes, job workers, bulk fetches) never lose each other's
+entries. Cache hits do not rewrite the manifest: access times are kept in
+memory and written with the next update, or at most every
+``ACCESS_FLUSH_SECONDS``.
+
+Key Classes:
+-----------
+ColumnarCache: Manifest-indexed, size-bounded LRU store of daily series
+
+Key Functions:
+-----------
+default_cache(): Shared cache instance used by the data loaders
+merge_ranges(): Union of date intervals
+missing_ranges(): Parts of a window not covered by a set of intervals
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - exercised only without pyarrow
+    pa = None
+    feather = None
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[1] / "data" / "cache" / "power"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512 MB
+MANIFEST_NAME = "manifest.json"
+LOCK_NAME = "manifest.lock"
+ACCESS_FLUSH_SECONDS = 30.0
+INDEX_NAME = "Date"
+ONE_DAY = pd.Timedelta(days=1)
+
+DateRange = Tuple[pd.Timestamp, pd.Timestamp]
+
+
+def _atomic_write(path: Path, write_fn) -> None:
+    """Write via ``write_fn(tmp_path)`` to a sibling temp file, then rename."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        write_fn(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _lock_file(fh) -> None:
+    if fcntl is not None:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+    else:  # pragma: no cover - Windows
+        fh.seek(0)
+        msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+
+
+def _unlock_file(fh) -> None:
+    if fcntl is not None:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+    else:  # pragma: no cover - Windows
+        fh.seek(0)
+        msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def merge_ranges(ranges: Sequence[Tuple]) -> List[DateRange]:
+    """
+    Union of inclusive daily date intervals.
+
+    Overlapping and adjacent intervals (one ending the day before the next
+    starts) are merged.
+
+    Parameters
+    ----------
+    ranges : Sequence[Tuple]
+        (start, end) pairs, date-like
+
+    Returns
+    -------
+    List[DateRange]
+        Sorted disjoint intervals
+    """
+    merged: List[List[pd.Timestamp]] = []
+    for start, end in sorted((pd.Timestamp(a), pd.Timestamp(b)) for a, b in ranges):
+        if start > end:
+            raise ValueError(f"Invalid date range: {start.date()} > {end.date()}")
+        if merged and start <= merged[-1][1] + ONE_DAY:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(a, b) for a, b in merged]
+
+
+def missing_ranges(covered: Sequence[Tuple], start, end) -> List[DateRange]:
+    """
+    Parts of [start, end] not covered by ``covered``.
+
+    Parameters
+    ----------
+    covered : Sequence[Tuple]
+        (start, end) intervals already available
+    start, end : date-like
+        Requested window (inclusive)
+
+    Returns
+    -------
+    List[DateRange]
+        Sorted gaps to fetch (empty if fully covered)
+
+    Example
+    -------
+    >>> missing_ranges([('2020-01-01', '2024-12-31')], '2019-07-01', '2025-01-10')
+    [(Timestamp('2019-07-01'), Timestamp('2019-12-31')),
+     (Timestamp('2025-01-01'), Timestamp('2025-01-10'))]
+    """
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    gaps = []
+    cursor = start
+    for a, b in merge_ranges(covered):
+        if b < cursor:
+            continue
+        if a > end:
+            break
+        if a > cursor:
+            gaps.append((cursor, a - ONE_DAY))
+        cursor = max(cursor, b + ONE_DAY)
+        if cursor > end:
+            break
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def _ranges_to_json(ranges: Sequence[DateRange]) -> List[List[str]]:
+    return [[a.strftime('%Y-%m-%d'), b.strftime('%Y-%m-%d')] for a, b in ranges]
+
+
+def _ranges_from_entry(entry: Dict) -> List[DateRange]:
+    return [(pd.Timestamp(a), pd.Timestamp(b)) for a, b in entry['coverage']]
+
+
+class ColumnarCache:
+    """
+    Manifest-indexed columnar store for daily NASA POWER series.
+
+    Parameters
+    ----------
+    root : str or Path, optional
+        Cache directory (default: energy_derivatives/data/cache/power)
+    max_bytes : int
+        Size bound; least-recently-used entries are evicted beyond it
+    fmt : str, optional
+        'feather' or 'pickle' (default: feather if pyarrow is installed)
+
+    Examples
+    --------
+    >>> cache = ColumnarCache()
+    >>> cache.put(['ALLSKY_SFC_SW_DWN'], 24.99, 121.30, df, '2020-01-01', '2024-12-31')
+    >>> df = cache.get(['ALLSKY_SFC_SW_DWN'], 24.99, 121.30, '2021-01-01', '2021-12-31')
+    """
+
+    def __init__(self, root=None, max_bytes: int = DEFAULT_MAX_BYTES, fmt: Optional[str] = None):
+        if fmt is None:
+            fmt = 'feather' if feather is not None else 'pickle'
+        if fmt not in ('feather', 'pickle'):
+            raise ValueError(f"Unknown cache format: {fmt}")
+        if fmt == 'feather' and feather is None:
+            raise ImportError("pyarrow required for Feather cache. Install with: pip install pyarrow")
+
+        self.root = Path(root) if root is not None else DEFAULT_CACHE_DIR
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_bytes)
+        self.fmt = fmt
+        self._lock = threading.RLock()
+        self._lock_fh = None
+        self._lock_depth = 0
+        self._access: Dict[str, float] = {}  # key -> last access not yet written
+        self._access_flushed = time.time()
+
+    # ------------------------------------------------------------------
+    # Keys and manifest
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def key(variables: Sequence[str], lat: float, lon: float,
+            partition: Optional[str] = None) -> str:
+        """
+        Entry key for a parameter set at a location (order-insensitive).
+
+        ``partition`` splits one series into separate entries, e.g. hourly
+        data stored per year ('hourly-2020').
+        """
+        key = f"{'-'.join(sorted(variables))}_{float(lat):.4f}_{float(lon):.4f}"
+        return key if partition is None else f"{key}@{partition}"
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / MANIFEST_NAME
+
+    def _read_manifest(self) -> Dict[str, Dict]:
+        """Manifest on disk, with this instance's unwritten access times applied."""
+        if not self.manifest_path.exists():
+            return {}
+        try:
+            manifest = json.loads(self.manifest_path.read_text())
+        except (OSError, ValueError) as exc:
+            warnings.warn(f"Cache manifest unreadable ({exc}); starting a new one")
+            return {}
+        for key, accessed in self._access.items():
+            if key in manifest:
+                manifest[key]['last_access'] = max(manifest[key]['last_access'], accessed)
+        return manifest
+
+    def _write_manifest(self, manifest: Dict[str, Dict]) -> None:
+        """Replace the manifest (callers hold ``_manifest_lock`` and read it under it)."""
+        self._access.clear()
+        self._access_flushed = time.time()
+
+        def write(tmp):
+            with open(tmp, 'w') as fh:
+                json.dump(manifest, fh, indent=1, sort_keys=True)
+        _atomic_write(self.manifest_path, write)
+
+    @contextmanager
+    def _manifest_lock(self):
+        """Hold the thread lock and the cross-process manifest lock (reentrant)."""
+        with self._lock:
+            if self._lock_depth == 0:
+                fh = open(self.root / LOCK_NAME, 'a+b')
+                try:
+                    _lock_file(fh)
+                except BaseException:
+                    fh.close()
+                    raise
+                self._lock_fh = fh
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0:
+                    fh, self._lock_fh = self._lock_fh, None
+                    try:
+                        _unlock_file(fh)
+                    finally:
+                        fh.close()
+
+    def flush_access(self) -> None:
+        """Write access times recorded by ``get`` since the last manifest write."""
+        with self._manifest_lock():
+            if self._access:
+                self._write_manifest(self._read_manifest())
+
+    def entries(self) -> Dict[str, Dict]:
+        """Copy of the manifest: key -> entry metadata."""
+        with self._lock:
+            return self._read_manifest()
+
+    def coverage(self, variables: Sequence[str], lat: float, lon: float,
+                 partition: Optional[str] = None) -> List[DateRange]:
+        """Disjoint date intervals covered by the cached series (empty if none)."""
+        entry = self.entries().get(self.key(variables, lat, lon, partition))
+        return [] if entry is None else _ranges_from_entry(entry)
+
+    def missing(self, variables: Sequence[str], lat: float, lon: float, start, end,
+                partition: Optional[str] = None) -> List[DateRange]:
+        """Gaps between the requested window and the cached coverage."""
+        return missing_ranges(self.coverage(variables, lat, lon, partition), start, end)
+
+    def entry(self, variables: Sequence[str], lat: float, lon: float,
+              partition: Optional[str] = None) -> Optional[Dict]:
+        """Manifest metadata of one entry (None if not cached)."""
+        return self.entries().get(self.key(variables, lat, lon, partition))
+
+    def data_version(self) -> str:
+        """
+        Fingerprint of the cached data.
+
+        Changes whenever an entry is written, merged, evicted or dropped,
+        but not on reads (access times are excluded), so it can key
+        results derived from the cache.
+        """
+        content = {
+            key: [entry['file'], entry['coverage'], entry['rows'], entry.get('written')]
+            for key, entry in self.entries().items()
+        }
+        payload = json.dumps(content, sort_keys=True).encode()
+        return hashlib.sha256(payload).hexdigest()[:16]
+
+    def total_bytes(self) -> int:
+        """Total size of all cached files."""
+        return sum(e['bytes'] for e in self.entries().values())
+
+    # ------------------------------------------------------------------
+    # File I/O
+    # ------------------------------------------------------------------
+
+    def _write_frame(self, df: pd.DataFrame, path: str, fmt: str) -> None:
+        if fmt == 'feather':
+            # Uncompressed so reads can memory-map the column buffers
+            feather.write_feather(df.reset_index(), path, compression='uncompressed')
+        else:
+            df.to_pickle(path)
+
+    def _read_frame(self, path: Path, fmt: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        if fmt == 'feather':
+            cols = None if columns is None else [INDEX_NAME] + list(columns)
+            table = feather.read_table(path, columns=cols, memory_map=True)
+            return table.to_pandas().set_index(INDEX_NAME)
+        df = pd.read_pickle(path)
+        return df if columns is None else df[list(columns)]
+
+    @staticmethod
+    def _normalize(df: pd.DataFrame, dtype=np.float32) -> pd.DataFrame:
+        """``dtype`` columns, sorted de-duplicated DatetimeIndex named 'Date' (last row wins)."""
+        df = df.copy()
+        df.index = pd.DatetimeIndex(pd.to_datetime(df.index), name=INDEX_NAME)
+        df = df[~df.index.duplicated(keep='last')].sort_index()
+        numeric = df.select_dtypes(include=[np.number]).columns
+        df[numeric] = df[numeric].astype(dtype)
+        return df
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, variables: Sequence[str], lat: float, lon: float,
+            start=None, end=None, columns: Optional[List[str]] = None,
+            partition: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """
+        Load a cached series if it covers [start, end].
+
+        Parameters
+        ----------
+        variables : Sequence[str]
+            NASA POWER parameter set the entry was fetched with
+        lat, lon : float
+            Location
+        start, end : date-like, optional
+            Requested window (default: the full cached coverage); must be
+            fully covered
+        columns : List[str], optional
+            Subset of columns to read
+        partition : str, optional
+            Entry partition (see ``key``)
+
+        Returns
+        -------
+        pd.DataFrame or None
+            Rows within [start, end] (whole days, so intraday rows of the
+            last day are included), or None on a miss / partial coverage
+        """
+        key = self.key(variables, lat, lon, partition)
+        with self._lock:
+            manifest = self._read_manifest()
+            entry = manifest.get(key)
+            if entry is None:
+                return None
+            covered = _ranges_from_entry(entry)
+            start = covered[0][0] if start is None else pd.Timestamp(start)
+            end = covered[-1][1] if end is None else pd.Timestamp(end)
+            if missing_ranges(covered, start, end):
+                return None
+
+            path = self.root / entry['file']
+            try:
+                df = self._read_frame(path, entry['format'], columns)
+            except Exception as exc:  # noqa: BLE001
+                warnings.warn(f"Cached entry {key} unusable ({exc}); dropping it")
+                with self._manifest_lock():
+                    manifest = self._read_manifest()
+                    # Another writer may have replaced it meanwhile
+                    if manifest.get(key, {}).get('written') == entry.get('written'):
+                        self._drop(manifest, key)
+                        self._write_manifest(manifest)
+                return None
+
+            self._access[key] = time.time()
+            if time.time() - self._access_flushed >= ACCESS_FLUSH_SECONDS:
+                self.flush_access()
+
+        return df[(df.index >= start) & (df.index < end + ONE_DAY)]
+
+    def put(self, variables: Sequence[str], lat: float, lon: float,
+            df: pd.DataFrame, start, end, merge: bool = False,
+            partition: Optional[str] = None, dtype=np.float32,
+            meta: Optional[Dict] = None) -> pd.DataFrame:
+        """
+        Store a series, replacing or extending the entry for the same key.
+
+        Parameters
+        ----------
+        variables : Sequence[str]
+            NASA POWER parameter set
+        lat, lon : float
+            Location
+        df : pd.DataFrame
+            Daily (or intraday) series with a datetime-like index
+        start, end : date-like
+            Coverage the series represents (the requested API window; rows
+            dropped as invalid inside it do not count as missing)
+        merge : bool
+            Merge with the existing entry instead of replacing it: rows are
+            combined (new rows win on duplicate dates) and coverage unioned
+        partition : str, optional
+            Entry partition (see ``key``)
+        dtype : numpy dtype
+            Storage type of numeric columns (float32 suits POWER's own
+            precision; use float64 for series that need more)
+        meta : Dict, optional
+            JSON-serializable metadata kept in the manifest entry
+
+        Returns
+        -------
+        pd.DataFrame
+            The stored (normalized) frame, including merged rows
+        """
+        df = self._normalize(df, dtype)
+        key = self.key(variables, lat, lon, partition)
+        suffix = 'feather' if self.fmt == 'feather' else 'pkl'
+        filename = f"{key}.{suffix}"
+        path = self.root / filename
+        covered = [(pd.Timestamp(start), pd.Timestamp(end))]
+
+        with self._manifest_lock():
+            manifest = self._read_manifest()
+            old = manifest.get(key)
+            if merge and old is not None:
+                try:
+                    existing = self._read_frame(self.root / old['file'], old['format'])
+                    df = self._normalize(pd.concat([existing, df]), dtype)
+                    covered += _ranges_from_entry(old)
+                except Exception as exc:  # noqa: BLE001
+                    warnings.warn(f"Cached entry {key} unusable ({exc}); replacing it")
+            covered = merge_ranges(covered)
+
+            _atomic_write(path, lambda tmp: self._write_frame(df, tmp, self.fmt))
+            if old is not None and old['file'] != filename:
+                self._remove_file(old['file'])
+            manifest[key] = {
+                'file': filename,
+                'format': self.fmt,
+                'variables': sorted(variables),
+                'lat': float(lat),
+                'lon': float(lon),
+                'coverage': _ranges_to_json(covered),
+                'rows': int(len(df)),
+                'columns': list(df.columns),
+                'bytes': path.stat().st_size,
+                'written': time.time(),
+                'last_access': time.time(),
+            }
+            if meta is not None:
+                manifest[key]['meta'] = meta
+            self._evict(manifest, keep=key)
+            self._write_manifest(manifest)
+
+        return df
+
+    def invalidate(self, variables: Sequence[str], lat: float, lon: float,
+                   partition: Optional[str] = None) -> bool:
+        """Drop one entry; returns True if it existed."""
+        key = self.key(variables, lat, lon, partition)
+        with self._manifest_lock():
+            manifest = self._read_manifest()
+            if key not in manifest:
+                return False
+            self._drop(manifest, key)
+            self._write_manifest(manifest)
+            return True
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._manifest_lock():
+            manifest = self._read_manifest()
+            for key in list(manifest):
+                self._drop(manifest, key)
+            self._write_manifest(manifest)
+
+    def stats(self) -> Dict:
+        """Entry count, total size and size bound."""
+        manifest = self.entries()
+        return {
+            'entries': len(manifest),
+            'bytes': sum(e['bytes'] for e in manifest.values()),
+            'max_bytes': self.max_bytes,
+            'format': self.fmt,
+            'root': str(self.root),
+        }
+
+    # ------------------------------------------------------------------
+    # Eviction
+    # ------------------------------------------------------------------
+
+    def _remove_file(self, filename: str) -> None:
+        try:
+            (self.root / filename).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _drop(self, manifest: Dict[str, Dict], key: str) -> None:
+        entry = manifest.pop(key)
+        self._remove_file(entry['file'])
+
+    def _evict(self, manifest: Dict[str, Dict], keep: Optional[str] = None) -> None:
+        """Drop least-recently-used entries until the size bound holds."""
+        total = sum(e['bytes'] for e in manifest.values())
+        for key in sorted(manifest, key=lambda k: manifest[k]['last_access']):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= manifest[key]['bytes']
+            self._drop(manifest, key)
+
+
+_default_cache: Optional[ColumnarCache] = None
+
+
+def default_cache() -> ColumnarCache:
+    """
+    Shared cache used by the NASA POWER loaders.
+
+    The directory can be moved with the ``SPK_CACHE_DIR`` environment variable.
+    """
+    global _default_cache
+    root = Path(os.environ.get('SPK_CACHE_DIR', DEFAULT_CACHE_DIR))
+    if _default_cache is None or _default_cache.root != root:
+        _default_cache = ColumnarCache(root)
+    return _default_cache
@@ -5,8 +5,16 @@ Data Loader for Energy Derivatives
 Loads and processes empirical CEIR data to derive realistic underlying prices
 for derivative pricing models.
 
+The CSVs are parsed, joined with the energy series and given their derived
+columns (Supply, Market_Cap, CEIR) once: ``ingest_ceir_data`` stores the
+result as a typed float64 entry in the columnar cache together with the
+provenance of its source files (name, size, modification time). Later
+loads memory-map just the columns they need, and re-ingest only when a
+source file changes.
+
 Key Functions:
 -----------
+ingest_ceir_data(): Build the cached, pre-joined CEIR dataset
 load_ceir_data(): Load Bitcoin CEIR from empirical folder
 compute_energy_price(): Derive energy unit prices from CEIR
 estimate_volatility(): Estimate volatility from historical prices
@@ -15,11 +23,29 @@ load_parameters(): Load all parameters for derivative pricing
 
 import numpy as np
 import pandas as pd
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Sequence
 import warnings
+import hashlib
+import time
 from pathlib import Path
 
+from .cache import ColumnarCache, default_cache
+
 REQUIRED_COLUMNS = ["Date", "Price", "Market_Cap"]
+BTC_DATA_CANDIDATES = [
+    'bitcoin_ceir_final.csv',
+    'bitcoin_ceir_complete.csv',
+    'btc_ds_parsed.csv'
+]
+ENERGY_DATA_FILE = 'btc_con.csv'
+
+# Cache entry of an ingested dataset: fixed pseudo-variable and location,
+# partitioned by source directory. Bump the version when parsing changes.
+CEIR_CACHE_VARIABLES = ['CEIR_DATASET']
+CEIR_INGEST_VERSION = 1
+
+# Columns load_parameters / get_ceir_summary read
+PARAMETER_COLUMNS = ['Price', 'Market_Cap', 'CEIR', 'Energy_TWh_Annual']
 
 
 def validate_ceir_schema(df: pd.DataFrame) -> pd.DataFrame:
@@ -40,10 +66,13 @@ def validate_ceir_schema(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def _resolve_data_directory(data_dir: str, use_repo_fallback: bool = True) -> Optional[Path]:
+def _resolve_data_directory(data_dir: str, use_repo_fallback: bool = True,
+                            warn: bool = True) -> Optional[Path]:
     """
     Resolve the data directory with sensible fallbacks.
 
+    ``warn=False`` silences the fallback warnings (used when only probing).
+
     Returns
     -------
     Optional[Path]
@@ -57,16 +86,164 @@ def _resolve_data_directory(data_dir: str, use_repo_fallback: bool = True) -> Op
         # Fallback: look for empirical folder at repo root
         repo_root_candidate = Path(__file__).resolve().parents[2] / "empirical"
         if repo_root_candidate.exists():
-            warnings.warn(f"Data directory {data_dir} not found, using {repo_root_candidate}")
+            if warn:
+                warnings.warn(f"Data directory {data_dir} not found, using {repo_root_candidate}")
             return repo_root_candidate
 
-    warnings.warn(f"Data directory {data_dir} not found and no fallback available")
+    if warn:
+        warnings.warn(f"Data directory {data_dir} not found and no fallback available")
     return None
 
 
+def _ceir_sources(resolved_dir: Path) -> List[Path]:
+    """Bitcoin price file (first candidate found) plus the energy file, if present."""
+    for candidate in BTC_DATA_CANDIDATES:
+        path = resolved_dir / candidate
+        if path.exists():
+            energy_file = resolved_dir / ENERGY_DATA_FILE
+            return [path] + ([energy_file] if energy_file.exists() else [])
+    return []
+
+
+def ceir_provenance(sources: Sequence[Path]) -> Dict:
+    """
+    Provenance of an ingested CEIR dataset.
+
+    Source names, sizes and modification times plus the ingest version; a
+    cached dataset is reused only while this is unchanged.
+    """
+    return {
+        'directory': str(Path(sources[0]).resolve().parent),
+        'files': [[p.name, p.stat().st_size, p.stat().st_mtime_ns] for p in map(Path, sources)],
+        'ingest_version': CEIR_INGEST_VERSION,
+    }
+
+
+def _parse_ceir_sources(sources: Sequence[Path]) -> pd.DataFrame:
+    """Parse, join and derive the CEIR dataset from its source CSVs."""
+    btc_file = sources[0]
+    df = pd.read_csv(btc_file)
+
+    # Ensure Date column
+    if 'Date' not in df.columns:
+        if 'Exchange Date' in df.columns:
+            df['Date'] = pd.to_datetime(df['Exchange Date'])
+        else:
+            df['Date'] = pd.date_range(start='2018-01-01', periods=len(df))
+    else:
+        df['Date'] = pd.to_datetime(df['Date'])
+
+    # Ensure Price column
+    if 'Price' not in df.columns:
+        if 'Open' in df.columns:
+            df['Price'] = df['Open']
+        elif 'Close' in df.columns:
+            df['Price'] = df['Close']
+    df['Price'] = pd.to_numeric(df['Price'], errors='coerce')
+
+    # Join energy data if available
+    if len(sources) > 1:
+        energy_df = pd.read_csv(sources[1])
+        energy_df['DateTime'] = pd.to_datetime(energy_df['DateTime'])
+        energy_df['Date'] = energy_df['DateTime'].dt.date
+        energy_df = energy_df.rename(columns={'Estimated TWh per Year': 'Energy_TWh_Annual'})
+
+        df['Date_only'] = df['Date'].dt.date
+        df = df.merge(
+            energy_df[['Date', 'Energy_TWh_Annual']].drop_duplicates('Date', keep='first'),
+            left_on='Date_only',
+            right_on='Date',
+            how='left',
+            suffixes=('', '_energy')
+        )
+        df = df.drop('Date_only', axis=1)
+        if 'Date_energy' in df.columns:
+            df = df.drop('Date_energy', axis=1)
+
+    # Compute market cap if not present
+    if 'Market_Cap' not in df.columns:
+        # Approximate Bitcoin supply curve
+        days_since_start = (df['Date'] - df['Date'].min()).dt.days
+        df['Supply'] = 21e6 - (21e6 - 17e6) * np.exp(-0.693 * days_since_start / (4 * 365))
+        df['Market_Cap'] = df['Price'] * df['Supply']
+    df['Market_Cap'] = pd.to_numeric(df['Market_Cap'], errors='coerce')
+
+    # Compute CEIR if not present
+    if 'CEIR' not in df.columns and 'Energy_TWh_Annual' in df.columns:
+        df = compute_ceir_column(df)
+
+    df = validate_ceir_schema(df)
+    return df.sort_values('Date').reset_index(drop=True)
+
+
+def ingest_ceir_data(data_dir: str = '../empirical',
+                     use_repo_fallback: bool = True,
+                     store: Optional[ColumnarCache] = None,
+                     force: bool = False) -> Optional[Dict]:
+    """
+    Build the typed, pre-joined CEIR dataset in the columnar cache.
+
+    Parsing, the energy join and the derived columns run only when the
+    cached dataset is missing, ``force`` is set, or the provenance of the
+    source files changed. Only numeric columns are kept (float64), indexed
+    by Date; duplicate dates keep the last row.
+
+    Parameters
+    ----------
+    data_dir : str
+        Path to empirical data directory
+    use_repo_fallback : bool
+        If True, fall back to repo-level empirical folder when not found
+    store : ColumnarCache, optional
+        Cache to ingest into (default: ``cache.default_cache()``)
+    force : bool
+        Re-ingest even if the cached dataset is current
+
+    Returns
+    -------
+    Optional[Dict]
+        Manifest entry of the dataset (columns, rows, coverage and
+        ``meta['provenance']``), or None when no CEIR source file exists
+
+    Example
+    -------
+    >>> entry = ingest_ceir_data('../empirical')
+    >>> entry['columns'], entry['meta']['provenance']['files']
+    """
+    resolved_dir = _resolve_data_directory(data_dir, use_repo_fallback=use_repo_fallback)
+    if resolved_dir is None:
+        return None
+    sources = _ceir_sources(resolved_dir)
+    if not sources:
+        return None
+    return _ingest(sources, store or default_cache(), force)[1]
+
+
+def _ingest(sources: Sequence[Path], store: ColumnarCache,
+            force: bool = False):
+    """(cache partition, manifest entry) of the current dataset for ``sources``."""
+    provenance = ceir_provenance(sources)
+    partition = 'ceir-' + hashlib.sha256(provenance['directory'].encode()).hexdigest()[:12]
+    entry = store.entry(CEIR_CACHE_VARIABLES, 0.0, 0.0, partition)
+
+    if force or entry is None or entry.get('meta', {}).get('provenance') != provenance:
+        began = time.perf_counter()
+        df = _parse_ceir_sources(sources)
+        typed = df.set_index('Date').select_dtypes(include=[np.number])
+        store.put(CEIR_CACHE_VARIABLES, 0.0, 0.0, typed,
+                  df['Date'].min(), df['Date'].max(), partition=partition,
+                  dtype=np.float64,
+                  meta={'provenance': provenance,
+                        'ingest_seconds': time.perf_counter() - began})
+        entry = store.entry(CEIR_CACHE_VARIABLES, 0.0, 0.0, partition)
+    return partition, entry
+
+
 def load_ceir_data(data_dir: str = '../empirical',
                    use_repo_fallback: bool = True,
-                   use_live_if_missing: bool = False) -> pd.DataFrame:
+                   use_live_if_missing: bool = False,
+                   columns: Optional[Sequence[str]] = None,
+                   use_cache: bool = True) -> pd.DataFrame:
     """
     Load CEIR data from empirical folder.
     
@@ -78,6 +255,12 @@ def load_ceir_data(data_dir: str = '../empirical',
         If True, fall back to repo-level empirical folder when not found
     use_live_if_missing : bool
         If True, fetch live data when local data is missing
+    columns : Sequence[str], optional
+        Columns to load besides Date (default: all); columns the dataset
+        lacks are skipped. With the cache only these are read from disk.
+    use_cache : bool
+        If True, read the ingested dataset (see ``ingest_ceir_data``)
+        instead of parsing the CSVs
         
     Returns
     -------
@@ -98,77 +281,30 @@ def load_ceir_data(data_dir: str = '../empirical',
         return _generate_synthetic_ceir_data()
 
     try:
-        # Load Bitcoin price data
-        btc_data_candidates = [
-            'bitcoin_ceir_final.csv',
-            'bitcoin_ceir_complete.csv',
-            'btc_ds_parsed.csv'
-        ]
-
-        btc_file = None
-        for candidate in btc_data_candidates:
-            path = resolved_dir / candidate
-            if path.exists():
-                btc_file = path
-                break
-        
-        if btc_file is None:
+        sources = _ceir_sources(resolved_dir)
+        if not sources:
             warnings.warn("No Bitcoin price file found, using synthetic data")
             return _generate_synthetic_ceir_data()
-        
-        df = pd.read_csv(btc_file)
-        
-        # Ensure Date column
-        if 'Date' not in df.columns:
-            if 'Exchange Date' in df.columns:
-                df['Date'] = pd.to_datetime(df['Exchange Date'])
-            else:
-                df['Date'] = pd.date_range(start='2018-01-01', periods=len(df))
-        else:
-            df['Date'] = pd.to_datetime(df['Date'])
-        
-        # Ensure Price column
-        if 'Price' not in df.columns:
-            if 'Open' in df.columns:
-                df['Price'] = df['Open']
-            elif 'Close' in df.columns:
-                df['Price'] = df['Close']
-        df['Price'] = pd.to_numeric(df['Price'], errors='coerce')
-        
-        # Load energy data if available
-        energy_file = resolved_dir / 'btc_con.csv'
-        if energy_file.exists():
-            energy_df = pd.read_csv(energy_file)
-            energy_df['DateTime'] = pd.to_datetime(energy_df['DateTime'])
-            energy_df['Date'] = energy_df['DateTime'].dt.date
-            energy_df = energy_df.rename(columns={'Estimated TWh per Year': 'Energy_TWh_Annual'})
-            
-            df['Date_only'] = df['Date'].dt.date
-            df = df.merge(
-                energy_df[['Date', 'Energy_TWh_Annual']].drop_duplicates('Date', keep='first'),
-                left_on='Date_only',
-                right_on='Date',
-                how='left',
-                suffixes=('', '_energy')
-            )
-            df = df.drop('Date_only', axis=1)
-            if 'Date_energy' in df.columns:
-                df = df.drop('Date_energy', axis=1)
-        
-        # Compute market cap if not present
-        if 'Market_Cap' not in df.columns:
-            # Approximate Bitcoin supply curve
-            days_since_start = (df['Date'] - df['Date'].min()).dt.days
-            df['Supply'] = 21e6 - (21e6 - 17e6) * np.exp(-0.693 * days_since_start / (4 * 365))
-            df['Market_Cap'] = df['Price'] * df['Supply']
-        df['Market_Cap'] = pd.to_numeric(df['Market_Cap'], errors='coerce')
-        
-        # Compute CEIR if not present
-        if 'CEIR' not in df.columns and 'Energy_TWh_Annual' in df.columns:
-            df = compute_ceir_column(df)
-        
-        df = validate_ceir_schema(df)
-        return df.sort_values('Date').reset_index(drop=True)
+
+        if use_cache:
+            # A cache failure (unwritable directory, full disk) must not
+            # discard CSVs that parse fine: read them directly instead
+            try:
+                store = default_cache()
+                partition, entry = _ingest(sources, store)
+                if columns is not None:
+                    columns = [c for c in columns if c in entry['columns']]
+                df = store.get(CEIR_CACHE_VARIABLES, 0.0, 0.0, columns=columns, partition=partition)
+                if df is None:
+                    raise ValueError("ingested CEIR dataset missing from the cache")
+                return df.reset_index()
+            except Exception as exc:
+                warnings.warn(f"CEIR cache unavailable ({exc}); parsing the source files")
+
+        df = _parse_ceir_sources(sources)
+        if columns is not None:
+            df = df[['Date'] + [c for c in columns if c in df.columns and c != 'Date']]
+        return df
     
     except Exception as e:
         warnings.warn(f"Error loading CEIR data: {e}, using synthetic data")
@@ -203,7 +339,7 @@ def compute_ceir_column(df: pd.DataFrame, electricity_price: float = 0.05) -> pd
     
     # CEIR
     df['CEIR'] = df['Market_Cap'] / df['Cumulative_Energy_Cost']
-    df['CEIR'] = df['CEIR'].replace([np.inf, -np.inf], np.nan).fillna(method='ffill')
+    df['CEIR'] = df['CEIR'].replace([np.inf, -np.inf], np.nan).ffill()
     
     return df
 
@@ -361,12 +497,13 @@ def load_parameters(data_dir: str = '../empirical',
         - T: Time to maturity
         - r: Risk-free rate
         - K: Strike price (set to current price)
-        - ceir_df: Full CEIR DataFrame
+        - ceir_df: CEIR DataFrame (Date plus PARAMETER_COLUMNS present)
     """
     
-    # Load CEIR data
+    # Load CEIR data (only the columns used here and in get_ceir_summary)
     ceir_df = load_ceir_data(data_dir, use_repo_fallback=use_repo_fallback,
-                             use_live_if_missing=use_live_if_missing)
+                             use_live_if_missing=use_live_if_missing,
+                             columns=PARAMETER_COLUMNS)
     
     # Compute energy price
     energy_prices = compute_energy_price(ceir_df)
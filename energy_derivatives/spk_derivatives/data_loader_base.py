@@ -283,6 +283,7 @@ class EnergyDataLoader(ABC):
         
         # Compute prices (energy-source-specific)
         prices = self.compute_price(self.data_df, **loader_kwargs)
+        self.data_df['Price'] = prices
         
         # Calculate volatility (same for all sources)
         sigma, data_with_returns = self.get_volatility_params(
@@ -26,10 +26,18 @@ Q (m³/s) = (PREC_mm × Catchment_Area_km² × Runoff_Coefficient) / 86,400
 Daily Energy = Power × 86,400 seconds / 1000 (convert to kWh)
 Economic Value = Daily Energy × Energy Value ($/kWh)
 
+Conversion kernels are selected by name from ``power_models``: 'runoff'
+(the same-day formula above, default) or 'reservoir' (runoff routed
+through linear storage), e.g. ``HydroDataLoader(power_model='reservoir')``.
+
 Key Classes:
 -----------
 HydroDataLoader: Precipitation → economic price conversion
 
+Key Functions:
+-----------
+hydro_energy_price(): Precipitation-to-price kernel (any array shape)
+
 Key Methods:
 -----------
 fetch_data(): Fetch precipitation from NASA POWER API
@@ -51,14 +59,12 @@ Use preset locations with location_name parameter instead of manual coordinates:
 >>> hydro_locs = list_locations('hydro')
 """
 
-import requests
 import pandas as pd
 import numpy as np
 import warnings
-from typing import Optional
-from pathlib import Path
-import time
+from typing import Dict, Optional
 
+from . import nasa_power
 from .data_loader_base import EnergyDataLoader
 from .location_guide import get_location
 
@@ -76,10 +82,46 @@ DEFAULT_FALL_HEIGHT_M = 50.0         # 50m head (typical small/medium dam)
 DEFAULT_RUNOFF_COEFFICIENT = 0.60    # 60% of rain reaches the dam
 DEFAULT_TURBINE_EFFICIENCY = 0.87    # 87% conversion efficiency
 
-# API configuration
-MAX_RETRIES = 3
-RETRY_BACKOFF = 1.5  # seconds
-API_TIMEOUT = 30  # seconds
+HYDRO_VARIABLES = ['PREC', 'T2M', 'RH2M']  # Precipitation + temperature + humidity
+
+
+def hydro_energy_price(prec_mm, catchment_area_m2: float, fall_height_m: float,
+                       runoff_coefficient: float, turbine_efficiency: float,
+                       energy_value_per_kwh: float = 0.06) -> np.ndarray:
+    """
+    Daily economic value of run-off generation: ρ g Q h η × 24h × $/kWh.
+
+    Works elementwise on any array shape (one site or a site × day grid).
+    """
+    prec_mm = np.asarray(prec_mm, dtype=np.float64)
+    
+    # Convert precipitation to volumetric flow
+    # Volume (m³) = Precipitation_mm × Catchment_area_m² / 1000
+    # Flow rate (m³/s) = Volume / seconds_per_day
+    volume_m3 = (prec_mm / 1000) * catchment_area_m2 * runoff_coefficient
+    flow_rate = volume_m3 / 86400  # m³/s (86400 seconds per day)
+    
+    # Calculate power (Watts)
+    rho = 1000  # kg/m³ (water density)
+    g = 9.81    # m/s² (gravity)
+    power_w = rho * g * flow_rate * fall_height_m * turbine_efficiency
+    
+    # Daily energy (kWh)
+    daily_energy_kwh = (power_w * 86400) / 1000
+    
+    # Economic price ($/day)
+    return daily_energy_kwh * energy_value_per_kwh
+
+
+def clean_hydro_data(raw: pd.DataFrame) -> pd.DataFrame:
+    """Drop days with negative or extreme precipitation."""
+    original_len = len(raw)
+    df = raw[(raw['PREC'] >= 0) & (raw['PREC'] < 500)].copy()  # Remove invalid
+    removed = original_len - len(df)
+
+    if removed > 0:
+        warnings.warn(f"Removed {removed} days with invalid precipitation data")
+    return df
 
 
 class HydroDataLoader(EnergyDataLoader):
@@ -109,6 +151,10 @@ class HydroDataLoader(EnergyDataLoader):
         Turbine conversion efficiency (default: 0.87, typical: 0.85-0.92)
     energy_value_per_kwh : float
         Economic value per kWh (default: 0.06 = $0.06/kWh)
+    power_model : str, optional
+        Hydro model in ``power_models`` (default: 'runoff')
+    model_params : Dict, optional
+        Extra parameters of the model, e.g. {'release_fraction': 0.05}
     
     Attributes
     ----------
@@ -148,6 +194,8 @@ class HydroDataLoader(EnergyDataLoader):
         runoff_coefficient: float = None,
         turbine_efficiency: float = None,
         energy_value_per_kwh: float = 0.06,
+        power_model: Optional[str] = None,
+        model_params: Optional[Dict] = None,
     ):
         """
         Initialize hydro data loader.
@@ -174,7 +222,13 @@ class HydroDataLoader(EnergyDataLoader):
         turbine_efficiency : float, optional
             Turbine efficiency (0-1). If None and location provided, uses preset.
             Otherwise defaults to 0.87.
+        power_model : str, optional
+            Hydro model in ``power_models`` (default: 'runoff')
+        model_params : Dict, optional
+            Extra model parameters beyond the facility specifications
         """
+        from .power_models import get_model
+
         # Handle location-based initialization
         if location_name is not None:
             location_data = get_location(location_name)
@@ -224,6 +278,9 @@ class HydroDataLoader(EnergyDataLoader):
         self.runoff_coefficient = runoff_coefficient
         self.turbine_efficiency = turbine_efficiency
         self.energy_value = energy_value_per_kwh
+        self.power_model = get_model('hydro', power_model)
+        self.model_params = dict(model_params or {})
+        self.power_model.check_params(self.model_params)
         
         # Validate specifications
         if fall_height_m < 1 or fall_height_m > 500:
@@ -244,98 +301,23 @@ class HydroDataLoader(EnergyDataLoader):
             DataFrame with columns: PREC, T2M, RH2M, Price
             Index: DatetimeIndex with daily frequency
         """
-        # Check cache first
-        cache_dir = Path(__file__).parent.parent / 'data'
-        cache_file = cache_dir / f'nasa_hydro_{self.lat}_{self.lon}_{self.start_year}_{self.end_year}.csv'
-        
-        if cache_file.exists():
-            try:
-                print(f"📁 Loading cached NASA hydro data from {cache_file}")
-                df = pd.read_csv(cache_file, parse_dates=['Date'], index_col='Date')
-                if df.empty or 'PREC' not in df.columns:
-                    raise ValueError("Cached file is invalid")
-                print(f"✅ Loaded {len(df)} days of cached hydro data")
-                return df
-            except Exception as exc:
-                warnings.warn(f"Cache unusable ({exc}); refetching from API")
-        
-        # Fetch from NASA POWER API
-        base_url = "https://power.larc.nasa.gov/api/temporal/daily/point"
-        params = {
-            "parameters": "PREC,T2M,RH2M",  # Precipitation + temperature + humidity
-            "community": "RE",               # Renewable Energy
-            "longitude": self.lon,
-            "latitude": self.lat,
-            "start": f"{self.start_year}0101",
-            "end": f"{self.end_year}1231",
-            "format": "JSON"
-        }
-        
-        print(f"📡 Connecting to NASA MERRA-2 Data for Precipitation ({self.lat}, {self.lon})...")
-        print(f"   Date Range: {self.start_year}-01-01 to {self.end_year}-12-31")
         print(f"   Catchment Area: {self.catchment_area_km2:.0f} km²")
         print(f"   Fall Height: {self.fall_height}m")
         
-        response = None
-        for attempt in range(1, MAX_RETRIES + 1):
-            try:
-                response = requests.get(base_url, params=params, timeout=API_TIMEOUT)
-                response.raise_for_status()
-                break
-            except requests.exceptions.RequestException as e:
-                if attempt == MAX_RETRIES:
-                    raise ConnectionError(f"NASA API failed after {MAX_RETRIES} attempts: {e}")
-                sleep_for = RETRY_BACKOFF * attempt
-                warnings.warn(
-                    f"Attempt {attempt}/{MAX_RETRIES} failed. Retrying in {sleep_for:.1f}s"
-                )
-                time.sleep(sleep_for)
-        
-        if response is None:
-            raise ConnectionError("NASA API response is None")
-        
-        # Parse JSON response
-        try:
-            data = response.json()
-            properties = data['properties']
-            parameter = properties.get('parameter', {})
-            
-            prec_dict = parameter.get('PREC')
-            t2m_dict = parameter.get('T2M')
-            rh2m_dict = parameter.get('RH2M')
-            
-            if not all([prec_dict, t2m_dict, rh2m_dict]):
-                raise ValueError("Missing hydro parameters in response")
-            
-            # Create DataFrame
-            df = pd.DataFrame({
-                'PREC': pd.Series(prec_dict),
-                'T2M': pd.Series(t2m_dict),
-                'RH2M': pd.Series(rh2m_dict),
-            })
-            df.index = pd.to_datetime(df.index, format='%Y%m%d')
-            df.index.name = 'Date'
-            
-        except (KeyError, ValueError) as e:
-            raise ValueError(f"Failed to parse NASA API response: {e}")
-        
-        # Validate data (remove negative or extreme values)
-        original_len = len(df)
-        df = df[(df['PREC'] >= 0) & (df['PREC'] < 500)].copy()  # Remove invalid
-        removed = original_len - len(df)
-        
-        if removed > 0:
-            warnings.warn(f"Removed {removed} days with invalid precipitation data")
+        # Only the days missing from the shared cache are downloaded
+        variables = HYDRO_VARIABLES + [v for v in self.power_model.variables
+                                       if v not in HYDRO_VARIABLES]
+        df = nasa_power.load_daily(
+            variables,
+            self.lat, self.lon,
+            f"{self.start_year}-01-01", f"{self.end_year}-12-31",
+            clean=clean_hydro_data,
+        )
         
         print(f"✅ Loaded {len(df)} days of precipitation data")
         print(f"   Mean precipitation: {df['PREC'].mean():.2f} mm/day")
         print(f"   Max precipitation: {df['PREC'].max():.2f} mm/day")
         
-        # Cache for future use
-        cache_dir.mkdir(parents=True, exist_ok=True)
-        df.to_csv(cache_file)
-        print(f"💾 Cached data to {cache_file}")
-        
         return df
     
     def compute_price(
@@ -348,7 +330,8 @@ class HydroDataLoader(EnergyDataLoader):
         """
         Convert precipitation to economic price.
         
-        Uses hydroelectric power formula:
+        Runs the loader's ``power_model`` over the whole series; the
+        default 'runoff' model uses the hydroelectric power formula:
         P = ρ × g × Q × h × η (Watts)
         
         where Q is estimated from precipitation:
@@ -372,33 +355,22 @@ class HydroDataLoader(EnergyDataLoader):
         
         Notes
         -----
-        Assumes linear relationship between precipitation and flow (simplified).
-        Real hydrological models are more complex (soil moisture, evaporation, etc.).
+        'runoff' assumes a same-day linear relationship between precipitation
+        and flow (simplified); 'reservoir' adds storage, so flow lags rainfall.
         """
         coeff = runoff_coefficient or self.runoff_coefficient
         eta = turbine_efficiency or self.turbine_efficiency
         energy_val = energy_value_per_kwh or self.energy_value
         
-        prec_mm = df['PREC'].values
-        
-        # Convert precipitation to volumetric flow
-        # Volume (m³) = Precipitation_mm × Catchment_area_m² / 1000
-        # Flow rate (m³/s) = Volume / seconds_per_day
-        volume_m3 = (prec_mm / 1000) * self.catchment_area_m2 * coeff
-        flow_rate = volume_m3 / 86400  # m³/s (86400 seconds per day)
-        
-        # Calculate power (Watts)
-        rho = 1000  # kg/m³ (water density)
-        g = 9.81    # m/s² (gravity)
-        power_w = rho * g * flow_rate * self.fall_height * eta
-        
-        # Daily energy (kWh)
-        daily_energy_kwh = (power_w * 86400) / 1000
-        
-        # Economic price ($/day)
-        prices = daily_energy_kwh * energy_val
-        
-        return prices.astype(np.float64)
+        return self.power_model(
+            df,
+            catchment_area_km2=self.catchment_area_km2,
+            fall_height_m=self.fall_height,
+            runoff_coefficient=coeff,
+            turbine_efficiency=eta,
+            energy_value_per_kwh=energy_val,
+            **self.model_params,
+        )
     
     def load_parameters(
         self,
@@ -452,6 +424,7 @@ class HydroDataLoader(EnergyDataLoader):
             'fall_height_m': self.fall_height,
             'runoff_coefficient': runoff_coefficient or self.runoff_coefficient,
             'turbine_efficiency': turbine_efficiency or self.turbine_efficiency,
+            'power_model': self.power_model.name,
         }
         params['data_source'] = 'NASA MERRA-2 (POWER API)'
         params['parameter'] = 'PREC (Daily Precipitation in mm)'
@@ -12,17 +12,18 @@ Parameter: ALLSKY_SFC_SW_DWN (Solar Irradiance in kW-hr/m²/day)
 Key Functions:
 -----------
 fetch_nasa_data(): Fetch historical GHI data from NASA API
+clean_solar_data(): Rename and validate a raw POWER irradiance response
 get_volatility_params(): Calculate annualized volatility from solar data
+solar_energy_price(): Irradiance-to-price kernel (any array shape)
 load_solar_parameters(): Load complete parameters for solar derivative pricing
 """
 
-import requests
 import pandas as pd
 import numpy as np
 import warnings
-from typing import Dict, Tuple, Optional
-from pathlib import Path
-import time
+from typing import Dict, Tuple, Optional, Sequence
+
+from . import nasa_power
 
 # --- CONFIGURATION ---
 # Coordinates for Taoyuan, Taiwan
@@ -30,8 +31,21 @@ LAT = 24.99
 LON = 121.30
 START_YEAR = 2020
 END_YEAR = 2024
-MAX_RETRIES = 3
-RETRY_BACKOFF = 1.5  # seconds
+SOLAR_VARIABLES = ['ALLSKY_SFC_SW_DWN']  # Solar Irradiance (kW-hr/m²/day)
+
+
+def clean_solar_data(raw: pd.DataFrame) -> pd.DataFrame:
+    """Rename the POWER irradiance column to GHI and drop missing days."""
+    df = raw.rename(columns={'ALLSKY_SFC_SW_DWN': 'GHI'})
+
+    # Filter missing data (NASA uses -999 for missing, in any variable)
+    original_len = len(df)
+    df = df[(df > -900).all(axis=1)].copy()
+    removed = original_len - len(df)
+
+    if removed > 0:
+        warnings.warn(f"Removed {removed} days with missing data")
+    return df
 
 
 def fetch_nasa_data(
@@ -39,7 +53,8 @@ def fetch_nasa_data(
     lon: float = LON,
     start: int = START_YEAR,
     end: int = END_YEAR,
-    cache: bool = True
+    cache: bool = True,
+    variables: Optional[Sequence[str]] = None
 ) -> pd.DataFrame:
     """
     Fetches Daily Global Horizontal Irradiance (GHI) from NASA POWER API.
@@ -55,98 +70,29 @@ def fetch_nasa_data(
     end : int
         End year (default: 2024)
     cache : bool
-        If True, cache data locally to avoid repeated API calls
+        If True, use the shared columnar cache (see ``cache.ColumnarCache``)
+        and download only days not already cached
+    variables : Sequence[str], optional
+        Extra POWER parameters to fetch alongside irradiance (e.g. ['T2M']
+        for the 'pv_temperature' power model)
 
     Returns
     -------
     pd.DataFrame
-        DataFrame with Date index and GHI column (kW-hr/m²/day)
+        DataFrame with Date index and GHI column (kW-hr/m²/day), plus any
+        extra variables;
+        float32 when cache=True. Windows ending after yesterday are
+        truncated to the last available day.
     """
 
-    # Check cache first
-    cache_dir = Path(__file__).parent.parent / 'data'
-    cache_file = cache_dir / f'nasa_ghi_{lat}_{lon}_{start}_{end}.csv'
-
-    if cache and cache_file.exists():
-        try:
-            print(f"📁 Loading cached NASA data from {cache_file}")
-            df = pd.read_csv(cache_file, parse_dates=['Date'], index_col='Date')
-            if df.empty or 'GHI' not in df.columns:
-                raise ValueError("Cached file is empty or missing GHI column")
-            print(f"✅ Loaded {len(df)} days of cached data")
-            return df
-        except Exception as exc:  # noqa: BLE001
-            warnings.warn(f"Cached NASA data unusable ({exc}); refetching from API")
-
-    # Fetch from NASA API
-    base_url = "https://power.larc.nasa.gov/api/temporal/daily/point"
-    params = {
-        "parameters": "ALLSKY_SFC_SW_DWN",  # Solar Irradiance (kW-hr/m²/day)
-        "community": "RE",                   # Renewable Energy
-        "longitude": lon,
-        "latitude": lat,
-        "start": f"{start}0101",
-        "end": f"{end}1231",
-        "format": "JSON"
-    }
-
-    print(f"📡 Connecting to NASA Satellite Database for Taoyuan ({lat}, {lon})...")
-    print(f"   Date Range: {start}-01-01 to {end}-12-31")
-
-    response = None
-    for attempt in range(1, MAX_RETRIES + 1):
-        try:
-            response = requests.get(base_url, params=params, timeout=30)
-            response.raise_for_status()
-            break
-        except requests.exceptions.RequestException as e:
-            if attempt == MAX_RETRIES:
-                raise ConnectionError(f"NASA API Failed after {attempt} attempts: {e}")
-            sleep_for = RETRY_BACKOFF * attempt
-            warnings.warn(f"NASA API request failed (attempt {attempt}/{MAX_RETRIES}): {e}. Retrying in {sleep_for:.1f}s")
-            time.sleep(sleep_for)
-
-    if response is None:
-        raise ConnectionError("NASA API response is None after retries")
-
-    try:
-        data = response.json()
-    except ValueError as e:
-        raise ValueError(f"Failed to parse NASA API JSON response: {e}")
-
-    # Parse JSON into DataFrame
-    try:
-        properties = data['properties']
-        if not isinstance(properties, dict):
-            raise ValueError("Malformed response: 'properties' missing or not a dict")
-        parameter = properties.get('parameter', {})
-        if not isinstance(parameter, dict) or 'ALLSKY_SFC_SW_DWN' not in parameter:
-            raise ValueError("Malformed response: ALLSKY_SFC_SW_DWN not present")
-        solar_dict = parameter['ALLSKY_SFC_SW_DWN']
-        if not isinstance(solar_dict, dict):
-            raise ValueError("Malformed response: ALLSKY_SFC_SW_DWN not a dict")
-        df = pd.DataFrame.from_dict(solar_dict, orient='index', columns=['GHI'])
-        df.index = pd.to_datetime(df.index, format='%Y%m%d')
-        df.index.name = 'Date'
-    except (KeyError, ValueError) as e:
-        raise ValueError(f"Failed to parse NASA API response: {e}")
-
-    # Filter missing data (NASA uses -999 for missing)
-    original_len = len(df)
-    df = df[df['GHI'] > -900].copy()
-    removed = original_len - len(df)
-
-    if removed > 0:
-        warnings.warn(f"Removed {removed} days with missing data")
+    # Only the days missing from the cache are downloaded
+    requested = SOLAR_VARIABLES + [v for v in (variables or []) if v not in SOLAR_VARIABLES]
+    df = nasa_power.load_daily(requested, lat, lon,
+                               f"{start}-01-01", f"{end}-12-31",
+                               clean=clean_solar_data, cache=cache)
 
     print(f"✅ Success! Loaded {len(df)} days of historical solar data")
 
-    # Cache for future use
-    if cache:
-        cache_dir.mkdir(parents=True, exist_ok=True)
-        df.to_csv(cache_file)
-        print(f"💾 Cached data to {cache_file}")
-
     return df
 
 
@@ -263,6 +209,22 @@ def get_volatility_params(
     return float(annual_vol), df
 
 
+def solar_energy_price(ghi,
+                       energy_value_per_kwh: float = 0.10,
+                       panel_efficiency: float = 0.20,
+                       panel_area_m2: float = 1.0) -> np.ndarray:
+    """
+    Daily economic value of a panel: GHI × efficiency × area × $/kWh.
+
+    Works elementwise on any array shape (one site or a site × day grid).
+    """
+    # Energy generated (kWh) = GHI × efficiency × area
+    energy_kwh = np.asarray(ghi) * panel_efficiency * panel_area_m2
+
+    # Economic value ($) = energy × price per kWh
+    return energy_kwh * energy_value_per_kwh
+
+
 def compute_solar_price(df: pd.DataFrame,
                        energy_value_per_kwh: float = 0.10,
                        panel_efficiency: float = 0.20,
@@ -290,13 +252,8 @@ def compute_solar_price(df: pd.DataFrame,
         Array of daily energy prices
     """
 
-    # Energy generated (kWh) = GHI × efficiency × area
-    energy_kwh = df['GHI'] * panel_efficiency * panel_area_m2
-
-    # Economic value ($) = energy × price per kWh
-    prices = energy_kwh * energy_value_per_kwh
-
-    return prices.to_numpy()
+    return solar_energy_price(df['GHI'].to_numpy(), energy_value_per_kwh,
+                              panel_efficiency, panel_area_m2)
 
 
 def load_solar_parameters(
@@ -310,7 +267,9 @@ def load_solar_parameters(
     cache: bool = True,
     volatility_method: str = 'log',
     volatility_cap: Optional[float] = None,
-    deseason: bool = True
+    deseason: bool = True,
+    power_model: Optional[str] = None,
+    model_params: Optional[Dict] = None
 ) -> Dict:
     """
     Load all parameters for solar derivative pricing from NASA data.
@@ -343,6 +302,11 @@ def load_solar_parameters(
         Example: 2.0 for 200% cap.
     deseason : bool
         Remove seasonal patterns before calculating volatility
+    power_model : str, optional
+        Solar model in ``power_models``: 'linear' (default) or
+        'pv_temperature' (fetches T2M and derates for cell temperature)
+    model_params : Dict, optional
+        Extra parameters of the model, e.g. {'temp_coefficient': -0.0035}
 
     Returns
     -------
@@ -358,6 +322,7 @@ def load_solar_parameters(
         - location: Dict with lat/lon
         - volatility_method: Method used for calculation
         - volatility_capped: Whether capping was applied
+        - power_model: Name of the conversion model used
 
     Examples
     --------
@@ -371,8 +336,14 @@ def load_solar_parameters(
     >>> params = load_solar_parameters(lat=33.45, lon=-112.07)  # Phoenix, AZ
     """
 
+    from .power_models import get_model
+
+    model = get_model('solar', power_model)
+    model_params = dict(model_params or {})
+    model.check_params(model_params)
+
     # Fetch NASA data
-    ghi_df = fetch_nasa_data(lat, lon, start, end, cache)
+    ghi_df = fetch_nasa_data(lat, lon, start, end, cache, variables=model.variables)
 
     # Calculate volatility with specified method
     sigma, ghi_df = get_volatility_params(
@@ -383,7 +354,7 @@ def load_solar_parameters(
     )
 
     # Compute energy prices
-    energy_prices = compute_solar_price(ghi_df, energy_value_per_kwh)
+    energy_prices = model(ghi_df, energy_value_per_kwh=energy_value_per_kwh, **model_params)
 
     # Get current price (latest)
     S0 = float(energy_prices[-1])
@@ -413,7 +384,8 @@ def load_solar_parameters(
         'date_range': f"{start}-{end}",
         'volatility_method': volatility_method,
         'volatility_cap': volatility_cap,
-        'deseasonalized': deseason
+        'deseasonalized': deseason,
+        'power_model': model.name
     }
 
     return params
@@ -26,6 +26,14 @@ Key Classes:
 -----------
 WindDataLoader: Wind speed → economic price conversion
 
+Key Functions:
+-----------
+wind_energy_price(): Power-curve price kernel (any array shape)
+
+Conversion kernels are selected by name from ``power_models``:
+'cubic' (the formula above, default) or 'power_curve' (cut-in / rated /
+cut-out turbine curve), e.g. ``WindDataLoader(power_model='power_curve')``.
+
 Key Methods:
 -----------
 fetch_data(): Fetch wind speed from NASA POWER API
@@ -47,14 +55,12 @@ Use preset locations with location_name parameter instead of manual coordinates:
 >>> print(format_location_table())
 """
 
-import requests
 import pandas as pd
 import numpy as np
 import warnings
-from typing import Optional
-from pathlib import Path
-import time
+from typing import Dict, Optional
 
+from . import nasa_power
 from .data_loader_base import EnergyDataLoader
 from .location_guide import get_location
 
@@ -71,10 +77,38 @@ DEFAULT_ROTOR_DIAMETER_M = 80.0  # 80m diameter = 5 MW typical turbine
 DEFAULT_HUB_HEIGHT_M = 80.0      # Hub height at 80m (50-100m typical)
 DEFAULT_POWER_COEFFICIENT = 0.40  # Cp = 0.40 (40% efficient)
 
-# API configuration
-MAX_RETRIES = 3
-RETRY_BACKOFF = 1.5  # seconds
-API_TIMEOUT = 30  # seconds
+WIND_VARIABLES = ['WS10M', 'WS50M', 'WD10M']  # Wind speed at 10m & 50m + direction
+
+
+def wind_energy_price(wind_speed, rotor_area_m2: float, power_coefficient: float,
+                      air_density: float = 1.225,
+                      energy_value_per_kwh: float = 0.08) -> np.ndarray:
+    """
+    Daily economic value of a turbine's output: 0.5 ρ A Cp v³ × 24h × $/kWh.
+
+    Works elementwise on any array shape (one site or a site × day grid).
+    """
+    wind_speed = np.asarray(wind_speed, dtype=np.float64)  # m/s
+    
+    # Calculate power (Watts)
+    power_w = 0.5 * air_density * rotor_area_m2 * power_coefficient * (wind_speed ** 3)
+    
+    # Daily energy (kWh) = Power (W) × 24 hours / 1000
+    daily_energy_kwh = (power_w * 24) / 1000
+    
+    # Economic price ($/day)
+    return daily_energy_kwh * energy_value_per_kwh
+
+
+def clean_wind_data(raw: pd.DataFrame) -> pd.DataFrame:
+    """Drop days with invalid 50m wind speeds."""
+    original_len = len(raw)
+    df = raw[(raw['WS50M'] > 0) & (raw['WS50M'] < 50)].copy()  # Remove invalid values
+    removed = original_len - len(df)
+
+    if removed > 0:
+        warnings.warn(f"Removed {removed} days with invalid wind data")
+    return df
 
 
 class WindDataLoader(EnergyDataLoader):
@@ -104,6 +138,10 @@ class WindDataLoader(EnergyDataLoader):
         Air density in kg/m³ (default: 1.225 at sea level)
     energy_value_per_kwh : float
         Economic value per kWh (default: 0.08 = $0.08/kWh)
+    power_model : str, optional
+        Wind model in ``power_models`` (default: 'cubic')
+    model_params : Dict, optional
+        Extra parameters of the model, e.g. {'cut_out_ms': 22.0}
     
     Attributes
     ----------
@@ -138,6 +176,8 @@ class WindDataLoader(EnergyDataLoader):
         power_coefficient: float = None,
         air_density: float = 1.225,
         energy_value_per_kwh: float = 0.08,
+        power_model: Optional[str] = None,
+        model_params: Optional[Dict] = None,
     ):
         """
         Initialize wind data loader.
@@ -161,7 +201,13 @@ class WindDataLoader(EnergyDataLoader):
         power_coefficient : float, optional
             Power coefficient Cp. If None and location provided, uses preset.
             Otherwise defaults to 0.40.
+        power_model : str, optional
+            Wind model in ``power_models`` (default: 'cubic')
+        model_params : Dict, optional
+            Extra model parameters beyond the turbine specifications
         """
+        from .power_models import get_model
+
         # Handle location-based initialization
         if location_name is not None:
             location_data = get_location(location_name)
@@ -207,6 +253,9 @@ class WindDataLoader(EnergyDataLoader):
         self.power_coefficient = power_coefficient
         self.air_density = air_density
         self.energy_value = energy_value_per_kwh
+        self.power_model = get_model('wind', power_model)
+        self.model_params = dict(model_params or {})
+        self.power_model.check_params(self.model_params)
         
         # Validate specifications
         if power_coefficient <= 0 or power_coefficient > 0.593:  # Betz limit
@@ -231,95 +280,20 @@ class WindDataLoader(EnergyDataLoader):
             DataFrame with columns: WS10M, WS50M, WD10M, Price
             Index: DatetimeIndex with daily frequency
         """
-        # Check cache first
-        cache_dir = Path(__file__).parent.parent / 'data'
-        cache_file = cache_dir / f'nasa_wind_{self.lat}_{self.lon}_{self.start_year}_{self.end_year}.csv'
-        
-        if cache_file.exists():
-            try:
-                print(f"📁 Loading cached NASA wind data from {cache_file}")
-                df = pd.read_csv(cache_file, parse_dates=['Date'], index_col='Date')
-                if df.empty or 'WS50M' not in df.columns:
-                    raise ValueError("Cached file is invalid")
-                print(f"✅ Loaded {len(df)} days of cached wind data")
-                return df
-            except Exception as exc:
-                warnings.warn(f"Cache unusable ({exc}); refetching from API")
-        
-        # Fetch from NASA POWER API
-        base_url = "https://power.larc.nasa.gov/api/temporal/daily/point"
-        params = {
-            "parameters": "WS10M,WS50M,WD10M",  # Wind speed at 10m & 50m + direction
-            "community": "RE",                   # Renewable Energy
-            "longitude": self.lon,
-            "latitude": self.lat,
-            "start": f"{self.start_year}0101",
-            "end": f"{self.end_year}1231",
-            "format": "JSON"
-        }
-        
-        print(f"📡 Connecting to NASA MERRA-2 Data for Wind Speed ({self.lat}, {self.lon})...")
-        print(f"   Date Range: {self.start_year}-01-01 to {self.end_year}-12-31")
         print(f"   Hub Height: {self.hub_height}m (using WS50M parameter)")
         
-        response = None
-        for attempt in range(1, MAX_RETRIES + 1):
-            try:
-                response = requests.get(base_url, params=params, timeout=API_TIMEOUT)
-                response.raise_for_status()
-                break
-            except requests.exceptions.RequestException as e:
-                if attempt == MAX_RETRIES:
-                    raise ConnectionError(f"NASA API failed after {MAX_RETRIES} attempts: {e}")
-                sleep_for = RETRY_BACKOFF * attempt
-                warnings.warn(
-                    f"Attempt {attempt}/{MAX_RETRIES} failed. Retrying in {sleep_for:.1f}s"
-                )
-                time.sleep(sleep_for)
-        
-        if response is None:
-            raise ConnectionError("NASA API response is None")
-        
-        # Parse JSON response
-        try:
-            data = response.json()
-            properties = data['properties']
-            parameter = properties.get('parameter', {})
-            
-            ws10m_dict = parameter.get('WS10M')
-            ws50m_dict = parameter.get('WS50M')
-            wd10m_dict = parameter.get('WD10M')
-            
-            if not all([ws10m_dict, ws50m_dict, wd10m_dict]):
-                raise ValueError("Missing wind parameters in response")
-            
-            # Create DataFrame
-            df = pd.DataFrame({
-                'WS10M': pd.Series(ws10m_dict),
-                'WS50M': pd.Series(ws50m_dict),
-                'WD10M': pd.Series(wd10m_dict),
-            })
-            df.index = pd.to_datetime(df.index, format='%Y%m%d')
-            df.index.name = 'Date'
-            
-        except (KeyError, ValueError) as e:
-            raise ValueError(f"Failed to parse NASA API response: {e}")
-        
-        # Validate data
-        original_len = len(df)
-        df = df[(df['WS50M'] > 0) & (df['WS50M'] < 50)].copy()  # Remove invalid values
-        removed = original_len - len(df)
-        
-        if removed > 0:
-            warnings.warn(f"Removed {removed} days with invalid wind data")
+        # Only the days missing from the shared cache are downloaded
+        variables = WIND_VARIABLES + [v for v in self.power_model.variables
+                                      if v not in WIND_VARIABLES]
+        df = nasa_power.load_daily(
+            variables,
+            self.lat, self.lon,
+            f"{self.start_year}-01-01", f"{self.end_year}-12-31",
+            clean=clean_wind_data,
+        )
         
         print(f"✅ Loaded {len(df)} days of wind speed data")
         
-        # Cache for future use
-        cache_dir.mkdir(parents=True, exist_ok=True)
-        df.to_csv(cache_file)
-        print(f"💾 Cached data to {cache_file}")
-        
         return df
     
     def compute_price(
@@ -332,8 +306,8 @@ class WindDataLoader(EnergyDataLoader):
         """
         Convert wind speed to economic price.
         
-        Uses power curve formula:
-        P = 0.5 × ρ × A × Cp × v³ (Watts)
+        Runs the loader's ``power_model`` over the whole series; the
+        default 'cubic' model is P = 0.5 × ρ × A × Cp × v³ (Watts).
         
         Parameters
         ----------
@@ -353,25 +327,21 @@ class WindDataLoader(EnergyDataLoader):
         
         Notes
         -----
-        Power curve formula assumes Cp is constant (simplified).
-        Real turbines have variable Cp depending on wind speed.
+        The 'cubic' model assumes Cp is constant (simplified); use
+        power_model='power_curve' for cut-in, rated and cut-out behaviour.
         """
         Cp = power_coefficient or self.power_coefficient
         rho = air_density or self.air_density
         energy_val = energy_value_per_kwh or self.energy_value
         
-        wind_speed = df['WS50M'].values  # m/s
-        
-        # Calculate power (Watts)
-        power_w = 0.5 * rho * self.rotor_area * Cp * (wind_speed ** 3)
-        
-        # Daily energy (kWh) = Power (W) × 24 hours / 1000
-        daily_energy_kwh = (power_w * 24) / 1000
-        
-        # Economic price ($/day)
-        prices = daily_energy_kwh * energy_val
-        
-        return prices.astype(np.float64)
+        return self.power_model(
+            df,
+            rotor_diameter_m=self.rotor_diameter,
+            power_coefficient=Cp,
+            air_density=rho,
+            energy_value_per_kwh=energy_val,
+            **self.model_params,
+        )
     
     def load_parameters(
         self,
@@ -425,6 +395,7 @@ class WindDataLoader(EnergyDataLoader):
             'hub_height_m': self.hub_height,
             'rotor_area_m2': float(self.rotor_area),
             'power_coefficient': power_coefficient or self.power_coefficient,
+            'power_model': self.power_model.name,
         }
         params['data_source'] = 'NASA MERRA-2 (POWER API)'
         params['parameter'] = 'WS50M (Wind Speed at 50m hub height)'
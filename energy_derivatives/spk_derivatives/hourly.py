@@ -0,0 +1,255 @@
+"""
+Hourly-Resolution Data Mode
+===========================
+
+Intraday contracts need hourly prices: 24x the rows of the daily loaders,
+or ~175k rows per decade per site. Instead of building one large frame,
+hourly data flows through a generator pipeline:
+
+1. ``nasa_power.iter_hourly_chunks`` yields one calendar year at a time,
+   each year stored as its own cache partition ('hourly-<year>') and
+   fetched gap by gap
+2. ``iter_hourly_prices`` converts each chunk to prices with the loaders'
+   price kernels
+3. ``HourlyAggregator`` folds each chunk into running daily / monthly
+   statistics and drops it
+
+Only one year of hourly rows is in memory at any time; the output is the
+(much smaller) table of period statistics.
+
+Units: POWER hourly irradiance is Wh/m² per hour, wind speed m/s and
+precipitation mm per hour. Prices are $ per hour of output, so summing a
+day's hourly prices gives the daily loaders' $/day.
+
+Key Classes:
+-----------
+HourlyAggregator: Running per-period statistics over a chunk stream
+
+Key Functions:
+-----------
+hourly_price(): Hourly resource values -> $/hour
+iter_hourly_prices(): Stream of priced yearly chunks
+load_hourly_statistics(): Daily / monthly statistics for a site
+"""
+
+from typing import Dict, Iterable, Iterator, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from . import nasa_power
+from .bulk_fetch import ENERGY_TYPES
+from .cache import ColumnarCache
+from .region import PRICE_INPUTS, price_matrix
+
+STAT_COLUMNS = ['hours', 'mean', 'std', 'min', 'max', 'total', 'realized_vol']
+FREQ_NAMES = {'D': 'daily', 'M': 'monthly'}
+
+
+def hourly_price(energy_type: str, values, **price_kwargs) -> np.ndarray:
+    """
+    Convert hourly resource values to $ per hour.
+
+    The daily kernels price a day's resource; here they are rescaled to
+    one hour: irradiance Wh/m² -> kWh/m², wind power x 1h instead of 24h.
+    Hydro already prices a volume of water, so mm/hour needs no scaling.
+
+    Parameters
+    ----------
+    energy_type : str
+        'solar' (GHI), 'wind' (WS50M) or 'hydro' (PREC)
+    values : array_like
+        Hourly values of the resource variable
+    **price_kwargs
+        Technology overrides (see ``region.PRICE_INPUTS``)
+
+    Returns
+    -------
+    np.ndarray
+        $ per hour, same shape as ``values``
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if energy_type == 'solar':
+        return price_matrix('solar', values / 1000.0, **price_kwargs)
+    if energy_type == 'wind':
+        return price_matrix('wind', values, **price_kwargs) / 24.0
+    return price_matrix(energy_type, values, **price_kwargs)
+
+
+def iter_hourly_prices(energy_type: str, lat: float, lon: float, start, end,
+                       store: Optional[ColumnarCache] = None,
+                       cache: bool = True,
+                       base_url: Optional[str] = None,
+                       **price_kwargs) -> Iterator[pd.DataFrame]:
+    """
+    Yield yearly chunks of hourly data with a 'Price' column.
+
+    Parameters
+    ----------
+    energy_type : str
+        'solar', 'wind' or 'hydro'
+    lat, lon : float
+        Location
+    start, end : date-like
+        Inclusive window (whole days)
+    store : ColumnarCache, optional
+        Cache for the yearly partitions (default: ``default_cache()``)
+    cache : bool
+        Read and fill the cache
+    base_url : str, optional
+        Daily endpoint override (the hourly one is derived from it)
+    **price_kwargs
+        Technology overrides
+
+    Yields
+    ------
+    pd.DataFrame
+        Cleaned hourly variables plus 'Price', one calendar year per chunk
+    """
+    if energy_type not in ENERGY_TYPES:
+        raise ValueError(f"Unknown energy_type: {energy_type}. Choose from: {sorted(ENERGY_TYPES)}")
+    variables, clean = ENERGY_TYPES[energy_type]
+    column, _ = PRICE_INPUTS[energy_type]
+
+    for chunk in nasa_power.iter_hourly_chunks(variables, lat, lon, start, end, clean=clean,
+                                               store=store, cache=cache, base_url=base_url):
+        chunk = chunk.copy()
+        chunk['Price'] = hourly_price(energy_type, chunk[column].to_numpy(), **price_kwargs)
+        yield chunk
+
+
+class HourlyAggregator:
+    """
+    Per-period statistics accumulated chunk by chunk.
+
+    Keeps only additive partial sums per period (count, sum, sum of
+    squares, min, max, sum of squared log returns), so chunks may arrive in
+    any size and a period split across two chunks is combined exactly.
+
+    Parameters
+    ----------
+    freqs : Sequence[str]
+        Period frequencies: 'D' (daily) and/or 'M' (monthly)
+    column : str
+        Column to aggregate
+    """
+
+    def __init__(self, freqs: Sequence[str] = ('D', 'M'), column: str = 'Price'):
+        unknown = [f for f in freqs if f not in FREQ_NAMES]
+        if unknown:
+            raise ValueError(f"Unsupported freqs: {unknown}. Choose from: {sorted(FREQ_NAMES)}")
+        self.freqs = tuple(freqs)
+        self.column = column
+        self.rows = 0
+        self._partials: Dict[str, list] = {f: [] for f in self.freqs}
+        self._last_value: Optional[float] = None
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Fold one time-ordered chunk into the running statistics."""
+        if chunk.empty:
+            return
+        values = chunk[self.column].to_numpy(dtype=np.float64)
+        previous = np.concatenate([[np.nan if self._last_value is None else self._last_value],
+                                   values[:-1]])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = np.log(values / previous)
+        r2 = np.where(np.isfinite(returns), returns ** 2, 0.0)
+
+        frame = pd.DataFrame({
+            'hours': np.isfinite(values).astype(np.int64),
+            'sum': np.nan_to_num(values),
+            'sumsq': np.nan_to_num(values) ** 2,
+            'min': values,
+            'max': values,
+            'r2': r2,
+        }, index=chunk.index)
+        for freq in self.freqs:
+            grouped = frame.groupby(chunk.index.to_period(freq))
+            self._partials[freq].append(grouped.agg({
+                'hours': 'sum', 'sum': 'sum', 'sumsq': 'sum',
+                'min': 'min', 'max': 'max', 'r2': 'sum',
+            }))
+
+        self.rows += len(chunk)
+        self._last_value = float(values[-1])
+
+    def consume(self, chunks: Iterable[pd.DataFrame]) -> 'HourlyAggregator':
+        """Update with every chunk of an iterable (e.g. ``iter_hourly_prices``)."""
+        for chunk in chunks:
+            self.update(chunk)
+        return self
+
+    def result(self) -> Dict[str, pd.DataFrame]:
+        """
+        Statistics per period.
+
+        Returns
+        -------
+        Dict[str, pd.DataFrame]
+            'daily' / 'monthly' -> DataFrame indexed by period start with
+            columns hours, mean, std, min, max, total, realized_vol
+            (square root of the summed squared hourly log returns)
+        """
+        out = {}
+        for freq in self.freqs:
+            if not self._partials[freq]:
+                out[FREQ_NAMES[freq]] = pd.DataFrame(columns=STAT_COLUMNS)
+                continue
+            p = pd.concat(self._partials[freq]).groupby(level=0).agg({
+                'hours': 'sum', 'sum': 'sum', 'sumsq': 'sum',
+                'min': 'min', 'max': 'max', 'r2': 'sum',
+            })
+            n = p['hours'].to_numpy(dtype=np.float64)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                mean = p['sum'] / n
+                var = (p['sumsq'] - p['sum'] ** 2 / n) / (n - 1)
+            stats = pd.DataFrame({
+                'hours': p['hours'],
+                'mean': mean,
+                'std': np.sqrt(var.clip(lower=0)),
+                'min': p['min'],
+                'max': p['max'],
+                'total': p['sum'],
+                'realized_vol': np.sqrt(p['r2']),
+            })
+            stats.index = p.index.to_timestamp()
+            stats.index.name = 'Date'
+            out[FREQ_NAMES[freq]] = stats
+        return out
+
+
+def load_hourly_statistics(energy_type: str, lat: float, lon: float, start, end,
+                           freqs: Sequence[str] = ('D', 'M'),
+                           store: Optional[ColumnarCache] = None,
+                           cache: bool = True,
+                           base_url: Optional[str] = None,
+                           **price_kwargs) -> Dict[str, pd.DataFrame]:
+    """
+    Daily / monthly statistics of hourly prices, streamed year by year.
+
+    Parameters
+    ----------
+    energy_type : str
+        'solar', 'wind' or 'hydro'
+    lat, lon : float
+        Location
+    start, end : date-like
+        Inclusive window (whole days)
+    freqs : Sequence[str]
+        'D' and/or 'M'
+    store, cache, base_url, **price_kwargs
+        See ``iter_hourly_prices``
+
+    Returns
+    -------
+    Dict[str, pd.DataFrame]
+        See ``HourlyAggregator.result``
+
+    Example
+    -------
+    >>> stats = load_hourly_statistics('wind', 57.05, 9.92, '2001-01-01', '2024-12-31')
+    >>> stats['monthly'][['mean', 'std', 'realized_vol']].tail()
+    """
+    chunks = iter_hourly_prices(energy_type, lat, lon, start, end, store=store,
+                                cache=cache, base_url=base_url, **price_kwargs)
+    return HourlyAggregator(freqs).consume(chunks).result()
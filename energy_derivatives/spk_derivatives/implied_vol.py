@@ -0,0 +1,251 @@
+"""
+Implied Volatility from Quoted Prices
+=====================================
+
+Inverts the pricing engines: given market quotes for energy claims, solve
+for the volatility sigma that reproduces each quoted price.
+
+The solver is a vectorized Newton/bisection hybrid. Every quote keeps its
+own bracket [lo, hi]; each iteration takes a Newton step where it stays
+inside the bracket and the vega is usable, and a bisection step otherwise,
+so it converges quadratically near the root but can never diverge. All
+quotes are updated together, one batched pricing call per iteration.
+
+- method='analytic': closed-form prices with analytic vega (``analytic``)
+- method='binomial': batched lattice prices (``binomial.price_batch``)
+  with a batched finite-difference vega
+
+Quotes that cannot be inverted are flagged rather than raising:
+
+- 'below_intrinsic': price under the no-arbitrage lower bound
+- 'above_upper_bound': price at or above the spot price
+- 'below_bracket' / 'above_bracket': price outside the model prices at
+  the ends of ``sigma_bounds``, so no sigma in the bracket reproduces it
+- 'no_vega': payoff has no volatility exposure (redeemable claims)
+- 'low_vega': price is flat in sigma at the solution (deep ITM/OTM), so
+  the quote does not pin down a volatility
+- 'max_iter': bracket did not shrink to tolerance in time
+- 'residual': the solved sigma does not reprice the quote to within
+  tolerance
+
+Key Functions:
+-----------
+implied_volatility(): Solve sigma for a batch of quotes
+implied_params(): Convert solved rows to GreeksCalculator / stress-test kwargs
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple
+
+from .analytic import bs_price, bs_vega
+from .binomial import price_batch
+
+FLAG_OK = 'ok'
+FLAG_BELOW_INTRINSIC = 'below_intrinsic'
+FLAG_ABOVE_UPPER = 'above_upper_bound'
+FLAG_NO_VEGA = 'no_vega'
+FLAG_LOW_VEGA = 'low_vega'
+FLAG_MAX_ITER = 'max_iter'
+FLAG_BELOW_BRACKET = 'below_bracket'
+FLAG_ABOVE_BRACKET = 'above_bracket'
+FLAG_RESIDUAL = 'residual'
+
+# Below this vega (relative to S0) the price is flat in sigma to within
+# floating-point noise, so the quote does not identify a volatility
+MIN_RELATIVE_VEGA = 1e-8
+
+
+def _pricer(method: str, payoff_type: str, N: int):
+    """Return (price_fn, vega_fn) operating on flat arrays."""
+    if method == 'analytic':
+        def price_fn(S, K, T, r, sigma):
+            return bs_price(S, K, T, r, sigma, payoff_type)
+
+        def vega_fn(S, K, T, r, sigma, price):
+            return bs_vega(S, K, T, r, sigma, payoff_type)
+    elif method == 'binomial':
+        def price_fn(S, K, T, r, sigma):
+            return price_batch(S, K, T, r, sigma, N=N, payoff_type=payoff_type)
+
+        def vega_fn(S, K, T, r, sigma, price):
+            h = np.maximum(1e-4, 1e-3 * sigma)
+            return (price_batch(S, K, T, r, sigma + h, N=N, payoff_type=payoff_type) - price) / h
+    else:
+        raise ValueError(f"Unknown method: {method}")
+    return price_fn, vega_fn
+
+
+def _no_arbitrage_bounds(S, K, T, r) -> Tuple[np.ndarray, np.ndarray]:
+    """Call price bounds: max(S - K e^{-rT}, 0) <= C < S."""
+    return np.maximum(S - K * np.exp(-r * T), 0.0), S
+
+
+def implied_volatility(prices, S0, K, T, r,
+                       payoff_type: str = 'call',
+                       method: str = 'analytic',
+                       N: int = 100,
+                       tol: float = 1e-8,
+                       max_iter: int = 100,
+                       sigma_bounds: Tuple[float, float] = (1e-4, 5.0)) -> pd.DataFrame:
+    """
+    Solve implied volatility for a batch of quoted prices.
+
+    Parameters
+    ----------
+    prices : array_like
+        Quoted prices
+    S0, K, T, r : array_like
+        Contract parameters, broadcast against ``prices``
+    payoff_type : str
+        'call' or 'redeemable'
+    method : str
+        'analytic' (closed form + analytic vega) or 'binomial' (batched lattice)
+    N : int
+        Tree steps for method='binomial'
+    tol : float
+        Tolerance on sigma (price error / vega, and final bracket width);
+        the final price error must also be within tol * max(vega, 1)
+    max_iter : int
+        Maximum iterations
+    sigma_bounds : Tuple[float, float]
+        Initial search bracket for sigma
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per quote (flattened broadcast order): S0, K, T, r, sigma,
+        payoff_type, price, model_price, iterations, converged, flag
+
+    Example
+    -------
+    >>> iv = implied_volatility([0.0045, 0.0060], S0=0.035, K=0.040, T=1.0, r=0.025)
+    >>> iv[['K', 'sigma', 'flag']]
+    """
+    if payoff_type not in ('call', 'redeemable'):
+        raise ValueError(f"Unknown payoff_type: {payoff_type}")
+    price_fn, vega_fn = _pricer(method, payoff_type, N)
+
+    target, S, K_, T_, r_ = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (prices, S0, K, T, r))
+    )
+    target, S, K_, T_, r_ = (x.ravel().copy() for x in (target, S, K_, T_, r_))
+    n = target.size
+
+    sigma = np.full(n, np.nan)
+    flags = np.full(n, FLAG_OK, dtype=object)
+    iterations = np.zeros(n, dtype=int)
+
+    # Screen quotes that cannot be inverted
+    if payoff_type == 'redeemable':
+        flags[:] = FLAG_NO_VEGA
+    else:
+        lower, upper = _no_arbitrage_bounds(S, K_, T_, r_)
+        flags[target < lower - tol * S] = FLAG_BELOW_INTRINSIC
+        flags[target >= upper] = FLAG_ABOVE_UPPER
+    active = flags == FLAG_OK
+
+    lo = np.full(n, float(sigma_bounds[0]))
+    hi = np.full(n, float(sigma_bounds[1]))
+    if method == 'binomial':
+        # Keep the lattice's risk-neutral probability inside [0, 1]
+        lo = np.maximum(lo, 1.0001 * np.abs(r_) * np.sqrt(T_ / N))
+
+    # Brenner-Subrahmanyam ATM approximation as the starting point
+    with np.errstate(divide='ignore', invalid='ignore'):
+        guess = np.sqrt(2 * np.pi / T_) * target / S
+    # Quotes outside the model prices at the bracket ends have no root in it
+    idx = np.flatnonzero(active)
+    if idx.size:
+        args = (S[idx], K_[idx], T_[idx], r_[idx])
+        price_lo, price_hi = price_fn(*args, lo[idx]), price_fn(*args, hi[idx])
+        flags[idx[target[idx] < price_lo]] = FLAG_BELOW_BRACKET
+        flags[idx[target[idx] > price_hi]] = FLAG_ABOVE_BRACKET
+        active = flags == FLAG_OK
+
+    sigma = np.where(active, np.clip(np.nan_to_num(guess, nan=0.3), lo * 1.01, hi * 0.99), np.nan)
+
+    for _ in range(max_iter):
+        idx = np.flatnonzero(active)
+        if idx.size == 0:
+            break
+        s_S, s_K, s_T, s_r, s_sig = S[idx], K_[idx], T_[idx], r_[idx], sigma[idx]
+        model = price_fn(s_S, s_K, s_T, s_r, s_sig)
+        diff = model - target[idx]
+        iterations[idx] += 1
+
+        # Prices increase in sigma: shrink the bracket around the root
+        hi[idx] = np.where(diff > 0, s_sig, hi[idx])
+        lo[idx] = np.where(diff <= 0, s_sig, lo[idx])
+
+        vega = vega_fn(s_S, s_K, s_T, s_r, s_sig, model)
+        # Converged once the price error maps to a sigma error below tol, so
+        # cheap far-OTM quotes are solved to the same sigma accuracy as ATM
+        done = (diff == 0) | (np.abs(diff) < tol * vega)
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            newton = s_sig - diff / vega
+        use_newton = (vega > 0) & (newton > lo[idx]) & (newton < hi[idx])
+        step = np.where(use_newton, newton, 0.5 * (lo[idx] + hi[idx]))
+
+        done |= (hi[idx] - lo[idx]) < tol
+        sigma[idx] = np.where(done, s_sig, step)
+        active[idx[done]] = False
+
+    flags[active] = FLAG_MAX_ITER
+    solved = np.flatnonzero(np.isin(flags, (FLAG_OK, FLAG_MAX_ITER)))
+    if solved.size:
+        vega = vega_fn(S[solved], K_[solved], T_[solved], r_[solved], sigma[solved],
+                       price_fn(S[solved], K_[solved], T_[solved], r_[solved], sigma[solved]))
+        flags[solved[vega < MIN_RELATIVE_VEGA * S[solved]]] = FLAG_LOW_VEGA
+    model_price = np.full(n, np.nan)
+    solved = np.flatnonzero(flags == FLAG_OK)
+    if solved.size:
+        args = (S[solved], K_[solved], T_[solved], r_[solved], sigma[solved])
+        model_price[solved] = price_fn(*args)
+        vega = vega_fn(*args, model_price[solved])
+        residual = np.abs(model_price[solved] - target[solved])
+        flags[solved[~(residual <= tol * np.maximum(vega, 1.0))]] = FLAG_RESIDUAL
+    converged = flags == FLAG_OK
+    sigma = np.where(converged, sigma, np.nan)
+    model_price = np.where(converged, model_price, np.nan)
+
+    return pd.DataFrame({
+        'S0': S,
+        'K': K_,
+        'T': T_,
+        'r': r_,
+        'sigma': sigma,
+        'payoff_type': payoff_type,
+        'price': target,
+        'model_price': model_price,
+        'iterations': iterations,
+        'converged': converged,
+        'flag': flags,
+    })
+
+
+def implied_params(iv_df: pd.DataFrame, include_payoff: bool = False) -> List[Dict]:
+    """
+    Convert converged rows into keyword dicts for the pricing tools.
+
+    The dicts can be splatted straight into ``GreeksCalculator(**p)`` or
+    ``analysis.stress_test_rates(**p)`` style calls.
+
+    Parameters
+    ----------
+    iv_df : pd.DataFrame
+        Output of ``implied_volatility``
+    include_payoff : bool
+        Include 'payoff_type' (accepted by GreeksCalculator, not by every helper)
+
+    Returns
+    -------
+    List[Dict]
+        One dict per converged quote with S0, K, T, r, sigma
+    """
+    cols = ['S0', 'K', 'T', 'r', 'sigma'] + (['payoff_type'] if include_payoff else [])
+    solved = iv_df.loc[iv_df['converged'], cols]
+    return [
+        {k: (float(v) if k != 'payoff_type' else v) for k, v in row.items()}
+        for row in solved.to_dict(orient='records')
+    ]
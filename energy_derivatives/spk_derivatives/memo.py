@@ -0,0 +1,346 @@
+"""
+Memoized Parameter Loading
+==========================
+
+Caches the output of the parameter pipelines so repeated calls with the
+same inputs skip fetching, price computation and volatility estimation:
+
+- ``EnergyDataLoader.load_parameters`` (wind, hydro loaders)
+- ``data_loader_nasa.load_solar_parameters``
+- ``data_loader.load_parameters`` (CEIR CSVs)
+
+Results are keyed by a content hash of everything that determines them:
+the loader class, its constructor arguments, the ``load_parameters``
+kwargs and a version of the underlying data. For the NASA loaders the data
+version is ``ColumnarCache.data_version()``; for CEIR it is the name, size
+and modification time of every CSV in the resolved data directory. When
+the data changes the key changes, so stale results are never served and
+need no explicit invalidation.
+
+Two tiers:
+
+- in-process LRU (``maxsize`` entries)
+- optional on-disk pickle store (``disk_dir``, or $SPK_MEMO_DIR for the
+  shared instance), so results survive restarts and are shared by workers
+
+Returned dicts are shallow copies: callers may add or replace keys, but
+the DataFrames and arrays inside are shared and must not be mutated.
+
+Key Classes:
+-----------
+MemoCache: Two-tier (memory LRU + disk) result cache
+
+Key Functions:
+-----------
+content_key(): Stable hash of arbitrary JSON-like inputs
+memoized_loader_parameters(): Memoized EnergyDataLoader.load_parameters
+memoized_solar_parameters(): Memoized data_loader_nasa.load_solar_parameters
+memoized_ceir_parameters(): Memoized data_loader.load_parameters
+default_memo(): Shared MemoCache instance
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+import warnings
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Type
+
+from .cache import _atomic_write, default_cache
+
+DEFAULT_MAXSIZE = 64
+DEFAULT_MAX_DISK_ENTRIES = 256
+
+_MISSING = object()
+
+
+def _canonical(value: Any) -> Any:
+    """JSON-serializable, order-independent form of ``value``."""
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted(_canonical(v) for v in value)
+    if isinstance(value, type):
+        return f"{value.__module__}.{value.__qualname__}"
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if hasattr(value, 'item'):  # numpy scalars
+        return value.item()
+    return repr(value)
+
+
+def content_key(*parts: Any) -> str:
+    """
+    Stable SHA-256 key for a set of inputs.
+
+    Dict ordering does not matter; classes hash by qualified name and
+    other objects by ``repr``.
+
+    Returns
+    -------
+    str
+        Hex digest
+    """
+    payload = json.dumps(_canonical(list(parts)), sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class MemoCache:
+    """
+    Two-tier result cache: in-process LRU plus an optional pickle store.
+
+    Parameters
+    ----------
+    maxsize : int
+        Entries kept in memory
+    disk_dir : str or Path, optional
+        Directory for the on-disk tier (default: memory only)
+    max_disk_entries : int
+        Files kept on disk; the oldest are pruned beyond this
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE,
+                 disk_dir=None,
+                 max_disk_entries: int = DEFAULT_MAX_DISK_ENTRIES):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.disk_dir = Path(disk_dir) if disk_dir is not None else None
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+        self.max_disk_entries = max_disk_entries
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / f"{key}.pkl"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Cached value for ``key`` (memory first, then disk), else ``default``."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        if self.disk_dir is not None:
+            path = self._disk_path(key)
+            if path.exists():
+                try:
+                    with open(path, 'rb') as fh:
+                        value = pickle.load(fh)
+                except Exception as exc:  # noqa: BLE001
+                    warnings.warn(f"Memo entry {path.name} unreadable ({exc}); ignoring it")
+                else:
+                    with self._lock:
+                        self.disk_hits += 1
+                        self._remember(key, value)
+                    return value
+
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def put(self, key: str, value: Any) -> None:
+        """Store ``value`` in memory and, if enabled, on disk."""
+        with self._lock:
+            self._remember(key, value)
+        if self.disk_dir is not None:
+            def write(tmp):
+                with open(tmp, 'wb') as fh:
+                    pickle.dump(value, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            _atomic_write(self._disk_path(key), write)
+            self._prune_disk()
+
+    def _remember(self, key: str, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _prune_disk(self) -> None:
+        files = sorted(self.disk_dir.glob('*.pkl'), key=lambda p: p.stat().st_mtime)
+        for path in files[:max(0, len(files) - self.max_disk_entries)]:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._entries.clear()
+            if self.disk_dir is not None:
+                for path in self.disk_dir.glob('*.pkl'):
+                    path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict:
+        """Hit / miss counters and sizes."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'disk_dir': str(self.disk_dir) if self.disk_dir is not None else None,
+            }
+
+
+_default_memo: Optional[MemoCache] = None
+
+
+def default_memo() -> MemoCache:
+    """
+    Shared memo cache.
+
+    Memory only unless the ``SPK_MEMO_DIR`` environment variable names a
+    directory for the disk tier.
+    """
+    global _default_memo
+    disk_dir = os.environ.get('SPK_MEMO_DIR')
+    current = str(_default_memo.disk_dir) if _default_memo and _default_memo.disk_dir else None
+    if _default_memo is None or current != disk_dir:
+        _default_memo = MemoCache(disk_dir=disk_dir)
+    return _default_memo
+
+
+def _memoized(make_key, version, compute, memo: Optional[MemoCache]) -> Dict:
+    """
+    Look up ``make_key(version())``; on a miss compute and store.
+
+    The result is stored under the version read *after* computing, since
+    computing may itself fill the data cache (a first load fetches data).
+    """
+    memo = memo if memo is not None else default_memo()
+    params = memo.get(make_key(version()), _MISSING)
+    if params is _MISSING:
+        params = compute()
+        memo.put(make_key(version()), params)
+    return dict(params)
+
+
+def memoized_loader_parameters(loader_cls: Type,
+                               init_kwargs: Optional[Dict] = None,
+                               memo: Optional[MemoCache] = None,
+                               **load_kwargs) -> Dict:
+    """
+    Memoized ``loader_cls(**init_kwargs).load_parameters(**load_kwargs)``.
+
+    Parameters
+    ----------
+    loader_cls : type
+        EnergyDataLoader subclass (e.g. WindDataLoader)
+    init_kwargs : Dict, optional
+        Constructor arguments
+    memo : MemoCache, optional
+        Result cache (default: ``default_memo()``)
+    **load_kwargs
+        Passed to ``load_parameters`` (T, r, volatility_method, ...)
+
+    Returns
+    -------
+    Dict
+        Same as ``load_parameters``
+
+    Example
+    -------
+    >>> params = memoized_loader_parameters(WindDataLoader, {'location_name': 'Aalborg'}, r=0.03)
+    """
+    init_kwargs = dict(init_kwargs or {})
+    store = default_cache()  # the cache the loaders read through
+    return _memoized(
+        lambda version: content_key('loader', loader_cls, init_kwargs, load_kwargs, version),
+        store.data_version,
+        lambda: loader_cls(**init_kwargs).load_parameters(**load_kwargs),
+        memo,
+    )
+
+
+def memoized_solar_parameters(memo: Optional[MemoCache] = None, **kwargs) -> Dict:
+    """
+    Memoized ``data_loader_nasa.load_solar_parameters(**kwargs)``.
+
+    Keyed like ``memoized_loader_parameters``: the kwargs plus
+    ``ColumnarCache.data_version()``.
+
+    Example
+    -------
+    >>> params = memoized_solar_parameters(lat=24.99, lon=121.30, r=0.03)
+    """
+    from .data_loader_nasa import load_solar_parameters
+
+    store = default_cache()
+    return _memoized(
+        lambda version: content_key('solar', kwargs, version),
+        store.data_version,
+        lambda: load_solar_parameters(**kwargs),
+        memo,
+    )
+
+
+def ceir_data_version(data_dir: str = '../empirical', use_repo_fallback: bool = True) -> str:
+    """Fingerprint of the CEIR CSVs ``load_parameters`` would read."""
+    from .data_loader import _resolve_data_directory
+
+    resolved = _resolve_data_directory(data_dir, use_repo_fallback=use_repo_fallback, warn=False)
+    if resolved is None:
+        return 'synthetic'
+    files = [
+        (p.name, st.st_size, st.st_mtime_ns)
+        for p in sorted(resolved.glob('*.csv'))
+        for st in (p.stat(),)
+    ]
+    return content_key(str(resolved.resolve()), files)
+
+
+def memoized_ceir_parameters(data_dir: str = '../empirical',
+                             T: float = 1.0,
+                             r: float = 0.05,
+                             use_repo_fallback: bool = True,
+                             use_live_if_missing: bool = False,
+                             memo: Optional[MemoCache] = None) -> Dict:
+    """
+    Memoized ``data_loader.load_parameters``.
+
+    Keyed on the arguments and ``ceir_data_version``, so editing or
+    replacing a CSV is picked up on the next call. Live fetches (no local
+    data and ``use_live_if_missing``) are not memoized. Without local data
+    the synthetic fallback is drawn once and reused.
+
+    Parameters
+    ----------
+    data_dir, T, r, use_repo_fallback, use_live_if_missing
+        See ``data_loader.load_parameters``
+    memo : MemoCache, optional
+        Result cache (default: ``default_memo()``)
+
+    Returns
+    -------
+    Dict
+        Same as ``data_loader.load_parameters``
+    """
+    from .data_loader import load_parameters
+
+    def compute() -> Dict:
+        return load_parameters(data_dir=data_dir, T=T, r=r,
+                               use_repo_fallback=use_repo_fallback,
+                               use_live_if_missing=use_live_if_missing)
+
+    version = ceir_data_version(data_dir, use_repo_fallback)
+    if version == 'synthetic' and use_live_if_missing:
+        return compute()
+    return _memoized(
+        lambda v: content_key('ceir', data_dir, T, r, use_repo_fallback, v),
+        lambda: ceir_data_version(data_dir, use_repo_fallback),
+        compute,
+        memo,
+    )
@@ -16,6 +16,10 @@ simulate_paths(): Generate GBM price paths
 compute_price(): Price via path averaging
 confidence_interval(): Compute confidence bounds
 stress_test(): Evaluate performance under different volatilities
+
+Key Functions:
+-----------
+price_batch(): Price many contracts at once on shared draws
 """
 
 import numpy as np
@@ -24,6 +28,8 @@ from typing import Tuple, Dict, List, Optional
 from scipy import stats
 import warnings
 
+from .profiling import phase
+
 
 class MonteCarloSimulator:
     """
@@ -109,26 +115,28 @@ class MonteCarloSimulator:
         dt = self.T / num_steps
         
         if return_paths:
-            # Return full paths
-            paths = np.zeros((self.num_simulations, num_steps + 1))
-            paths[:, 0] = self.S0
-            
-            for step in range(1, num_steps + 1):
-                Z = self.rng.normal(0, 1, self.num_simulations)
-                paths[:, step] = paths[:, step-1] * np.exp(
-                    (self.r - 0.5 * self.sigma ** 2) * dt + 
-                    self.sigma * np.sqrt(dt) * Z
-                )
+            # Return full paths: draw all steps at once (same stream order as
+            # one draw per step) and accumulate log-increments along time
+            with phase('monte_carlo', 'rng'):
+                Z = self.rng.normal(0, 1, (num_steps, self.num_simulations)).T
+            with phase('monte_carlo', 'paths'):
+                log_increments = ((self.r - 0.5 * self.sigma ** 2) * dt +
+                                  self.sigma * np.sqrt(dt) * Z)
+                paths = np.empty((self.num_simulations, num_steps + 1))
+                paths[:, 0] = self.S0
+                paths[:, 1:] = self.S0 * np.exp(np.cumsum(log_increments, axis=1))
             
             self.terminal_prices = paths[:, -1]
             return paths
         else:
             # Compute terminal prices only (more efficient)
-            Z = self.rng.normal(0, 1, self.num_simulations)
-            self.terminal_prices = self.S0 * np.exp(
-                (self.r - 0.5 * self.sigma ** 2) * self.T + 
-                self.sigma * np.sqrt(self.T) * Z
-            )
+            with phase('monte_carlo', 'rng'):
+                Z = self.rng.normal(0, 1, self.num_simulations)
+            with phase('monte_carlo', 'paths'):
+                self.terminal_prices = self.S0 * np.exp(
+                    (self.r - 0.5 * self.sigma ** 2) * self.T + 
+                    self.sigma * np.sqrt(self.T) * Z
+                )
             return None
     
     def _compute_payoffs(self) -> np.ndarray:
@@ -143,12 +151,13 @@ class MonteCarloSimulator:
         if self.terminal_prices is None:
             raise RuntimeError("Must call simulate_paths() first")
         
-        if self.payoff_type == 'call':
-            payoffs = np.maximum(self.terminal_prices - self.K, 0)
-        elif self.payoff_type == 'redeemable':
-            payoffs = self.terminal_prices.copy()
-        else:
-            raise ValueError(f"Unknown payoff_type: {self.payoff_type}")
+        with phase('monte_carlo', 'payoff'):
+            if self.payoff_type == 'call':
+                payoffs = np.maximum(self.terminal_prices - self.K, 0)
+            elif self.payoff_type == 'redeemable':
+                payoffs = self.terminal_prices.copy()
+            else:
+                raise ValueError(f"Unknown payoff_type: {self.payoff_type}")
         
         self.payoffs = payoffs
         return payoffs
@@ -175,7 +184,8 @@ class MonteCarloSimulator:
         if self.payoffs is None:
             self._compute_payoffs()
         
-        price = np.exp(-self.r * self.T) * np.mean(self.payoffs)
+        with phase('monte_carlo', 'statistics'):
+            price = np.exp(-self.r * self.T) * np.mean(self.payoffs)
         self._price_cache = price
         return price
     
@@ -202,12 +212,13 @@ class MonteCarloSimulator:
         if self.payoffs is None:
             self._compute_payoffs()
         
-        # Discount payoffs
-        pv_payoffs = np.exp(-self.r * self.T) * self.payoffs
-        
-        mean_price = np.mean(pv_payoffs)
-        std_price = np.std(pv_payoffs)
-        se = std_price / np.sqrt(self.num_simulations)
+        with phase('monte_carlo', 'statistics'):
+            # Discount payoffs
+            pv_payoffs = np.exp(-self.r * self.T) * self.payoffs
+            
+            mean_price = np.mean(pv_payoffs)
+            std_price = np.std(pv_payoffs)
+            se = std_price / np.sqrt(self.num_simulations)
         
         # Critical value
         alpha = 1 - confidence
@@ -365,3 +376,71 @@ def price_energy_derivative_mc(S0: float, K: float, T: float, r: float, sigma: f
     """
     sim = MonteCarloSimulator(S0, K, T, r, sigma, num_simulations, payoff_type=payoff_type)
     return sim.confidence_interval()
+
+
+def price_batch(S0, K, T, r, sigma, num_simulations: int = 10000,
+                payoff_type: str = 'call', seed: Optional[int] = None,
+                max_elements: int = 2 ** 22) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Price a batch of contracts by Monte-Carlo on shared draws.
+
+    All inputs broadcast to a common batch shape. One set of standard
+    normals is drawn and reused by every contract (common random numbers),
+    so each price equals ``MonteCarloSimulator(..., seed=seed).price()``
+    for the same seed, and differences between contracts carry no
+    sampling noise of their own. Terminal prices are evaluated in row
+    chunks of at most ``max_elements`` values to bound memory.
+
+    Parameters
+    ----------
+    S0, K, T, r, sigma : array_like
+        Contract parameters (broadcast against each other)
+    num_simulations : int
+        Draws per contract (shared by the batch)
+    payoff_type : str
+        'call' or 'redeemable'
+    seed : int, optional
+        Random seed
+    max_elements : int
+        Largest (contracts x draws) block evaluated at once
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        (prices, standard errors), each with the broadcast batch shape
+    """
+    S0, K, T, r, sigma = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (S0, K, T, r, sigma))
+    )
+    shape = S0.shape
+    S0, K, T, r, sigma = (x.reshape(-1, 1) for x in (S0, K, T, r, sigma))
+
+    if np.any(S0 <= 0):
+        raise ValueError("S0 must be positive")
+    if np.any(T <= 0):
+        raise ValueError("T must be positive")
+    if np.any(sigma <= 0):
+        raise ValueError("sigma must be positive")
+    if num_simulations < 1:
+        raise ValueError("num_simulations must be at least 1")
+    if payoff_type not in ('call', 'redeemable'):
+        raise ValueError(f"Unknown payoff_type: {payoff_type}")
+
+    with phase('monte_carlo', 'rng'):
+        Z = np.random.default_rng(seed).normal(0, 1, num_simulations)
+    prices = np.empty(len(S0))
+    errors = np.empty(len(S0))
+    rows = max(1, max_elements // num_simulations)
+    for lo in range(0, len(S0), rows):
+        sl = slice(lo, lo + rows)
+        with phase('monte_carlo', 'paths'):
+            terminal = S0[sl] * np.exp((r[sl] - 0.5 * sigma[sl] ** 2) * T[sl] +
+                                       sigma[sl] * np.sqrt(T[sl]) * Z)
+        with phase('monte_carlo', 'payoff'):
+            payoffs = np.maximum(terminal - K[sl], 0) if payoff_type == 'call' else terminal
+        with phase('monte_carlo', 'statistics'):
+            pv = np.exp(-r[sl] * T[sl]) * payoffs
+            prices[sl] = pv.mean(axis=1)
+            errors[sl] = pv.std(axis=1) / np.sqrt(num_simulations)
+
+    return prices.reshape(shape), errors.reshape(shape)
@@ -0,0 +1,384 @@
+"""
+NASA POWER Daily API Client
+===========================
+
+Shared request, retry and parsing logic for the solar, wind and hydro
+loaders, plus coverage-aware loading on top of the columnar cache.
+
+``load_daily`` asks the cache which parts of the requested window are
+missing for a (location, parameter set), downloads only those gaps and
+merges them into the stored series. Extending a window by a year fetches
+that year; a sub-range of a cached window fetches nothing; a daily refresh
+fetches one day. The end of the window is clamped to yesterday, since
+POWER has no data for today or the future.
+
+Key Classes:
+-----------
+RetryBudget: Shared cap on retries across concurrent requests
+
+Key Functions:
+-----------
+fetch_daily(): One API request for a date range (with retries)
+fetch_hourly(): Same for hourly values (one row per UTC hour)
+load_daily(): Cache-aware load that only downloads missing days
+missing_days(): Date ranges a load would download
+latest_available_date(): Last day a request may end on
+power_url(): Endpoint in effect (argument, environment, or live API)
+iter_hourly_chunks(): Hourly series one cached year at a time
+"""
+
+import os
+import threading
+import time
+import warnings
+from typing import Callable, Iterator, List, Optional, Sequence
+
+import pandas as pd
+import requests
+
+from .cache import ONE_DAY, ColumnarCache, default_cache
+
+# --- CONFIGURATION ---
+POWER_DAILY_URL = "https://power.larc.nasa.gov/api/temporal/daily/point"
+POWER_HOURLY_URL = "https://power.larc.nasa.gov/api/temporal/hourly/point"
+BASE_URL_ENV = "NASA_POWER_BASE_URL"  # Daily endpoint override, e.g. a local power_server
+COMMUNITY = "RE"  # Renewable Energy
+MAX_RETRIES = 3
+RETRY_BACKOFF = 1.5  # seconds
+API_TIMEOUT = 30  # seconds
+TIMESTAMP_FORMATS = {'daily': '%Y%m%d', 'hourly': '%Y%m%d%H'}
+
+
+class RetryBudget:
+    """
+    Thread-safe cap on the total number of retries across many requests.
+
+    Once the budget is spent, failed requests raise immediately instead of
+    backing off, so an outage costs a bounded amount of time in bulk runs.
+
+    Parameters
+    ----------
+    retries : int
+        Total retries allowed
+    """
+
+    def __init__(self, retries: int):
+        if retries < 0:
+            raise ValueError("retries must be non-negative")
+        self.total = retries
+        self.remaining = retries
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        """Consume one retry; False if the budget is exhausted."""
+        with self._lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+    @property
+    def used(self) -> int:
+        return self.total - self.remaining
+
+
+def power_url(base_url: Optional[str] = None, temporal: str = 'daily') -> str:
+    """
+    Point endpoint: ``base_url``, else $NASA_POWER_BASE_URL, else the live API.
+
+    Overrides name the daily endpoint; ``temporal='hourly'`` swaps its
+    ``/daily/`` path segment for ``/hourly/``.
+    """
+    if temporal not in ('daily', 'hourly'):
+        raise ValueError(f"Unknown temporal resolution: {temporal}")
+    url = base_url or os.environ.get(BASE_URL_ENV)
+    if url is None:
+        return POWER_DAILY_URL if temporal == 'daily' else POWER_HOURLY_URL
+    return url.replace('/daily/', f'/{temporal}/') if temporal == 'hourly' else url
+
+
+def latest_available_date() -> pd.Timestamp:
+    """Yesterday (UTC): the latest day a daily request can cover."""
+    return pd.Timestamp.now(tz='UTC').tz_localize(None).normalize() - pd.Timedelta(days=1)
+
+
+def fetch_daily(variables: Sequence[str], lat: float, lon: float, start, end,
+                session: Optional[requests.Session] = None,
+                retry_budget: Optional[RetryBudget] = None,
+                base_url: Optional[str] = None) -> pd.DataFrame:
+    """
+    Fetch daily values of a parameter set for one location and date range.
+
+    Parameters
+    ----------
+    variables : Sequence[str]
+        NASA POWER parameter names (e.g. ['WS10M', 'WS50M'])
+    lat, lon : float
+        Location
+    start, end : date-like
+        Inclusive date range
+    session : requests.Session, optional
+        Session to reuse connections across requests
+    retry_budget : RetryBudget, optional
+        Shared retry allowance; each retry consumes one
+    base_url : str, optional
+        Daily point endpoint (default: ``power_url()``)
+
+    Returns
+    -------
+    pd.DataFrame
+        One float column per variable, DatetimeIndex named 'Date'.
+        Fill values (-999) are returned as-is for the caller to filter.
+
+    Raises
+    ------
+    ConnectionError
+        If every attempt fails
+    ValueError
+        If the response cannot be parsed or lacks a variable
+    """
+    return _fetch_point(variables, lat, lon, start, end, 'daily',
+                        session=session, retry_budget=retry_budget, base_url=base_url)
+
+
+def fetch_hourly(variables: Sequence[str], lat: float, lon: float, start, end,
+                 session: Optional[requests.Session] = None,
+                 retry_budget: Optional[RetryBudget] = None,
+                 base_url: Optional[str] = None) -> pd.DataFrame:
+    """
+    Fetch hourly values (UTC) of a parameter set for one location.
+
+    Same arguments and errors as ``fetch_daily``; ``base_url`` names the
+    daily endpoint (see ``power_url``). Keep requests to about a year:
+    POWER limits the size of hourly responses.
+
+    Returns
+    -------
+    pd.DataFrame
+        One float column per variable, hourly DatetimeIndex named 'Date'
+    """
+    return _fetch_point(variables, lat, lon, start, end, 'hourly',
+                        session=session, retry_budget=retry_budget, base_url=base_url)
+
+
+def _fetch_point(variables: Sequence[str], lat: float, lon: float, start, end,
+                 temporal: str,
+                 session: Optional[requests.Session] = None,
+                 retry_budget: Optional[RetryBudget] = None,
+                 base_url: Optional[str] = None) -> pd.DataFrame:
+    """Shared request / retry / parse path of ``fetch_daily`` and ``fetch_hourly``."""
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    params = {
+        "parameters": ",".join(variables),
+        "community": COMMUNITY,
+        "longitude": lon,
+        "latitude": lat,
+        "start": start.strftime('%Y%m%d'),
+        "end": end.strftime('%Y%m%d'),
+        "format": "JSON"
+    }
+    if temporal == 'hourly':
+        params["time-standard"] = "UTC"
+    get = session.get if session is not None else requests.get
+
+    print(f"📡 Fetching {temporal} {params['parameters']} for ({lat}, {lon}): "
+          f"{start.date()} to {end.date()}")
+
+    response = None
+    for attempt in range(1, MAX_RETRIES + 1):
+        try:
+            response = get(power_url(base_url, temporal), params=params, timeout=API_TIMEOUT)
+            response.raise_for_status()
+            break
+        except requests.exceptions.RequestException as e:
+            if attempt == MAX_RETRIES:
+                raise ConnectionError(f"NASA API failed after {MAX_RETRIES} attempts: {e}")
+            if retry_budget is not None and not retry_budget.acquire():
+                raise ConnectionError(f"NASA API failed and the retry budget is exhausted: {e}")
+            sleep_for = RETRY_BACKOFF * attempt
+            warnings.warn(
+                f"NASA API request failed (attempt {attempt}/{MAX_RETRIES}): {e}. "
+                f"Retrying in {sleep_for:.1f}s"
+            )
+            time.sleep(sleep_for)
+
+    if response is None:
+        raise ConnectionError("NASA API response is None after retries")
+
+    try:
+        data = response.json()
+    except ValueError as e:
+        raise ValueError(f"Failed to parse NASA API JSON response: {e}")
+
+    try:
+        properties = data['properties']
+        if not isinstance(properties, dict):
+            raise ValueError("Malformed response: 'properties' missing or not a dict")
+        parameter = properties.get('parameter', {})
+        missing = [v for v in variables if not isinstance(parameter.get(v), dict)]
+        if missing:
+            raise ValueError(f"Malformed response: {', '.join(missing)} not present")
+        df = pd.DataFrame({v: pd.Series(parameter[v], dtype=float) for v in variables})
+        df.index = pd.to_datetime(df.index, format=TIMESTAMP_FORMATS[temporal])
+        df.index.name = 'Date'
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Failed to parse NASA API response: {e}")
+
+    return df.sort_index()
+
+
+def _fill_gaps(store: ColumnarCache, variables: Sequence[str], lat: float, lon: float,
+               start, end, fetch, partition: Optional[str] = None,
+               step: pd.Timedelta = ONE_DAY):
+    """
+    Fetch and cache the gaps of [start, end]; returns (gaps, frame).
+
+    Invalid days dropped by ``clean`` (-999 fill) inside the window are
+    cached as covered, since POWER will not fill them later. Only the gap
+    that ends the window is held back past its last complete day (rows are
+    ``step`` apart), as those days are usually not published yet and the
+    next call fetches them again. ``frame`` holds the rows of [start, end]
+    up to that point, or the raw last chunk when nothing in it is valid.
+    """
+    gaps = store.missing(variables, lat, lon, start, end, partition=partition)
+    stored = chunk = None
+    read_end = end
+    for gap_start, gap_end in gaps:
+        chunk = fetch(gap_start, gap_end)
+        cover_end = gap_end
+        if gap_end == end:
+            cover_end = gap_start - ONE_DAY
+            if not chunk.empty:
+                last_complete = (chunk.index.max() + step).normalize() - ONE_DAY
+                cover_end = min(gap_end, last_complete)
+            read_end = cover_end
+        if cover_end >= gap_start:
+            stored = store.put(variables, lat, lon, chunk, gap_start, cover_end,
+                               merge=True, partition=partition)
+
+    if read_end < start:  # nothing valid in the window yet
+        return gaps, chunk
+    if stored is not None:  # the merged entry is at hand; no need to read it back
+        return gaps, stored[(stored.index >= start) & (stored.index < read_end + ONE_DAY)]
+    df = store.get(variables, lat, lon, start, read_end, partition=partition)
+    if df is None:  # entry evicted or unreadable since ``missing``
+        df = fetch(start, end)
+    return gaps, df
+
+
+def load_daily(variables: Sequence[str], lat: float, lon: float, start, end,
+               clean: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+               store: Optional[ColumnarCache] = None,
+               cache: bool = True,
+               session: Optional[requests.Session] = None,
+               retry_budget: Optional[RetryBudget] = None,
+               base_url: Optional[str] = None) -> pd.DataFrame:
+    """
+    Load a daily series, downloading only the days not already cached.
+
+    Parameters
+    ----------
+    variables : Sequence[str]
+        NASA POWER parameter names
+    lat, lon : float
+        Location
+    start, end : date-like
+        Inclusive window; ``end`` is clamped to ``latest_available_date()``
+    clean : callable, optional
+        Applied to each fetched chunk before caching (rename columns, drop
+        invalid days); must keep the DatetimeIndex
+    store : ColumnarCache, optional
+        Cache to use (default: ``default_cache()``)
+    cache : bool
+        If False, bypass the cache and fetch the whole window
+    session : requests.Session, optional
+        Session to reuse connections across gap requests
+    retry_budget : RetryBudget, optional
+        Shared retry allowance (see ``fetch_daily``)
+    base_url : str, optional
+        Daily point endpoint (default: ``power_url()``)
+
+    Returns
+    -------
+    pd.DataFrame
+        Cleaned series for [start, end] (float32 when served via the cache)
+    """
+    start = pd.Timestamp(start)
+    end = min(pd.Timestamp(end), latest_available_date())
+    if start > end:
+        raise ValueError(f"No NASA POWER data available for {start.date()} onwards yet")
+
+    def fetch(a, b) -> pd.DataFrame:
+        df = fetch_daily(variables, lat, lon, a, b, session=session,
+                         retry_budget=retry_budget, base_url=base_url)
+        return clean(df) if clean is not None else df
+
+    if not cache:
+        return fetch(start, end)
+
+    store = store if store is not None else default_cache()
+    gaps, df = _fill_gaps(store, variables, lat, lon, start, end, fetch)
+    if not gaps:
+        print(f"📁 Loaded {len(df)} days of cached data from {store.root}")
+    return df
+
+
+def iter_hourly_chunks(variables: Sequence[str], lat: float, lon: float, start, end,
+                       clean: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+                       store: Optional[ColumnarCache] = None,
+                       cache: bool = True,
+                       session: Optional[requests.Session] = None,
+                       retry_budget: Optional[RetryBudget] = None,
+                       base_url: Optional[str] = None) -> Iterator[pd.DataFrame]:
+    """
+    Yield an hourly series one calendar year at a time.
+
+    Each year is its own cache partition ('hourly-<year>'), filled gap by
+    gap like ``load_daily``, so a multi-decade history is never held in
+    memory at once and refreshing the current year fetches only new days.
+
+    Parameters
+    ----------
+    variables, lat, lon, clean, store, cache, session, retry_budget, base_url
+        As for ``load_daily``
+    start, end : date-like
+        Inclusive window (whole days); ``end`` is clamped to yesterday
+
+    Yields
+    ------
+    pd.DataFrame
+        Hourly rows of one year within the window, in time order
+    """
+    start = pd.Timestamp(start).normalize()
+    end = min(pd.Timestamp(end).normalize(), latest_available_date())
+    if start > end:
+        raise ValueError(f"No NASA POWER data available for {start.date()} onwards yet")
+    if cache:
+        store = store if store is not None else default_cache()
+
+    def fetch(a, b) -> pd.DataFrame:
+        df = fetch_hourly(variables, lat, lon, a, b, session=session,
+                          retry_budget=retry_budget, base_url=base_url)
+        return clean(df) if clean is not None else df
+
+    for year in range(start.year, end.year + 1):
+        a = max(start, pd.Timestamp(year=year, month=1, day=1))
+        b = min(end, pd.Timestamp(year=year, month=12, day=31))
+        if not cache:
+            yield fetch(a, b)
+            continue
+
+        partition = f"hourly-{year}"
+        _, df = _fill_gaps(store, variables, lat, lon, a, b, fetch, partition,
+                           step=pd.Timedelta(hours=1))
+        yield df
+
+
+def missing_days(variables: Sequence[str], lat: float, lon: float, start, end,
+                 store: Optional[ColumnarCache] = None) -> List:
+    """Date ranges ``load_daily`` would download for this request."""
+    store = store if store is not None else default_cache()
+    end = min(pd.Timestamp(end), latest_available_date())
+    if pd.Timestamp(start) > end:
+        return []
+    return store.missing(variables, lat, lon, start, end)
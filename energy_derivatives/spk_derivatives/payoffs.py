@@ -0,0 +1,251 @@
+"""
+Array-Native Payoff and P&L Kernels
+===================================
+
+Vectorized payoff, profit/loss and break-even computations for single
+options and multi-leg strategies (spreads, collars, straddles, ...).
+
+A strategy is a list of leg dicts, matching the list-of-dicts convention
+used by ``portfolio_greeks`` and ``scenario_comparison``:
+
+    {'type': 'call' | 'put' | 'underlying',
+     'K': float,            # strike (entry price for 'underlying')
+     'quantity': float,     # signed: positive = long, negative = short
+     'premium': float}      # premium per unit (ignored for 'underlying')
+
+All kernels broadcast a (n_spots,) spot array against a (n_legs,) leg
+array, so thousands of spot points are evaluated in one NumPy expression.
+
+Key Functions:
+-----------
+position_legs(): Legs for 'long_call', 'short_call', 'long_put', 'short_put'
+vertical_spread(): Bull/bear call or put spread legs
+collar(): Long underlying + long put + short call legs
+strategy_payoff(): Payoff at expiry over a spot array
+strategy_pnl(): Net P&L at expiry over a spot array
+tail_slope(): P&L slope above the highest strike
+break_even_points(): Exact break-even spots (closed form)
+"""
+
+import numpy as np
+from typing import Dict, List, Tuple
+
+LEG_TYPES = ('call', 'put', 'underlying')
+
+POSITIONS = {
+    'long_call': ('call', 1.0),
+    'short_call': ('call', -1.0),
+    'long_put': ('put', 1.0),
+    'short_put': ('put', -1.0),
+}
+
+
+def position_legs(position: str, K: float, premium: float) -> List[Dict]:
+    """
+    Build the single leg for a plain option position.
+
+    Parameters
+    ----------
+    position : str
+        'long_call', 'short_call', 'long_put' or 'short_put'
+    K : float
+        Strike price
+    premium : float
+        Option premium per unit
+
+    Returns
+    -------
+    List[Dict]
+        One-element leg list
+    """
+    if position not in POSITIONS:
+        raise ValueError(f"Unknown position: {position}")
+    option_type, quantity = POSITIONS[position]
+    return [{'type': option_type, 'K': K, 'quantity': quantity, 'premium': premium}]
+
+
+def vertical_spread(K_low: float, K_high: float,
+                    premium_low: float, premium_high: float,
+                    option_type: str = 'call') -> List[Dict]:
+    """
+    Vertical spread: long the lower strike, short the higher strike.
+
+    With calls this is a bull call spread; with puts it is a bear put
+    spread mirrored (long K_low put, short K_high put) - flip quantities
+    for the opposite view.
+
+    Parameters
+    ----------
+    K_low, K_high : float
+        Lower and upper strikes
+    premium_low, premium_high : float
+        Premiums of the lower and upper strike options
+    option_type : str
+        'call' or 'put'
+
+    Returns
+    -------
+    List[Dict]
+        Two-leg strategy
+    """
+    if K_low >= K_high:
+        raise ValueError("K_low must be below K_high")
+    return [
+        {'type': option_type, 'K': K_low, 'quantity': 1.0, 'premium': premium_low},
+        {'type': option_type, 'K': K_high, 'quantity': -1.0, 'premium': premium_high},
+    ]
+
+
+def collar(S_entry: float, K_put: float, K_call: float,
+           premium_put: float, premium_call: float) -> List[Dict]:
+    """
+    Collar: long underlying, long protective put, short covered call.
+
+    Parameters
+    ----------
+    S_entry : float
+        Entry price of the underlying
+    K_put, K_call : float
+        Put (floor) and call (cap) strikes
+    premium_put, premium_call : float
+        Premiums paid for the put and received for the call
+
+    Returns
+    -------
+    List[Dict]
+        Three-leg strategy
+    """
+    if K_put > K_call:
+        raise ValueError("K_put must not exceed K_call")
+    return [
+        {'type': 'underlying', 'K': S_entry, 'quantity': 1.0, 'premium': 0.0},
+        {'type': 'put', 'K': K_put, 'quantity': 1.0, 'premium': premium_put},
+        {'type': 'call', 'K': K_call, 'quantity': -1.0, 'premium': premium_call},
+    ]
+
+
+def _leg_arrays(legs: List[Dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Unpack legs into (is_call, is_put, strikes, quantities, premiums) arrays."""
+    if not legs:
+        raise ValueError("Strategy must contain at least one leg")
+    types = [leg.get('type', 'call') for leg in legs]
+    unknown = set(types) - set(LEG_TYPES)
+    if unknown:
+        raise ValueError(f"Unknown leg type(s): {sorted(unknown)}")
+    types = np.array(types)
+    strikes = np.array([leg['K'] for leg in legs], dtype=float)
+    quantities = np.array([leg.get('quantity', 1.0) for leg in legs], dtype=float)
+    premiums = np.array([leg.get('premium', 0.0) for leg in legs], dtype=float)
+    premiums = np.where(types == 'underlying', 0.0, premiums)
+    return types == 'call', types == 'put', strikes, quantities, premiums
+
+
+def strategy_payoff(spot, legs: List[Dict]) -> np.ndarray:
+    """
+    Payoff at expiry of a strategy over an array of spot prices.
+
+    Parameters
+    ----------
+    spot : array_like
+        Spot prices at expiry, shape (n,)
+    legs : List[Dict]
+        Strategy legs
+
+    Returns
+    -------
+    np.ndarray
+        Payoff per spot, shape (n,)
+    """
+    is_call, is_put, strikes, quantities, _ = _leg_arrays(legs)
+    S = np.asarray(spot, dtype=float)[..., None]
+    intrinsic = np.where(
+        is_call, np.maximum(S - strikes, 0.0),
+        np.where(is_put, np.maximum(strikes - S, 0.0), S - strikes)
+    )
+    return intrinsic @ quantities
+
+
+def net_premium(legs: List[Dict]) -> float:
+    """Net premium paid for the strategy (negative = net credit)."""
+    _, _, _, quantities, premiums = _leg_arrays(legs)
+    return float(quantities @ premiums)
+
+
+def strategy_pnl(spot, legs: List[Dict]) -> np.ndarray:
+    """
+    Net profit/loss at expiry: payoff minus net premium paid.
+
+    Parameters
+    ----------
+    spot : array_like
+        Spot prices at expiry, shape (n,)
+    legs : List[Dict]
+        Strategy legs
+
+    Returns
+    -------
+    np.ndarray
+        Net P&L per spot, shape (n,)
+    """
+    return strategy_payoff(spot, legs) - net_premium(legs)
+
+
+def tail_slope(legs: List[Dict]) -> float:
+    """
+    Slope of the expiry P&L above the highest strike.
+
+    Calls and underlying legs each contribute their signed quantity; puts
+    are worthless there. Positive = unbounded upside, negative = unbounded loss.
+    """
+    is_call, is_put, _, quantities, _ = _leg_arrays(legs)
+    return float(quantities[~is_put].sum())
+
+
+def break_even_points(legs: List[Dict]) -> np.ndarray:
+    """
+    Exact break-even spot prices of a strategy.
+
+    Expiry P&L is piecewise linear in S with kinks at the strikes, so each
+    root is found in closed form by linear interpolation between the knots
+    where the P&L changes sign, plus the tail beyond the highest strike.
+    A knot where the P&L is exactly zero counts only where the sign
+    differs on either side; a flat zero segment contributes its ends (the
+    end next to a loss or profit), not every knot along it, and a P&L that
+    only touches zero is not a break-even.
+
+    Parameters
+    ----------
+    legs : List[Dict]
+        Strategy legs
+
+    Returns
+    -------
+    np.ndarray
+        Sorted break-even spot prices (may be empty)
+    """
+    _, _, strikes, _, _ = _leg_arrays(legs)
+    knots = np.unique(np.concatenate(([0.0], strikes[strikes > 0])))
+    pnl = strategy_pnl(knots, legs)
+
+    # Interior segments: sign changes between consecutive knots
+    a, b = knots[:-1], knots[1:]
+    pa, pb = pnl[:-1], pnl[1:]
+    crosses = (pa * pb) < 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        interior = a - pa * (b - a) / (pb - pa)
+    # Zero knots: compare the sign on either side (the tail slope to the right
+    # of the last knot; S = 0 has no left side and counts when P&L leaves zero)
+    slope = tail_slope(legs)
+    sign = np.sign(pnl)
+    left = np.concatenate(([np.nan], sign[:-1]))
+    right = np.concatenate((sign[1:], [np.sign(slope)]))
+    at_zero = (pnl == 0.0) & (right != left) & ~(np.isnan(left) & (right == 0))
+    roots = [interior[crosses], knots[at_zero]]
+
+    # Right tail: slope is the net exposure to the underlying above all strikes
+    if slope != 0.0:
+        tail_root = knots[-1] - pnl[-1] / slope
+        if tail_root > knots[-1]:
+            roots.append(np.array([tail_root]))
+
+    return np.unique(np.concatenate(roots))
@@ -0,0 +1,298 @@
+"""
+Power-Conversion Model Registry
+===============================
+
+Named, array-native kernels that turn NASA POWER resource variables into
+daily economic value ($/day). Every kernel is elementwise along sites and
+only recurses along the last (time) axis, so the same call prices one
+site's series or a whole (site x day) grid from ``region``.
+
+Built-in models:
+
+- solar 'linear' (default): GHI x efficiency x area
+- solar 'pv_temperature': PV output derated for cell temperature, estimated
+  from air temperature (T2M) and irradiance with the NOCT model
+- wind 'cubic' (default): constant-Cp cubic law 0.5 rho A Cp v^3
+- wind 'power_curve': turbine curve with cut-in, rated and cut-out speeds,
+  or a tabulated manufacturer curve, via ``np.interp``
+- hydro 'runoff' (default): same-day linear runoff
+- hydro 'reservoir': runoff routed through a linear storage reservoir that
+  releases a fixed fraction per day, smoothing rainfall into generation
+
+Loaders pick a model by name (``WindDataLoader(power_model='power_curve')``,
+``RegionScreener(..., power_model=...)``); new models are added with the
+``register_model`` decorator.
+
+Key Classes:
+-----------
+PowerModel: A registered kernel with its inputs and default parameters
+
+Key Functions:
+-----------
+register_model(): Decorator adding a kernel to the registry
+get_model(): Look up a model by energy type and name
+list_models(): Registered model names per energy type
+compute_prices(): Run a model on a DataFrame or dict of arrays
+"""
+
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from scipy import signal
+
+from .data_loader_hydro import (
+    DEFAULT_CATCHMENT_AREA_KM2,
+    DEFAULT_FALL_HEIGHT_M,
+    DEFAULT_RUNOFF_COEFFICIENT,
+    DEFAULT_TURBINE_EFFICIENCY,
+    hydro_energy_price,
+)
+from .data_loader_nasa import solar_energy_price
+from .data_loader_wind import (
+    DEFAULT_POWER_COEFFICIENT,
+    DEFAULT_ROTOR_DIAMETER_M,
+    wind_energy_price,
+)
+
+ENERGY_TYPES = ('solar', 'wind', 'hydro')
+DEFAULT_MODELS = {'solar': 'linear', 'wind': 'cubic', 'hydro': 'runoff'}
+
+SOLAR_DEFAULTS = {'energy_value_per_kwh': 0.10, 'panel_efficiency': 0.20, 'panel_area_m2': 1.0}
+WIND_DEFAULTS = {'energy_value_per_kwh': 0.08, 'rotor_diameter_m': DEFAULT_ROTOR_DIAMETER_M,
+                 'power_coefficient': DEFAULT_POWER_COEFFICIENT, 'air_density': 1.225}
+HYDRO_DEFAULTS = {'energy_value_per_kwh': 0.06, 'catchment_area_km2': DEFAULT_CATCHMENT_AREA_KM2,
+                  'fall_height_m': DEFAULT_FALL_HEIGHT_M,
+                  'runoff_coefficient': DEFAULT_RUNOFF_COEFFICIENT,
+                  'turbine_efficiency': DEFAULT_TURBINE_EFFICIENCY}
+
+
+class PowerModel:
+    """
+    A registered power-conversion kernel.
+
+    Parameters
+    ----------
+    name : str
+        Model name within its energy type
+    energy_type : str
+        'solar', 'wind' or 'hydro'
+    kernel : callable
+        ``kernel(**inputs, **params) -> np.ndarray`` of $/day
+    inputs : Sequence[str]
+        Data columns the kernel reads (cleaned loader column names)
+    defaults : Dict
+        Default parameters; only these may be overridden
+    variables : Sequence[str]
+        POWER parameters to fetch for the inputs (beyond the loader's own)
+    description : str
+        One-line summary
+    """
+
+    def __init__(self, name: str, energy_type: str, kernel: Callable,
+                 inputs: Sequence[str], defaults: Dict,
+                 variables: Sequence[str] = (), description: str = ''):
+        self.name = name
+        self.energy_type = energy_type
+        self.kernel = kernel
+        self.inputs = list(inputs)
+        self.defaults = dict(defaults)
+        self.variables = list(variables)
+        self.description = description
+
+    def check_params(self, params: Dict) -> None:
+        """Raise ValueError for parameters the model does not accept."""
+        unknown = set(params) - set(self.defaults)
+        if unknown:
+            raise ValueError(
+                f"Unknown parameters for {self.energy_type} model '{self.name}': "
+                f"{sorted(unknown)}. Accepted: {sorted(self.defaults)}"
+            )
+
+    def __call__(self, data, **params) -> np.ndarray:
+        """
+        Price ``data`` (DataFrame or mapping of column -> array).
+
+        Returns
+        -------
+        np.ndarray
+            $/day with the shape of the input arrays
+        """
+        self.check_params(params)
+        missing = [c for c in self.inputs if c not in data]
+        if missing:
+            raise ValueError(
+                f"{self.energy_type} model '{self.name}' needs columns {missing}"
+                + (f" (fetch POWER variables {self.variables})" if self.variables else "")
+            )
+        arrays = {c: np.asarray(data[c], dtype=np.float64) for c in self.inputs}
+        return self.kernel(**arrays, **{**self.defaults, **params})
+
+    def __repr__(self) -> str:
+        return f"PowerModel({self.energy_type}/{self.name}: {self.description})"
+
+
+POWER_MODELS: Dict[str, Dict[str, PowerModel]] = {e: {} for e in ENERGY_TYPES}
+
+
+def register_model(energy_type: str, name: str, inputs: Sequence[str], defaults: Dict,
+                   variables: Sequence[str] = (), description: str = ''):
+    """
+    Decorator registering a kernel under (energy_type, name).
+
+    Example
+    -------
+    >>> @register_model('wind', 'flat', inputs=['WS50M'], defaults={'value': 1.0})
+    ... def flat(WS50M, value):
+    ...     return np.full_like(WS50M, value)
+    """
+    if energy_type not in POWER_MODELS:
+        raise ValueError(f"Unknown energy_type: {energy_type}. Choose from: {list(ENERGY_TYPES)}")
+
+    def decorator(kernel: Callable) -> Callable:
+        POWER_MODELS[energy_type][name] = PowerModel(
+            name, energy_type, kernel, inputs, defaults, variables, description)
+        return kernel
+    return decorator
+
+
+def get_model(energy_type: str, name: Optional[str] = None) -> PowerModel:
+    """Registered model (default model of the energy type when ``name`` is None)."""
+    if energy_type not in POWER_MODELS:
+        raise ValueError(f"Unknown energy_type: {energy_type}. Choose from: {list(ENERGY_TYPES)}")
+    name = name or DEFAULT_MODELS[energy_type]
+    if name not in POWER_MODELS[energy_type]:
+        raise ValueError(
+            f"Unknown {energy_type} model: {name}. "
+            f"Choose from: {sorted(POWER_MODELS[energy_type])}"
+        )
+    return POWER_MODELS[energy_type][name]
+
+
+def list_models(energy_type: Optional[str] = None) -> Dict[str, List[str]]:
+    """Registered model names per energy type."""
+    types = [energy_type] if energy_type is not None else list(ENERGY_TYPES)
+    return {e: sorted(POWER_MODELS[e]) for e in types}
+
+
+def compute_prices(energy_type: str, data, model: Optional[str] = None, **params) -> np.ndarray:
+    """
+    Price resource data with a named model.
+
+    Parameters
+    ----------
+    energy_type : str
+        'solar', 'wind' or 'hydro'
+    data : pd.DataFrame or Mapping[str, array_like]
+        Input columns (1-D per site, or 2-D site x day arrays)
+    model : str, optional
+        Model name (default: the energy type's default model)
+    **params
+        Model parameter overrides
+
+    Returns
+    -------
+    np.ndarray
+        $/day, shaped like the inputs
+    """
+    return get_model(energy_type, model)(data, **params)
+
+
+# ---------------------------------------------------------------------------
+# Solar
+# ---------------------------------------------------------------------------
+
+@register_model('solar', 'linear', inputs=['GHI'], defaults=SOLAR_DEFAULTS,
+                description='GHI x efficiency x area')
+def _solar_linear(GHI, energy_value_per_kwh, panel_efficiency, panel_area_m2):
+    return solar_energy_price(GHI, energy_value_per_kwh, panel_efficiency, panel_area_m2)
+
+
+@register_model('solar', 'pv_temperature', inputs=['GHI', 'T2M'],
+                defaults={**SOLAR_DEFAULTS, 'temp_coefficient': -0.004, 'noct_c': 45.0,
+                          'sun_hours': 12.0},
+                variables=['T2M'],
+                description='PV derated for NOCT cell temperature')
+def _solar_pv_temperature(GHI, T2M, energy_value_per_kwh, panel_efficiency, panel_area_m2,
+                          temp_coefficient, noct_c, sun_hours):
+    # Mean daytime irradiance (W/m²) from the daily total (kWh/m²)
+    irradiance = GHI * 1000.0 / sun_hours
+    # NOCT model: cell runs (NOCT - 20)°C above air at 800 W/m²
+    cell_temp = T2M + (noct_c - 20.0) / 800.0 * irradiance
+    derate = np.clip(1.0 + temp_coefficient * (cell_temp - 25.0), 0.0, None)
+    return solar_energy_price(GHI, energy_value_per_kwh, panel_efficiency, panel_area_m2) * derate
+
+
+# ---------------------------------------------------------------------------
+# Wind
+# ---------------------------------------------------------------------------
+
+def _rotor_area(rotor_diameter_m: float) -> float:
+    return np.pi * (rotor_diameter_m / 2) ** 2
+
+
+@register_model('wind', 'cubic', inputs=['WS50M'], defaults=WIND_DEFAULTS,
+                description='Constant-Cp cubic law')
+def _wind_cubic(WS50M, energy_value_per_kwh, rotor_diameter_m, power_coefficient, air_density):
+    return wind_energy_price(WS50M, _rotor_area(rotor_diameter_m), power_coefficient,
+                             air_density, energy_value_per_kwh)
+
+
+@register_model('wind', 'power_curve', inputs=['WS50M'],
+                defaults={**WIND_DEFAULTS, 'cut_in_ms': 3.0, 'rated_ms': 12.0,
+                          'cut_out_ms': 25.0, 'curve_speeds_ms': None, 'curve_power_kw': None},
+                description='Cut-in / rated / cut-out turbine curve')
+def _wind_power_curve(WS50M, energy_value_per_kwh, rotor_diameter_m, power_coefficient,
+                      air_density, cut_in_ms, rated_ms, cut_out_ms,
+                      curve_speeds_ms, curve_power_kw):
+    if (curve_speeds_ms is None) != (curve_power_kw is None):
+        raise ValueError("Give both curve_speeds_ms and curve_power_kw, or neither")
+    if curve_speeds_ms is not None:
+        speeds = np.asarray(curve_speeds_ms, dtype=float)
+        power_kw = np.asarray(curve_power_kw, dtype=float)
+        if speeds.shape != power_kw.shape or np.any(np.diff(speeds) <= 0):
+            raise ValueError("curve_speeds_ms must be increasing and match curve_power_kw")
+    else:
+        if not 0 <= cut_in_ms < rated_ms < cut_out_ms:
+            raise ValueError("Need 0 <= cut_in_ms < rated_ms < cut_out_ms")
+        # Cubic ramp from cut-in to the rated output of the Cp law
+        rated_kw = 0.5 * air_density * _rotor_area(rotor_diameter_m) * power_coefficient \
+            * rated_ms ** 3 / 1000.0
+        speeds = np.linspace(cut_in_ms, rated_ms, 25)
+        power_kw = rated_kw * (speeds ** 3 - cut_in_ms ** 3) / (rated_ms ** 3 - cut_in_ms ** 3)
+
+    output_kw = np.interp(WS50M, speeds, power_kw, left=0.0, right=power_kw[-1])
+    output_kw = np.where(WS50M >= cut_out_ms, 0.0, output_kw)  # storm shutdown
+    output_kw = np.where(np.isnan(WS50M), np.nan, output_kw)
+    return output_kw * 24.0 * energy_value_per_kwh
+
+
+# ---------------------------------------------------------------------------
+# Hydro
+# ---------------------------------------------------------------------------
+
+@register_model('hydro', 'runoff', inputs=['PREC'], defaults=HYDRO_DEFAULTS,
+                description='Same-day linear runoff')
+def _hydro_runoff(PREC, energy_value_per_kwh, catchment_area_km2, fall_height_m,
+                  runoff_coefficient, turbine_efficiency):
+    return hydro_energy_price(PREC, catchment_area_km2 * 1e6, fall_height_m,
+                              runoff_coefficient, turbine_efficiency, energy_value_per_kwh)
+
+
+@register_model('hydro', 'reservoir', inputs=['PREC'],
+                defaults={**HYDRO_DEFAULTS, 'release_fraction': 0.10},
+                description='Runoff routed through a linear storage reservoir')
+def _hydro_reservoir(PREC, energy_value_per_kwh, catchment_area_km2, fall_height_m,
+                     runoff_coefficient, turbine_efficiency, release_fraction):
+    if not 0 < release_fraction <= 1:
+        raise ValueError("release_fraction must lie in (0, 1]")
+    inflow = np.nan_to_num(PREC, nan=0.0) * runoff_coefficient  # mm of catchment per day
+
+    # Storage S_t = (1 - k) S_{t-1} + I_t, release k S_t: a first-order
+    # filter along time, started at the steady state of the mean inflow
+    k = release_fraction
+    steady = inflow.mean(axis=-1, keepdims=True) / k
+    storage, _ = signal.lfilter([1.0], [1.0, -(1.0 - k)], inflow, axis=-1,
+                                zi=(1.0 - k) * steady)
+    release = k * storage
+    return hydro_energy_price(release, catchment_area_km2 * 1e6, fall_height_m,
+                              1.0, turbine_efficiency, energy_value_per_kwh)
@@ -0,0 +1,349 @@
+"""
+Offline NASA POWER Stand-in Server
+==================================
+
+A small HTTP server speaking the POWER daily and hourly point APIs, for
+CI runs and benchmarks without network access. Point the loaders at it with the
+``NASA_POWER_BASE_URL`` environment variable (or ``base_url=``):
+
+    python -m spk_derivatives.power_server --port 8765
+    export NASA_POWER_BASE_URL=http://127.0.0.1:8765/api/temporal/daily/point
+
+Two data sources:
+
+- synthesized: deterministic seasonal series for any (lat, lon, window,
+  parameter). A given day always has the same value, whatever window it
+  is requested in, so cached and incremental loads agree with full ones.
+- replayed: recorded POWER responses (see ``record_fixture``) served for
+  any sub-window. Requests not covered by a fixture fall back to
+  synthesis, or get a 404 with ``strict=True``.
+
+Hourly requests are always synthesized (``synthesize_hourly``), consistent
+with the synthesized daily values.
+
+Key Classes:
+-----------
+PowerStubServer: Threaded HTTP server with a ``url`` property
+
+Key Functions:
+-----------
+synthesize_daily(): Deterministic POWER-like daily values
+synthesize_hourly(): Hourly values consistent with the daily ones
+record_fixture(): Save a live POWER response for replay
+start_server(): Run a server on a background thread
+"""
+
+import argparse
+import json
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Union
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+DAILY_PATH = "/api/temporal/daily/point"
+HOURLY_PATH = "/api/temporal/hourly/point"
+IRRADIANCE_PARAMETERS = ('ALLSKY_SFC_SW_DWN',)  # daily kWh/m² -> hourly Wh/m²
+PRECIPITATION_PARAMETERS = ('PREC', 'PRECTOTCORR')  # daily mm -> hourly mm
+FILL_VALUE = -999.0
+
+# parameter -> (annual mean, seasonal amplitude, noise std, lower clip)
+PARAMETER_PROFILES: Dict[str, tuple] = {
+    'ALLSKY_SFC_SW_DWN': (4.5, 1.8, 1.0, 0.1),  # kWh/m²/day
+    'WS10M': (4.0, 1.0, 1.2, 0.1),  # m/s
+    'WS50M': (6.0, 1.5, 1.8, 0.1),  # m/s
+    'WD10M': (180.0, 40.0, 60.0, 0.0),  # degrees
+    'PREC': (3.0, 2.0, 2.5, 0.0),  # mm/day
+    'PRECTOTCORR': (3.0, 2.0, 2.5, 0.0),  # mm/day
+    'T2M': (15.0, 10.0, 2.5, -60.0),  # °C
+    'RH2M': (70.0, 10.0, 8.0, 5.0),  # %
+}
+DEFAULT_PROFILE = (1.0, 0.3, 0.2, 0.0)
+
+
+def _seed(parameter: str, lat: float, lon: float, year: int) -> int:
+    key = f"{parameter}|{round(float(lat), 4)}|{round(float(lon), 4)}|{year}"
+    return zlib.crc32(key.encode())
+
+
+def synthesize_daily(parameters: Sequence[str], lat: float, lon: float,
+                     start, end) -> pd.DataFrame:
+    """
+    Deterministic POWER-like daily values.
+
+    Each value depends only on (parameter, location, day), so any window
+    is a slice of the same underlying series.
+
+    Parameters
+    ----------
+    parameters : Sequence[str]
+        POWER parameter names; unknown names get a generic positive series
+    lat, lon : float
+        Location (seasonality flips sign south of the equator)
+    start, end : date-like
+        Inclusive window
+
+    Returns
+    -------
+    pd.DataFrame
+        One column per parameter, DatetimeIndex named 'Date'
+    """
+    days = pd.date_range(pd.Timestamp(start), pd.Timestamp(end), freq='D', name='Date')
+    hemisphere = 1.0 if lat >= 0 else -1.0
+    season = hemisphere * np.cos(2 * np.pi * (days.dayofyear.to_numpy() - 172) / 365.25)
+
+    columns = {}
+    for name in parameters:
+        mean, amplitude, noise, floor = PARAMETER_PROFILES.get(name, DEFAULT_PROFILE)
+        values = np.empty(len(days))
+        for year in np.unique(days.year):
+            in_year = days.year == year
+            # One draw per day of the year, indexed by day: window-independent
+            draws = np.random.default_rng(_seed(name, lat, lon, year)).standard_normal(366)
+            values[in_year] = draws[days.dayofyear[in_year] - 1]
+        columns[name] = np.maximum(mean + amplitude * season + noise * values, floor).round(2)
+
+    return pd.DataFrame(columns, index=days)
+
+
+def synthesize_hourly(parameters: Sequence[str], lat: float, lon: float,
+                      start, end) -> pd.DataFrame:
+    """
+    Deterministic POWER-like hourly values (UTC) for whole days.
+
+    Built from ``synthesize_daily`` with a diurnal shape in local solar
+    time: irradiance follows a daylight arch whose hourly Wh/m² sum to the
+    daily kWh/m², precipitation is spread evenly, and other parameters
+    swing ±10% around the daily value.
+
+    Returns
+    -------
+    pd.DataFrame
+        One column per parameter, hourly DatetimeIndex named 'Date'
+    """
+    daily = synthesize_daily(parameters, lat, lon, start, end)
+    hours = pd.date_range(daily.index[0], daily.index[-1] + pd.Timedelta(hours=23),
+                          freq='h', name='Date')
+    day_values = daily.reindex(hours.normalize()).to_numpy()
+
+    solar_hour = (hours.hour.to_numpy() + lon / 15.0) % 24
+    arch = np.clip(np.sin(np.pi * (solar_hour - 6) / 12), 0, None)
+    arch_per_day = arch.reshape(-1, 24).sum(axis=1).repeat(24)
+    swing = 1 + 0.1 * np.sin(2 * np.pi * (solar_hour - 9) / 24)
+
+    columns = {}
+    for j, name in enumerate(parameters):
+        if name in IRRADIANCE_PARAMETERS:
+            values = 1000 * day_values[:, j] * arch / arch_per_day
+        elif name in PRECIPITATION_PARAMETERS:
+            values = day_values[:, j] / 24
+        else:
+            values = day_values[:, j] * swing
+        columns[name] = values.round(3)
+    return pd.DataFrame(columns, index=hours)
+
+
+def _power_payload(df: pd.DataFrame, lat: float, lon: float, fmt: str = '%Y%m%d') -> Dict:
+    """POWER response body for a daily (or, with fmt='%Y%m%d%H', hourly) frame."""
+    keys = df.index.strftime(fmt)
+    return {
+        'type': 'Feature',
+        'geometry': {'type': 'Point', 'coordinates': [lon, lat]},
+        'properties': {'parameter': {
+            name: dict(zip(keys, df[name].fillna(FILL_VALUE).astype(float).tolist()))
+            for name in df.columns
+        }},
+        'header': {'fill_value': FILL_VALUE, 'source': 'spk_derivatives.power_server'},
+    }
+
+
+def _fixture_path(directory: Union[str, Path], parameter: str, lat: float, lon: float) -> Path:
+    return Path(directory) / f"{parameter}_{float(lat):.4f}_{float(lon):.4f}.json"
+
+
+def record_fixture(parameters: Sequence[str], lat: float, lon: float, start, end,
+                   directory: Union[str, Path], base_url: Optional[str] = None) -> Dict[str, Path]:
+    """
+    Fetch a window from POWER and save it for replay.
+
+    Each parameter is stored in its own file, merged with any days already
+    recorded, so fixtures can be grown window by window.
+
+    Parameters
+    ----------
+    parameters : Sequence[str]
+        POWER parameter names
+    lat, lon : float
+        Location
+    start, end : date-like
+        Inclusive window
+    directory : str or Path
+        Fixture directory
+    base_url : str, optional
+        Endpoint to record from (default: ``nasa_power.power_url()``)
+
+    Returns
+    -------
+    Dict[str, Path]
+        Fixture file per parameter
+    """
+    from .nasa_power import fetch_daily
+
+    df = fetch_daily(parameters, lat, lon, start, end, base_url=base_url)
+    Path(directory).mkdir(parents=True, exist_ok=True)
+
+    written = {}
+    for name in parameters:
+        path = _fixture_path(directory, name, lat, lon)
+        series = json.loads(path.read_text()) if path.exists() else {}
+        series.update(_power_payload(df[[name]], lat, lon)['properties']['parameter'][name])
+        path.write_text(json.dumps(dict(sorted(series.items()))))
+        written[name] = path
+    return written
+
+
+def _replay(directory: Path, parameters: Sequence[str], lat: float, lon: float,
+            start, end) -> Optional[pd.DataFrame]:
+    """Recorded values for the window, or None unless every day is recorded."""
+    keys = pd.date_range(pd.Timestamp(start), pd.Timestamp(end), freq='D').strftime('%Y%m%d')
+    columns = {}
+    for name in parameters:
+        path = _fixture_path(directory, name, lat, lon)
+        if not path.exists():
+            return None
+        series = json.loads(path.read_text())
+        if any(k not in series for k in keys):
+            return None
+        columns[name] = [series[k] for k in keys]
+    return pd.DataFrame(columns, index=pd.to_datetime(keys, format='%Y%m%d'))
+
+
+class _PowerHandler(BaseHTTPRequestHandler):
+    """Serves GET <DAILY_PATH|HOURLY_PATH>?parameters=...&latitude=...&longitude=...&start=...&end=..."""
+
+    def do_GET(self):
+        server: PowerStubServer = self.server
+        parts = urlsplit(self.path)
+        path = parts.path.rstrip('/')
+        if path not in (DAILY_PATH, HOURLY_PATH):
+            return self._send(404, {'messages': [f"Unknown endpoint: {parts.path}"]})
+
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        try:
+            parameters = [p for p in query['parameters'].split(',') if p]
+            lat, lon = float(query['latitude']), float(query['longitude'])
+            start = pd.Timestamp(query['start'])
+            end = pd.Timestamp(query['end'])
+        except (KeyError, ValueError) as e:
+            return self._send(422, {'messages': [f"Invalid request: {e}"]})
+        if not parameters or start > end:
+            return self._send(422, {'messages': ["Empty parameter list or window"]})
+
+        if path == HOURLY_PATH:
+            df = synthesize_hourly(parameters, lat, lon, start, end)
+            with server.lock:
+                server.request_count += 1
+            return self._send(200, _power_payload(df, lat, lon, fmt='%Y%m%d%H'))
+
+        df = None
+        if server.fixtures_dir is not None:
+            df = _replay(server.fixtures_dir, parameters, lat, lon, start, end)
+            if df is None and server.strict:
+                return self._send(404, {'messages': ["No recorded fixture covers this request"]})
+        if df is None:
+            df = synthesize_daily(parameters, lat, lon, start, end)
+
+        with server.lock:
+            server.request_count += 1
+        self._send(200, _power_payload(df, lat, lon))
+
+    def _send(self, status: int, body: Dict) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class PowerStubServer(ThreadingHTTPServer):
+    """
+    Threaded stand-in for the POWER daily point API.
+
+    Parameters
+    ----------
+    host : str
+        Bind address
+    port : int
+        Port (0 = pick a free one)
+    fixtures_dir : str or Path, optional
+        Recorded fixtures to replay before synthesizing
+    strict : bool
+        Answer 404 instead of synthesizing when no fixture covers a request
+    verbose : bool
+        Log each request to stderr
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0,
+                 fixtures_dir: Optional[Union[str, Path]] = None,
+                 strict: bool = False, verbose: bool = False):
+        super().__init__((host, port), _PowerHandler)
+        self.fixtures_dir = Path(fixtures_dir) if fixtures_dir is not None else None
+        self.strict = strict
+        self.verbose = verbose
+        self.request_count = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """Daily point endpoint, usable as ``base_url`` / NASA_POWER_BASE_URL."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{DAILY_PATH}"
+
+
+def start_server(port: int = 0, fixtures_dir: Optional[Union[str, Path]] = None,
+                 strict: bool = False) -> PowerStubServer:
+    """
+    Start a stand-in server on a daemon thread.
+
+    Call ``server.shutdown()`` when done.
+
+    Example
+    -------
+    >>> server = start_server()
+    >>> df = nasa_power.load_daily(['WS50M'], 57.05, 9.92, '2020-01-01', '2020-12-31',
+    ...                            base_url=server.url)
+    >>> server.shutdown()
+    """
+    server = PowerStubServer(port=port, fixtures_dir=fixtures_dir, strict=strict)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline NASA POWER stand-in server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--fixtures', default=None, help="Recorded fixture directory")
+    parser.add_argument('--strict', action='store_true',
+                        help="404 instead of synthesizing for unrecorded requests")
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    server = PowerStubServer(args.host, args.port, args.fixtures, args.strict, args.verbose)
+    print(f"Serving NASA POWER stand-in at {server.url}")
+    print(f"export NASA_POWER_BASE_URL={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
@@ -0,0 +1,153 @@
+"""
+Engine Phase Timings
+====================
+
+Opt-in instrumentation of the pricing hot paths. Engines wrap each phase
+in ``with phase(engine, name):``; while profiling is disabled (the default)
+that returns one shared no-op context, so a hook costs a function call and
+a flag test. When enabled, each phase's wall time is added to a histogram
+keyed by (engine, phase):
+
+- binomial: build (terminal prices), payoff, rollback
+- monte_carlo: rng (normal draws), paths, payoff, statistics
+- greeks: reprice (one bumped valuation), total
+
+Aggregates are small and mergeable, so timings recorded in worker
+processes can be shipped back with each result (``snapshot(reset=True)``
+in the worker, ``merge()`` in the parent).
+
+Profiling starts enabled when the environment sets SPK_PROFILE=1.
+
+Key Classes:
+-----------
+Timings: Thread-safe histograms of durations by key
+
+Key Functions:
+-----------
+phase(): Context manager timing one engine phase
+enable(): Switch profiling on or off
+snapshot(): Current engine phase aggregates
+merge(): Fold aggregates from another process into this one
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Hashable, Optional, Tuple
+
+# Upper bounds (seconds) of the histogram buckets; +Inf is implicit
+BUCKETS: Tuple[float, ...] = (1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 0.01, 0.025,
+                              0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Timings:
+    """
+    Histograms of durations, one per key.
+
+    Each entry is ``[count, sum, bucket_counts]`` with non-cumulative
+    counts per bucket of ``BUCKETS`` plus a final overflow bucket.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS):
+        self.buckets = tuple(buckets)
+        self._data: Dict[Hashable, list] = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, key: Hashable) -> list:
+        entry = self._data.get(key)
+        if entry is None:
+            entry = self._data[key] = [0, 0.0, [0] * (len(self.buckets) + 1)]
+        return entry
+
+    def observe(self, key: Hashable, seconds: float) -> None:
+        with self._lock:
+            entry = self._entry(key)
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2][bisect_left(self.buckets, seconds)] += 1
+
+    def snapshot(self, reset: bool = False) -> Dict[Hashable, list]:
+        """Copy of every entry; ``reset`` clears them afterwards."""
+        with self._lock:
+            data = {key: [e[0], e[1], list(e[2])] for key, e in self._data.items()}
+            if reset:
+                self._data.clear()
+        return data
+
+    def merge(self, snapshot: Dict[Hashable, list]) -> None:
+        """Add another ``snapshot()`` (same buckets) into this one."""
+        with self._lock:
+            for key, (count, total, counts) in snapshot.items():
+                entry = self._entry(key)
+                entry[0] += count
+                entry[1] += total
+                entry[2] = [a + b for a, b in zip(entry[2], counts)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_enabled = os.environ.get('SPK_PROFILE', '').lower() in ('1', 'true', 'yes')
+_timings = Timings()
+
+
+class _Phase:
+    __slots__ = ('key', 'start')
+
+    def __init__(self, key: Tuple[str, str]):
+        self.key = key
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _timings.observe(self.key, time.perf_counter() - self.start)
+        return False
+
+
+class _NoPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_PHASE = _NoPhase()
+
+
+def phase(engine: str, name: str):
+    """Time the enclosed block as ``name`` of ``engine`` (no-op when disabled)."""
+    if not _enabled:
+        return _NO_PHASE
+    return _Phase((engine, name))
+
+
+def enable(flag: bool = True) -> None:
+    """Switch phase profiling on (or off) for this process."""
+    global _enabled
+    _enabled = bool(flag)
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def snapshot(reset: bool = False) -> Dict[Tuple[str, str], list]:
+    """Engine phase aggregates, keyed by (engine, phase)."""
+    return _timings.snapshot(reset)
+
+
+def merge(data: Optional[Dict[Tuple[str, str], list]]) -> None:
+    """Fold aggregates recorded elsewhere (e.g. a worker process) into this process."""
+    if data:
+        _timings.merge(data)
+
+
+def reset() -> None:
+    _timings.clear()
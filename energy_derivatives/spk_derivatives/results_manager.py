@@ -14,6 +14,8 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime
 import numpy as np
 
+from .payoffs import POSITIONS, position_legs, break_even_points
+
 
 class PricingResult:
     """
@@ -530,7 +532,8 @@ def comparative_context(result: PricingResult) -> Dict[str, str]:
     return context
 
 
-def break_even_analysis(result: PricingResult, system_size_kw: float = 10.0) -> Dict[str, Any]:
+def break_even_analysis(result: PricingResult, system_size_kw: float = 10.0,
+                        position: str = 'long_call') -> Dict[str, Any]:
     """
     Calculate break-even scenarios: "When does this pay off?"
 
@@ -542,31 +545,37 @@ def break_even_analysis(result: PricingResult, system_size_kw: float = 10.0) ->
         Pricing result
     system_size_kw : float
         System size in kW for scaling
+    position : str
+        'long_call', 'short_call', 'long_put' or 'short_put'
 
     Returns
     -------
     dict
-        Break-even calculations
+        Break-even calculations; 'breakeven_price' and
+        'breakeven_change_pct' are None when the position never breaks even
     """
-    # Simplified break-even calculation
-    # For a call option: pays off when S_T > K + premium
-
-    premium = result.option_price
     strike = result.params['K']
     spot = result.params['S0']
-
-    # Break-even spot price at expiry
-    breakeven_price = strike + premium
+    premium = result.option_price
+    if POSITIONS.get(position, ('call',))[0] == 'put':
+        # result.option_price is the call premium; put via put-call parity
+        premium = premium - spot + strike * np.exp(-result.params['r'] * result.params['T'])
+
+    # Break-even spot price at expiry, solved exactly from the expiry P&L
+    legs = position_legs(position, strike, premium)
+    points = break_even_points(legs)
+    if points.size == 0:
+        return {
+            'breakeven_price': None,
+            'breakeven_change_pct': None,
+            'current_spot': spot,
+            'strike': strike,
+            'premium_paid': premium,
+            'interpretation': "Position does not break even at any expiry price",
+        }
+    breakeven_price = float(points[0])
     breakeven_change_pct = ((breakeven_price / spot) - 1) * 100
 
-    # Probability estimate (simplified using normal approximation)
-    vol = result.params['sigma']
-    T = result.params['T']
-
-    # For ATM option, roughly 50% probability
-    # For ITM/OTM, adjust based on moneyness
-    moneyness = result.computed['moneyness']
-
     return {
         'breakeven_price': breakeven_price,
         'breakeven_change_pct': breakeven_change_pct,
@@ -10,6 +10,7 @@ for risk management and hedging strategies.
 Key Functions:
 -----------
 compute_greeks(): Compute all Greeks at once
+greeks_batch(): Binomial Greeks for many contracts in one stacked repricing
 delta(): Price sensitivity to underlying
 vega(): Price sensitivity to volatility
 theta(): Time decay
@@ -19,8 +20,9 @@ rho(): Interest rate sensitivity
 import numpy as np
 import pandas as pd
 from typing import Dict, Optional
-from .binomial import BinomialTree
+from .binomial import BinomialTree, price_batch
 from .monte_carlo import MonteCarloSimulator
+from .profiling import phase
 import warnings
 
 
@@ -96,16 +98,17 @@ class GreeksCalculator:
         r = kwargs.get('r', self.r)
         sigma = kwargs.get('sigma', self.sigma)
         
-        if self.pricing_method == 'binomial':
-            tree = BinomialTree(S0, K, T, r, sigma, self.N, self.payoff_type)
-            return tree.price()
-        elif self.pricing_method == 'monte_carlo':
-            sim = MonteCarloSimulator(S0, K, T, r, sigma, 
-                                     self.num_simulations, seed=self.seed,
-                                     payoff_type=self.payoff_type)
-            return sim.price()
-        else:
-            raise ValueError(f"Unknown pricing method: {self.pricing_method}")
+        with phase('greeks', 'reprice'):
+            if self.pricing_method == 'binomial':
+                tree = BinomialTree(S0, K, T, r, sigma, self.N, self.payoff_type)
+                return tree.price()
+            elif self.pricing_method == 'monte_carlo':
+                sim = MonteCarloSimulator(S0, K, T, r, sigma, 
+                                         self.num_simulations, seed=self.seed,
+                                         payoff_type=self.payoff_type)
+                return sim.price()
+            else:
+                raise ValueError(f"Unknown pricing method: {self.pricing_method}")
     
     def base_price(self) -> float:
         """
@@ -274,14 +277,15 @@ class GreeksCalculator:
         Dict[str, float]
             Dictionary containing all Greeks
         """
-        greeks = {
-            'Price': self.base_price(),
-            'Delta': self.delta(),
-            'Gamma': self.gamma(),
-            'Vega': self.vega(),
-            'Theta': self.theta(),
-            'Rho': self.rho()
-        }
+        with phase('greeks', 'total'):
+            greeks = {
+                'Price': self.base_price(),
+                'Delta': self.delta(),
+                'Gamma': self.gamma(),
+                'Vega': self.vega(),
+                'Theta': self.theta(),
+                'Rho': self.rho()
+            }
         return greeks
     
     def to_dataframe(self) -> pd.DataFrame:
@@ -382,3 +386,56 @@ def compute_energy_derivatives_greeks(S0: float, K: float, T: float, r: float,
         seed=seed
     )
     return calc.to_dataframe()
+
+
+def greeks_batch(S0, K, T, r, sigma, N: int = 100,
+                 payoff_type: str = 'call') -> Dict[str, np.ndarray]:
+    """
+    Binomial price and Greeks for a batch of contracts.
+
+    Uses the same finite differences and bump sizes as
+    ``GreeksCalculator(..., pricing_method='binomial')``, but every bumped
+    valuation of every contract is priced in one ``binomial.price_batch``
+    call (8 stacked lattices per contract).
+
+    Parameters
+    ----------
+    S0, K, T, r, sigma : array_like
+        Contract parameters (broadcast against each other)
+    N : int
+        Tree steps (shared by the batch)
+    payoff_type : str
+        'call' or 'redeemable'
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        Price, Delta, Gamma, Vega (per 1% vol), Theta (per day) and Rho
+        (per 1% rate), each with the broadcast batch shape
+    """
+    S0, K, T, r, sigma = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (S0, K, T, r, sigma))
+    )
+    h_s = 0.01 * S0
+    h_v = np.where(sigma - 0.01 <= 0, sigma / 4, 0.01)
+    h_t = np.where(T - 1 / 252 <= 0, T / 2, 1 / 252)
+    h_r = 0.01
+    with phase('greeks', 'total'):
+        bumped = [
+            (S0, T, r, sigma),
+            (S0 + h_s, T, r, sigma), (S0 - h_s, T, r, sigma),
+            (S0, T, r, sigma + h_v), (S0, T, r, sigma - h_v),
+            (S0, T - h_t, r, sigma),
+            (S0, T, r + h_r, sigma), (S0, T, r - h_r, sigma),
+        ]
+        stacked = [np.stack([b[i] for b in bumped]) for i in range(4)]
+        v = price_batch(stacked[0], K, stacked[1], stacked[2], stacked[3], N=N,
+                        payoff_type=payoff_type)
+    return {
+        'Price': v[0],
+        'Delta': (v[1] - v[2]) / (2 * h_s),
+        'Gamma': (v[1] - 2 * v[0] + v[2]) / h_s ** 2,
+        'Vega': (v[3] - v[4]) / (2 * h_v) * 0.01,
+        'Theta': (v[5] - v[0]) / (h_t * 252),
+        'Rho': (v[6] - v[7]) / (2 * h_r) * 0.01,
+    }
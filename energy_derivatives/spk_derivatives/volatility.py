@@ -0,0 +1,474 @@
+"""
+Volatility Estimators with Incremental Updates
+==============================================
+
+Time-varying alternatives to the single full-sample standard deviation used
+by the data loaders:
+
+- RollingVolatility: equally weighted variance over the last ``window`` returns
+- EWMAVolatility: RiskMetrics-style exponentially weighted variance
+- GARCHVolatility: GARCH(1,1), fitted by maximum likelihood, with a
+  mean-reverting variance forecast
+
+Every estimator is fitted once on history and then updated one observation
+at a time with ``update(price)`` at O(1) cost, so a nightly refresh folds in
+the new day instead of rescanning years of data. ``get_state`` returns a
+small JSON-serializable dict that ``from_state`` restores, so the state can
+be stored next to the cached series between runs (the rolling window keeps
+its last ``window`` returns; EWMA and GARCH keep a handful of floats).
+
+``term_structure(maturities)`` returns the annualized sigma to use for each
+maturity: flat for the rolling and EWMA models, converging from the current
+level to the long-run level for GARCH. Each value is the root-mean variance
+over [0, T], which is what the constant-sigma pricers expect.
+
+Key Classes:
+-----------
+VolatilityEstimator: Common interface (update / sigma / term_structure / state)
+RollingVolatility: Rolling-window estimator
+EWMAVolatility: Exponentially weighted estimator
+GARCHVolatility: GARCH(1,1) estimator
+
+Key Functions:
+-----------
+log_returns(): Finite log returns of a positive price series
+volatility_term_structure(): Fit a model and tabulate sigma by maturity
+"""
+
+import numpy as np
+import pandas as pd
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Dict, Optional, Sequence, Tuple
+from scipy import optimize, signal
+
+
+def log_returns(prices) -> np.ndarray:
+    """
+    Log returns of a price series, skipping non-positive or missing prices.
+
+    Parameters
+    ----------
+    prices : array_like
+        Price series in time order
+
+    Returns
+    -------
+    np.ndarray
+        Finite log returns
+    """
+    prices = np.asarray(prices, dtype=float)
+    prices = prices[np.isfinite(prices) & (prices > 0)]
+    returns = np.diff(np.log(prices))
+    return returns[np.isfinite(returns)]
+
+
+class VolatilityEstimator(ABC):
+    """
+    Base class for incrementally updated volatility estimators.
+
+    Subclasses implement ``_update_return`` (fold in one log return),
+    ``variance`` (current one-period variance) and the state hooks.
+
+    Parameters
+    ----------
+    periods : int
+        Observations per year used for annualization (252 trading days,
+        365 for calendar-daily energy series)
+    """
+
+    model = 'base'
+
+    def __init__(self, periods: int = 252):
+        if periods <= 0:
+            raise ValueError("periods must be positive")
+        self.periods = periods
+        self.last_price: Optional[float] = None
+        self.n_obs = 0
+
+    # --- to implement -------------------------------------------------
+
+    @abstractmethod
+    def _update_return(self, ret: float) -> None:
+        """Fold one log return into the state."""
+
+    @property
+    @abstractmethod
+    def variance(self) -> float:
+        """Current one-period variance forecast."""
+
+    @abstractmethod
+    def _model_state(self) -> Dict:
+        """Model-specific part of ``get_state``."""
+
+    @abstractmethod
+    def _load_model_state(self, state: Dict) -> None:
+        """Inverse of ``_model_state``."""
+
+    # --- shared interface ---------------------------------------------
+
+    def fit(self, prices) -> 'VolatilityEstimator':
+        """
+        Initialize from a price history.
+
+        Parameters
+        ----------
+        prices : array_like
+            Historical prices in time order
+
+        Returns
+        -------
+        VolatilityEstimator
+            self
+        """
+        prices = np.asarray(prices, dtype=float)
+        valid = prices[np.isfinite(prices) & (prices > 0)]
+        if len(valid) < 3:
+            raise ValueError("Need at least 3 valid prices to fit a volatility model")
+        self.update_returns(log_returns(valid))
+        self.last_price = float(valid[-1])
+        return self
+
+    def update_returns(self, returns) -> 'VolatilityEstimator':
+        """Fold in a sequence of log returns (in time order)."""
+        for ret in np.asarray(returns, dtype=float):
+            if np.isfinite(ret):
+                self._update_return(float(ret))
+                self.n_obs += 1
+        return self
+
+    def update(self, price: float) -> float:
+        """
+        Fold in one new price observation in O(1).
+
+        Parameters
+        ----------
+        price : float
+            Latest price; non-positive or missing prices are skipped
+
+        Returns
+        -------
+        float
+            Updated annualized sigma
+        """
+        if not np.isfinite(price) or price <= 0:
+            return self.sigma
+        if self.last_price is not None:
+            self.update_returns([np.log(price / self.last_price)])
+        self.last_price = float(price)
+        return self.sigma
+
+    @property
+    def sigma(self) -> float:
+        """Current annualized volatility."""
+        return float(np.sqrt(max(self.variance, 0.0) * self.periods))
+
+    def term_structure(self, maturities) -> np.ndarray:
+        """
+        Annualized sigma for each maturity (default: flat).
+
+        Parameters
+        ----------
+        maturities : array_like
+            Maturities in years
+
+        Returns
+        -------
+        np.ndarray
+            Sigma per maturity, same shape as ``maturities``
+        """
+        return np.full(np.shape(maturities), self.sigma)
+
+    def get_state(self) -> Dict:
+        """JSON-serializable snapshot of the estimator."""
+        return {
+            'model': self.model,
+            'periods': self.periods,
+            'last_price': self.last_price,
+            'n_obs': self.n_obs,
+            **self._model_state(),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'VolatilityEstimator':
+        """Rebuild an estimator from ``get_state`` output."""
+        target = ESTIMATORS.get(state.get('model'))
+        if target is None:
+            raise ValueError(f"Unknown volatility model: {state.get('model')}")
+        if cls is not VolatilityEstimator and not issubclass(target, cls):
+            raise ValueError(f"State is for {target.__name__}, not {cls.__name__}")
+        est = target.__new__(target)
+        VolatilityEstimator.__init__(est, periods=state['periods'])
+        est.last_price = state['last_price']
+        est.n_obs = state['n_obs']
+        est._load_model_state(state)
+        return est
+
+
+class RollingVolatility(VolatilityEstimator):
+    """
+    Rolling-window volatility (population std of the last ``window`` returns).
+
+    Running sums make each update O(1); the window itself is kept so the
+    oldest return can be dropped.
+
+    Parameters
+    ----------
+    window : int
+        Returns in the window (e.g. 30, 90, 365)
+    periods : int
+        Observations per year
+    """
+
+    model = 'rolling'
+
+    def __init__(self, window: int = 90, periods: int = 252):
+        super().__init__(periods)
+        if window < 2:
+            raise ValueError("window must be at least 2")
+        self.window = window
+        self._returns = deque()
+        self._sum = 0.0
+        self._sumsq = 0.0
+
+    def _update_return(self, ret: float) -> None:
+        self._returns.append(ret)
+        self._sum += ret
+        self._sumsq += ret * ret
+        if len(self._returns) > self.window:
+            old = self._returns.popleft()
+            self._sum -= old
+            self._sumsq -= old * old
+
+    @property
+    def variance(self) -> float:
+        n = len(self._returns)
+        if n < 2:
+            return np.nan
+        mean = self._sum / n
+        return max(self._sumsq / n - mean * mean, 0.0)
+
+    def _model_state(self) -> Dict:
+        return {'window': self.window, 'returns': list(self._returns)}
+
+    def _load_model_state(self, state: Dict) -> None:
+        self.window = state['window']
+        self._returns = deque()
+        self._sum = self._sumsq = 0.0
+        for ret in state['returns']:
+            self._update_return(ret)
+
+
+class EWMAVolatility(VolatilityEstimator):
+    """
+    Exponentially weighted variance: v_t = lam * v_{t-1} + (1 - lam) * r_t^2.
+
+    Parameters
+    ----------
+    lam : float
+        Decay factor in (0, 1) (RiskMetrics daily: 0.94)
+    periods : int
+        Observations per year
+    """
+
+    model = 'ewma'
+
+    def __init__(self, lam: float = 0.94, periods: int = 252):
+        super().__init__(periods)
+        if not 0 < lam < 1:
+            raise ValueError("lam must lie in (0, 1)")
+        self.lam = lam
+        self._var: Optional[float] = None
+
+    def _update_return(self, ret: float) -> None:
+        if self._var is None:
+            self._var = ret * ret
+        else:
+            self._var = self.lam * self._var + (1 - self.lam) * ret * ret
+
+    def fit(self, prices) -> 'EWMAVolatility':
+        # Seed with the sample variance rather than the first squared return
+        returns = log_returns(prices)
+        if len(returns) >= 2 and self._var is None:
+            self._var = float(np.var(returns))
+        return super().fit(prices)
+
+    @property
+    def variance(self) -> float:
+        return np.nan if self._var is None else self._var
+
+    def _model_state(self) -> Dict:
+        return {'lam': self.lam, 'var': self._var}
+
+    def _load_model_state(self, state: Dict) -> None:
+        self.lam = state['lam']
+        self._var = state['var']
+
+
+def _garch_variances(returns: np.ndarray, omega: float, alpha: float, beta: float,
+                     initial: float) -> np.ndarray:
+    """
+    Conditional variances h_t = omega + alpha r_{t-1}^2 + beta h_{t-1}.
+
+    The recursion is a first-order linear filter in r^2, so it runs through
+    ``scipy.signal.lfilter`` instead of a Python loop.
+    """
+    drive = omega + alpha * np.concatenate([[initial], returns[:-1] ** 2])
+    h, _ = signal.lfilter([1.0], [1.0, -beta], drive, zi=[beta * initial])
+    return h
+
+
+class GARCHVolatility(VolatilityEstimator):
+    """
+    GARCH(1,1) volatility: h_{t+1} = omega + alpha r_t^2 + beta h_t.
+
+    ``fit`` estimates (omega, alpha, beta) by Gaussian maximum likelihood
+    unless all three are given; ``update`` then applies the recursion.
+
+    Parameters
+    ----------
+    omega, alpha, beta : float, optional
+        Fixed parameters (estimated by ``fit`` when omitted)
+    periods : int
+        Observations per year
+    """
+
+    model = 'garch'
+
+    def __init__(self, omega: Optional[float] = None, alpha: Optional[float] = None,
+                 beta: Optional[float] = None, periods: int = 252):
+        super().__init__(periods)
+        self.omega, self.alpha, self.beta = omega, alpha, beta
+        self._next_var: Optional[float] = None
+
+    @property
+    def persistence(self) -> float:
+        """alpha + beta (< 1 for a stationary model)."""
+        return self.alpha + self.beta
+
+    @property
+    def long_run_variance(self) -> float:
+        """Unconditional one-period variance omega / (1 - alpha - beta)."""
+        return self.omega / (1.0 - self.persistence)
+
+    def _estimate(self, returns: np.ndarray) -> Tuple[float, float, float]:
+        sample_var = float(np.var(returns))
+        r2 = returns ** 2
+
+        def neg_loglik(theta):
+            alpha, beta = theta
+            if alpha + beta >= 0.9999:
+                return 1e10
+            omega = sample_var * (1 - alpha - beta)  # variance targeting
+            h = _garch_variances(returns, omega, alpha, beta, sample_var)
+            h = np.maximum(h, 1e-300)
+            return 0.5 * np.sum(np.log(h) + r2 / h)
+
+        best = min(
+            (optimize.minimize(neg_loglik, x0, method='L-BFGS-B',
+                               bounds=[(1e-6, 0.5), (0.0, 0.9999)])
+             for x0 in ([0.05, 0.90], [0.10, 0.60], [0.20, 0.20])),
+            key=lambda res: res.fun,
+        )
+        alpha, beta = (float(v) for v in best.x)
+        return sample_var * (1 - alpha - beta), alpha, beta
+
+    def fit(self, prices) -> 'GARCHVolatility':
+        returns = log_returns(prices)
+        if len(returns) < 30:
+            raise ValueError("Need at least 30 returns to fit GARCH(1,1)")
+        if None in (self.omega, self.alpha, self.beta):
+            self.omega, self.alpha, self.beta = self._estimate(returns)
+        if self.alpha + self.beta >= 1:
+            raise ValueError("GARCH(1,1) requires alpha + beta < 1")
+
+        # Run the filter over the whole history at once, then continue in O(1)
+        h = _garch_variances(returns, self.omega, self.alpha, self.beta, float(np.var(returns)))
+        self._next_var = float(self.omega + self.alpha * returns[-1] ** 2 + self.beta * h[-1])
+        self.n_obs += len(returns)
+        valid = np.asarray(prices, dtype=float)
+        valid = valid[np.isfinite(valid) & (valid > 0)]
+        self.last_price = float(valid[-1])
+        return self
+
+    def _update_return(self, ret: float) -> None:
+        if self._next_var is None:
+            raise ValueError("Call fit() before updating a GARCH model")
+        self._next_var = self.omega + self.alpha * ret * ret + self.beta * self._next_var
+
+    @property
+    def variance(self) -> float:
+        return np.nan if self._next_var is None else self._next_var
+
+    def term_structure(self, maturities) -> np.ndarray:
+        """
+        Root-mean forecast variance over [0, T], annualized.
+
+        E[h_{t+k}] = V_L + (alpha + beta)^(k-1) (h_{t+1} - V_L), so short
+        maturities sit near the current level and long ones approach the
+        long-run volatility.
+        """
+        T = np.asarray(maturities, dtype=float)
+        n = np.maximum(np.rint(T * self.periods), 1.0)
+        p = self.persistence
+        V_L = self.long_run_variance
+        mean_var = V_L + (self.variance - V_L) * (1 - p ** n) / (n * (1 - p))
+        return np.sqrt(np.maximum(mean_var, 0.0) * self.periods)
+
+    def _model_state(self) -> Dict:
+        return {'omega': self.omega, 'alpha': self.alpha, 'beta': self.beta,
+                'next_var': self._next_var}
+
+    def _load_model_state(self, state: Dict) -> None:
+        self.omega, self.alpha, self.beta = state['omega'], state['alpha'], state['beta']
+        self._next_var = state['next_var']
+
+
+ESTIMATORS = {
+    'rolling': RollingVolatility,
+    'ewma': EWMAVolatility,
+    'garch': GARCHVolatility,
+}
+
+
+def volatility_term_structure(prices,
+                              maturities: Sequence[float] = (0.25, 0.5, 1.0, 2.0),
+                              model: str = 'garch',
+                              periods: int = 252,
+                              **model_kwargs) -> pd.DataFrame:
+    """
+    Fit a volatility model to a price history and tabulate sigma by maturity.
+
+    Parameters
+    ----------
+    prices : array_like
+        Historical prices (e.g. ``params['prices']`` / ``params['energy_prices']``)
+    maturities : Sequence[float]
+        Maturities in years
+    model : str
+        'rolling', 'ewma' or 'garch'
+    periods : int
+        Observations per year
+    **model_kwargs
+        Passed to the estimator (window, lam, omega/alpha/beta)
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns: T, sigma, model
+
+    Example
+    -------
+    >>> ts = volatility_term_structure(params['energy_prices'], model='garch')
+    >>> for T, sigma in ts[['T', 'sigma']].itertuples(index=False):
+    ...     BinomialTree(S0, K, T, r, sigma, N=200).price()
+    """
+    if model not in ESTIMATORS:
+        raise ValueError(f"Unknown model: {model}. Choose from: {sorted(ESTIMATORS)}")
+    estimator = ESTIMATORS[model](periods=periods, **model_kwargs).fit(prices)
+    T = np.asarray(maturities, dtype=float)
+    return pd.DataFrame({
+        'T': T,
+        'sigma': estimator.term_structure(T),
+        'model': model,
+    })
@@ -0,0 +1,60 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from spk_derivatives.analysis import _run_task_graph, run_full_analysis  # noqa: E402
+
+
+def _add(a, b):
+    return a + b
+
+
+def test_task_graph_resolves_dependencies_and_rejects_cycles():
+    graph = {
+        'x': (_add, {'a': 1, 'b': 2}, {}),
+        'y': (_add, {'a': 10}, {'b': 'x'}),
+        'z': (_add, {}, {'a': 'x', 'b': 'y'}),
+    }
+    results, timings = _run_task_graph(graph, parallel=False)
+    assert results == {'x': 3, 'y': 13, 'z': 16}
+    assert set(timings) == set(graph)
+
+    with pytest.raises(ValueError):
+        _run_task_graph({'p': (_add, {'a': 1}, {'b': 'q'}),
+                         'q': (_add, {'a': 1}, {'b': 'p'})}, parallel=False)
+
+
+def test_full_analysis_parallel_matches_sequential(tmp_path):
+    params = dict(S0=0.035, K=0.040, T=1.0, r=0.025, sigma=0.42,
+                  scenarios=[{'name': 'Base', 'S0': 0.035, 'K': 0.040, 'sigma': 0.42}])
+    sequential = run_full_analysis(**params, parallel=False)
+    parallel = run_full_analysis(**params, parallel=True, max_workers=2,
+                                 export_file=str(tmp_path / 'analysis.xlsx'))
+
+    for key in ('sensitivity_table', 'vol_stress', 'rate_stress', 'combined_stress', 'scenario_comparison'):
+        pd.testing.assert_frame_equal(sequential[key], parallel[key])
+    assert parallel['sensitivity_table'].iloc[5]['Delta'] == parallel['base_greeks']['Delta']
+    assert 'export' in parallel['timings']
+    assert (tmp_path / 'analysis.xlsx').exists()
+
+
+def test_write_only_excel_and_arrow_exports(tmp_path):
+    import openpyxl
+    import pyarrow as pa
+    from spk_derivatives.analysis import combined_stress_test, export_results, export_to_excel
+
+    grid = combined_stress_test(S0=0.035, K=0.040, T=1.0)
+    export_to_excel(str(tmp_path / 'grid.xlsx'), combined_stress_df=grid, write_only=True)
+    ws = openpyxl.load_workbook(tmp_path / 'grid.xlsx')['Combined Stress']
+    assert [c.value for c in ws[1]] == ['Volatility'] + list(grid.columns)
+    assert ws.max_row == len(grid) + 1
+
+    files = export_results({'combined_stress': grid, 'timings': {}}, str(tmp_path / 'bundle'), fmt='arrow')
+    assert list(files) == ['combined_stress']
+    with pa.ipc.open_file(files['combined_stress']) as reader:
+        pd.testing.assert_frame_equal(reader.read_pandas(), grid)
@@ -1,9 +1,12 @@
+import os
 import sys
 from pathlib import Path
+import pytest
 from fastapi.testclient import TestClient
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
+os.environ.setdefault("SPK_API_EXECUTOR", "thread")
 
 from api.main import app  # type: ignore  # noqa: E402
 
@@ -30,3 +33,311 @@ def test_rate_limit_headers_present():
     payload = {"S0": 1.0, "K": 1.0, "T": 1.0, "r": 0.05, "sigma": 0.2}
     resp = client.post("/price", json=payload)
     assert resp.status_code == 200
+
+
+def test_default_parameters_preloaded_and_refreshed(monkeypatch):
+    from api.param_store import ParameterStore  # type: ignore
+
+    calls, version = [], ["v1"]
+
+    def loader(data_dir, use_repo_fallback):
+        calls.append(data_dir)
+        S0 = 2.0 if version[0] == "v1" else 3.0
+        return {"S0": S0, "sigma": 0.4, "K": S0, "ceir_df": object()}
+
+    store = ParameterStore(loader=loader, version=lambda d, f: version[0],
+                           resolve=lambda d, f: d.rstrip("/"), max_dirs=1)
+    monkeypatch.setattr(app.state, "param_store", store)
+    monkeypatch.setenv("SPK_API_DATA_DIRS", "data/a,data/b")
+    monkeypatch.setenv("SPK_PARAM_REFRESH_SECONDS", "0")
+
+    with TestClient(app) as started:
+        assert calls == ["data/a", "data/b"]
+        for _ in range(3):
+            resp = started.post("/price", json={"data_dir": "data/b", "N": 10})
+            assert resp.status_code == 200
+        assert resp.json()["inputs"] == {"S0": 2.0, "sigma": 0.4, "K": 2.0, "T": 1.0, "r": 0.05}
+        assert len(calls) == 2
+        assert store.get("data/a")["S0"] == 2.0
+
+        assert store.refresh() == 0
+        version[0] = "v2"
+        assert store.refresh() == 2 and len(calls) == 4
+        resp = started.post("/greeks", json={"data_dir": "data/a", "N": 10})
+        assert resp.json()["inputs"]["S0"] == 3.0
+
+        # Spellings of one directory share a snapshot; other directories are bounded
+        assert store.get("data/a/") is store.get("data/a") and len(calls) == 4
+        for data_dir in ("data/c", "data/d", "data/e"):
+            store.get(data_dir)
+        assert set(store.keys()) == {"data/a", "data/b", "data/e"}
+
+
+def test_batch_pricing_groups_engines_and_reports_item_errors(monkeypatch):
+    import numpy as np
+    import pyarrow as pa
+
+    import api.main as main  # type: ignore
+    from spk_derivatives.binomial import BinomialTree
+    from spk_derivatives.monte_carlo import MonteCarloSimulator
+
+    contracts = [
+        {"id": "a", "S0": 1.0, "K": 1.0, "sigma": 0.2, "N": 50},
+        {"id": "b", "S0": 1.2, "K": 1.0, "sigma": 0.3, "method": "monte_carlo",
+         "num_simulations": 2000, "seed": 7},
+        {"id": "bad", "S0": -1.0, "sigma": 0.2},
+        {"id": "c", "S0": 0.9, "K": 1.0, "sigma": 0.25, "N": 50},
+        {"id": "d", "S0": 1.0, "sigma": 0.2, "method": "analytic", "payoff_type": "redeemable"},
+        {"id": "e", "S0": 1.0, "sigma": 0.2, "method": "lattice"},
+        {"id": "f", "S0": 1.0, "sigma": 0.2, "T": -1, "method": "analytic"},
+    ]
+    resp = client.post("/price/batch", json={"contracts": contracts, "defaults": {"T": 0.5}})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["count"] == 7 and body["errors"] == 3
+    results = body["results"]
+    assert [r["id"] for r in results] == ["a", "b", "bad", "c", "d", "e", "f"]
+    assert results[0]["price"] == pytest.approx(BinomialTree(1.0, 1.0, 0.5, 0.05, 0.2, 50).price())
+    assert results[3]["price"] == pytest.approx(BinomialTree(0.9, 1.0, 0.5, 0.05, 0.25, 50).price())
+    assert results[1]["price"] == pytest.approx(
+        MonteCarloSimulator(1.2, 1.0, 0.5, 0.05, 0.3, 2000, seed=7).price())
+    assert results[1]["ci_95"][0] < results[1]["price"] < results[1]["ci_95"][1]
+    assert "S0 must be positive" in results[2]["error"] and results[2]["price"] is None
+    assert results[4]["price"] == pytest.approx(1.0) and "method" in results[5]["error"]
+    assert "T must be positive" in results[6]["error"] and results[6]["price"] is None
+
+    # Columnar JSON and Arrow give the same prices
+    columns = {"S0": [1.0, 0.9], "K": 1.0, "sigma": [0.2, 0.25], "T": 0.5, "N": 50}
+    columnar = client.post("/price/batch", json={"columns": columns}).json()["results"]
+    assert [r["price"] for r in columnar] == [results[0]["price"], results[3]["price"]]
+    table = pa.table({"S0": [1.0, 0.9], "K": [1.0, 1.0], "sigma": [0.2, 0.25],
+                      "T": [0.5, 0.5], "N": [50, 50]})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    arrow = client.post("/price/batch", content=sink.getvalue().to_pybytes(),
+                        headers={"content-type": "application/vnd.apache.arrow.stream"})
+    assert np.allclose([r["price"] for r in arrow.json()["results"]],
+                       [results[0]["price"], results[3]["price"]])
+
+    assert client.post("/price/batch", json={"rows": []}).status_code == 400
+
+    # The limit counts contracts, not requests
+    monkeypatch.setattr(main, "BATCH_CONTRACT_LIMIT", main.parse_limit("5/minute"))
+    main.limiter.reset()
+    assert client.post("/price/batch", json={"columns": {**columns, "S0": [1.0] * 4, "sigma": 0.2}}).status_code == 200
+    assert client.post("/price/batch", json={"columns": columns}).status_code == 429
+    main.limiter.reset()
+
+
+def test_repeated_price_requests_hit_response_cache(monkeypatch):
+    from api.response_cache import ResponseCache  # type: ignore
+
+    monkeypatch.setattr(app.state, "response_cache", ResponseCache(ttl=60))
+    payload = {"S0": 1.0, "K": 1.0, "sigma": 0.2, "method": "monte_carlo",
+               "num_simulations": 2000, "seed": 3}
+    first = client.post("/price", json=payload).json()
+    assert client.post("/price", json=payload).json() == first
+    client.post("/price", json={**payload, "seed": None})
+    stats = client.get("/cache/stats").json()
+    assert (stats["hits"], stats["misses"], stats["uncacheable"]) == (1, 1, 1)
+
+
+def test_stress_streams_ndjson_scenarios():
+    import json
+
+    payload = {"S0": 1.0, "K": 1.0, "sigma": 0.2, "num_simulations": 2000,
+               "volatilities": [0.1, 0.3, 0.5, 0.7, 0.9, 1.1], "rates": [0.01]}
+    resp = client.post("/stress", json=payload, headers={"Accept": "application/x-ndjson"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    start, rows, done = lines[0], lines[1:-1], lines[-1]
+    assert start["scenarios"] == 8 and done == {"done": True, "count": 8}
+    assert sorted(r.get("vol", 0) for r in rows if r["scenario"] == "vol") == payload["volatilities"]
+    # Shared draws: a lower rate lowers the call price without sampling noise
+    base = next(r for r in rows if r["scenario"] == "base")
+    rate = next(r for r in rows if r["scenario"] == "rate")
+    assert rate["rate"] == 0.01 and rate["price"] < base["price"]
+
+
+def test_job_endpoints_queue_report_and_serve_results(monkeypatch, tmp_path):
+    from api.jobs import JobStore, run_job  # type: ignore
+
+    store = JobStore(tmp_path / "jobs.sqlite", tmp_path / "results")
+    monkeypatch.setattr(app.state, "job_store", store)
+    resp = client.post("/jobs", json={"kind": "monte_carlo",
+                                      "params": {"S0": 1.0, "K": 1.0, "sigma": 0.2, "num_simulations": 20000,
+                                                 "chunk_size": 10000, "seed": 1}})
+    assert resp.status_code == 202
+    job_id = resp.json()["id"]
+    assert client.get(f"/jobs/{job_id}").json()["status"] == "queued"
+    assert client.post("/jobs", json={"kind": "monte_carlo",
+                                      "params": {"S0": 1.0, "sigma": 0.2, "chunk_size": 1}}).status_code == 400
+
+    run_job(store, store.claim("test"))  # what a worker process does
+    job = client.get(f"/jobs/{job_id}").json()
+    assert job["status"] == "done" and job["params"]["r"] == 0.05
+    assert job["result"]["ci_95"][0] < job["result"]["price"] < job["result"]["ci_95"][1]
+    download = client.get(job["results"]["convergence"])
+    assert download.status_code == 200 and download.content[:4] == b"PAR1"
+    assert client.get("/jobs/missing").status_code == 404
+
+
+def test_metrics_endpoint_exposes_latency_engine_phases_and_queues():
+    client.post("/price", json={"S0": 1.0, "K": 1.0, "sigma": 0.2, "N": 30})
+    resp = client.get("/metrics")
+    assert resp.status_code == 200 and resp.headers["content-type"].startswith("text/plain")
+    text = resp.text
+    assert 'spk_http_request_duration_seconds_count{method="POST",endpoint="/price"}' in text
+    assert 'spk_http_request_duration_seconds_bucket{method="POST",endpoint="/price",le="+Inf"}' in text
+    assert 'spk_engine_phase_seconds_count{engine="binomial",phase="rollback"}' in text
+    assert 'spk_executor_in_flight{lane="heavy"} 0' in text
+    assert "spk_response_cache_hit_ratio" in text and 'spk_jobs{status="queued"}' in text
+
+
+def test_price_feed_pushes_only_contracts_whose_inputs_change(monkeypatch):
+    from api.param_store import ParameterStore  # type: ignore
+    from spk_derivatives.binomial import BinomialTree  # type: ignore
+
+    store = ParameterStore(loader=lambda data_dir, use_repo_fallback: {"S0": 2.0, "sigma": 0.4, "K": 2.0},
+                           version=lambda d, f: "v1")
+    monkeypatch.setattr(app.state, "param_store", store)
+    monkeypatch.setenv("SPK_PARAM_REFRESH_SECONDS", "0")
+    monkeypatch.setenv("SPK_FEED_POLL_SECONDS", "0")
+    live = {"S0": 1.0, "K": 1.0, "sigma": 0.2, "N": 20}
+
+    with TestClient(app) as started:
+        with started.websocket_connect("/ws/prices") as a, started.websocket_connect("/ws/prices") as b:
+            a.send_json({"action": "subscribe", "contracts": [
+                {"id": "live", **live},
+                {"id": "fixed", **live, "r": 0.03, "greeks": False},
+                {"id": "defaults", "N": 20},
+                {"id": "bad", "N": 0},
+            ]})
+            ack = a.receive_json()
+            assert ack["type"] == "subscribed" and ack["ids"] == ["live", "fixed", "defaults"]
+            assert "bad" in ack["errors"]
+            first = {m["id"]: m for m in (a.receive_json() for _ in range(3))}
+            assert first["live"]["price"] == pytest.approx(BinomialTree(1.0, 1.0, 1.0, 0.05, 0.2, 20).price())
+            assert first["live"]["greeks"]["Delta"] > 0 and "greeks" not in first["fixed"]
+            assert first["defaults"]["inputs"]["S0"] == 2.0
+
+            # Same contract from another client: one entry, cached price sent at once
+            b.send_json({"action": "subscribe", "contracts": [{"id": "mine", **live}]})
+            assert b.receive_json()["type"] == "subscribed"
+            assert b.receive_json()["price"] == first["live"]["price"]
+            feed = app.state.price_feed
+            assert feed.stats()["contracts"] == 3 and feed.stats()["repriced"] == 3
+
+            assert started.post("/market/rate", json={"r": 0.07}).json() == {"r": 0.07}
+            updates = {m["id"]: m for m in (a.receive_json() for _ in range(2))}
+            assert set(updates) == {"live", "defaults"}
+            assert updates["live"]["inputs"]["r"] == 0.07 and updates["live"]["price"] > first["live"]["price"]
+            assert b.receive_json()["price"] == updates["live"]["price"]
+            # One batch for the rate move; the fixed-rate contract was not repriced
+            assert feed.stats()["repriced"] == 5
+
+
+def test_price_surfaces_serve_binomial_quotes_within_their_bound(monkeypatch):
+    import time
+
+    from spk_derivatives.binomial import BinomialTree  # type: ignore
+
+    monkeypatch.setenv("SPK_PRICE_SURFACES", "1")
+    monkeypatch.setenv("SPK_SURFACE_NODES", "12,8,8")
+    monkeypatch.setenv("SPK_SURFACE_TOLERANCE", "0.05")
+    monkeypatch.setenv("SPK_SURFACE_KEYS", "0.05:60:call")
+    monkeypatch.setenv("SPK_API_DATA_DIRS", "data/surface")
+    monkeypatch.setenv("SPK_PARAM_REFRESH_SECONDS", "0")
+    store = type(app.state.param_store)(
+        loader=lambda data_dir, use_repo_fallback: {"S0": 1.0, "sigma": 0.4, "K": 1.0},
+        version=lambda d, f: "v1")
+    monkeypatch.setattr(app.state, "param_store", store)
+    payload = {"S0": 1.1, "K": 1.0, "sigma": 0.35, "T": 0.5, "N": 60, "data_dir": "data/surface"}
+
+    with TestClient(app) as started:
+        for _ in range(200):
+            surfaces = app.state.surfaces.stats()["surfaces"]
+            if surfaces and all(s.get("nodes") for s in surfaces):
+                break
+            time.sleep(0.05)
+        resp = started.post("/price", json=payload).json()
+        bound = resp["surface"]["error_bound"]["Price"]
+        assert abs(resp["price"] - BinomialTree(1.1, 1.0, 0.5, 0.05, 0.35, 60).price()) <= bound
+
+        # Steps outside SPK_SURFACE_KEYS are priced in full and build nothing
+        assert "surface" not in started.post("/price", json={**payload, "N": 70}).json()
+        assert len(app.state.surfaces.stats()["surfaces"]) == 1
+
+        # Lattice noise puts the Delta/Gamma bounds over their tolerance: full Greeks
+        greeks = started.post("/greeks", json=payload).json()
+        assert "surface" not in greeks
+        assert set(greeks["greeks"]) == {"Price", "Delta", "Gamma", "Vega", "Theta", "Rho"}
+        app.state.surfaces.greek_tolerance = {name: 1e3 for name in app.state.surfaces.greek_tolerance}
+        assert "surface" in started.post("/greeks", json=payload).json()
+        # Outside the sigma range: priced in full
+        assert "surface" not in started.post("/price", json={**payload, "sigma": 2.0}).json()
+        stats = started.get("/surfaces").json()
+        assert stats["hits"] == 2 and [s["N"] for s in stats["surfaces"]] == [60]
+        assert stats["keys"] == [[0.05, 60, "call"]]
+
+
+def test_pricing_responses_negotiate_msgpack_and_arrow():
+    import pyarrow as pa
+
+    import api.main as main  # type: ignore
+    from api.formats import loads_msgpack  # type: ignore
+
+    main.limiter.reset()
+    payload = {"S0": 1.0, "K": 1.0, "sigma": 0.2, "N": 30}
+    as_json = client.post("/price", json=payload).json()
+    resp = client.post("/price", json=payload, headers={"Accept": "application/msgpack"})
+    assert resp.headers["content-type"] == "application/msgpack"
+    assert loads_msgpack(resp.content) == as_json
+    assert client.post("/price", json=payload, headers={"Accept": "text/csv"}).status_code == 406
+
+    columns = {"S0": [1.0, -1.0, 0.9], "K": 1.0, "sigma": 0.2, "N": 30}
+    resp = client.post("/price/batch", json={"columns": columns},
+                       headers={"Accept": "application/vnd.apache.arrow.stream"})
+    table = pa.ipc.open_stream(resp.content).read_all()
+    assert resp.headers["x-batch-errors"] == "1"
+    assert table.column("price").to_pylist()[0] == as_json["price"]
+    assert table.column("price").null_count == 1 and "S0" in table.column("error").to_pylist()[1]
+
+    resp = client.post("/price/batch?layout=columns", json={"columns": columns},
+                       headers={"Accept": "application/msgpack"})
+    body = loads_msgpack(resp.content)
+    assert body["count"] == 3 and body["columns"]["price"][2] == table.column("price").to_pylist()[2]
+    main.limiter.reset()
+
+
+def test_surface_service_evicts_lru_and_does_not_retry_timed_out_builds():
+    import asyncio
+
+    from api.executor import LaneTimeout  # type: ignore
+    from api.param_store import ParameterStore  # type: ignore
+    from api.surfaces import SurfaceService  # type: ignore
+
+    class TimingOut:
+        calls = 0
+
+        async def run(self, lane, fn, *args):
+            TimingOut.calls += 1
+            raise LaneTimeout("heavy job exceeded 120s")
+
+    store = ParameterStore(loader=lambda data_dir, use_repo_fallback: {"S0": 1.0, "sigma": 0.4, "K": 1.0},
+                           version=lambda d, f: "v1", resolve=lambda d, f: d)
+    service = SurfaceService(store, TimingOut(), enabled=True, max_surfaces=2, check_seconds=0)
+    params = {"S0": 1.0, "K": 1.0, "T": 1.0, "r": 0.05, "sigma": 0.4}
+
+    async def go():
+        for data_dir in ("a", "b", "a", "c", "a"):
+            service.quote(data_dir, True, params, 100, "call")
+            await service.wait_built()
+
+    with pytest.warns(UserWarning, match="not retrying"):
+        asyncio.run(go())
+    stats = service.stats()["surfaces"]
+    assert [s["data_dir"] for s in stats] == ["c", "a"] and all(s["failed"] for s in stats)
+    assert TimingOut.calls == 3  # a, b, c once each; "a" was never rebuilt
@@ -0,0 +1,84 @@
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from spk_derivatives import nasa_power  # noqa: E402
+from spk_derivatives.bulk_fetch import bulk_summary, fetch_many  # noqa: E402
+from spk_derivatives.cache import ColumnarCache  # noqa: E402
+
+
+class StubPower(BaseHTTPRequestHandler):
+    """POWER-shaped responses; tracks peak concurrency; fails sites with lon < 0."""
+    in_flight = 0
+    peak = 0
+    requests = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.requests += 1
+            cls.peak = max(cls.peak, cls.in_flight)
+        time.sleep(0.02)
+        query = {k: v[0] for k, v in parse_qs(urlsplit(self.path).query).items()}
+        status, body = 503, b''
+        if float(query['longitude']) >= 0:
+            days = pd.date_range(query['start'], query['end']).strftime('%Y%m%d')
+            status, body = 200, json.dumps({'properties': {'parameter': {
+                name: {d: 5.0 for d in days} for name in query['parameters'].split(',')
+            }}}).encode()
+        # Leave before responding: the client may reuse its slot as soon as it reads
+        with cls.lock:
+            cls.in_flight -= 1
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_url():
+    StubPower.in_flight = StubPower.peak = StubPower.requests = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubPower)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/api/temporal/daily/point"
+    server.shutdown()
+
+
+def test_fetch_many_respects_per_host_limit(stub_url, tmp_path):
+    jobs = [{'lat': 10.0 + i, 'lon': 20.0, 'start': 2020, 'end': 2020,
+             'energy_type': ('solar', 'wind', 'hydro')[i % 3]} for i in range(24)]
+    results = fetch_many(jobs, max_workers=12, per_host_limit=3,
+                         store=ColumnarCache(tmp_path), base_url=stub_url)
+
+    summary = bulk_summary(results)
+    assert summary['ok'].all() and (summary['days'] == 366).all()
+    assert StubPower.peak <= 3
+    assert list(results[1]['data'].columns) == ['WS10M', 'WS50M', 'WD10M']
+
+
+def test_retry_budget_bounds_total_retries(stub_url, tmp_path, monkeypatch):
+    monkeypatch.setattr(nasa_power, 'RETRY_BACKOFF', 0.0)
+    jobs = [{'lat': 1.0, 'lon': -float(i + 1), 'start': 2020, 'end': 2020,
+             'energy_type': 'solar'} for i in range(10)]
+    results = fetch_many(jobs, max_workers=5, retry_budget=4,
+                         store=ColumnarCache(tmp_path), base_url=stub_url)
+
+    assert all(r['error'] for r in results)
+    assert StubPower.requests == len(jobs) + 4
@@ -0,0 +1,191 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from spk_derivatives import data_loader_nasa, nasa_power  # noqa: E402
+from spk_derivatives.cache import ColumnarCache, missing_ranges  # noqa: E402
+
+
+def _series(start, end, column='GHI'):
+    index = pd.date_range(start, end, freq='D')
+    return pd.DataFrame({column: np.linspace(1.0, 5.0, len(index))}, index=index)
+
+
+def test_put_get_respects_coverage_and_types(tmp_path):
+    cache = ColumnarCache(tmp_path)
+    cache.put(['ALLSKY_SFC_SW_DWN'], 24.99, 121.30, _series('2020-01-01', '2024-12-31'),
+              '2020-01-01', '2024-12-31')
+
+    window = cache.get(['ALLSKY_SFC_SW_DWN'], 24.99, 121.30, '2022-01-01', '2022-12-31')
+    assert len(window) == 365
+    assert window['GHI'].dtype == np.float32
+    assert isinstance(window.index, pd.DatetimeIndex)
+    assert cache.get(['ALLSKY_SFC_SW_DWN'], 24.99, 121.30, '2019-01-01', '2022-12-31') is None
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_lru_eviction_keeps_recent_entries(tmp_path):
+    probe = ColumnarCache(tmp_path / 'probe')
+    probe.put(['X'], 0, 0, _series('2000-01-01', '2009-12-31'), '2000-01-01', '2009-12-31')
+    entry_bytes = probe.total_bytes()
+
+    cache = ColumnarCache(tmp_path / 'lru', max_bytes=int(2.5 * entry_bytes))
+    for lon in (0, 1, 2):
+        cache.put(['X'], 0, lon, _series('2000-01-01', '2009-12-31'), '2000-01-01', '2009-12-31')
+        if lon == 1:
+            cache.get(['X'], 0, 0)  # touch the first entry so the second is oldest
+
+    assert cache.stats()['entries'] == 2
+    assert cache.coverage(['X'], 0, 1) == []
+    assert cache.coverage(['X'], 0, 0) != []
+
+
+def test_missing_ranges_and_merge_on_put(tmp_path):
+    assert missing_ranges([('2020-01-01', '2024-12-31')], '2019-07-01', '2025-01-10') == [
+        (pd.Timestamp('2019-07-01'), pd.Timestamp('2019-12-31')),
+        (pd.Timestamp('2025-01-01'), pd.Timestamp('2025-01-10')),
+    ]
+    assert missing_ranges([('2020-01-01', '2024-12-31')], '2021-03-01', '2021-04-01') == []
+
+    cache = ColumnarCache(tmp_path)
+    cache.put(['X'], 0, 0, _series('2020-01-01', '2020-12-31', 'X'), '2020-01-01', '2020-12-31')
+    cache.put(['X'], 0, 0, _series('2020-12-01', '2021-06-30', 'X'), '2020-12-01', '2021-06-30', merge=True)
+    assert cache.coverage(['X'], 0, 0) == [(pd.Timestamp('2020-01-01'), pd.Timestamp('2021-06-30'))]
+    merged = cache.get(['X'], 0, 0)
+    assert len(merged) == 547 and merged.index.is_unique
+
+
+def test_fetch_nasa_data_downloads_only_missing_days(tmp_path, monkeypatch):
+    monkeypatch.setenv('SPK_CACHE_DIR', str(tmp_path))
+    requested = []
+
+    class FakeResponse:
+        def __init__(self, params):
+            self.params = params
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            days = pd.date_range(self.params['start'], self.params['end']).strftime('%Y%m%d')
+            return {'properties': {'parameter': {'ALLSKY_SFC_SW_DWN': {d: 4.0 for d in days}}}}
+
+    def fake_get(url, params=None, timeout=None):
+        requested.append((params['start'], params['end']))
+        return FakeResponse(params)
+
+    monkeypatch.setattr(nasa_power.requests, 'get', fake_get)
+    first = data_loader_nasa.fetch_nasa_data(start=2020, end=2020)
+    extended = data_loader_nasa.fetch_nasa_data(start=2020, end=2021)
+    subrange = data_loader_nasa.fetch_nasa_data(start=2021, end=2021)
+
+    assert requested == [('20200101', '20201231'), ('20210101', '20211231')]
+    assert len(first) == 366 and len(extended) == 731 and len(subrange) == 365
+
+
+def _put_many(root, lon):
+    cache = ColumnarCache(root)
+    for lat in range(5):
+        cache.put(['X'], lat, lon, _series('2020-01-01', '2020-01-31', 'X'), '2020-01-01', '2020-01-31')
+
+
+def test_concurrent_processes_keep_every_entry_and_hits_do_not_rewrite(tmp_path):
+    import multiprocessing
+
+    context = multiprocessing.get_context('spawn')
+    workers = [context.Process(target=_put_many, args=(tmp_path, lon)) for lon in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+        assert worker.exitcode == 0
+
+    cache = ColumnarCache(tmp_path)
+    assert cache.stats()['entries'] == 20
+    before = cache.manifest_path.stat().st_mtime_ns
+    assert cache.get(['X'], 0, 0) is not None
+    assert cache.manifest_path.stat().st_mtime_ns == before
+    cache.flush_access()
+    assert cache.manifest_path.stat().st_mtime_ns != before
+
+
+def _serve_power(monkeypatch, value):
+    """Fake POWER endpoint returning ``value(timestamp)``; returns the requested windows."""
+    requested = []
+
+    class FakeResponse:
+        def __init__(self, url, params):
+            self.hourly = 'hourly' in url
+            self.params = params
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            last = pd.Timestamp(self.params['end']) + pd.Timedelta(hours=23 if self.hourly else 0)
+            stamps = pd.date_range(self.params['start'], last, freq='h' if self.hourly else 'D')
+            fmt = '%Y%m%d%H' if self.hourly else '%Y%m%d'
+            values = {t.strftime(fmt): value(t) for t in stamps}
+            return {'properties': {'parameter': {'X': values}}}
+
+    def fake_get(url, params=None, timeout=None):
+        requested.append((params['start'], params['end']))
+        return FakeResponse(url, params)
+
+    monkeypatch.setattr(nasa_power.requests, 'get', fake_get)
+    return requested
+
+
+def _valid(df):
+    return df[df['X'] > -999]
+
+
+def test_trailing_fill_days_are_fetched_again(tmp_path, monkeypatch):
+    published = {'end': pd.Timestamp('2020-01-25')}
+    requested = _serve_power(monkeypatch, lambda t: 4.0 if t <= published['end'] else -999.0)
+    store = ColumnarCache(tmp_path)
+
+    def load():
+        return nasa_power.load_daily(['X'], 0, 0, '2020-01-01', '2020-01-31',
+                                     clean=_valid, store=store)
+
+    assert len(load()) == 25
+    assert store.coverage(['X'], 0, 0) == [(pd.Timestamp('2020-01-01'), pd.Timestamp('2020-01-25'))]
+    published['end'] = pd.Timestamp('2020-01-31')
+    assert len(load()) == 31
+    assert requested == [('20200101', '20200131'), ('20200126', '20200131')]
+
+
+def test_invalid_days_inside_the_window_are_covered(tmp_path, monkeypatch):
+    requested = _serve_power(monkeypatch, lambda t: -999.0 if t == pd.Timestamp('2020-12-31') else 4.0)
+    store = ColumnarCache(tmp_path)
+    nasa_power.load_daily(['X'], 0, 0, '2021-01-01', '2021-12-31', clean=_valid, store=store)
+
+    df = nasa_power.load_daily(['X'], 0, 0, '2020-01-01', '2021-12-31', clean=_valid, store=store)
+    assert len(df) == 365 + 365
+    assert store.coverage(['X'], 0, 0) == [(pd.Timestamp('2020-01-01'), pd.Timestamp('2021-12-31'))]
+    assert len(nasa_power.load_daily(['X'], 0, 0, '2020-01-01', '2021-12-31',
+                                     clean=_valid, store=store)) == 730
+    assert requested == [('20210101', '20211231'), ('20200101', '20201231')]
+
+
+def test_partly_published_hours_are_fetched_again(tmp_path, monkeypatch):
+    published = {'end': pd.Timestamp('2020-01-05 11:00')}
+    requested = _serve_power(monkeypatch, lambda t: 4.0 if t <= published['end'] else -999.0)
+    store = ColumnarCache(tmp_path)
+
+    def load():
+        return pd.concat(nasa_power.iter_hourly_chunks(['X'], 0, 0, '2020-01-01', '2020-01-06',
+                                                       clean=_valid, store=store))
+
+    assert len(load()) == 4 * 24
+    assert store.coverage(['X'], 0, 0, partition='hourly-2020') == [
+        (pd.Timestamp('2020-01-01'), pd.Timestamp('2020-01-04'))]
+    published['end'] = pd.Timestamp('2020-01-06 23:00')
+    assert len(load()) == 6 * 24
+    assert requested == [('20200101', '20200106'), ('20200105', '20200106')]
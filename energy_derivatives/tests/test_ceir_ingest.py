@@ -0,0 +1,80 @@
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from spk_derivatives import data_loader  # noqa: E402
+from spk_derivatives.cache import ColumnarCache  # noqa: E402
+
+
+def _write_sources(directory, n=600):
+    dates = pd.date_range('2019-01-01', periods=n)
+    prices = 8000 * np.exp(np.cumsum(np.random.default_rng(3).normal(0, 0.02, n)))
+    pd.DataFrame({'Date': dates.strftime('%m/%d/%Y'), 'Open': prices, 'Note': 'x'}) \
+        .to_csv(directory / 'bitcoin_ceir_final.csv', index=False)
+    pd.DataFrame({'DateTime': dates.strftime('%Y-%m-%dT00:00:00'),
+                  'Estimated TWh per Year': np.linspace(40, 120, n)}) \
+        .to_csv(directory / 'btc_con.csv', index=False)
+
+
+def test_ingest_once_then_read_columns_from_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv('SPK_CACHE_DIR', str(tmp_path / 'cache'))
+    _write_sources(tmp_path)
+
+    parses = []
+    original = data_loader._parse_ceir_sources
+    monkeypatch.setattr(data_loader, '_parse_ceir_sources',
+                        lambda sources: parses.append(1) or original(sources))
+
+    params = data_loader.load_parameters(str(tmp_path))
+    again = data_loader.load_parameters(str(tmp_path))
+    assert len(parses) == 1
+    assert again['S0'] == params['S0'] and again['sigma'] == params['sigma']
+    assert list(again['ceir_df'].columns) == ['Date'] + data_loader.PARAMETER_COLUMNS
+    assert again['ceir_df']['CEIR'].dtype == np.float64
+
+    # Same values as parsing the CSVs directly
+    direct = data_loader.load_ceir_data(str(tmp_path), use_cache=False)
+    assert np.allclose(data_loader.compute_energy_price(direct), again['energy_prices'])
+    assert 'Cumulative_Energy_Cost' in direct and 'Note' in direct
+
+    only = data_loader.load_ceir_data(str(tmp_path), columns=['CEIR', 'Nope'])
+    assert list(only.columns) == ['Date', 'CEIR'] and len(parses) == 2  # the direct parse only
+
+    # A changed source file is re-ingested on the next load
+    csv = tmp_path / 'btc_con.csv'
+    stat = csv.stat()
+    os.utime(csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    data_loader.load_ceir_data(str(tmp_path))
+    assert len(parses) == 3
+
+    store = ColumnarCache(tmp_path / 'cache')
+    entry = data_loader.ingest_ceir_data(str(tmp_path), store=store)
+    assert len(parses) == 3
+    assert entry['meta']['provenance']['files'][1][0] == 'btc_con.csv'
+    assert 'Note' not in entry['columns'] and entry['rows'] == 600
+
+
+def test_compute_ceir_column_forward_fills():
+    df = pd.DataFrame({'Market_Cap': [1e9, np.inf, 3e9], 'Energy_TWh_Annual': [36.5] * 3})
+    out = data_loader.compute_ceir_column(df)
+    assert out['CEIR'].tolist() == pytest.approx([200.0, 200.0, 200.0])
+
+
+def test_cache_failure_parses_sources_instead_of_synthetic(tmp_path, monkeypatch):
+    monkeypatch.setenv('SPK_CACHE_DIR', str(tmp_path / 'cache'))
+    _write_sources(tmp_path, n=50)
+
+    def denied(*args, **kwargs):
+        raise PermissionError("read-only cache")
+
+    monkeypatch.setattr(ColumnarCache, 'put', denied)
+    with pytest.warns(UserWarning, match="CEIR cache unavailable"):
+        df = data_loader.load_ceir_data(str(tmp_path), columns=['CEIR'])
+    assert list(df.columns) == ['Date', 'CEIR'] and len(df) == 50
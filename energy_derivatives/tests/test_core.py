@@ -1,6 +1,7 @@
 import sys
 from pathlib import Path
 import numpy as np
+import pytest
 from scipy.stats import norm
 
 repo_root = Path(__file__).resolve().parents[1]
@@ -59,3 +60,13 @@ def test_greeks_theta_negative_and_rho_positive():
 
     assert theta < 0  # time decay should be negative for long call
     assert rho > 0    # call value rises with rates
+
+
+def test_greeks_batch_matches_greeks_calculator():
+    from spk_derivatives.sensitivities import greeks_batch
+
+    batch = greeks_batch([1.0, 2.0], [1.0, 1.5], [1.0, 0.5], 0.05, [0.2, 0.4], N=50)
+    for i, (S0, K, T, sigma) in enumerate([(1.0, 1.0, 1.0, 0.2), (2.0, 1.5, 0.5, 0.4)]):
+        expected = GreeksCalculator(S0, K, T, 0.05, sigma, N=50).compute_all_greeks()
+        for name, value in expected.items():
+            assert batch[name][i] == pytest.approx(value, rel=1e-9, abs=1e-12)
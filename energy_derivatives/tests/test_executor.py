@@ -0,0 +1,84 @@
+import asyncio
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from api import tasks  # type: ignore  # noqa: E402
+from api.executor import FAST, HEAVY, LaneBusy, LaneTimeout, PricingExecutor  # type: ignore  # noqa: E402
+from spk_derivatives.binomial import BinomialTree  # noqa: E402
+
+PARAMS = {"S0": 1.0, "K": 1.0, "T": 1.0, "r": 0.05, "sigma": 0.2}
+
+
+def test_process_lanes_price_in_warm_workers():
+    executor = PricingExecutor("process", fast={"workers": 1}, heavy={"workers": 1})
+    try:
+        executor.start()
+        assert all(s["started"] for s in executor.stats().values())
+
+        async def go():
+            return await asyncio.gather(
+                executor.run(FAST, tasks.price_task, PARAMS, "binomial", 50, 0, "call"),
+                executor.run(HEAVY, tasks.price_task, PARAMS, "monte_carlo", 0, 2000, "call"),
+            )
+
+        tree, mc = asyncio.run(go())
+        assert tree["price"] == pytest.approx(BinomialTree(1.0, 1.0, 1.0, 0.05, 0.2, 50).price())
+        assert mc["ci_95"][0] < mc["price"] < mc["ci_95"][1]
+    finally:
+        executor.shutdown()
+
+
+def test_process_lane_recovers_from_a_dead_worker():
+    executor = PricingExecutor("process", fast={"workers": 1})
+
+    async def go():
+        with pytest.raises(LaneBusy):
+            await executor.run(FAST, os._exit, 1)
+        return await executor.run(FAST, sum, [1, 2])
+
+    try:
+        assert asyncio.run(go()) == 3
+        assert executor.stats()[FAST]["in_flight"] == 0
+    finally:
+        executor.shutdown()
+
+
+def test_heavy_lane_overload_does_not_block_fast_lane():
+    executor = PricingExecutor("thread", heavy={"workers": 1, "queue": 0, "timeout": 0.2})
+    release = threading.Event()
+
+    async def go():
+        stuck = asyncio.create_task(executor.run(HEAVY, release.wait, 5))
+        await asyncio.sleep(0.05)
+        with pytest.raises(LaneBusy):
+            await executor.run(HEAVY, sum, [1])
+        # The fast lane is unaffected while the heavy one is saturated
+        assert await executor.run(FAST, sum, [1, 2]) == 3
+        with pytest.raises(LaneTimeout):
+            await stuck
+        # A timed-out job keeps its slot until it really finishes
+        assert executor.stats()[HEAVY]["in_flight"] == 1
+        release.set()
+        await asyncio.sleep(0.05)
+        return await executor.run(HEAVY, sum, [4])
+
+    try:
+        assert asyncio.run(go()) == 4
+        assert executor.stats()[HEAVY]["in_flight"] == 0
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_executor_rejects_bad_configuration():
+    with pytest.raises(ValueError):
+        PricingExecutor("gpu")
+    with pytest.raises(ValueError):
+        PricingExecutor(fast={"workers": 0})
@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from api import formats  # type: ignore  # noqa: E402
+
+
+def test_negotiate_ranks_by_quality_and_offers_arrow_only_for_columns():
+    assert formats.negotiate(None) == formats.JSON_TYPE
+    assert formats.negotiate("application/json;q=0.5, application/x-msgpack") == formats.MSGPACK_TYPE
+    assert formats.negotiate("application/vnd.apache.arrow.stream, */*;q=0.1") == formats.JSON_TYPE
+    assert formats.negotiate("application/vnd.apache.arrow.stream, */*;q=0.1",
+                             columnar=True) == formats.ARROW_STREAM_TYPE
+    with pytest.raises(HTTPException) as exc:
+        formats.negotiate("text/csv, application/msgpack;q=0")
+    assert exc.value.status_code == 406
+
+
+def test_arrays_are_encoded_from_their_buffers():
+    prices = np.linspace(0.0, 1.0, 1000)
+    payload = {"count": 2, "columns": {"price": prices, "id": ["a", None]}}
+    decoded = formats.loads_msgpack(formats.dumps_msgpack(payload))
+    assert isinstance(decoded["columns"]["price"], np.ndarray)
+    assert np.array_equal(decoded["columns"]["price"], prices) and decoded["columns"]["id"] == ["a", None]
+    # Raw float64 bytes plus a small header, not 1000 packed floats
+    assert len(formats.dumps_msgpack(prices)) < prices.nbytes + 64
+    assert formats.dumps_json({"p": np.array([0.5, 1.0])}) == b'{"p":[0.5,1.0]}'
+
+
+def test_json_without_orjson_writes_nan_as_null(monkeypatch):
+    payload = {"price": np.array([0.5, np.nan]), "ci_low": [np.nan], "error": float("inf")}
+    expected = b'{"price":[0.5,null],"ci_low":[null],"error":null}'
+    assert formats.dumps_json(payload) == expected
+    monkeypatch.setattr(formats, "orjson", None)
+    assert formats.dumps_json(payload) == expected
@@ -0,0 +1,32 @@
+import sys
+from pathlib import Path
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from spk_derivatives.analytic import bs_price  # noqa: E402
+from spk_derivatives.binomial import BinomialTree  # noqa: E402
+from spk_derivatives.hedging import DeltaHedgeSimulator, historical_paths  # noqa: E402
+
+
+def test_analytic_price_matches_binomial():
+    tree = BinomialTree(100.0, 100.0, 1.0, 0.05, 0.2, N=500)
+    assert abs(bs_price(100.0, 100.0, 1.0, 0.05, 0.2) - tree.price()) < 0.02
+
+
+def test_hedge_error_shrinks_with_rebalancing_frequency():
+    hedger = DeltaHedgeSimulator(S0=100.0, K=100.0, T=1.0, r=0.05, sigma=0.2)
+    daily = hedger.run_monte_carlo(num_paths=4000, num_steps=252, rebalance=1, seed=7)
+    monthly = hedger.run_monte_carlo(num_paths=4000, num_steps=252, rebalance=21, seed=7)
+
+    assert daily['pnl'].shape == (4000,)
+    assert abs(np.mean(daily['pnl'])) < 0.05
+    assert np.std(daily['pnl']) < 0.5 * np.std(monthly['pnl'])
+
+
+def test_historical_paths_start_at_common_spot():
+    prices = np.linspace(1.0, 2.0, 300)
+    paths = historical_paths(prices, num_steps=20, stride=10, S0=0.5)
+    assert paths.shape == (28, 21)
+    assert np.allclose(paths[:, 0], 0.5)
@@ -0,0 +1,59 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from spk_derivatives.cache import ColumnarCache  # noqa: E402
+from spk_derivatives.hourly import (  # noqa: E402
+    HourlyAggregator,
+    iter_hourly_prices,
+    load_hourly_statistics,
+)
+from spk_derivatives.power_server import start_server  # noqa: E402
+
+
+@pytest.fixture
+def server():
+    srv = start_server()
+    yield srv
+    srv.shutdown()
+
+
+def test_streamed_statistics_match_full_frame(server, tmp_path):
+    store = ColumnarCache(tmp_path)
+    kwargs = dict(store=store, base_url=server.url)
+
+    chunks = list(iter_hourly_prices('wind', 57.05, 9.92, '2020-11-15', '2021-02-10', **kwargs))
+    assert [c.index.year.unique().tolist() for c in chunks] == [[2020], [2021]]
+    assert server.request_count == 2
+    full = pd.concat(chunks)
+
+    stats = load_hourly_statistics('wind', 57.05, 9.92, '2020-11-15', '2021-02-10', **kwargs)
+    assert server.request_count == 2  # both yearly partitions served from the cache
+    partitions = {k.split('@')[1] for k in store.entries()}
+    assert partitions == {'hourly-2020', 'hourly-2021'}
+
+    daily = full['Price'].resample('D')
+    np.testing.assert_allclose(stats['daily']['mean'], daily.mean(), rtol=1e-6)
+    np.testing.assert_allclose(stats['daily']['std'], daily.std(), rtol=1e-5)
+    monthly = full['Price'].resample('MS')
+    np.testing.assert_allclose(stats['monthly']['total'], monthly.sum(), rtol=1e-6)
+    assert stats['monthly'].index[0] == pd.Timestamp('2020-11-01')
+
+    # Synthetic wind is never calm, so cleaning drops no hours
+    assert (stats['daily']['hours'] == 24).all()
+
+
+def test_aggregator_combines_periods_split_across_chunks():
+    idx = pd.date_range('2022-03-01', periods=96, freq='h')
+    df = pd.DataFrame({'Price': np.linspace(1.0, 2.0, 96)}, index=idx)
+    whole = HourlyAggregator().consume([df]).result()
+    split = HourlyAggregator().consume([df.iloc[:30], df.iloc[30:77], df.iloc[77:]]).result()
+    for name in ('daily', 'monthly'):
+        pd.testing.assert_frame_equal(whole[name], split[name])
+    assert whole['daily']['realized_vol'].iloc[1] > 0
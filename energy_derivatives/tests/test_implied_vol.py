@@ -0,0 +1,51 @@
+import sys
+from pathlib import Path
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from spk_derivatives.analytic import bs_price  # noqa: E402
+from spk_derivatives.binomial import BinomialTree, price_batch  # noqa: E402
+from spk_derivatives.implied_vol import implied_volatility, implied_params  # noqa: E402
+from spk_derivatives.sensitivities import GreeksCalculator  # noqa: E402
+
+
+def test_price_batch_matches_binomial_tree():
+    prices = price_batch([100.0, 90.0], 100.0, 1.0, 0.05, [0.2, 0.3], N=200)
+    expected = [BinomialTree(100.0, 100.0, 1.0, 0.05, 0.2, N=200).price(),
+                BinomialTree(90.0, 100.0, 1.0, 0.05, 0.3, N=200).price()]
+    assert np.allclose(prices, expected)
+
+
+def test_round_trip_recovers_volatility():
+    rng = np.random.default_rng(0)
+    S = rng.uniform(0.8, 1.2, 500)
+    T = rng.uniform(0.25, 2.0, 500)
+    sigma = rng.uniform(0.1, 1.0, 500)
+    quotes = bs_price(S, 1.0, T, 0.03, sigma)
+
+    iv = implied_volatility(quotes, S, 1.0, T, 0.03)
+    assert iv['converged'].all()
+    assert np.max(np.abs(iv['sigma'] - sigma)) < 1e-6
+
+    lattice = implied_volatility(price_batch(S[:20], 1.0, T[:20], 0.03, sigma[:20], N=200),
+                                 S[:20], 1.0, T[:20], 0.03, method='binomial', N=200)
+    assert np.max(np.abs(lattice['sigma'] - sigma[:20])) < 1e-6
+
+
+def test_unsolvable_quotes_are_flagged():
+    iv = implied_volatility([0.018, 0.0001, 0.05], S0=0.035, K=0.020, T=1.0, r=0.025)
+    assert list(iv['flag']) == ['ok', 'below_intrinsic', 'above_upper_bound']
+    assert iv['sigma'].isna().sum() == 2
+
+    params = implied_params(iv)
+    assert len(params) == 1
+    GreeksCalculator(**params[0]).delta()
+
+
+def test_quote_above_bracket_is_not_converged():
+    for method in ('analytic', 'binomial'):
+        iv = implied_volatility([0.995], S0=1.0, K=1.0, T=1.0, r=0.05, method=method)
+        assert list(iv['flag']) == ['above_bracket']
+        assert not iv['converged'].any() and iv['sigma'].isna().all()
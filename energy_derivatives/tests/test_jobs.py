@@ -0,0 +1,84 @@
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from api.jobs import STALE_SECONDS, JobStore, run_job, worker_id  # type: ignore  # noqa: E402
+from spk_derivatives.analytic import bs_price  # noqa: E402
+
+MC = {"S0": 1.0, "K": 1.0, "T": 1.0, "r": 0.05, "sigma": 0.2,
+      "num_simulations": 40_000, "chunk_size": 10_000, "seed": 11}
+
+
+def test_monte_carlo_job_reports_partial_ci_and_stores_results(tmp_path):
+    store = JobStore(tmp_path / "jobs.sqlite", tmp_path / "results")
+    job_id = store.submit("monte_carlo", MC)
+    assert store.get(job_id)["status"] == "queued"
+
+    seen = []
+    report = store.report
+    store.report = lambda i, p, partial=None: seen.append((p, partial)) or report(i, p, partial)
+    job = store.claim("test")
+    assert job["status"] == "running" and store.claim("other") is None
+    assert run_job(store, job) == "done"
+
+    assert [p for p, _ in seen] == [0.25, 0.5, 0.75, 1.0]
+    assert seen[0][1]["paths"] == 10_000 and seen[0][1]["ci_95"][0] < seen[0][1]["price"]
+    widths = [partial["ci_95"][1] - partial["ci_95"][0] for _, partial in seen]
+    assert widths[-1] < widths[0]
+
+    done = store.get(job_id)
+    assert done["status"] == "done" and done["progress"] == 1.0
+    result = done["result"]
+    assert result["paths"] == 40_000 and result["seed"] == 11
+    assert abs(result["price"] - bs_price(1.0, 1.0, 1.0, 0.05, 0.2)) < 4 * result["std_error"]
+
+    trace = pd.read_parquet(store.artifact_path(job_id, "convergence"))
+    assert trace["paths"].tolist() == [10_000, 20_000, 30_000, 40_000]
+    assert trace["price"].iloc[-1] == pytest.approx(result["price"])
+    assert np.isclose(trace["std_error"].iloc[0], seen[0][1]["std_error"])
+
+
+def test_cancel_fail_and_recover(tmp_path):
+    store = JobStore(tmp_path / "jobs.sqlite", tmp_path / "results")
+    with pytest.raises(ValueError):
+        store.submit("monte_carlo", {**MC, "num_simulations": 0})
+    with pytest.raises(ValueError):
+        store.submit("nope", {})
+
+    queued = store.submit("monte_carlo", MC)
+    assert store.cancel(queued)["status"] == "cancelled"
+
+    running = store.submit("monte_carlo", MC)
+    job = store.claim("test")
+    store.cancel(running)
+    assert run_job(store, job) == "cancelled"  # stops at the first progress report
+    assert store.get(running)["status"] == "cancelled"
+
+    broken = store.submit("monte_carlo", {**MC, "S0": -1.0})
+    assert run_job(store, store.claim("test")) == "failed"
+    assert "S0 must be positive" in store.get(broken)["error"]
+
+    # Only jobs whose worker is gone go back to the queue
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    orphan = store.submit("monte_carlo", MC)
+    store.claim(f"{socket.gethostname()}:{dead.pid}")
+    live = store.submit("monte_carlo", MC)
+    store.claim(worker_id())
+    remote = store.submit("monte_carlo", MC)
+    store.claim("other-host:1")
+    assert store.recover() == 1 and store.get(orphan)["status"] == "queued"
+    assert store.get(live)["status"] == store.get(remote)["status"] == "running"
+
+    store._update(remote, heartbeat=time.time() - 2 * STALE_SECONDS)
+    assert store.recover() == 1 and store.get(remote)["status"] == "queued"
+    assert {j["id"] for j in store.list(status="queued")} == {orphan, remote}
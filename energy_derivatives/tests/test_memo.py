@@ -0,0 +1,84 @@
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from spk_derivatives import data_loader  # noqa: E402
+from spk_derivatives.cache import default_cache  # noqa: E402
+from spk_derivatives.data_loader_wind import WIND_VARIABLES, WindDataLoader  # noqa: E402
+from spk_derivatives.memo import (  # noqa: E402
+    MemoCache,
+    content_key,
+    memoized_ceir_parameters,
+    memoized_loader_parameters,
+)
+from spk_derivatives.power_server import start_server  # noqa: E402
+
+
+@pytest.fixture
+def server(monkeypatch):
+    srv = start_server()
+    monkeypatch.setenv('NASA_POWER_BASE_URL', srv.url)
+    yield srv
+    srv.shutdown()
+
+
+def test_content_key_ignores_dict_order():
+    assert content_key({'a': 1, 'b': [1, 2]}) == content_key({'b': [1, 2], 'a': 1})
+    assert content_key({'a': 1}) != content_key({'a': 2})
+
+
+def test_loader_parameters_memoized_until_cache_changes(server, tmp_path, monkeypatch):
+    monkeypatch.setenv('SPK_CACHE_DIR', str(tmp_path / 'cache'))
+    store = default_cache()
+    memo = MemoCache(disk_dir=tmp_path / 'memo')
+    init = {'lat': 57.05, 'lon': 9.92, 'start_year': 2020, 'end_year': 2020}
+
+    first = memoized_loader_parameters(WindDataLoader, init, memo=memo, r=0.03)
+    version = store.data_version()
+    second = memoized_loader_parameters(WindDataLoader, init, memo=memo, r=0.03)
+    assert memo.stats()['hits'] == 1 and second['sigma'] == first['sigma']
+    assert store.data_version() == version  # reads do not bump the version
+
+    # Fresh process: served from the disk tier
+    warm = MemoCache(disk_dir=tmp_path / 'memo')
+    memoized_loader_parameters(WindDataLoader, init, memo=warm, r=0.03)
+    assert warm.stats()['disk_hits'] == 1
+
+    # Different kwargs and changed data both miss
+    memoized_loader_parameters(WindDataLoader, init, memo=memo, r=0.04)
+    store.invalidate(WIND_VARIABLES, 57.05, 9.92)
+    memoized_loader_parameters(WindDataLoader, init, memo=memo, r=0.03)
+    assert memo.stats()['misses'] == 3
+    assert server.request_count == 2
+
+
+def test_ceir_parameters_reload_when_csv_changes(tmp_path, monkeypatch):
+    csv = tmp_path / 'bitcoin_ceir_final.csv'
+    dates = pd.date_range('2021-01-01', periods=400)
+    prices = 30000 * np.exp(np.cumsum(np.random.default_rng(0).normal(0, 0.02, 400)))
+    pd.DataFrame({'Date': dates, 'Price': prices, 'Market_Cap': prices * 19e6,
+                  'CEIR': prices / 1000}).to_csv(csv, index=False)
+
+    calls = []
+    original = data_loader.load_parameters
+    monkeypatch.setattr(data_loader, 'load_parameters',
+                        lambda **kw: calls.append(kw) or original(**kw))
+    memo = MemoCache()
+
+    a = memoized_ceir_parameters(str(tmp_path), memo=memo)
+    a['S0'] = -1.0  # callers get copies
+    b = memoized_ceir_parameters(str(tmp_path), memo=memo)
+    assert len(calls) == 1 and b['S0'] > 0
+
+    stat = csv.stat()
+    csv.write_text(csv.read_text())
+    os.utime(csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    memoized_ceir_parameters(str(tmp_path), memo=memo)
+    assert len(calls) == 2
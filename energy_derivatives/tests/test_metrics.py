@@ -0,0 +1,57 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from spk_derivatives import profiling  # noqa: E402
+from spk_derivatives.binomial import BinomialTree  # noqa: E402
+from spk_derivatives.monte_carlo import MonteCarloSimulator  # noqa: E402
+from spk_derivatives.sensitivities import GreeksCalculator  # noqa: E402
+
+
+@pytest.fixture
+def profiled():
+    was = profiling.enabled()
+    profiling.reset()
+    profiling.enable()
+    yield
+    profiling.enable(was)
+    profiling.reset()
+
+
+def test_engine_phases_recorded_only_when_enabled(profiled):
+    BinomialTree(1.0, 1.0, 1.0, 0.05, 0.2, 50).price()
+    MonteCarloSimulator(1.0, 1.0, 1.0, 0.05, 0.2, 1000, seed=0).confidence_interval()
+    GreeksCalculator(1.0, 1.0, 1.0, 0.05, 0.2, N=20).compute_all_greeks()
+    data = profiling.snapshot()
+    assert {('binomial', 'build'), ('binomial', 'payoff'), ('binomial', 'rollback'),
+            ('monte_carlo', 'rng'), ('monte_carlo', 'paths'), ('monte_carlo', 'payoff'),
+            ('monte_carlo', 'statistics'), ('greeks', 'reprice'), ('greeks', 'total')} <= set(data)
+    count, total, buckets = data[('greeks', 'total')]
+    assert count == 1 and total > 0 and sum(buckets) == 1
+    assert data[('binomial', 'rollback')][0] == 1 + data[('greeks', 'reprice')][0]
+
+    # Worker snapshots merge into the parent's aggregate
+    worker = profiling.snapshot(reset=True)
+    assert profiling.snapshot() == {}
+    profiling.merge(worker)
+    profiling.merge(worker)
+    assert profiling.snapshot()[('greeks', 'total')][0] == 2
+
+    profiling.enable(False)
+    profiling.reset()
+    BinomialTree(1.0, 1.0, 1.0, 0.05, 0.2, 50).price()
+    assert profiling.snapshot() == {}
+
+
+def test_disabled_hooks_are_cheap(profiled):
+    profiling.enable(False)
+    start = time.perf_counter()
+    for _ in range(100_000):
+        with profiling.phase('binomial', 'rollback'):
+            pass
+    assert (time.perf_counter() - start) / 100_000 < 5e-6
@@ -0,0 +1,52 @@
+import sys
+from pathlib import Path
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from spk_derivatives import payoffs  # noqa: E402
+from spk_derivatives.analysis import pnl_calculator, break_even_analysis  # noqa: E402
+
+
+def test_single_position_pnl_matches_scalar_formula():
+    spots = np.linspace(0.02, 0.06, 2001)
+    pnl = pnl_calculator(S0=0.035, K=0.040, T=1.0, r=0.025, sigma=0.42,
+                         spot_range=spots, option_price=0.004, position='short_put')
+    expected = 0.004 - np.maximum(0.040 - spots, 0)
+    assert len(pnl) == spots.size
+    assert np.allclose(pnl['Net P&L ($/kWh)'], expected)
+
+
+def test_bull_call_spread_break_even_and_bounds():
+    legs = payoffs.vertical_spread(0.04, 0.05, premium_low=0.006, premium_high=0.002)
+    points = payoffs.break_even_points(legs)
+    assert np.allclose(points, [0.044])
+
+    be = break_even_analysis(S0=0.035, K=0.040, T=1.0, r=0.025, sigma=0.42, legs=legs)
+    assert np.isclose(be['max_loss'], -0.004)
+    assert np.isclose(be['max_profit'], 0.006)
+
+
+def test_collar_payoff_is_bounded():
+    legs = payoffs.collar(S_entry=1.0, K_put=0.9, K_call=1.2, premium_put=0.03, premium_call=0.03)
+    pnl = payoffs.strategy_pnl(np.array([0.1, 0.9, 1.0, 1.2, 5.0]), legs)
+    assert np.allclose(pnl, [-0.1, -0.1, 0.0, 0.2, 0.2])
+    assert np.allclose(payoffs.break_even_points(legs), [1.0])
+
+
+def test_break_even_ignores_flat_zero_segments_and_handles_no_root():
+    from spk_derivatives.results_manager import PricingResult
+    from spk_derivatives.results_manager import break_even_analysis as result_break_even
+
+    assert np.allclose(payoffs.break_even_points(payoffs.position_legs('long_call', 1.0, 0.0)), [1.0])
+    assert payoffs.break_even_points(payoffs.position_legs('long_put', 1.0, 1.5)).size == 0
+
+    params = {'S0': 1.0, 'K': 1.0, 'T': 1.0, 'r': 0.05, 'sigma': 0.4}
+    result = PricingResult(option_price=0.18, greeks={}, params=params)
+    put = result_break_even(result, position='long_put')
+    put_premium = 0.18 - 1.0 + np.exp(-0.05)
+    assert np.isclose(put['premium_paid'], put_premium)
+    assert np.isclose(put['breakeven_price'], 1.0 - put_premium)
+    deep = PricingResult(option_price=1.2, greeks={}, params={**params, 'S0': 0.1})
+    assert result_break_even(deep, position='long_put')['breakeven_price'] is None
@@ -0,0 +1,93 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from spk_derivatives.cache import ColumnarCache  # noqa: E402
+from spk_derivatives.data_loader_hydro import hydro_energy_price  # noqa: E402
+from spk_derivatives.data_loader_wind import WindDataLoader  # noqa: E402
+from spk_derivatives.power_models import compute_prices, get_model, list_models  # noqa: E402
+from spk_derivatives.power_server import start_server  # noqa: E402
+from spk_derivatives.region import RegionScreener  # noqa: E402
+
+
+@pytest.fixture
+def server():
+    srv = start_server()
+    yield srv
+    srv.shutdown()
+
+
+def test_kernels_on_site_by_day_arrays():
+    assert list_models() == {'solar': ['linear', 'pv_temperature'],
+                             'wind': ['cubic', 'power_curve'],
+                             'hydro': ['reservoir', 'runoff']}
+
+    # Power curve: zero below cut-in and from cut-out, flat between rated and cut-out
+    speeds = np.array([[0.0, 2.9, 3.0, 12.0, 20.0], [24.9, 25.0, 30.0, np.nan, 7.0]])
+    curve = compute_prices('wind', {'WS50M': speeds}, model='power_curve')
+    cubic = compute_prices('wind', {'WS50M': speeds})
+    assert curve.shape == speeds.shape
+    assert curve[0, :3].tolist() == [0.0, 0.0, 0.0] and curve[1, 1:3].tolist() == [0.0, 0.0]
+    assert curve[0, 3] == pytest.approx(cubic[0, 3]) and curve[0, 4] == curve[0, 3]
+    assert curve[1, 0] == curve[0, 3] and np.isnan(curve[1, 3])
+    assert 0 < curve[1, 4] < cubic[1, 4]
+
+    tabulated = compute_prices('wind', {'WS50M': np.array([5.0])}, model='power_curve',
+                               curve_speeds_ms=[4, 6], curve_power_kw=[100, 300])
+    assert tabulated[0] == pytest.approx(200 * 24 * 0.08)
+
+    # Reservoir: routes the same water, lagged and smoothed
+    rng = np.random.default_rng(0)
+    rain = rng.gamma(0.3, 10.0, (4, 3000))
+    stored = compute_prices('hydro', {'PREC': rain}, model='reservoir', release_fraction=0.05)
+    same_day = compute_prices('hydro', {'PREC': rain})
+    assert stored.shape == rain.shape
+    assert stored.sum(axis=1) == pytest.approx(same_day.sum(axis=1), rel=0.02)
+    assert (stored.std(axis=1) < 0.3 * same_day.std(axis=1)).all()
+    single = compute_prices('hydro', {'PREC': rain[2]}, model='reservoir', release_fraction=0.05)
+    assert np.allclose(single, stored[2])
+    assert hydro_energy_price(rain, 1e9, 50.0, 0.6, 0.87, 0.06) == pytest.approx(same_day)
+
+    # Temperature-derated PV loses output on hot days only
+    ghi = np.full(3, 6.0)
+    derated = compute_prices('solar', {'GHI': ghi, 'T2M': np.array([-10.0, 10.0, 40.0])},
+                             model='pv_temperature')
+    linear = compute_prices('solar', {'GHI': ghi})
+    assert derated[0] > linear[0] > derated[2] and derated[1] < derated[0]
+
+    with pytest.raises(ValueError, match='needs columns'):
+        compute_prices('solar', {'GHI': ghi}, model='pv_temperature')
+    with pytest.raises(ValueError, match='Unknown parameters'):
+        get_model('wind')({'WS50M': speeds}, cut_in_ms=3.0)
+    with pytest.raises(ValueError, match='Unknown wind model'):
+        get_model('wind', 'betz')
+
+
+def test_loaders_and_screener_select_models_by_name(server, tmp_path, monkeypatch):
+    monkeypatch.setenv('NASA_POWER_BASE_URL', server.url)
+    monkeypatch.setenv('SPK_CACHE_DIR', str(tmp_path / 'cache'))
+
+    loader = WindDataLoader(lat=56.5, lon=9.5, start_year=2020, end_year=2020,
+                            power_model='power_curve', model_params={'cut_out_ms': 20.0})
+    df = loader.fetch_data()
+    prices = loader.compute_price(df)
+    expected = compute_prices('wind', df, model='power_curve', cut_out_ms=20.0)
+    assert np.allclose(prices, expected)
+    assert loader.load_parameters()['turbine_specs']['power_model'] == 'power_curve'
+    with pytest.raises(ValueError, match='Unknown parameters'):
+        WindDataLoader(power_model='cubic', model_params={'cut_out_ms': 20.0})
+
+    # Screening with a two-input model fetches T2M alongside irradiance
+    screener = RegionScreener((24.0, 25.0, 121.0, 121.0), 1.0, energy_type='solar',
+                              start_year=2020, end_year=2020, power_model='pv_temperature')
+    dates, values, coords = screener.fetch(store=ColumnarCache(tmp_path / 'cache'))
+    assert sorted(values) == ['GHI', 'T2M'] and values['T2M'].shape == (2, len(dates))
+    table = screener.evaluate(values, coords)
+    linear = RegionScreener((24.0, 25.0, 121.0, 121.0), 1.0, energy_type='solar',
+                            start_year=2020, end_year=2020).evaluate(values['GHI'], coords)
+    assert (table['mean_price'] < linear['mean_price']).all()
@@ -0,0 +1,61 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from spk_derivatives import nasa_power  # noqa: E402
+from spk_derivatives.data_loader_wind import WindDataLoader  # noqa: E402
+from spk_derivatives.power_server import (  # noqa: E402
+    record_fixture,
+    start_server,
+    synthesize_daily,
+)
+
+
+@pytest.fixture
+def server():
+    srv = start_server()
+    yield srv
+    srv.shutdown()
+
+
+def test_synthesized_days_do_not_depend_on_window():
+    full = synthesize_daily(['WS50M', 'T2M'], 57.05, 9.92, '2019-12-01', '2020-03-01')
+    part = synthesize_daily(['WS50M', 'T2M'], 57.05, 9.92, '2020-01-15', '2020-02-15')
+    pd.testing.assert_frame_equal(full.loc[part.index], part)
+
+
+def test_loader_runs_offline_via_base_url_env(server, tmp_path, monkeypatch):
+    monkeypatch.setenv(nasa_power.BASE_URL_ENV, server.url)
+    monkeypatch.setenv('SPK_CACHE_DIR', str(tmp_path / 'cache'))
+
+    loader = WindDataLoader(lat=57.05, lon=9.92, start_year=2020, end_year=2020)
+    first = loader.fetch_data()
+    second = loader.fetch_data()
+
+    assert len(first) == 366 and first['WS50M'].between(0, 50).all()
+    assert server.request_count == 1  # second load served from the cache
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_recorded_fixtures_replay_in_strict_mode(server, tmp_path):
+    fixtures = tmp_path / 'fixtures'
+    record_fixture(['PREC', 'T2M'], 10.0, 20.0, '2021-01-01', '2021-06-30',
+                   fixtures, base_url=server.url)
+
+    replay = start_server(fixtures_dir=fixtures, strict=True)
+    try:
+        df = nasa_power.fetch_daily(['PREC', 'T2M'], 10.0, 20.0, '2021-02-01', '2021-02-28',
+                                    base_url=replay.url)
+        expected = synthesize_daily(['PREC', 'T2M'], 10.0, 20.0, '2021-02-01', '2021-02-28')
+        pd.testing.assert_frame_equal(df, expected, check_names=False, check_freq=False)
+
+        with pytest.raises(ConnectionError):
+            nasa_power.fetch_daily(['PREC'], 10.0, 20.0, '2022-01-01', '2022-01-31',
+                                   base_url=replay.url, retry_budget=nasa_power.RetryBudget(0))
+    finally:
+        replay.shutdown()
@@ -0,0 +1,54 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from spk_derivatives.cache import ColumnarCache  # noqa: E402
+from spk_derivatives.data_loader_wind import WindDataLoader  # noqa: E402
+from spk_derivatives.power_server import start_server  # noqa: E402
+from spk_derivatives.region import RegionScreener, grid_cells, volatility_matrix  # noqa: E402
+
+
+@pytest.fixture
+def server():
+    srv = start_server()
+    yield srv
+    srv.shutdown()
+
+
+def test_grid_and_vectorized_volatility():
+    cells = grid_cells((10.0, 11.0, 20.0, 22.0), 0.5)
+    assert cells.shape == (15, 2) and cells[-1].tolist() == [11.0, 22.0]
+
+    rng = np.random.default_rng(1)
+    prices = np.exp(np.cumsum(rng.normal(0, 0.01, (3, 200)), axis=1))
+    prices[1, 50] = np.nan
+    prices[2, 1:] = np.nan  # no returns -> fallback
+    sigma, n = volatility_matrix(prices, periods=252)
+    expected = np.std(np.diff(np.log(prices[0])), ddof=1) * np.sqrt(252)
+    assert sigma[0] == pytest.approx(expected)
+    assert n.tolist() == [199, 197, 0] and sigma[2] == 0.20
+
+
+def test_screen_matches_single_site_loader(server, tmp_path, monkeypatch):
+    monkeypatch.setenv('NASA_POWER_BASE_URL', server.url)
+    monkeypatch.setenv('SPK_CACHE_DIR', str(tmp_path / 'cache'))
+
+    screener = RegionScreener((56.0, 57.0, 9.0, 10.0), 0.5, energy_type='wind',
+                              start_year=2020, end_year=2020)
+    table = screener.screen(rank_by='sigma', ascending=True,
+                            store=ColumnarCache(tmp_path / 'cache'))
+
+    assert len(table) == 9 and table['rank'].tolist() == list(range(1, 10))
+    assert table['sigma'].is_monotonic_increasing
+    assert (table['option_price'] > 0).all()
+
+    params = WindDataLoader(lat=56.5, lon=9.5, start_year=2020, end_year=2020).load_parameters()
+    row = table[(table['lat'] == 56.5) & (table['lon'] == 9.5)].iloc[0]
+    assert row['S0'] == pytest.approx(params['S0'], rel=1e-6)
+    assert row['sigma'] == pytest.approx(params['sigma'], rel=1e-6)
+    assert server.request_count == 9  # the loader was served from the shared cache
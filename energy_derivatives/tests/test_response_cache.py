@@ -0,0 +1,73 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from api.response_cache import ResponseCache, request_key  # type: ignore  # noqa: E402
+
+PARAMS = {"S0": 1.0, "K": 1.0, "T": 1.0, "r": 0.05, "sigma": 0.2}
+
+
+def test_request_key_canonicalization():
+    base = request_key("price", PARAMS, "binomial", None, 100, 10000, payoff_type="call")
+    # Float noise, dict order and unused engine options do not split entries
+    noisy = dict(reversed(list({**PARAMS, "sigma": 0.2 + 1e-15}.items())))
+    assert request_key("price", noisy, "binomial", 7, 100, 5, payoff_type="call") == base
+    assert request_key("price", PARAMS, "binomial", None, 101, 10000, payoff_type="call") != base
+    assert request_key("greeks", PARAMS, "binomial", None, 100, 10000, payoff_type="call") != base
+    # Unseeded Monte-Carlo is never cached
+    assert request_key("price", PARAMS, "monte_carlo", None, 100, 10000) is None
+    assert request_key("price", PARAMS, "monte_carlo", 1, 100, 10000) != \
+        request_key("price", PARAMS, "monte_carlo", 2, 100, 10000)
+
+
+def test_cache_coalesces_and_serves_hits_until_ttl(monkeypatch):
+    cache = ResponseCache(maxsize=2, ttl=30)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"price": 0.1}
+
+    async def go():
+        first = await asyncio.gather(*[cache.get_or_compute("k", compute) for _ in range(5)])
+        again = await cache.get_or_compute("k", compute)
+        unkeyed = await cache.get_or_compute(None, compute)
+        return first, again, unkeyed
+
+    first, again, unkeyed = asyncio.run(go())
+    assert len(calls) == 2 and all(r == {"price": 0.1} for r in first + [again, unkeyed])
+    stats = cache.stats()
+    assert (stats["misses"], stats["coalesced"], stats["hits"], stats["uncacheable"]) == (1, 4, 1, 1)
+    assert stats["hit_rate"] == pytest.approx(5 / 6) and stats["saved_seconds"] > 0.2
+
+    # Expired entries are recomputed
+    import api.response_cache as rc  # type: ignore
+    now = rc.time.time()
+    monkeypatch.setattr(rc.time, "time", lambda: now + 31)
+    asyncio.run(cache.get_or_compute("k", compute))
+    assert len(calls) == 3
+
+
+def test_errors_are_not_cached_and_shared_tier_spans_instances(tmp_path):
+    db = tmp_path / "responses.sqlite"
+    one, two = ResponseCache(ttl=30, shared_path=db), ResponseCache(ttl=30, shared_path=db)
+
+    async def fail():
+        raise ValueError("bad contract")
+
+    async def value():
+        return {"greeks": {"Delta": 0.6}}
+
+    with pytest.raises(ValueError):
+        asyncio.run(one.get_or_compute("k", fail))
+    assert asyncio.run(one.get_or_compute("k", value)) == {"greeks": {"Delta": 0.6}}
+    assert asyncio.run(two.get_or_compute("k", fail)) == {"greeks": {"Delta": 0.6}}
+    assert two.stats()["shared_hits"] == 1
+    two.clear()
+    assert ResponseCache(ttl=30, shared_path=db).stats()["entries"] == 0
@@ -0,0 +1,45 @@
+import asyncio
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from api import streaming  # type: ignore  # noqa: E402
+
+
+def test_stream_type_and_encoding():
+    assert streaming.stream_type("text/html, text/event-stream;q=0.9") == streaming.SSE_TYPE
+    assert streaming.stream_type("application/json") is None
+    assert streaming.encode({"a": 1}, streaming.NDJSON_TYPE) == b'{"a": 1}\n'
+    assert streaming.encode({"a": 1}, streaming.SSE_TYPE, "done") == b'event: done\ndata: {"a": 1}\n\n'
+    assert streaming.chunked(list(range(7)), first=1, size=4) == [[0], [1, 2, 3, 4], [5, 6]]
+
+
+def test_stream_chunks_windows_and_stops_on_disconnect(monkeypatch):
+    monkeypatch.setattr(streaming, "DISCONNECT_POLL_SECONDS", 0.01)
+    started, cancelled, gone = [], [], []
+
+    async def run(chunk):
+        started.append(chunk)
+        try:
+            await asyncio.sleep(0 if chunk == 0 else 10)
+        except asyncio.CancelledError:
+            cancelled.append(chunk)
+            raise
+        return [{"chunk": chunk}]
+
+    async def is_disconnected():
+        return bool(gone)
+
+    async def go():
+        rows = []
+        async for row in streaming.stream_chunks(run, range(100), 2, is_disconnected):
+            rows.append(row)
+            gone.append(True)  # client leaves after the first row
+        await asyncio.sleep(0)
+        return rows
+
+    rows = asyncio.run(go())
+    assert rows == [{"chunk": 0}]
+    assert started == [0, 1, 2] and sorted(cancelled) == [1, 2]
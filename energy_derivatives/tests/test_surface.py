@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from spk_derivatives.binomial import price_batch  # noqa: E402
+from spk_derivatives.sensitivities import greeks_batch  # noqa: E402
+from spk_derivatives.surface import PriceSurface, chebyshev_nodes  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def surface():
+    return PriceSurface.build(r=0.05, N=60, moneyness=(0.7, 1.5), T=(0.25, 1.5),
+                              sigma=(0.2, 0.6), nodes=(16, 10, 10), validation_points=128)
+
+
+def test_surface_quotes_any_strike_within_validated_bound(surface):
+    rng = np.random.default_rng(7)
+    K = rng.uniform(0.5, 50.0, 200)
+    S0 = K * rng.uniform(0.75, 1.45, 200)
+    T, sigma = rng.uniform(0.3, 1.4, 200), rng.uniform(0.25, 0.55, 200)
+    quote = surface.quote(S0, K, T, sigma)
+    assert quote["on_surface"].all()
+    exact = price_batch(S0, K, T, 0.05, sigma, N=60)
+    # The bound is per unit strike; prices scale with K
+    assert np.all(np.abs(quote["Price"] - exact) <= surface.error_bound["Price"] * K)
+    vega = greeks_batch(S0, K, T, 0.05, sigma, N=60)["Vega"]
+    assert np.all(np.abs(quote["Vega"] - vega) <= surface.error_bound["Vega"] * K)
+
+
+def test_surface_falls_back_outside_its_domain(surface):
+    quote = surface.quote([1.0, 1.0], [1.0, 1.0], [0.5, 0.5], [0.3, 0.9], greeks=False)
+    assert quote["on_surface"].tolist() == [True, False]
+    assert quote["Price"][1] == pytest.approx(price_batch(1.0, 1.0, 0.5, 0.05, 0.9, N=60))
+    with pytest.raises(ValueError):
+        surface.quote(1.0, 1.0, 0.5, 0.9, fallback=False)
+    assert np.allclose(np.sort(chebyshev_nodes(3, (0.0, 2.0))), [1 - np.sqrt(3) / 2, 1, 1 + np.sqrt(3) / 2])
@@ -0,0 +1,74 @@
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from spk_derivatives.volatility import (  # noqa: E402
+    EWMAVolatility,
+    GARCHVolatility,
+    RollingVolatility,
+    VolatilityEstimator,
+    volatility_term_structure,
+)
+
+
+def simulate_garch(n=4000, omega=2e-6, alpha=0.08, beta=0.90, seed=7):
+    rng = np.random.default_rng(seed)
+    h = omega / (1 - alpha - beta)
+    returns = np.empty(n)
+    for t in range(n):
+        returns[t] = np.sqrt(h) * rng.standard_normal()
+        h = omega + alpha * returns[t] ** 2 + beta * h
+    return 100 * np.exp(np.concatenate([[0.0], np.cumsum(returns)]))
+
+
+def test_incremental_updates_match_batch_fit():
+    prices = simulate_garch()
+    returns = np.diff(np.log(prices))
+
+    rolling = RollingVolatility(window=60).fit(prices[:-20])
+    for p in prices[-20:]:
+        rolling.update(p)
+    assert rolling.sigma == pytest.approx(np.std(returns[-60:]) * np.sqrt(252), rel=1e-9)
+
+    garch = GARCHVolatility().fit(prices[:-20])
+    fixed = dict(omega=garch.omega, alpha=garch.alpha, beta=garch.beta)
+    for p in prices[-20:]:
+        garch.update(p)
+    batch = GARCHVolatility(**fixed).fit(prices)
+    assert garch.sigma == pytest.approx(batch.sigma, rel=1e-6)
+
+    ewma = EWMAVolatility(lam=0.94).fit(prices[:-1])
+    expected = 0.94 * ewma.variance + 0.06 * returns[-1] ** 2
+    ewma.update(prices[-1])
+    assert ewma.variance == pytest.approx(expected)
+
+
+def test_state_round_trips_through_json():
+    prices = simulate_garch(n=500)
+    for est in (RollingVolatility(window=30, periods=365), EWMAVolatility(), GARCHVolatility()):
+        est.fit(prices[:-1])
+        restored = VolatilityEstimator.from_state(json.loads(json.dumps(est.get_state())))
+        assert type(restored) is type(est)
+        assert restored.update(prices[-1]) == pytest.approx(est.update(prices[-1]))
+
+
+def test_garch_fit_and_term_structure():
+    prices = simulate_garch()
+    garch = GARCHVolatility().fit(prices)
+    assert garch.alpha == pytest.approx(0.08, abs=0.04)
+    assert garch.beta == pytest.approx(0.90, abs=0.05)
+
+    ts = volatility_term_structure(prices, maturities=[0.01, 1.0, 50.0], model='garch',
+                                   omega=garch.omega, alpha=garch.alpha, beta=garch.beta)
+    long_run = np.sqrt(garch.long_run_variance * 252)
+    assert ts['sigma'].iloc[0] == pytest.approx(garch.sigma, rel=0.05)
+    assert ts['sigma'].iloc[-1] == pytest.approx(long_run, rel=0.01)
+
+    flat = volatility_term_structure(prices, maturities=[0.5, 2.0], model='ewma')
+    assert flat['sigma'].nunique() == 1
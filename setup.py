@@ -73,6 +73,12 @@ setup(
             "plotly>=5.13.0",
         ],
 
+        # Excel / Parquet / Arrow export
+        "export": [
+            "openpyxl>=3.0.0",
+            "pyarrow>=10.0.0",
+        ],
+
         # Full installation (everything)
         "all": [
             "matplotlib>=3.4.0",